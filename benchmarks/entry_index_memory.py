@@ -0,0 +1,83 @@
+import datetime
+import gc
+import sys
+import tracemalloc
+from typing import Callable, List
+
+from beatdrop import CrontabEntry, IntervalEntry, ScheduleEntry
+from beatdrop.entry_index import CompactEntryIndex
+
+
+def make_entries(num_entries: int) -> List[ScheduleEntry]:
+    """Interval and crontab entries with small args and kwargs, like per user schedules.
+    """
+    sched_entries = []
+    for number in range(num_entries):
+        if number % 2:
+            sched_entries.append(IntervalEntry(
+                key="user:{}:sync".format(number),
+                enabled=True,
+                task="app.tasks.sync_user",
+                args=(number,),
+                kwargs={"full": False},
+                period=datetime.timedelta(minutes=5 + number % 60)
+            ))
+        else:
+            sched_entries.append(CrontabEntry(
+                key="user:{}:report".format(number),
+                enabled=True,
+                task="app.tasks.send_report",
+                args=(number, "daily"),
+                cron_expression="{} 6 * * *".format(number % 60)
+            ))
+
+    return sched_entries
+
+
+def traced_bytes(build: Callable[[], object]) -> int:
+    """Bytes still allocated by ``build`` after it returns.
+    """
+    gc.collect()
+    tracemalloc.start()
+    held = build()
+    gc.collect()
+    allocated = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del held
+
+    return allocated
+
+
+def index_bytes(sched_entries: List[ScheduleEntry], store_payloads: bool) -> int:
+    """Bytes held by an index of the entries, including the key strings it shares with the entries.
+    """
+    entry_index = None
+
+    def build() -> CompactEntryIndex:
+        nonlocal entry_index
+        entry_index = build_index(sched_entries, store_payloads)
+        return entry_index
+
+    allocated = traced_bytes(build)
+
+    return allocated + sum(sys.getsizeof(key) for key in entry_index)
+
+
+def build_index(sched_entries: List[ScheduleEntry], store_payloads: bool) -> CompactEntryIndex:
+    entry_index = CompactEntryIndex((CrontabEntry, IntervalEntry), store_payloads=store_payloads)
+    for sched_entry in sched_entries:
+        entry_index.add(sched_entry)
+
+    return entry_index
+
+
+if __name__ == "__main__":
+    num_entries = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    sched_entries = make_entries(num_entries)
+    results = [
+        ("entries", traced_bytes(lambda: make_entries(num_entries))),
+        ("index with payloads", index_bytes(sched_entries, store_payloads=True)),
+        ("index without payloads", index_bytes(sched_entries, store_payloads=False))
+    ]
+    for name, allocated in results:
+        print("{:>10.1f} bytes/entry  {}".format(allocated / num_entries, name))
@@ -0,0 +1,37 @@
+import statistics
+import subprocess
+import sys
+
+
+targets = [
+    "import beatdrop",
+    "from beatdrop import IntervalEntry",
+    "from beatdrop import MemScheduler",
+    "from beatdrop import SQLScheduler",
+    "from beatdrop import RedisScheduler",
+    "from beatdrop import CeleryRedisScheduler",
+    "from beatdrop import RQSQLScheduler"
+]
+
+
+def import_time(statement: str, runs: int) -> float:
+    """Median wall time in milliseconds to run an import statement in a fresh interpreter.
+    """
+    code = (
+        "import time\n"
+        "started_at = time.perf_counter()\n"
+        "{}\n"
+        "print((time.perf_counter() - started_at) * 1000)"
+    ).format(statement)
+    times = []
+    for _ in range(runs):
+        result = subprocess.run([sys.executable, "-c", code], capture_output=True, check=True, text=True)
+        times.append(float(result.stdout.splitlines()[-1]))
+
+    return statistics.median(times)
+
+
+if __name__ == "__main__":
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    for statement in targets:
+        print("{:>10.1f} ms  {}".format(import_time(statement, runs), statement))
@@ -0,0 +1,113 @@
+import datetime
+from pathlib import Path
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List, Optional
+
+from beatdrop import CrontabEntry, IntervalEntry, MemScheduler, ScheduleEntry, SQLScheduler
+from beatdrop.logger import logger
+from beatdrop.metrics import MetricsSink, SCHEDULING_LAG
+from beatdrop.schedulers.scheduler import Scheduler
+
+
+class LagSink(MetricsSink):
+    """Keep the scheduling lag of every send, how late it was after the entry was due.
+    """
+
+    def __init__(self) -> None:
+        self.lags: List[float] = []
+
+
+    def observe(self, name: str, value: float, labels: Optional[Dict[str, str]] = None) -> None:
+        if name == SCHEDULING_LAG:
+            self.lags.append(value)
+
+
+    def increment(self, name: str, value: float = 1, labels: Optional[Dict[str, str]] = None) -> None:
+        pass
+
+
+def make_entries() -> List[ScheduleEntry]:
+    """An entry every 250 ms, and a six field cron entry every second.
+    """
+    return [
+        IntervalEntry(
+            key="every_250_ms",
+            enabled=True,
+            task="app.tasks.poll",
+            period=datetime.timedelta(milliseconds=250)
+        ),
+        CrontabEntry(
+            key="every_second",
+            enabled=True,
+            task="app.tasks.tick",
+            cron_expression="* * * * * *"
+        )
+    ]
+
+
+def mem_scheduler(lag_sink: LagSink, db_path: Path, **kwargs) -> Scheduler:
+    return MemScheduler(default_sched_entries=make_entries(), metrics_sink=lag_sink, **kwargs)
+
+
+def sql_scheduler(lag_sink: LagSink, db_path: Path, **kwargs) -> Scheduler:
+    db_path.unlink(missing_ok=True)
+    sched = SQLScheduler(
+        lock_timeout=datetime.timedelta(seconds=3),
+        create_engine_kwargs={"url": "sqlite:///{}".format(db_path)},
+        metrics_sink=lag_sink,
+        **kwargs
+    )
+    sched.create_tables()
+    for sched_entry in make_entries():
+        sched.save(sched_entry)
+
+    return sched
+
+
+def measure(make_scheduler: Callable[..., Scheduler], seconds: float, db_path: Path, **kwargs) -> List[float]:
+    """Run a scheduler's ticks and sleeps like ``run`` does, and return the sorted scheduling lag of each send in ms.
+
+    The lag of storage backed schedulers includes claiming the entry in storage before it is sent.
+    """
+    lag_sink = LagSink()
+    sched = make_scheduler(lag_sink, db_path, **kwargs)
+    sched.send = lambda sched_entry: None
+    stop_at = time.monotonic() + seconds
+    while time.monotonic() < stop_at:
+        sched._sleep(sched._tick())
+
+    return sorted(lag * 1000 for lag in lag_sink.lags)
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Nearest rank percentile.
+    """
+    return sorted_values[min(int(fraction * len(sorted_values)), len(sorted_values) - 1)]
+
+
+if __name__ == "__main__":
+    logger.remove()
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 10
+    runs = [
+        ("mem", mem_scheduler, {"max_interval": 1}),
+        ("mem high_resolution", mem_scheduler, {"max_interval": .25, "high_resolution": True}),
+        ("sql", sql_scheduler, {"max_interval": 1}),
+        (
+            "sql high_resolution look_ahead",
+            sql_scheduler,
+            {"max_interval": .5, "high_resolution": True, "look_ahead_window": 1}
+        )
+    ]
+    print("{:<32}  {:>6}  {:>8}  {:>8}  {:>8}".format("scheduler", "sends", "p50 ms", "p99 ms", "max ms"))
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for name, make_scheduler, kwargs in runs:
+            lags = measure(make_scheduler, seconds, Path(tmp_dir) / "jitter.sqlite", **kwargs)
+            print("{:<32}  {:>6}  {:>8.3f}  {:>8.3f}  {:>8.3f}".format(
+                name,
+                len(lags),
+                percentile(lags, .5),
+                percentile(lags, .99),
+                lags[-1]
+            ))
@@ -0,0 +1,85 @@
+import datetime
+import random
+import sys
+import time
+from typing import List
+
+from beatdrop import IntervalEntry, MemScheduler, ScheduleEntry
+from beatdrop.helpers import utc_now_naive
+from beatdrop.logger import logger
+from beatdrop.timing_wheel import TimingWheel
+
+
+def make_entries(num_entries: int) -> List[ScheduleEntry]:
+    """Hourly interval entries, last sent at random times in the past hour.
+    """
+    utc_now = utc_now_naive()
+    period = datetime.timedelta(hours=1)
+    # ``construct`` skips validation, so a million entries are built in seconds
+    return [
+        IntervalEntry.construct(
+            key="entry:{}".format(number),
+            enabled=True,
+            task="app.tasks.run",
+            args=None,
+            kwargs=None,
+            expires_at=None,
+            next_due_at=None,
+            period=period,
+            last_sent_at=utc_now - datetime.timedelta(seconds=random.uniform(0, 3600))
+        )
+        for number in range(num_entries)
+    ]
+
+
+def tick_ms(sched: MemScheduler, num_ticks: int) -> float:
+    """Mean milliseconds per scheduler tick, with ticks spread over a second.
+    """
+    started_at = time.perf_counter()
+    for _ in range(num_ticks):
+        sched._run_once()
+        time.sleep(1 / num_ticks)
+
+    return ((time.perf_counter() - started_at) - 1) * 1000 / num_ticks
+
+
+def churn_us(num_entries: int, num_operations: int) -> float:
+    """Mean microseconds to schedule and cancel a key, in a wheel with ``num_entries`` other keys.
+    """
+    timing_wheel = TimingWheel()
+    now = time.time()
+    for number in range(num_entries):
+        timing_wheel.schedule("entry:{}".format(number), now + random.uniform(0, 3600))
+
+    keys = ["churn:{}".format(number) for number in range(num_operations)]
+    started_at = time.perf_counter()
+    for key in keys:
+        timing_wheel.schedule(key, now + random.uniform(0, 3600))
+
+    for key in keys:
+        timing_wheel.cancel(key)
+
+    return (time.perf_counter() - started_at) * 1e6 / num_operations
+
+
+if __name__ == "__main__":
+    logger.remove()
+    sizes = [int(size) for size in sys.argv[1:]] or [10000, 100000, 1000000]
+    print("{:>10}  {:>14}  {:>14}  {:>18}".format("entries", "scan ms/tick", "wheel ms/tick", "wheel churn us/op"))
+    for num_entries in sizes:
+        sched_entries = make_entries(num_entries)
+        scan_sched = MemScheduler(max_interval=60, default_sched_entries=sched_entries)
+        scan_sched.send = lambda sched_entry: None
+        wheel_sched = MemScheduler(
+            max_interval=60,
+            default_sched_entries=sched_entries,
+            timing_wheel_tick=datetime.timedelta(milliseconds=50)
+        )
+        wheel_sched.send = lambda sched_entry: None
+        num_ticks = 3 if num_entries >= 1000000 else 10
+        print("{:>10}  {:>14.2f}  {:>14.2f}  {:>18.2f}".format(
+            num_entries,
+            tick_ms(scan_sched, num_ticks),
+            tick_ms(wheel_sched, num_ticks),
+            churn_us(num_entries, 100000)
+        ))
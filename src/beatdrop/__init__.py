@@ -1,18 +1,41 @@
 
-
 __version__ = "0.1.0a9"
 __all__ = [
     "art",
-    "exceptions"
+    "exceptions",
+    "EntryPage",
+    "ScheduleEntryFilter"
 ]
 
+from importlib import import_module
+from typing import Any, List
+
 from beatdrop import art
 from beatdrop import exceptions
-from beatdrop.entries import *
-from beatdrop.schedulers import *
 
 from beatdrop.entries import __all__ as entries_all
 from beatdrop.schedulers import __all__ as schedulers_all
-__all__ += entries_all  
+__all__ += entries_all
 __all__ += schedulers_all
 
+# Everything else is imported lazily on first access, see ``beatdrop.schedulers``.
+_lazy_modules = {
+    "EntryPage": "beatdrop.pagination",
+    "ScheduleEntryFilter": "beatdrop.entry_filter"
+}
+_lazy_modules.update({name: "beatdrop.entries" for name in entries_all})
+_lazy_modules.update({name: "beatdrop.schedulers" for name in schedulers_all})
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _lazy_modules:
+        raise AttributeError("module '{}' has no attribute '{}'".format(__name__, name))
+
+    value = getattr(import_module(_lazy_modules[name]), name)
+    globals()[name] = value
+
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(__all__))
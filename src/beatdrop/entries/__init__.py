@@ -1,4 +1,7 @@
 
+from importlib import import_module
+from typing import Any, List
+
 __all__ = [
     "ScheduleEntry",
     "CrontabEntry",
@@ -8,17 +11,33 @@ __all__ = [
     "default_sched_entry_types"
 ]
 
-from beatdrop.entries.schedule_entry import ScheduleEntry
+# Entry types are imported lazily on first access.
+_lazy_entries = {
+    "ScheduleEntry": "beatdrop.entries.schedule_entry",
+    "CrontabEntry": "beatdrop.entries.crontab_entry",
+    "CrontabTZEntry": "beatdrop.entries.crontab_tz_entry",
+    "EventEntry": "beatdrop.entries.event_entry",
+    "IntervalEntry": "beatdrop.entries.interval_entry"
+}
+
+
+def __getattr__(name: str) -> Any:
+    if name == "default_sched_entry_types":
+        value = (
+            __getattr__("CrontabEntry"),
+            __getattr__("CrontabTZEntry"),
+            __getattr__("EventEntry"),
+            __getattr__("IntervalEntry")
+        )
+    elif name in _lazy_entries:
+        value = getattr(import_module(_lazy_entries[name]), name)
+    else:
+        raise AttributeError("module '{}' has no attribute '{}'".format(__name__, name))
+
+    globals()[name] = value
 
-from beatdrop.entries.crontab_entry import CrontabEntry
-from beatdrop.entries.crontab_tz_entry import CrontabTZEntry
-from beatdrop.entries.event_entry import EventEntry
-from beatdrop.entries.interval_entry import IntervalEntry
+    return value
 
 
-default_sched_entry_types = (
-    CrontabEntry,
-    CrontabTZEntry,
-    EventEntry,
-    IntervalEntry
-)
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(__all__))
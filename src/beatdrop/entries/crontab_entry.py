@@ -1,11 +1,11 @@
 
 import datetime
-from typing import ClassVar, List
+from typing import ClassVar, List, Optional
 
 from croniter import croniter
 from pydantic import Field, validator
 
-from beatdrop.helpers import utc_now_naive
+from beatdrop.helpers import utc_now_naive, utc_timestamp
 from beatdrop.entries.schedule_entry import ScheduleEntry
 from beatdrop import validators
 
@@ -29,13 +29,23 @@ class CrontabEntry(ScheduleEntry):
         Keyword arguments to pass the task. 
         These will be serialized/deserialized as JSON. 
         ``jsonpickle`` is used to serialize and deserialize these.
+    expires_at : Optional[datetime.datetime]
+        The entry is not sent at or after this time, and storage backed schedulers remove it.
+        Takes naive or aware datetimes.
+        Naive datetimes are assumed to be in UTC.
     cron_expression : str
         Crontab style date and time expression.
         ``croniter`` package is currently used as the parser. 
         https://pypi.org/project/croniter/
+        A sixth field after the day of week field is the second, 
+        like ``"* * * * * */15"`` for every 15 seconds.
+        Run schedulers with ``high_resolution`` to send entries due more often than every second.
     last_sent_at : datetime.datetime, optional
         **Client read only field**
         Last time the entry was sent.  Naive datetime in UTC.
+    next_due_at : Optional[float]
+        **Client read only field**
+        When the entry is next due, as UTC epoch seconds.
 
     Attributes
     ----------
@@ -50,7 +60,7 @@ class CrontabEntry(ScheduleEntry):
    
     cron_expression: str
 
-    client_read_only_fields: ClassVar[List[str]] = ["last_sent_at"]
+    client_read_only_fields: ClassVar[List[str]] = ["last_sent_at", "next_due_at"]
     last_sent_at: datetime.datetime = Field(default_factory=utc_now_naive)
 
     _dt_is_naive = validator(
@@ -64,18 +74,27 @@ class CrontabEntry(ScheduleEntry):
     )(validators.valid_cron_expression)
 
 
-    def due_in(self) -> datetime.timedelta:
+    def _next_run_at(self) -> datetime.datetime:
         crony = croniter(
             expr_format=self.cron_expression, 
             start_time=self.last_sent_at,
             ret_type=datetime.datetime
         )
 
-        return crony.get_next() - utc_now_naive()
+        return crony.get_next()
+
+
+    def due_in(self) -> datetime.timedelta:
+        return self._next_run_at() - utc_now_naive()
+
+
+    def compute_next_due_at(self) -> Optional[float]:
+        return utc_timestamp(self._next_run_at())
 
     
     def sent(self): 
         self.last_sent_at = utc_now_naive()
+        self.next_due_at = self.compute_next_due_at()
 
 
     def __str__(self) -> str:
@@ -1,12 +1,12 @@
 
 import datetime
-from typing import ClassVar, List
+from typing import ClassVar, List, Optional
 
 from croniter import croniter
 from pydantic import Field, validator
 import pytz
 
-from beatdrop.helpers import utc_now_naive
+from beatdrop.helpers import utc_now_naive, utc_timestamp
 from beatdrop.entries.schedule_entry import ScheduleEntry
 from beatdrop import validators
 
@@ -40,16 +40,26 @@ class CrontabTZEntry(ScheduleEntry):
         Keyword arguments to pass the task. 
         These will be serialized/deserialized as JSON. 
         ``jsonpickle`` is used to serialize and deserialize these.
+    expires_at : Optional[datetime.datetime]
+        The entry is not sent at or after this time, and storage backed schedulers remove it.
+        Takes naive or aware datetimes.
+        Naive datetimes are assumed to be in UTC.
     cron_expression : str
         Crontab style date and time expression.
         ``croniter`` package is currently used as the parser. 
         https://pypi.org/project/croniter/
+        A sixth field after the day of week field is the second, 
+        like ``"* * * * * */15"`` for every 15 seconds.
+        Run schedulers with ``high_resolution`` to send entries due more often than every second.
     timezone : str
         The timezone string.
         ``pytz`` library is used to parse this and create aware datetimes.
     last_sent_at : datetime.datetime, optional
         **Client read only field**
         Last time the entry was sent.  Naive datetime in UTC.
+    next_due_at : Optional[float]
+        **Client read only field**
+        When the entry is next due, as UTC epoch seconds.
 
     Attributes
     ----------
@@ -65,7 +75,7 @@ class CrontabTZEntry(ScheduleEntry):
     cron_expression: str
     timezone: str
 
-    client_read_only_fields: ClassVar[List[str]] = ["last_sent_at"]
+    client_read_only_fields: ClassVar[List[str]] = ["last_sent_at", "next_due_at"]
     last_sent_at: datetime.datetime = Field(default_factory=datetime.datetime.utcnow)
 
     _dt_is_naive = validator(
@@ -79,7 +89,7 @@ class CrontabTZEntry(ScheduleEntry):
     )(validators.valid_cron_expression)
 
 
-    def due_in(self) -> datetime.timedelta:
+    def _next_run_at(self) -> datetime.datetime:
         # if we keep last_sent at as a naive utc
         timezone = pytz.timezone(self.timezone)
         crony = croniter(
@@ -88,11 +98,20 @@ class CrontabTZEntry(ScheduleEntry):
             ret_type=datetime.datetime
         )
 
-        return crony.get_next().astimezone(pytz.utc).replace(tzinfo=None) - utc_now_naive()
+        return crony.get_next().astimezone(pytz.utc).replace(tzinfo=None)
+
+
+    def due_in(self) -> datetime.timedelta:
+        return self._next_run_at() - utc_now_naive()
+
+
+    def compute_next_due_at(self) -> Optional[float]:
+        return utc_timestamp(self._next_run_at())
 
     
     def sent(self): 
         self.last_sent_at = utc_now_naive()
+        self.next_due_at = self.compute_next_due_at()
 
 
     def __str__(self) -> str:
@@ -1,10 +1,10 @@
 
 import datetime
-from typing import ClassVar, List
+from typing import ClassVar, List, Optional
 
 import pytz
 
-from beatdrop.helpers import utc_now_naive
+from beatdrop.helpers import utc_now_naive, utc_timestamp
 from beatdrop.entries.schedule_entry import ScheduleEntry
 
 
@@ -29,10 +29,17 @@ class EventEntry(ScheduleEntry):
         Keyword arguments to pass the task. 
         These will be serialized/deserialized as JSON. 
         ``jsonpickle`` is used to serialize and deserialize these.
+    expires_at : Optional[datetime.datetime]
+        The entry is not sent at or after this time, and storage backed schedulers remove it.
+        Takes naive or aware datetimes.
+        Naive datetimes are assumed to be in UTC.
     due_at : datetime.datetime
         The due at datetime.
         Takes naive or aware datetimes.
         Naive datetimes are assumed to be in UTC.
+    next_due_at : Optional[float]
+        **Client read only field**
+        When the entry is due, as UTC epoch seconds. ``None`` once it was sent.
 
     Attributes
     ----------
@@ -47,7 +54,7 @@ class EventEntry(ScheduleEntry):
 
     due_at: datetime.datetime
 
-    client_read_only_fields: ClassVar[List[str]] = ["was_sent"]
+    client_read_only_fields: ClassVar[List[str]] = ["was_sent", "next_due_at"]
     was_sent: bool = False
 
 
@@ -58,16 +65,22 @@ class EventEntry(ScheduleEntry):
 
         naive_due_at_utc = self.due_at
         if self.due_at.tzinfo is not None:
-            print(naive_due_at_utc)
             naive_due_at_utc = self.due_at.astimezone(pytz.utc).replace(tzinfo=None)
-            print(naive_due_at_utc)
 
         return naive_due_at_utc - utc_now_naive()
 
+
+    def compute_next_due_at(self) -> Optional[float]:
+        if self.was_sent:
+            return None
+
+        return utc_timestamp(self.due_at)
+
     
     def sent(self):
         self.was_sent = True
         self.enabled = False
+        self.next_due_at = self.compute_next_due_at()
 
 
     def __str__(self) -> str:
@@ -1,10 +1,10 @@
 
 import datetime
-from typing import ClassVar, List
+from typing import ClassVar, List, Optional
 
 from pydantic import Field, validator
 
-from beatdrop.helpers import utc_now_naive
+from beatdrop.helpers import utc_now_naive, utc_timestamp
 from beatdrop.entries.schedule_entry import ScheduleEntry
 from beatdrop import validators
 
@@ -28,11 +28,20 @@ class IntervalEntry(ScheduleEntry):
         Keyword arguments to pass the task. 
         These will be serialized/deserialized as JSON. 
         ``jsonpickle`` is used to serialize and deserialize these.
+    expires_at : Optional[datetime.datetime]
+        The entry is not sent at or after this time, and storage backed schedulers remove it.
+        Takes naive or aware datetimes.
+        Naive datetimes are assumed to be in UTC.
     period : datetime.timedelta
         How often to run the schedule entry.
+        Periods under a second need a scheduler with ``high_resolution``, 
+        to send them at each period instead of at each ``max_interval``.
     last_sent_at : datetime.datetime, optional
         **Client read only field**
         Last time the entry was sent
+    next_due_at : Optional[float]
+        **Client read only field**
+        When the entry is next due, as UTC epoch seconds.
 
     Attributes
     ----------
@@ -47,7 +56,7 @@ class IntervalEntry(ScheduleEntry):
    
     period: datetime.timedelta
 
-    client_read_only_fields: ClassVar[List[str]] = ["last_sent_at"]
+    client_read_only_fields: ClassVar[List[str]] = ["last_sent_at", "next_due_at"]
     last_sent_at: datetime.datetime = Field(default_factory=datetime.datetime.utcnow)
 
     _dt_is_naive = validator(
@@ -62,8 +71,13 @@ class IntervalEntry(ScheduleEntry):
         return self.period - delta_since_sent
 
     
+    def compute_next_due_at(self) -> Optional[float]:
+        return utc_timestamp(self.last_sent_at + self.period)
+
+
     def sent(self):
         self.last_sent_at = utc_now_naive()
+        self.next_due_at = self.compute_next_due_at()
 
 
     def __str__(self) -> str:
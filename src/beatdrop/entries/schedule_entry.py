@@ -1,11 +1,13 @@
 
 
 import datetime
+import time
 from typing import Any, Callable, cast, ClassVar, Dict, List, Optional, Tuple
 import jsonpickle
 
 from pydantic import BaseModel, Field
 
+from beatdrop.helpers import naive_utc, utc_now_naive
 from beatdrop.logger import logger
 from beatdrop.exceptions import MethodNotImplementedError
 
@@ -18,6 +20,14 @@ class ScheduleEntry(BaseModel):
     * ``due_in`` - returns timedelta until it should be run again.
     * ``sent`` - called by the scheduler to let the entry know its task was sent for execution.
 
+    Entry types *should* also implement:
+
+    * ``compute_next_due_at`` - returns when the entry is next due from its own fields, as UTC epoch seconds.
+
+    ``next_due_at`` is computed when the entry is saved, and entry types that implement ``compute_next_due_at``
+    must update it in ``sent``.
+    Schedulers then check if those entries are due with ``next_due_at`` instead of calling ``due_in``.
+
     See their docstrings for more details.
 
     A basic ``__str__`` method is also included. 
@@ -39,6 +49,14 @@ class ScheduleEntry(BaseModel):
         Keyword arguments to pass the task. 
         These will be serialized/deserialized as JSON. 
         ``jsonpickle`` is used to serialize and deserialize these. 
+    expires_at : Optional[datetime.datetime]
+        The entry is not sent at or after this time, and storage backed schedulers remove it.
+        Takes naive or aware datetimes.
+        Naive datetimes are assumed to be in UTC.
+    next_due_at : Optional[float]
+        **Client read only field**
+        When the entry is next due, as UTC epoch seconds.
+        ``None`` if it has not been computed, or the entry will not be due again.
 
     Attributes
     ----------
@@ -52,13 +70,15 @@ class ScheduleEntry(BaseModel):
     """
 
     _logger: ClassVar = logger
-    client_read_only_fields: ClassVar[List[str]] = []
+    client_read_only_fields: ClassVar[List[str]] = ["next_due_at"]
 
     key: str
     enabled: bool
     task: str
     args: Optional[Tuple[Any, ...]] = Field(default=None)
     kwargs: Optional[Dict[str, Any]] = Field(default=None)
+    expires_at: Optional[datetime.datetime] = Field(default=None)
+    next_due_at: Optional[float] = Field(default=None)
 
     class Config:
 
@@ -87,6 +107,7 @@ class ScheduleEntry(BaseModel):
 
         This should be used to update any metadata as necessary for the entry.
         Like the last sent time etc.
+        Entry types that implement ``compute_next_due_at`` must also update ``next_due_at`` here.
 
         Raises
         ------
@@ -96,6 +117,56 @@ class ScheduleEntry(BaseModel):
         raise MethodNotImplementedError("You must implement the 'sent' method for a schedule.")
 
 
+    def compute_next_due_at(self) -> Optional[float]:
+        """Compute when the entry is next due.
+
+        The base implementation adds ``due_in`` to the current time. 
+        Entry types should override it to compute it from their own fields, 
+        which tells schedulers that ``next_due_at`` is kept up to date by ``sent``.
+
+        Returns
+        -------
+        Optional[float]
+            UTC epoch seconds the entry is next due at, 
+            or ``None`` if it will not be due again.
+        """
+        return time.time() + self.due_in().total_seconds()
+
+
+    @classmethod
+    def computes_next_due_at(cls) -> bool:
+        """Check if the entry type implements ``compute_next_due_at``, and keeps ``next_due_at`` up to date.
+
+        Returns
+        -------
+        bool
+            ``True`` if ``next_due_at`` can be used instead of ``due_in``, or else ``False``.
+        """
+        return cls.compute_next_due_at is not ScheduleEntry.compute_next_due_at
+
+
+    def is_expired(self, utc_now: Optional[datetime.datetime] = None) -> bool:
+        """Check if the entry has expired.
+
+        Parameters
+        ----------
+        utc_now : Optional[datetime.datetime], optional
+            Naive datetime in UTC to check against, by default the current time.
+
+        Returns
+        -------
+        bool
+            ``True`` if ``expires_at`` is set and has passed, or else ``False``.
+        """
+        if self.expires_at is None:
+            return False
+
+        if utc_now is None:
+            utc_now = utc_now_naive()
+
+        return naive_utc(self.expires_at) <= utc_now
+
+
     def __str__(self) -> str:
         return "{}(key={}, enabled={}, task={}, args={}, kwargs={})".format(
             type(self).__name__,
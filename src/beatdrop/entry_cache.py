@@ -0,0 +1,119 @@
+from collections import OrderedDict
+import copy
+import threading
+import time
+from typing import Any, Optional, Tuple
+
+from beatdrop.entries.schedule_entry import ScheduleEntry
+
+
+class EntryCache:
+    """Bounded LRU cache of decoded schedule entries, for ``get`` on client hot paths.
+
+    Entries are stored and returned as deep copies, so callers can modify what they get.
+    Each entry can be stored with the storage version it was read at,
+    for schedulers that check the version before using a cached entry.
+    The least recently used entry is evicted when the cache is full.
+    ``generation`` changes with every invalidation, 
+    so an entry read before an invalidation is not cached after it.
+    All methods are thread safe.
+
+    Parameters
+    ----------
+    max_size : int
+        Maximum number of cached entries.
+    ttl : Optional[float], optional
+        Seconds an entry is cached for, by default None to cache until it is evicted or invalidated.
+    """
+
+    def __init__(self, max_size: int, ttl: Optional[float] = None) -> None:
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.generation = 0
+        self._entries: "OrderedDict[str, Tuple[float, Any, ScheduleEntry]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+
+    def get(self, key: str) -> Optional[Tuple[Any, ScheduleEntry]]:
+        """Get a cached entry.
+
+        Parameters
+        ----------
+        key : str
+            Schedule entry key.
+
+        Returns
+        -------
+        Optional[Tuple[Any, ScheduleEntry]]
+            The storage version and a copy of the entry, or ``None`` if it is not cached or has expired.
+        """
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None and self.ttl is not None and time.monotonic() - cached[0] > self.ttl:
+                del self._entries[key]
+                cached = None
+
+            if cached is None:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+
+        return cached[1], copy.deepcopy(cached[2])
+
+
+    def put(
+        self,
+        sched_entry: ScheduleEntry,
+        version: Any = None,
+        generation: Optional[int] = None
+    ) -> None:
+        """Cache an entry.
+
+        Parameters
+        ----------
+        sched_entry : ScheduleEntry
+            Schedule entry, a copy is cached.
+        version : Any, optional
+            Storage version the entry was read at, by default None
+        generation : Optional[int], optional
+            ``generation`` before the entry was read, by default None.
+            The entry is not cached if the cache was invalidated since.
+        """
+        cached = (time.monotonic(), version, copy.deepcopy(sched_entry))
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+
+            self._entries[sched_entry.key] = cached
+            self._entries.move_to_end(sched_entry.key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+
+    def invalidate(self, key: str) -> None:
+        """Remove an entry from the cache.
+
+        Parameters
+        ----------
+        key : str
+            Schedule entry key.
+        """
+        with self._lock:
+            self.generation += 1
+            self._entries.pop(key, None)
+
+
+    def clear(self) -> None:
+        """Remove all entries from the cache.
+        """
+        with self._lock:
+            self.generation += 1
+            self._entries.clear()
+
+
+    def __len__(self) -> int:
+        return len(self._entries)
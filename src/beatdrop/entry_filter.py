@@ -0,0 +1,91 @@
+from typing import Optional, Type, Union
+
+from pydantic import BaseModel, validator
+
+from beatdrop.entries.schedule_entry import ScheduleEntry
+
+
+class ScheduleEntryFilter(BaseModel):
+    """Filter for listing schedule entries.
+
+    Only entries that match **all** of the given criteria are returned.
+    Criteria left as ``None`` are ignored.
+
+    Storage backed schedulers push the filter down to storage
+    so only matching entries are read and deserialized.
+
+    Parameters
+    ----------
+    key_prefix : Optional[str]
+        Entry keys must start with this prefix.
+    entry_type : Optional[Union[str, Type[ScheduleEntry]]]
+        Schedule entry type, or its class name.
+        Stored as the class name.
+    task : Optional[str]
+        The full python path to the task.
+    enabled : Optional[bool]
+        Enabled state of the entry.
+
+    Example
+    -------
+    .. code-block:: python
+
+        from beatdrop import CrontabTZEntry, ScheduleEntryFilter
+
+        enabled_tz_entries = sched.list(
+            filter=ScheduleEntryFilter(
+                entry_type=CrontabTZEntry,
+                enabled=True
+            )
+        )
+    """
+
+    key_prefix: Optional[str] = None
+    entry_type: Optional[Union[str, Type[ScheduleEntry]]] = None
+    task: Optional[str] = None
+    enabled: Optional[bool] = None
+
+
+    def matches(self, sched_entry: ScheduleEntry) -> bool:
+        """Check if a schedule entry matches this filter.
+
+        Parameters
+        ----------
+        sched_entry : ScheduleEntry
+            Schedule entry to check.
+
+        Returns
+        -------
+        bool
+            ``True`` if the entry matches all of the filter criteria, or else ``False``.
+        """
+        if (
+            self.key_prefix is not None
+            and not sched_entry.key.startswith(self.key_prefix)
+        ):
+            return False
+
+        if (
+            self.entry_type is not None
+            and type(sched_entry).__name__ != self.entry_type
+        ):
+            return False
+
+        if self.task is not None and sched_entry.task != self.task:
+            return False
+
+        if self.enabled is not None and sched_entry.enabled != self.enabled:
+            return False
+
+        return True
+
+
+    @validator("entry_type")
+    def entry_type_name(
+        cls,
+        v: Union[str, Type[ScheduleEntry], None]
+    ) -> Optional[str]:
+        if isinstance(v, type):
+            return v.__name__
+
+        return v
@@ -0,0 +1,279 @@
+from array import array
+import math
+import time
+from typing import Dict, Iterator, List, Optional, Tuple, Type
+import zlib
+
+from beatdrop.entries.schedule_entry import ScheduleEntry
+from beatdrop.exceptions import ScheduleEntryTypeNotRegistered
+
+
+class CompactEntryIndex:
+    """Compact scheduling index for very large numbers of schedule entries.
+
+    Each entry is held as its key, a type id, an enabled bit and its next due time as a UTC epoch float,
+    in a list and parallel arrays instead of as a ``ScheduleEntry``.
+    With ``store_payloads``, the entry JSON is also kept compressed,
+    so the full entry can be materialized with ``payload`` when it is due or requested.
+    Payloads are compressed with the first JSON of each entry type as a preset dictionary,
+    since entries of a type share their field names and most of their values.
+
+    Removing an entry moves the last entry into its slot, so removals do not keep the order of the entries.
+    The index is not thread safe.
+
+    Parameters
+    ----------
+    sched_entry_types : Tuple[Type[ScheduleEntry]]
+        Schedule entry types that can be indexed.
+    store_payloads : bool, optional
+        Keep the compressed entry JSON, by default True.
+    """
+
+    __slots__ = (
+        "sched_entry_types",
+        "store_payloads",
+        "_type_ids",
+        "_slots",
+        "_keys",
+        "_entry_type_ids",
+        "_enabled",
+        "_next_due",
+        "_payloads",
+        "_zdicts"
+    )
+
+    def __init__(
+        self,
+        sched_entry_types: Tuple[Type[ScheduleEntry]],
+        store_payloads: bool = True
+    ) -> None:
+        self.sched_entry_types = sched_entry_types
+        self.store_payloads = store_payloads
+        self._type_ids = {entry_type.__name__: type_id for type_id, entry_type in enumerate(sched_entry_types)}
+        self._slots: Dict[str, int] = {}
+        self._keys: List[str] = []
+        self._entry_type_ids = array("H")
+        self._enabled = array("B")
+        self._next_due = array("d")
+        self._payloads: List[bytes] = []
+        self._zdicts: Dict[int, bytes] = {}
+
+
+    def add(self, sched_entry: ScheduleEntry, next_due: Optional[float] = None) -> None:
+        """Add or update an entry.
+
+        Parameters
+        ----------
+        sched_entry : ScheduleEntry
+            Schedule entry to index.
+        next_due : Optional[float], optional
+            UTC epoch seconds the entry is next due at, 
+            by default None to use the entry's ``next_due_at``, or compute it from ``due_in``.
+            Expired entries are never due.
+
+        Raises
+        ------
+        beatdrop.exceptions.ScheduleEntryTypeNotRegistered
+            The entry type is not one of ``sched_entry_types``.
+        """
+        type_name = type(sched_entry).__name__
+        if type_name not in self._type_ids:
+            raise ScheduleEntryTypeNotRegistered(
+                "The schedule entry type '{}' is not registered".format(type_name)
+            )
+
+        type_id = self._type_ids[type_name]
+        if sched_entry.is_expired():
+            next_due = math.inf
+        elif next_due is None and sched_entry.next_due_at is not None and sched_entry.computes_next_due_at():
+            next_due = sched_entry.next_due_at
+        elif next_due is None:
+            next_due = time.time() + sched_entry.due_in().total_seconds()
+
+        payload = b""
+        if self.store_payloads:
+            payload = self._compress(type_id, sched_entry.json().encode())
+
+        slot = self._slots.get(sched_entry.key)
+        if slot is None:
+            self._slots[sched_entry.key] = len(self._keys)
+            self._keys.append(sched_entry.key)
+            self._entry_type_ids.append(type_id)
+            self._enabled.append(sched_entry.enabled)
+            self._next_due.append(next_due)
+            if self.store_payloads:
+                self._payloads.append(payload)
+        else:
+            self._entry_type_ids[slot] = type_id
+            self._enabled[slot] = sched_entry.enabled
+            self._next_due[slot] = next_due
+            if self.store_payloads:
+                self._payloads[slot] = payload
+
+
+    def remove(self, key: str) -> bool:
+        """Remove an entry.
+
+        Parameters
+        ----------
+        key : str
+            Schedule entry key.
+
+        Returns
+        -------
+        bool
+            ``True`` if the entry was indexed, or else ``False``.
+        """
+        slot = self._slots.pop(key, None)
+        if slot is None:
+            return False
+
+        last_slot = len(self._keys) - 1
+        if slot != last_slot:
+            last_key = self._keys[last_slot]
+            self._slots[last_key] = slot
+            self._keys[slot] = last_key
+            self._entry_type_ids[slot] = self._entry_type_ids[last_slot]
+            self._enabled[slot] = self._enabled[last_slot]
+            self._next_due[slot] = self._next_due[last_slot]
+            if self.store_payloads:
+                self._payloads[slot] = self._payloads[last_slot]
+
+        self._keys.pop()
+        self._entry_type_ids.pop()
+        self._enabled.pop()
+        self._next_due.pop()
+        if self.store_payloads:
+            self._payloads.pop()
+
+        return True
+
+
+    def payload(self, key: str) -> str:
+        """Get the JSON of an entry, to materialize it.
+
+        Parameters
+        ----------
+        key : str
+            Schedule entry key.
+
+        Returns
+        -------
+        str
+            Schedule entry JSON.
+
+        Raises
+        ------
+        KeyError
+            The entry is not indexed, or payloads are not stored.
+        """
+        if not self.store_payloads:
+            raise KeyError(key)
+
+        slot = self._slots[key]
+        decompressor = zlib.decompressobj(zdict=self._zdicts[self._entry_type_ids[slot]])
+
+        return (decompressor.decompress(self._payloads[slot]) + decompressor.flush()).decode()
+
+
+    def entry_type(self, key: str) -> Type[ScheduleEntry]:
+        """Get the type of an entry.
+        """
+        return self.sched_entry_types[self._entry_type_ids[self._slots[key]]]
+
+
+    def enabled(self, key: str) -> bool:
+        """Check if an entry is enabled.
+        """
+        return bool(self._enabled[self._slots[key]])
+
+
+    def next_due(self, key: str) -> float:
+        """Get the UTC epoch seconds an entry is next due at.
+        """
+        return self._next_due[self._slots[key]]
+
+
+    def set_next_due(self, key: str, next_due: float) -> None:
+        """Set the UTC epoch seconds an entry is next due at, without changing its payload.
+
+        Parameters
+        ----------
+        key : str
+            Schedule entry key.
+        next_due : float
+            UTC epoch seconds, ``math.inf`` for never.
+        """
+        self._next_due[self._slots[key]] = next_due
+
+
+    def scan(self, now: float, soon: float) -> Tuple[List[str], int, float]:
+        """Find the enabled entries due at ``now``.
+
+        Parameters
+        ----------
+        now : float
+            UTC epoch seconds.
+        soon : float
+            UTC epoch seconds to count the entries due before.
+
+        Returns
+        -------
+        Tuple[List[str], int, float]
+            Keys of the due entries,
+            the number of entries due before ``soon``
+            and the earliest next due time of the entries that are not due, ``math.inf`` if there are none.
+        """
+        due_keys = []
+        num_due_soon = 0
+        earliest = math.inf
+        enabled = self._enabled
+        keys = self._keys
+        for slot, next_due in enumerate(self._next_due):
+            if next_due > soon and next_due >= earliest:
+                continue
+
+            if not enabled[slot]:
+                continue
+
+            if next_due <= soon:
+                num_due_soon += 1
+
+            if next_due <= now:
+                due_keys.append(keys[slot])
+            elif next_due < earliest:
+                earliest = next_due
+
+        return due_keys, num_due_soon, earliest
+
+
+    def counts(self) -> List[Tuple[str, bool, int]]:
+        """Count the entries by type name and enabled state, for ``beatdrop.entry_stats.EntryStats``.
+        """
+        counts: Dict[Tuple[int, int], int] = {}
+        for type_id, enabled in zip(self._entry_type_ids, self._enabled):
+            counts[type_id, enabled] = counts.get((type_id, enabled), 0) + 1
+
+        return [
+            (self.sched_entry_types[type_id].__name__, bool(enabled), count)
+            for (type_id, enabled), count in counts.items()
+        ]
+
+
+    def _compress(self, type_id: int, sched_entry_json: bytes) -> bytes:
+        zdict = self._zdicts.setdefault(type_id, sched_entry_json)
+        compressor = zlib.compressobj(zdict=zdict)
+
+        return compressor.compress(sched_entry_json) + compressor.flush()
+
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._slots
+
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._keys)
+
+
+    def __len__(self) -> int:
+        return len(self._keys)
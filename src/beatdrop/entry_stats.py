@@ -0,0 +1,85 @@
+from typing import Dict, Iterable, NamedTuple, Tuple
+
+from beatdrop.entries.schedule_entry import ScheduleEntry
+
+
+class EntryStats(NamedTuple):
+    """Counts of schedule entries by type and enabled state.
+
+    Parameters
+    ----------
+    total : int
+        Total number of schedule entries.
+    enabled : int
+        Number of enabled schedule entries.
+    disabled : int
+        Number of disabled schedule entries.
+    by_type : Dict[str, int]
+        Number of schedule entries for each schedule entry type name.
+    enabled_by_type : Dict[str, int]
+        Number of enabled schedule entries for each schedule entry type name.
+    """
+
+    total: int
+    enabled: int
+    disabled: int
+    by_type: Dict[str, int]
+    enabled_by_type: Dict[str, int]
+
+
+    @classmethod
+    def from_counts(cls, counts: Iterable[Tuple[str, bool, int]]) -> "EntryStats":
+        """Create stats from counts grouped by type and enabled state.
+
+        Parameters
+        ----------
+        counts : Iterable[Tuple[str, bool, int]]
+            Schedule entry type name, enabled state, and the number of entries in that group.
+            The same group may be given more than once.
+
+        Returns
+        -------
+        EntryStats
+            Totals of the counts.
+        """
+        enabled = 0
+        disabled = 0
+        by_type = {}
+        enabled_by_type = {}
+        for entry_type, is_enabled, count in counts:
+            if count == 0:
+                continue
+
+            by_type[entry_type] = by_type.get(entry_type, 0) + count
+            if is_enabled:
+                enabled += count
+                enabled_by_type[entry_type] = enabled_by_type.get(entry_type, 0) + count
+            else:
+                disabled += count
+
+        return cls(
+            total=enabled + disabled,
+            enabled=enabled,
+            disabled=disabled,
+            by_type=by_type,
+            enabled_by_type=enabled_by_type
+        )
+
+
+    @classmethod
+    def from_entries(cls, sched_entries: Iterable[ScheduleEntry]) -> "EntryStats":
+        """Create stats by counting schedule entries.
+
+        Parameters
+        ----------
+        sched_entries : Iterable[ScheduleEntry]
+            Schedule entries to count.
+
+        Returns
+        -------
+        EntryStats
+            Counts of the schedule entries.
+        """
+        return cls.from_counts(
+            (type(entry).__name__, entry.enabled, 1) for entry in sched_entries
+        )
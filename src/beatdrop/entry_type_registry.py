@@ -1,21 +1,45 @@
 
+from collections import OrderedDict
+import hashlib
 import json
-from typing import Tuple, Type
+import threading
+from typing import Optional, Tuple, Type
 
 import jsonpickle
 
-from beatdrop import ScheduleEntry
+from beatdrop.entries.schedule_entry import ScheduleEntry
 from beatdrop.exceptions import ScheduleEntryTypeNotRegistered
 
 
 class EntryTypeRegistry:
     """Contains the ScheduleEntry types and how to deserialize them from json.
+
+    With a ``memo_size``, ``dejson_entry`` keeps the most recently decoded entries by a digest of their JSON.
+    Decoding the same JSON again returns a deep copy of the memoized entry, 
+    instead of parsing, restoring and validating it.
+    Memoized entries are never returned, so changes to decoded entries do not leak into the memo.
+
+    Parameters
+    ----------
+    sched_entry_types : Tuple[Type[ScheduleEntry]]
+        Schedule entry types that can be decoded.
+    memo_size : Optional[int], optional
+        Maximum number of memoized entries, by default None to not memoize.
     """
 
-    def __init__(self, sched_entry_types: Tuple[Type[ScheduleEntry]]):
+    def __init__(
+        self,
+        sched_entry_types: Tuple[Type[ScheduleEntry]],
+        memo_size: Optional[int] = None
+    ):
         self.sched_entry_types = sched_entry_types
         self._sched_entry_type_lookup = {entry.__name__: entry for entry in self.sched_entry_types}
         self.jp_unpickler = jsonpickle.Unpickler()
+        self.memo_size = memo_size
+        self.memo_hits = 0
+        self.memo_misses = 0
+        self._memo: "OrderedDict[bytes, ScheduleEntry]" = OrderedDict()
+        self._memo_lock = threading.Lock()
 
 
     def dedict_entry(self, sched_entry_dict: dict) -> ScheduleEntry:
@@ -70,6 +94,27 @@ class EntryTypeRegistry:
         ScheduleEntry
             Rehydrated model.
         """
-        return self.dedict_entry(
-            json.loads(sched_entry_json)
-        )
+        if not self.memo_size:
+            return self.dedict_entry(
+                json.loads(sched_entry_json)
+            )
+
+        digest = hashlib.blake2b(sched_entry_json.encode(), digest_size=16).digest()
+        with self._memo_lock:
+            template = self._memo.get(digest)
+            if template is not None:
+                self._memo.move_to_end(digest)
+                self.memo_hits += 1
+            else:
+                self.memo_misses += 1
+
+        if template is None:
+            template = self.dedict_entry(
+                json.loads(sched_entry_json)
+            )
+            with self._memo_lock:
+                self._memo[digest] = template
+                while len(self._memo) > self.memo_size:
+                    self._memo.popitem(last=False)
+
+        return template.copy(deep=True)
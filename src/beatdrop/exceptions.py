@@ -34,3 +34,14 @@ class ScheduleEntryTypeNotRegistered(BeatdropError):
     """
     pass
 
+
+class InvalidPageCursor(BeatdropError):
+    """The page cursor is malformed or was not created by this scheduler.
+    """
+    pass
+
+
+class StorageSchemaError(BeatdropError):
+    """The scheduler's storage was created by an earlier version of beatdrop and must be migrated.
+    """
+    pass
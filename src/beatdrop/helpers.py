@@ -2,4 +2,23 @@
 import datetime
 
 def utc_now_naive() -> datetime.datetime:
-    return datetime.datetime.now(tz=datetime.timezone.utc).replace(tzinfo=None)
\ No newline at end of file
+    return datetime.datetime.now(tz=datetime.timezone.utc).replace(tzinfo=None)
+
+
+def naive_utc(dt: datetime.datetime) -> datetime.datetime:
+    """Convert a datetime to a naive datetime in UTC.
+
+    Naive datetimes are assumed to already be in UTC.
+    """
+    if dt.tzinfo is None:
+        return dt
+
+    return dt.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+
+
+def utc_timestamp(dt: datetime.datetime) -> float:
+    """POSIX timestamp of a datetime.
+
+    Naive datetimes are assumed to be in UTC.
+    """
+    return naive_utc(dt).replace(tzinfo=datetime.timezone.utc).timestamp()
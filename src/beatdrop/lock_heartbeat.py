@@ -0,0 +1,82 @@
+import threading
+import time
+from typing import Callable, Optional
+
+from beatdrop.logger import logger
+from beatdrop import messages
+
+
+class LockHeartbeat:
+    """Background thread that refreshes a scheduler lock on its own cadence.
+
+    The lock is refreshed every ``interval`` seconds, independent of how long a tick takes.
+    When ``refresh`` returns ``False``, or it has not succeeded for ``lock_timeout`` seconds,
+    the lock is considered lost, ``lock_lost`` is set and the thread stops.
+    Errors raised by ``refresh`` are logged and retried on the next beat.
+
+    Parameters
+    ----------
+    refresh : Callable[[], bool]
+        Refreshes the lock. Returns ``True`` if the lock is still held.
+    interval : float
+        Seconds between refreshes.
+    lock_timeout : float
+        Seconds the lock lives without a refresh.
+    lock_lost : threading.Event
+        Set when the lock is lost.
+    """
+
+    def __init__(
+        self,
+        refresh: Callable[[], bool],
+        interval: float,
+        lock_timeout: float,
+        lock_lost: threading.Event
+    ) -> None:
+        self.refresh = refresh
+        self.interval = interval
+        self.lock_timeout = lock_timeout
+        self.lock_lost = lock_lost
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+
+    def start(self) -> None:
+        """Start refreshing the lock in a daemon thread.
+        """
+        self._stopped.clear()
+        self._thread = threading.Thread(
+            target=self._beat,
+            name="beatdrop-lock-heartbeat",
+            daemon=True
+        )
+        self._thread.start()
+
+
+    def stop(self) -> None:
+        """Stop refreshing the lock. Waits for a refresh in progress to finish.
+        """
+        self._stopped.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+
+        self._thread = None
+
+
+    def _beat(self) -> None:
+        last_refreshed_at = time.monotonic()
+        while not self._stopped.wait(self.interval):
+            try:
+                refreshed = self.refresh()
+            except Exception as error:
+                logger.error(messages.sched_lock_heartbeat_failed_template, type(error).__name__, error)
+                if time.monotonic() - last_refreshed_at < self.lock_timeout:
+                    continue
+
+                refreshed = False
+
+            if not refreshed:
+                self.lock_lost.set()
+                return
+
+            last_refreshed_at = time.monotonic()
@@ -1,14 +1,93 @@
-
+import datetime
+import json
 import sys
+from typing import Any, Optional, Union
 
 from loguru import logger
 
-logger.remove()
-logger.add(
-    sink=sys.stdout,
-    level="DEBUG",
-    # format="{time:!UTC} {module}: {line} <level>{message}</level>",
-    format="{time:!UTC}: <level>{message}</level>",
-    colorize=True
-)
 
+text_format = "{time:!UTC}: <level>{message}</level>"
+_warning_level_no = logger.level("WARNING").no
+
+
+def configure_logging(
+    level: Union[str, int] = "INFO",
+    sink: Any = sys.stdout,
+    structured: bool = False,
+    colorize: Optional[bool] = None
+) -> int:
+    """Add a loguru handler for beatdrop's logs.
+
+    Importing beatdrop does not change loguru's handlers.
+    Without a handler added here, beatdrop's logs go to any handlers already added to loguru.
+    Remove loguru's default handler with ``logger.remove(0)`` first to avoid logging beatdrop's lines twice.
+
+    Messages are only formatted when a handler accepts their level,
+    so schedule entries are not formatted into debug lines unless debug logging is enabled.
+
+    Parameters
+    ----------
+    level : Union[str, int], optional
+        Minimum log level, by default "INFO"
+    sink : Any, optional
+        Any loguru sink, like a stream or file path, by default ``sys.stdout``
+    structured : bool, optional
+        Log compact JSON lines instead of text, by default False.
+        Routine per entry lines are left out, so debug level gives one summary line per scheduler tick.
+    colorize : Optional[bool], optional
+        Colorize text logs, by default None to colorize when the sink is a terminal.
+
+    Returns
+    -------
+    int
+        Loguru handler ID. Remove the handler with ``logger.remove(handler_id)``.
+
+    Example
+    -------
+    .. code-block:: python
+
+        from loguru import logger
+
+        from beatdrop.logger import configure_logging
+
+        logger.remove(0)
+        configure_logging(level="DEBUG", structured=True)
+    """
+    if structured:
+        return logger.add(
+            sink=sink,
+            level=level,
+            format=_structured_format,
+            filter=_structured_filter,
+            colorize=False
+        )
+
+    return logger.add(
+        sink=sink,
+        level=level,
+        format=text_format,
+        filter="beatdrop",
+        colorize=colorize
+    )
+
+
+def _structured_filter(record: dict) -> bool:
+    if record["name"] is None or record["name"].split(".")[0] != "beatdrop":
+        return False
+
+    if "entry_key" in record["extra"] and record["level"].no < _warning_level_no:
+        return False
+
+    return True
+
+
+def _structured_format(record: dict) -> str:
+    log = {
+        "time": record["time"].astimezone(datetime.timezone.utc).isoformat(),
+        "level": record["level"].name,
+        "message": record["message"]
+    }
+    log.update(record["extra"])
+    record["extra"]["_beatdrop_json"] = json.dumps(log, default=str, separators=(",", ":"))
+
+    return "{extra[_beatdrop_json]}\n"
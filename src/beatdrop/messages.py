@@ -11,14 +11,31 @@ sched_lock_lost = (
     "This may cause performance issues for the scheduler(s) and clients. "
     "Try increasing the 'max_interval' and 'lock_timeout' parameters on the scheduler."
 )
+sched_lock_lost_mid_tick = "Scheduler lock lost, no more entries will be claimed this tick."
+sched_lock_handing_off_template = "Handing off the scheduler lock to standby scheduler {}."
+sched_lock_heartbeat_failed_template = "Failed to refresh the scheduler lock from the heartbeat, retrying. {}: {}"
 sched_lock_refreshing = "Refreshing scheduler lock..."
 sched_lock_refreshed = "Scheduler lock refreshed."
 sched_lock_released = "Scheduler lock released."
 sched_lock_releasing = "Releasing scheduler lock..."
 sched_lock_unavailable = "Another scheduler has the scheduler lock."
+sched_lock_strategy_fallback_template = "Scheduler lock strategy {} does not support the {} dialect, using row_lease."
 sched_lock_wait_template = "Waking up in {0:.3f} seconds to check scheduler lock status."
 
+entry_cache_invalidation_failed_template = "Entry change notifications failed, clearing the entry cache. {}: {}"
+
+profile_requested_template = "Capturing a {} profile of the next {} scheduler ticks to: {}"
+profile_written_template = "Wrote a {} profile of {} scheduler ticks to: {}"
+
 sched_entry_due_template = "Entry is due: {}.updating and saving..."
+sched_entries_expired_template = "Removed {} expired schedule entries."
+sched_entries_indexing_template = "Indexing {} schedule entries saved by an earlier version of beatdrop..."
+sched_entries_indexed = "Schedule entries indexed."
+sched_entries_backfilled_template = "Filled the indexed columns of {} schedule entries saved by an earlier version of beatdrop."
+sched_entries_table_missing_columns_template = (
+    "The '{}' table is missing the columns: {}. "
+    "It was created by an earlier version of beatdrop, add the columns before starting the scheduler."
+)
 sched_entry_not_found_template = "Schedule entry with key: '{}' could not be found."
 sched_entry_sending_template = "Sending entry: {}"
 sched_entry_sent_template = "Schedule Entry sent: {}"
@@ -28,4 +45,14 @@ scheduler_pulling_entries = "Pulling all schedule entries..."
 scheduler_shut_down = "Scheduler shutdown."
 scheduler_shutting_down = "Shutting down the scheduler..."
 scheduler_sleep_template = "Sleeping for {0:.3f} seconds..."
-scheduler_starting = "Starting scheduler..."
\ No newline at end of file
+scheduler_tick_template = "Checked {} entries in {:.3f} seconds, {} were due."
+scheduler_starting = "Starting scheduler..."
+
+slow_tick_template = (
+    "Scheduler tick has been running for {:.3f} seconds, longer than the {:.3f} second slow tick threshold. "
+    "Thread stacks:\n{}"
+)
+
+stats_server_started_template = "Serving scheduler stats on http://{}:{}/stats"
+
+stats_server_request_template = "Stats server: {}"
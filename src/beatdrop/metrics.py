@@ -0,0 +1,205 @@
+import threading
+from typing import Dict, Optional, Tuple
+
+from beatdrop.exceptions import MethodNotImplementedError
+
+
+TICK_DURATION = "beatdrop_tick_duration_seconds"
+TICK_ENTRIES_SCANNED = "beatdrop_tick_entries_scanned_total"
+TICK_ENTRIES_DUE = "beatdrop_tick_entries_due_total"
+SCHEDULING_LAG = "beatdrop_scheduling_lag_seconds"
+SEND_LATENCY = "beatdrop_send_latency_seconds"
+SEND_FAILURES = "beatdrop_send_failures_total"
+LOCK_ACQUIRE_DURATION = "beatdrop_lock_acquire_seconds"
+LOCK_REFRESH_DURATION = "beatdrop_lock_refresh_seconds"
+LOCK_LOSSES = "beatdrop_lock_losses_total"
+
+
+class MetricsSink:
+    """Base class for scheduler metrics sinks.
+
+    Schedulers call ``observe`` for timings and ``increment`` for counts.
+    Metric names are the constants in ``beatdrop.metrics``.
+    Subclass this to send metrics to a metrics system.
+
+    Sinks are called from the scheduler's run loop, so they should be fast and must not raise.
+    """
+
+    @classmethod
+    def __get_validators__(cls):
+        yield cls.validate
+
+
+    @classmethod
+    def validate(cls, v: "MetricsSink") -> "MetricsSink":
+        if not isinstance(v, cls):
+            raise TypeError("Metrics sink must be a '{}'.".format(cls.__name__))
+
+        return v
+
+
+    def observe(
+        self,
+        name: str,
+        value: float,
+        labels: Optional[Dict[str, str]] = None
+    ) -> None:
+        """Record an observation, like a duration in seconds.
+
+        Parameters
+        ----------
+        name : str
+            Metric name.
+        value : float
+            Observed value.
+        labels : Optional[Dict[str, str]], optional
+            Metric labels, by default None
+
+        Raises
+        ------
+        beatdrop.exceptions.MethodNotImplementedError
+            Must implement ``observe`` method.
+        """
+        raise MethodNotImplementedError("Must implement the 'observe' method for a metrics sink.")
+
+
+    def increment(
+        self,
+        name: str,
+        amount: float = 1,
+        labels: Optional[Dict[str, str]] = None
+    ) -> None:
+        """Increment a counter.
+
+        Parameters
+        ----------
+        name : str
+            Metric name.
+        amount : float, optional
+            Amount to increment the counter by, by default 1
+        labels : Optional[Dict[str, str]], optional
+            Metric labels, by default None
+
+        Raises
+        ------
+        beatdrop.exceptions.MethodNotImplementedError
+            Must implement ``increment`` method.
+        """
+        raise MethodNotImplementedError("Must implement the 'increment' method for a metrics sink.")
+
+
+class NoOpMetricsSink(MetricsSink):
+    """Metrics sink that discards all metrics.
+
+    Used by schedulers by default.
+    """
+
+    def observe(
+        self,
+        name: str,
+        value: float,
+        labels: Optional[Dict[str, str]] = None
+    ) -> None:
+        pass
+
+
+    def increment(
+        self,
+        name: str,
+        amount: float = 1,
+        labels: Optional[Dict[str, str]] = None
+    ) -> None:
+        pass
+
+
+def _escape_label_value(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: Tuple[Tuple[str, str], ...]) -> str:
+    if len(labels) == 0:
+        return ""
+
+    return "{" + ",".join(
+        '{}="{}"'.format(name, _escape_label_value(value)) for name, value in labels
+    ) + "}"
+
+
+class PrometheusMetricsSink(MetricsSink):
+    """Metrics sink that keeps metrics in memory and renders them in the Prometheus text format.
+
+    Observations are rendered as summaries with ``_sum`` and ``_count`` samples,
+    and increments as counters.
+
+    Example
+    -------
+    .. code-block:: python
+
+        from beatdrop.metrics import PrometheusMetricsSink
+
+        metrics_sink = PrometheusMetricsSink()
+        sched = RedisScheduler(
+            max_interval=60,
+            lock_timeout=180,
+            redis_py_kwargs={},
+            metrics_sink=metrics_sink
+        )
+
+        # serve this from your metrics endpoint
+        metrics_sink.render()
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._summaries: Dict[str, Dict[Tuple[Tuple[str, str], ...], Tuple[float, int]]] = {}
+        self._counters: Dict[str, Dict[Tuple[Tuple[str, str], ...], float]] = {}
+
+
+    def observe(
+        self,
+        name: str,
+        value: float,
+        labels: Optional[Dict[str, str]] = None
+    ) -> None:
+        label_key = tuple(sorted((labels or {}).items()))
+        with self._lock:
+            samples = self._summaries.setdefault(name, {})
+            total, count = samples.get(label_key, (0.0, 0))
+            samples[label_key] = (total + value, count + 1)
+
+
+    def increment(
+        self,
+        name: str,
+        amount: float = 1,
+        labels: Optional[Dict[str, str]] = None
+    ) -> None:
+        label_key = tuple(sorted((labels or {}).items()))
+        with self._lock:
+            samples = self._counters.setdefault(name, {})
+            samples[label_key] = samples.get(label_key, 0) + amount
+
+
+    def render(self) -> str:
+        """Render all metrics in the Prometheus text exposition format.
+
+        Returns
+        -------
+        str
+            Metrics text.
+        """
+        lines = []
+        with self._lock:
+            for name, samples in sorted(self._summaries.items()):
+                lines.append("# TYPE {} summary".format(name))
+                for label_key, (total, count) in samples.items():
+                    labels = _format_labels(label_key)
+                    lines.append("{}_sum{} {}".format(name, labels, float(total)))
+                    lines.append("{}_count{} {}".format(name, labels, count))
+
+            for name, samples in sorted(self._counters.items()):
+                lines.append("# TYPE {} counter".format(name))
+                for label_key, total in samples.items():
+                    lines.append("{}{} {}".format(name, _format_labels(label_key), float(total)))
+
+        return "\n".join(lines) + "\n"
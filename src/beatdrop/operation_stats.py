@@ -0,0 +1,129 @@
+import bisect
+from contextlib import contextmanager
+import threading
+import time
+from typing import Dict, Iterator, List, Tuple
+
+
+HSCAN = "hscan"
+SSCAN = "sscan"
+HGET = "hget"
+HMGET = "hmget"
+HSET = "hset"
+HDEL = "hdel"
+ZRANGEBYSCORE = "zrangebyscore"
+LOCK_ACQUIRE = "lock_acquire"
+LOCK_REFRESH = "lock_refresh"
+SELECT = "select"
+SELECT_FOR_UPDATE = "select_for_update"
+COUNT = "count"
+COMMIT = "commit"
+DECODE = "decode"
+
+DEFAULT_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+
+
+class OperationStats:
+    """Latency histograms of storage operations, labeled by operation.
+
+    Each scheduler has its own ``OperationStats`` at ``operation_stats``.
+    Operation names are the constants in ``beatdrop.operation_stats``.
+
+    Parameters
+    ----------
+    buckets : Tuple[float, ...], optional
+        Upper bounds of the histogram buckets in seconds, by default ``DEFAULT_BUCKETS``
+
+    Example
+    -------
+    .. code-block:: python
+
+        sched.run(max_iterations=10)
+        print(sched.operation_stats.dump())
+    """
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS) -> None:
+        self._buckets = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        self._histograms: Dict[str, List[float]] = {}
+
+
+    @contextmanager
+    def time(self, operation: str) -> Iterator[None]:
+        """Time a block of code as an operation.
+
+        Parameters
+        ----------
+        operation : str
+            Operation name.
+        """
+        started_at = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(operation, time.perf_counter() - started_at)
+
+
+    def record(self, operation: str, seconds: float) -> None:
+        """Record the duration of an operation.
+
+        Parameters
+        ----------
+        operation : str
+            Operation name.
+        seconds : float
+            Duration of the operation in seconds.
+        """
+        bucket_index = bisect.bisect_left(self._buckets, seconds)
+        with self._lock:
+            histogram = self._histograms.get(operation)
+            if histogram is None:
+                # count, sum, max, then a count for each bucket and +Inf
+                histogram = [0, 0.0, 0.0] + [0] * (len(self._buckets) + 1)
+                self._histograms[operation] = histogram
+
+            histogram[0] += 1
+            histogram[1] += seconds
+            if seconds > histogram[2]:
+                histogram[2] = seconds
+
+            histogram[3 + bucket_index] += 1
+
+
+    def dump(self) -> Dict[str, dict]:
+        """Get a snapshot of the histograms.
+
+        Returns
+        -------
+        Dict[str, dict]
+            For each operation: ``count``, ``sum`` and ``max`` in seconds,
+            and cumulative ``buckets`` counts by upper bound, ending with ``"+Inf"``.
+        """
+        with self._lock:
+            histograms = {operation: list(histogram) for operation, histogram in self._histograms.items()}
+
+        bounds = [str(bound) for bound in self._buckets] + ["+Inf"]
+        dumped = {}
+        for operation, histogram in sorted(histograms.items()):
+            cumulative = 0
+            buckets = {}
+            for bound, bucket_count in zip(bounds, histogram[3:]):
+                cumulative += bucket_count
+                buckets[bound] = cumulative
+
+            dumped[operation] = {
+                "count": histogram[0],
+                "sum": histogram[1],
+                "max": histogram[2],
+                "buckets": buckets
+            }
+
+        return dumped
+
+
+    def reset(self) -> None:
+        """Clear all histograms."""
+        with self._lock:
+            self._histograms = {}
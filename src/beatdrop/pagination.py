@@ -0,0 +1,71 @@
+import base64
+import binascii
+import json
+from typing import List, NamedTuple, Optional
+
+from beatdrop.entries.schedule_entry import ScheduleEntry
+from beatdrop.exceptions import InvalidPageCursor
+
+
+class EntryPage(NamedTuple):
+    """A page of schedule entries.
+
+    Parameters
+    ----------
+    entries : List[ScheduleEntry]
+        Schedule entries in this page.
+    cursor : Optional[str]
+        Opaque continuation token for the next page,
+        or ``None`` if there are no more pages.
+    """
+
+    entries: List[ScheduleEntry]
+    cursor: Optional[str]
+
+
+def encode_page_cursor(state: dict) -> str:
+    """Encode pagination state as an opaque, URL safe continuation token.
+
+    Parameters
+    ----------
+    state : dict
+        JSON serializable pagination state.
+
+    Returns
+    -------
+    str
+        Continuation token.
+    """
+    state_json = json.dumps(state, separators=(",", ":"))
+
+    return base64.urlsafe_b64encode(state_json.encode()).decode().rstrip("=")
+
+
+def decode_page_cursor(cursor: str) -> dict:
+    """Decode a continuation token created with ``encode_page_cursor``.
+
+    Parameters
+    ----------
+    cursor : str
+        Continuation token.
+
+    Returns
+    -------
+    dict
+        Pagination state.
+
+    Raises
+    ------
+    beatdrop.exceptions.InvalidPageCursor
+        The token is malformed.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        state = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (binascii.Error, UnicodeError, ValueError) as error:
+        raise InvalidPageCursor("Invalid page cursor '{}'.".format(cursor)) from error
+
+    if not isinstance(state, dict):
+        raise InvalidPageCursor("Invalid page cursor '{}'.".format(cursor))
+
+    return state
@@ -0,0 +1,239 @@
+import cProfile
+import sys
+import threading
+import time
+import traceback
+import tracemalloc
+from typing import Optional
+
+from beatdrop.logger import logger
+from beatdrop import messages
+
+
+PROFILE_MODES = ("cprofile", "tracemalloc")
+
+
+class TickProfiler:
+    """Capture cProfile or tracemalloc data for a number of scheduler ticks.
+
+    A capture is requested with ``request``, starts at the beginning of the next tick,
+    and is written to a file once the requested number of ticks have finished.
+    ``cprofile`` captures are written with ``cProfile.Profile.dump_stats``
+    and can be read with ``pstats``.
+    ``tracemalloc`` captures are written with ``tracemalloc.Snapshot.dump``
+    and can be read with ``tracemalloc.Snapshot.load``.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._requested = None
+        self._mode = None
+        self._path = None
+        self._ticks_left = 0
+        self._num_ticks = 0
+        self._profile = None
+        self._started_tracemalloc = False
+
+
+    def request(self, num_ticks: int, path: str, mode: str = "cprofile") -> None:
+        """Request a capture of the next ticks.
+
+        Replaces any capture that has not started yet.
+
+        Parameters
+        ----------
+        num_ticks : int
+            Number of ticks to capture.
+        path : str
+            File path to write the capture to.
+        mode : str, optional
+            ``"cprofile"`` or ``"tracemalloc"``, by default "cprofile"
+
+        Raises
+        ------
+        ValueError
+            Invalid ``num_ticks`` or ``mode``.
+        """
+        if num_ticks < 1:
+            raise ValueError("'num_ticks' must be at least 1.")
+
+        if mode not in PROFILE_MODES:
+            raise ValueError("'mode' must be one of {}.".format(PROFILE_MODES))
+
+        # May be called from a signal handler, so it must not wait on the lock
+        self._requested = (num_ticks, path, mode)
+
+
+    @property
+    def active(self) -> bool:
+        """``True`` while a capture is running."""
+        return self._mode is not None
+
+
+    def tick_started(self) -> None:
+        """Start or resume a capture at the start of a tick.
+        """
+        with self._lock:
+            if self._mode is None:
+                requested = self._requested
+                if requested is None:
+                    return
+
+                self._requested = None
+                self._num_ticks, self._path, self._mode = requested
+                self._ticks_left = self._num_ticks
+                logger.info(messages.profile_requested_template, self._mode, self._num_ticks, self._path)
+                if self._mode == "tracemalloc":
+                    self._started_tracemalloc = not tracemalloc.is_tracing()
+                    if self._started_tracemalloc:
+                        tracemalloc.start()
+                else:
+                    self._profile = cProfile.Profile()
+
+            if self._profile is not None:
+                self._profile.enable()
+
+
+    def tick_finished(self) -> Optional[str]:
+        """Pause the capture at the end of a tick, and write it once enough ticks were captured.
+
+        Returns
+        -------
+        Optional[str]
+            Path the capture was written to, or ``None`` if nothing was written.
+        """
+        with self._lock:
+            if self._mode is None:
+                return None
+
+            if self._profile is not None:
+                self._profile.disable()
+
+            self._ticks_left -= 1
+            if self._ticks_left > 0:
+                return None
+
+            path = self._path
+            if self._mode == "tracemalloc":
+                tracemalloc.take_snapshot().dump(path)
+                if self._started_tracemalloc:
+                    tracemalloc.stop()
+            else:
+                self._profile.dump_stats(path)
+
+            logger.info(messages.profile_written_template, self._mode, self._num_ticks, path)
+            self._mode = None
+            self._path = None
+            self._profile = None
+            self._started_tracemalloc = False
+
+            return path
+
+
+class SlowTickWatchdog:
+    """Background thread that logs the stacks of all threads when a tick runs too long.
+
+    The stacks are logged once per slow tick at the ``WARNING`` level.
+
+    Parameters
+    ----------
+    threshold : float
+        Seconds a tick can run before it is slow.
+    """
+
+    def __init__(self, threshold: float) -> None:
+        self.threshold = threshold
+        self._cond = threading.Condition()
+        self._tick_started_at = None
+        self._tick_id = 0
+        self._stopped = False
+        self._thread = None
+
+
+    def tick_started(self) -> None:
+        """Start watching a tick. Starts the watchdog thread if it is not running.
+        """
+        with self._cond:
+            self._tick_id += 1
+            self._tick_started_at = time.monotonic()
+            if self._thread is None:
+                self._stopped = False
+                self._thread = threading.Thread(
+                    target=self._watch,
+                    name="beatdrop-slow-tick-watchdog",
+                    daemon=True
+                )
+                self._thread.start()
+
+            self._cond.notify()
+
+
+    def tick_finished(self) -> None:
+        """Stop watching the current tick.
+        """
+        with self._cond:
+            self._tick_started_at = None
+            self._cond.notify()
+
+
+    def stop(self) -> None:
+        """Stop the watchdog thread.
+        """
+        with self._cond:
+            self._stopped = True
+            thread = self._thread
+            self._thread = None
+            self._cond.notify()
+
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+
+
+    def _watch(self) -> None:
+        with self._cond:
+            while not self._stopped:
+                if self._tick_started_at is None:
+                    self._cond.wait()
+                    continue
+
+                tick_id = self._tick_id
+                tick_duration = time.monotonic() - self._tick_started_at
+                if tick_duration < self.threshold:
+                    self._cond.wait(self.threshold - tick_duration)
+                    continue
+
+                logger.warning(
+                    messages.slow_tick_template,
+                    tick_duration,
+                    self.threshold,
+                    format_thread_stacks()
+                )
+                # only dump the stacks once per tick
+                while (
+                    not self._stopped
+                    and self._tick_id == tick_id
+                    and self._tick_started_at is not None
+                ):
+                    self._cond.wait()
+
+
+def format_thread_stacks() -> str:
+    """Format the current stack of every thread.
+
+    Returns
+    -------
+    str
+        Stack of each thread, headed by the thread name and ID.
+    """
+    thread_names = {thread.ident: thread.name for thread in threading.enumerate()}
+    stacks = []
+    for thread_id, frame in sys._current_frames().items():
+        stacks.append(
+            "Thread {} ({}):\n{}".format(
+                thread_names.get(thread_id, "unknown"),
+                thread_id,
+                "".join(traceback.format_stack(frame))
+            )
+        )
+
+    return "\n".join(stacks)
@@ -0,0 +1,188 @@
+import random
+import time
+from typing import Optional
+import uuid
+
+from redis import Redis
+from redis.commands.core import Script
+
+
+# Scripts are bytes so they can be created without a client, see ``redis.commands.core.Script``.
+_acquire_fenced_script = Script(None, b"""
+if redis.call('set', KEYS[1], ARGV[1], 'NX', 'PX', ARGV[2]) then
+    return redis.call('incr', KEYS[2])
+end
+return 0
+""")
+
+_release_script = Script(None, b"""
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+""")
+
+_extend_script = Script(None, b"""
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('pexpire', KEYS[1], ARGV[2])
+end
+return 0
+""")
+
+_locked_script = Script(None, b"""
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('pttl', KEYS[1])
+end
+return 0
+""")
+
+_RETRY_DELAY = 0.2
+
+
+class RedisLock:
+    """Lock on a single Redis node.
+
+    The lock is acquired with ``SET NX PX`` and a random token,
+    and it is only released or extended by the holder of the token, with Lua scripts.
+    Each operation is one round trip.
+
+    With a ``fencing_key``, each acquisition also increments a counter in one round trip,
+    and the new value is the ``fencing_token``.
+    Fencing tokens only increase, so a system that remembers the highest token it has seen
+    can reject work from a holder that lost the lock.
+
+    Parameters
+    ----------
+    redis_conn : Redis
+        Redis client.
+    key : str
+        Redis key of the lock.
+    auto_release_time : float, optional
+        Seconds until the lock expires unless it is extended, by default 10
+    fencing_key : Optional[str], optional
+        Redis key of the fencing token counter, by default None for no fencing tokens.
+    """
+
+    def __init__(
+        self,
+        redis_conn: Redis,
+        key: str,
+        auto_release_time: float = 10,
+        fencing_key: Optional[str] = None
+    ) -> None:
+        self.redis_conn = redis_conn
+        self.key = key
+        self.auto_release_time = auto_release_time
+        self.fencing_key = fencing_key
+        self.fencing_token: Optional[int] = None
+        self._token: Optional[str] = None
+
+
+    def acquire(self, blocking: bool = True, timeout: float = -1) -> bool:
+        """Acquire the lock.
+
+        Parameters
+        ----------
+        blocking : bool, optional
+            Retry until the lock is acquired or ``timeout`` passes, by default True
+        timeout : float, optional
+            Seconds to retry for when blocking, by default -1 to retry forever.
+
+        Returns
+        -------
+        bool
+            ``True`` if the lock was acquired, or else ``False``.
+        """
+        token = uuid.uuid4().hex
+        auto_release_ms = int(self.auto_release_time * 1000)
+        started_at = time.monotonic()
+        while True:
+            if self.fencing_key is None:
+                acquired = self.redis_conn.set(self.key, token, nx=True, px=auto_release_ms)
+            else:
+                fencing_token = _acquire_fenced_script(
+                    keys=(self.key, self.fencing_key),
+                    args=(token, auto_release_ms),
+                    client=self.redis_conn
+                )
+                acquired = fencing_token > 0
+                if acquired:
+                    self.fencing_token = fencing_token
+
+            if acquired:
+                self._token = token
+                return True
+
+            waited = time.monotonic() - started_at
+            if not blocking or (timeout != -1 and waited >= timeout):
+                return False
+
+            delay = random.uniform(0, _RETRY_DELAY)
+            if timeout != -1:
+                delay = min(delay, timeout - waited)
+
+            time.sleep(delay)
+
+
+    def release(self) -> bool:
+        """Release the lock.
+
+        Returns
+        -------
+        bool
+            ``True`` if the lock was released, or ``False`` if it was not held.
+        """
+        if self._token is None:
+            return False
+
+        released = _release_script(
+            keys=(self.key,),
+            args=(self._token,),
+            client=self.redis_conn
+        )
+        self._token = None
+
+        return released == 1
+
+
+    def extend(self) -> bool:
+        """Reset the time until the lock expires to ``auto_release_time``.
+
+        Returns
+        -------
+        bool
+            ``True`` if the lock was extended, or ``False`` if it is no longer held.
+        """
+        if self._token is None:
+            return False
+
+        return _extend_script(
+            keys=(self.key,),
+            args=(self._token, int(self.auto_release_time * 1000)),
+            client=self.redis_conn
+        ) == 1
+
+
+    def locked(self) -> float:
+        """Seconds until the lock expires if it is held, or else 0.
+        """
+        if self._token is None:
+            return 0
+
+        return max(
+            _locked_script(
+                keys=(self.key,),
+                args=(self._token,),
+                client=self.redis_conn
+            ),
+            0
+        ) / 1000
+
+
+    def __enter__(self) -> "RedisLock":
+        self.acquire()
+        return self
+
+
+    def __exit__(self, *exc_info) -> None:
+        self.release()
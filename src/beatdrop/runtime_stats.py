@@ -0,0 +1,136 @@
+import collections
+import datetime
+import threading
+from typing import Optional
+
+from beatdrop.helpers import utc_now_naive
+
+
+class RuntimeStats:
+    """Live state of a running scheduler, reported by the stats server.
+
+    The scheduler's run loop updates it with cheap assignments under a short lock,
+    so reading it never blocks a tick.
+
+    Parameters
+    ----------
+    max_send_failures : int, optional
+        Number of recent send failures to keep, by default 20
+    """
+
+    def __init__(self, max_send_failures: int = 20) -> None:
+        self._lock = threading.Lock()
+        self._lock_held: Optional[bool] = None
+        self._last_tick_at: Optional[datetime.datetime] = None
+        self._last_tick_duration: Optional[float] = None
+        self._next_wake_up_at: Optional[datetime.datetime] = None
+        self._entries_due_next_minute: Optional[int] = None
+        self._dispatch_queue_depth = 0
+        self._send_failures = collections.deque(maxlen=max_send_failures)
+
+
+    def set_lock_held(self, lock_held: bool) -> None:
+        """Set whether this scheduler holds the scheduler lock.
+
+        Parameters
+        ----------
+        lock_held : bool
+            ``True`` if the scheduler holds the lock.
+        """
+        with self._lock:
+            self._lock_held = lock_held
+
+
+    def tick_finished(
+        self,
+        tick_duration: float,
+        entries_due_next_minute: Optional[int]
+    ) -> None:
+        """Record a finished tick.
+
+        Parameters
+        ----------
+        tick_duration : float
+            Duration of the tick in seconds.
+        entries_due_next_minute : Optional[int]
+            Number of entries due within a minute of the tick,
+            or ``None`` if the scheduler does not count them.
+        """
+        with self._lock:
+            self._last_tick_at = utc_now_naive()
+            self._last_tick_duration = tick_duration
+            self._entries_due_next_minute = entries_due_next_minute
+
+
+    def sleeping(self, sleep_time: datetime.timedelta) -> None:
+        """Record that the scheduler is about to sleep.
+
+        Parameters
+        ----------
+        sleep_time : datetime.timedelta
+            Time the scheduler will sleep for.
+        """
+        with self._lock:
+            self._next_wake_up_at = utc_now_naive() + sleep_time
+
+
+    def send_started(self) -> None:
+        """Add a due entry to the dispatch queue depth.
+        """
+        with self._lock:
+            self._dispatch_queue_depth += 1
+
+
+    def send_finished(self) -> None:
+        """Remove a due entry from the dispatch queue depth.
+        """
+        with self._lock:
+            self._dispatch_queue_depth -= 1
+
+
+    def send_failed(self, key: str, task: str, error: str) -> None:
+        """Record a schedule entry that could not be sent.
+
+        Parameters
+        ----------
+        key : str
+            Schedule entry key.
+        task : str
+            Schedule entry task.
+        error : str
+            Why the entry could not be sent.
+        """
+        with self._lock:
+            self._send_failures.append({
+                "at": utc_now_naive().isoformat(),
+                "key": key,
+                "task": task,
+                "error": error
+            })
+
+
+    def snapshot(self) -> dict:
+        """Get a JSON serializable copy of the current state.
+
+        Returns
+        -------
+        dict
+            ``lock_held`` (``None`` for schedulers without a lock), ``last_tick_at``, ``last_tick_duration``,
+            ``next_wake_up_at``, ``entries_due_next_minute``, ``dispatch_queue_depth``
+            and ``recent_send_failures``, oldest first.
+            Times are naive UTC ISO 8601 strings, or ``None`` before the first tick.
+        """
+        with self._lock:
+            return {
+                "lock_held": self._lock_held,
+                "last_tick_at": _isoformat(self._last_tick_at),
+                "last_tick_duration": self._last_tick_duration,
+                "next_wake_up_at": _isoformat(self._next_wake_up_at),
+                "entries_due_next_minute": self._entries_due_next_minute,
+                "dispatch_queue_depth": self._dispatch_queue_depth,
+                "recent_send_failures": list(self._send_failures)
+            }
+
+
+def _isoformat(dt: Optional[datetime.datetime]) -> Optional[str]:
+    return None if dt is None else dt.isoformat()
@@ -1,59 +1,52 @@
 
+from importlib import import_module
+from importlib.util import find_spec
+from typing import Any, List, Tuple
+
+# Schedulers are imported lazily on first access,
+# so importing beatdrop does not import the task and storage backends that are not used.
+# scheduler name: (module, required packages)
+_lazy_schedulers = {
+    # Base Schedulers with different features
+    "Scheduler": ("beatdrop.schedulers.scheduler", ()),
+    "SingletonLockScheduler": ("beatdrop.schedulers.singleton_lock_scheduler", ()),
+
+    # Scheduler implementations without task specifics
+    "MemScheduler": ("beatdrop.schedulers.mem_scheduler", ()),
+    "SQLScheduler": ("beatdrop.schedulers.sql_scheduler", ("sqlalchemy",)),
+    "RedisScheduler": ("beatdrop.schedulers.redis_scheduler", ("redis",)),
+
+    # Task backend implementations for send()
+    "CeleryScheduler": ("beatdrop.schedulers.celery_scheduler", ("celery",)),
+    "RQScheduler": ("beatdrop.schedulers.rq_scheduler", ("rq",)),
+
+    # Complete Schedulers
+    "CeleryRedisScheduler": ("beatdrop.schedulers.celery_redis_scheduler", ("celery", "redis")),
+    "CelerySQLScheduler": ("beatdrop.schedulers.celery_sql_scheduler", ("celery", "sqlalchemy")),
+    "RQRedisScheduler": ("beatdrop.schedulers.rq_redis_scheduler", ("rq", "redis")),
+    "RQSQLScheduler": ("beatdrop.schedulers.rq_sql_scheduler", ("rq", "sqlalchemy"))
+}
+
+
+def _installed(packages: Tuple[str, ...]) -> bool:
+    return all(find_spec(package) is not None for package in packages)
+
+
+# Only schedulers with their optional dependencies installed are listed
 __all__ = [
-    "Scheduler",
-    "SingletonLockScheduler",
-    "MemScheduler"
+    name for name, (_, packages) in _lazy_schedulers.items() if _installed(packages)
 ]
 
-# Base Schedulers with different features
-from beatdrop.schedulers.scheduler import Scheduler
-from beatdrop.schedulers.singleton_lock_scheduler import SingletonLockScheduler
-
-# Scheduler implementations without task specifics
-from beatdrop.schedulers.mem_scheduler import MemScheduler
-try:
-    from beatdrop.schedulers.sql_scheduler import SQLScheduler
-    __all__.append("SQLScheduler")
-except ModuleNotFoundError as error: # pragma: no cover
-    pass
-try:
-    from beatdrop.schedulers.redis_scheduler import RedisScheduler
-    __all__.append("RedisScheduler")
-except ModuleNotFoundError as error: # pragma: no cover
-    pass
-
-# Task backend implementations for send()
-try:
-    from beatdrop.schedulers.celery_scheduler import CeleryScheduler
-    __all__.append("CeleryScheduler")
-except ModuleNotFoundError as error: # pragma: no cover
-    pass
-try:
-    from beatdrop.schedulers.rq_scheduler import RQScheduler
-    __all__.append("RQScheduler")
-except ModuleNotFoundError as error: # pragma: no cover
-    pass
-
-# Complete Schedulers
-try:
-    from beatdrop.schedulers.celery_redis_scheduler import CeleryRedisScheduler
-    __all__.append("CeleryRedisScheduler")
-except ModuleNotFoundError as error: # pragma: no cover
-    pass
-try:
-    from beatdrop.schedulers.celery_sql_scheduler import CelerySQLScheduler
-    __all__.append("CelerySQLScheduler")
-except ModuleNotFoundError as error: # pragma: no cover
-    pass
-try:
-    from beatdrop.schedulers.rq_redis_scheduler import RQRedisScheduler
-    __all__.append("RQRedisScheduler")
-except ModuleNotFoundError as error: # pragma: no cover
-    pass 
-try:
-    from beatdrop.schedulers.rq_sql_scheduler import RQSQLScheduler
-    __all__.append("RQSQLScheduler")
-except ModuleNotFoundError as error: # pragma: no cover
-    pass 
+
+def __getattr__(name: str) -> Any:
+    if name not in _lazy_schedulers:
+        raise AttributeError("module '{}' has no attribute '{}'".format(__name__, name))
+
+    scheduler = getattr(import_module(_lazy_schedulers[name][0]), name)
+    globals()[name] = scheduler
+
+    return scheduler
 
 
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(__all__))
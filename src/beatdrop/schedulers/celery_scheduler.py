@@ -6,9 +6,9 @@ import celery
 from pydantic import Field
 from pydantic.dataclasses import dataclass
 
-from beatdrop import messages
+from beatdrop import messages, tracing
 from beatdrop.entries.schedule_entry import ScheduleEntry
-from beatdrop.schedulers.scheduler import Scheduler
+from beatdrop.schedulers.scheduler import FENCING_TOKEN_KEY, Scheduler
 
 class Config:
     arbitrary_types_allowed = True
@@ -40,6 +40,9 @@ class CeleryScheduler(Scheduler):
         In general these entries are not held in non-volatile storage 
         so any metadata they hold will be lost if the scheduler fails.
         These entries are static.  The keys cannot be overwritten or deleted.
+    metrics_sink : beatdrop.metrics.MetricsSink, default : NoOpMetricsSink()
+        Sink for tick, scheduling lag, send and lock metrics.
+        See ``beatdrop.metrics`` for the metric names.
     celery_app : celery.Celery
         Celery app for sending tasks.
     """
@@ -50,12 +53,15 @@ class CeleryScheduler(Scheduler):
     def send(self, sched_entry: ScheduleEntry) -> None:
         """Send a schedule entry to the Celery queue.
 
+        The current trace context is sent in the message headers, see ``beatdrop.tracing``.
+        The scheduler's ``fencing_token``, if it has one, is sent in the ``beatdrop_fencing_token`` header.
+
         Parameters
         ----------
         sched_entry : ScheduleEntry
             Schedule entry to send to the Celery queue.
         """
-        self._logger.debug(messages.sched_entry_sending_template.format(sched_entry))
+        self._logger.debug(messages.sched_entry_sending_template, sched_entry, entry_key=sched_entry.key)
         try:
             task_name = sched_entry.task
             if task_name.startswith("__main__"):
@@ -73,19 +79,38 @@ class CeleryScheduler(Scheduler):
             if task_kwargs is None:
                 task_kwargs = {}
             
+            headers = tracing.inject_context()
+            fencing_token = self.fencing_token
+            if fencing_token is not None:
+                headers[FENCING_TOKEN_KEY] = fencing_token
+
             if task_name in self.celery_app.tasks:
-                self.celery_app.tasks[task_name].delay(*task_args, **task_kwargs)
-                self._logger.info(messages.sched_entry_sent_template.format(sched_entry))
+                self.celery_app.tasks[task_name].apply_async(
+                    args=task_args,
+                    kwargs=task_kwargs,
+                    headers=headers
+                )
+                self._logger.info(messages.sched_entry_sent_template, sched_entry, entry_key=sched_entry.key)
             else:
-                self._logger.error("Could not find Celery task {} for entry {}".format(task_name, sched_entry))
+                self._logger.error(
+                    "Could not find Celery task {} for entry {}",
+                    task_name,
+                    sched_entry,
+                    entry_key=sched_entry.key
+                )
+                self._record_send_failure(
+                    sched_entry,
+                    "Could not find Celery task {}".format(task_name)
+                )
 
         except Exception as error:
+            self._record_send_failure(sched_entry, "{}: {}".format(type(error).__name__, error))
             self._logger.error(
-                "Failed to send entry: {}. Check that the Celery app is initialized and the function is registered as a task. {}: {}".format(
-                    sched_entry,
-                    type(error).__name__, 
-                    error
-                )
+                "Failed to send entry: {}. Check that the Celery app is initialized and the function is registered as a task. {}: {}",
+                sched_entry,
+                type(error).__name__, 
+                error,
+                entry_key=sched_entry.key
             )
 
 
@@ -34,6 +34,9 @@ class CelerySQLScheduler(SQLScheduler, CeleryScheduler):
         In general these entries are not held in non-volatile storage 
         so any metadata they hold will be lost if the scheduler fails.
         These entries are static.  The keys cannot be overwritten or deleted.
+    metrics_sink : beatdrop.metrics.MetricsSink, default : NoOpMetricsSink()
+        Sink for tick, scheduling lag, send and lock metrics.
+        See ``beatdrop.metrics`` for the metric names.
     lock_timeout: datetime.timedelta
         The time a scheduler does not refresh the scheduler lock before it is considered dead. 
         Should be at least 3 times the ``max_interval``.
@@ -1,14 +1,22 @@
 
 import copy
+import math
 import time
 from datetime import timedelta
+from typing import Iterator, List, Optional
 
+from pydantic import Field, validator
 from pydantic.dataclasses import dataclass
 
 from beatdrop import art, messages
+from beatdrop.entry_filter import ScheduleEntryFilter
+from beatdrop.entry_index import CompactEntryIndex
+from beatdrop.entry_stats import EntryStats
 from beatdrop.entries.schedule_entry import ScheduleEntry
-from beatdrop.exceptions import MaxRunIterations
+from beatdrop.exceptions import InvalidPageCursor, MaxRunIterations
+from beatdrop.pagination import decode_page_cursor, EntryPage, encode_page_cursor
 from beatdrop.schedulers.scheduler import Scheduler
+from beatdrop.timing_wheel import TimingWheel
 
 
 @dataclass
@@ -31,8 +39,52 @@ class MemScheduler(Scheduler):
         In general these entries are not held in non-volatile storage 
         so any metadata they hold will be lost if the scheduler fails.
         These entries are static.  The keys cannot be overwritten or deleted.
+    metrics_sink : beatdrop.metrics.MetricsSink, default : NoOpMetricsSink()
+        Sink for tick, scheduling lag, send and lock metrics.
+        See ``beatdrop.metrics`` for the metric names.
+    compact_index : bool, default : False
+        Hold the default entries in a ``beatdrop.entry_index.CompactEntryIndex`` instead of as entry objects,
+        for very large numbers of entries.
+        The entries are moved into the index when the scheduler is created, leaving ``default_sched_entries`` empty,
+        and each entry is only decoded when it is due or listed.
+    timing_wheel_tick : Optional[datetime.timedelta], default : None
+        Find due entries with a ``beatdrop.timing_wheel.TimingWheel`` with ticks of this length,
+        instead of checking every entry each tick.
+        Each tick only visits the entries that are due, so it takes the same time however many entries there are. 
+        Longer ticks move entries between the wheel's levels less often.
+        ``None`` checks every entry.
     """
 
+    compact_index: bool = Field(default=False)
+    timing_wheel_tick: Optional[timedelta] = Field(default=None)
+
+
+    def __post_init_post_parse__(self):
+        super().__post_init_post_parse__()
+        self._entry_index: Optional[CompactEntryIndex] = None
+        if self.compact_index:
+            self._entry_index = CompactEntryIndex(self.sched_entry_types)
+            for sched_entry in self.default_sched_entries:
+                self._entry_index.add(sched_entry)
+
+            self.default_sched_entries = []
+            self._default_sched_entry_lookup = {}
+
+        self._timing_wheel: Optional[TimingWheel] = None
+        if self.timing_wheel_tick is not None:
+            self._timing_wheel = TimingWheel(tick=self.timing_wheel_tick.total_seconds())
+            if self._entry_index is not None:
+                for key in self._entry_index:
+                    if self._entry_index.enabled(key) and self._entry_index.next_due(key) < math.inf:
+                        self._timing_wheel.schedule(key, self._entry_index.next_due(key))
+            else:
+                for sched_entry in self.default_sched_entries:
+                    if sched_entry.enabled and not sched_entry.is_expired():
+                        self._timing_wheel.schedule(
+                            sched_entry.key,
+                            time.time() + self._due_in(sched_entry).total_seconds()
+                        )
+
 
     def run(self, max_iterations: int = None) -> None:
         """Run the scheduler.
@@ -47,36 +99,302 @@ class MemScheduler(Scheduler):
         """
         try:
             self._logger.info(art.logo)
+            self._start_stats_server()
             self._logger.info(messages.scheduler_starting)
-            zero = timedelta(seconds=0)
-            sleep_time = self.max_interval
             num_iterations = 0
             while True:
-                for entry in self.default_sched_entries:
-                    if not entry.enabled:
-                        continue
-
-                    due_in = entry.due_in()
-                    if due_in <= zero:
-                        self._logger.debug(messages.sched_entry_sending_template.format(entry))
-                        self.send(entry)
-                        entry.sent()
-                        due_in = entry.due_in()
-
-                    if due_in < sleep_time:
-                        sleep_time = due_in
+                sleep_time = self._tick()
 
                 num_iterations = self._update_run_iteration(
                     num_iterations=num_iterations, 
                     max_iterations=max_iterations
                 )
-                self._logger.debug(messages.scheduler_sleep_template.format(sleep_time.total_seconds()))
-                time.sleep(sleep_time.total_seconds())
-                sleep_time = self.max_interval
+                self._sleep(sleep_time)
         except (MaxRunIterations, KeyboardInterrupt):
             self._logger.info(messages.scheduler_shut_down)
 
+        finally:
+            self._stop_stats_server()
+
+
+    def _run_once(self) -> timedelta:
+        """Run an iteration of the scheduler.
+
+        Returns
+        -------
+        timedelta
+            Sleep time until the scheduler should wake up and run again.
+        """
+        if self._timing_wheel is not None:
+            return self._run_wheel_once()
+
+        if self._entry_index is not None:
+            return self._run_index_once()
+
+        tick_started_at = time.perf_counter()
+        num_scanned = 0
+        num_due = 0
+        num_due_soon = 0
+        zero = timedelta(seconds=0)
+        sleep_time = self.max_interval
+        for entry in self.default_sched_entries:
+            if not entry.enabled or entry.is_expired():
+                continue
+
+            num_scanned += 1
+            due_in = self._due_in(entry)
+            checked_at = time.perf_counter()
+            if due_in <= self._due_soon:
+                num_due_soon += 1
+
+            if due_in <= zero:
+                num_due += 1
+                self._logger.debug(messages.sched_entry_sending_template, entry, entry_key=entry.key)
+                self._send_entry(entry, due_in, checked_at)
+                entry.sent()
+                due_in = self._due_in(entry)
+
+            if due_in < sleep_time:
+                sleep_time = due_in
+
+        self._record_tick(tick_started_at, num_scanned, num_due, num_due_soon)
+
+        return sleep_time
+
+
+    def _run_index_once(self) -> timedelta:
+        """Run an iteration of the scheduler on the compact entry index.
+
+        Only the entries the index has as due are decoded.
+
+        Returns
+        -------
+        timedelta
+            Sleep time until the scheduler should wake up and run again.
+        """
+        tick_started_at = time.perf_counter()
+        num_due = 0
+        now = time.time()
+        due_keys, num_due_soon, earliest = self._entry_index.scan(now, now + self._due_soon.total_seconds())
+        for key in due_keys:
+            entry = self._decode_entry(self._entry_index.payload(key))
+            if entry.is_expired():
+                self._entry_index.set_next_due(key, math.inf)
+                continue
+
+            due_in = self._due_in(entry)
+            checked_at = time.perf_counter()
+            if due_in <= timedelta(seconds=0):
+                num_due += 1
+                self._logger.debug(messages.sched_entry_sending_template, entry, entry_key=entry.key)
+                self._send_entry(entry, due_in, checked_at)
+                entry.sent()
+                due_in = self._due_in(entry)
+                self._entry_index.add(entry, next_due=time.time() + due_in.total_seconds())
+            else:
+                self._entry_index.set_next_due(key, now + due_in.total_seconds())
+
+            earliest = min(earliest, now + due_in.total_seconds())
+
+        self._record_tick(tick_started_at, len(due_keys), num_due, num_due_soon)
+
+        return min(self.max_interval, timedelta(seconds=max(earliest - time.time(), 0)))
+
+
+    def _run_wheel_once(self) -> timedelta:
+        """Run an iteration of the scheduler on the timing wheel.
+
+        Only the entries the wheel expires are visited, 
+        and they are scheduled on the wheel again for their next due time.
+
+        Returns
+        -------
+        timedelta
+            Sleep time until the scheduler should wake up and run again.
+        """
+        tick_started_at = time.perf_counter()
+        num_due = 0
+        zero = timedelta(seconds=0)
+        now = time.time()
+        due_keys = self._timing_wheel.advance(now)
+        num_due_soon = len(due_keys) + self._timing_wheel.count_before(now + self._due_soon.total_seconds())
+        for key in due_keys:
+            if self._entry_index is not None:
+                entry = self._decode_entry(self._entry_index.payload(key))
+            else:
+                entry = self._default_sched_entry_lookup[key]
+
+            if not entry.enabled or entry.is_expired():
+                continue
+
+            due_in = self._due_in(entry)
+            checked_at = time.perf_counter()
+            if due_in <= zero:
+                num_due += 1
+                self._logger.debug(messages.sched_entry_sending_template, entry, entry_key=entry.key)
+                self._send_entry(entry, due_in, checked_at)
+                entry.sent()
+                due_in = self._due_in(entry)
+                if self._entry_index is not None:
+                    self._entry_index.add(entry, next_due=time.time() + due_in.total_seconds())
+
+            if entry.enabled:
+                self._timing_wheel.schedule(key, time.time() + due_in.total_seconds())
+
+        self._record_tick(tick_started_at, len(due_keys), num_due, num_due_soon)
+        next_due = self._timing_wheel.next_due()
+        if next_due is None:
+            return self.max_interval
+
+        return min(self.max_interval, timedelta(seconds=max(next_due - time.time(), 0)))
+
+
+    def _indexed_entries(self, filter: Optional[ScheduleEntryFilter] = None) -> Iterator[ScheduleEntry]:
+        for key in self._entry_index:
+            entry = self._decode_entry(self._entry_index.payload(key))
+            if filter is None or filter.matches(entry):
+                yield entry
+
+
+    def list(self, *, filter: Optional[ScheduleEntryFilter] = None) -> List[ScheduleEntry]:
+        """List schedule entries.
+
+        Parameters
+        ----------
+        filter : Optional[ScheduleEntryFilter], optional
+            Only list entries that match this filter, by default None
+
+        Returns
+        -------
+        List[ScheduleEntry]
+            Copy of the matching schedule entries.
+        """
+        if self._entry_index is not None:
+            return list(self._indexed_entries(filter=filter))
+
+        sched_entries = self.default_sched_entries
+        if filter is not None:
+            sched_entries = [entry for entry in sched_entries if filter.matches(entry)]
+
+        return copy.deepcopy(sched_entries)
+
+
+    def list_page(
+        self,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        *,
+        filter: Optional[ScheduleEntryFilter] = None
+    ) -> EntryPage:
+        """List a page of schedule entries.
+
+        Parameters
+        ----------
+        cursor : Optional[str], optional
+            Continuation token from the previous page, by default None for the first page.
+        limit : int, optional
+            Maximum number of entries in the page, by default 100
+        filter : Optional[ScheduleEntryFilter], optional
+            Only list entries that match this filter, by default None
+
+        Returns
+        -------
+        EntryPage
+            Copy of the schedule entries in the page, and the continuation token for the next page.
+
+        Raises
+        ------
+        ValueError
+            ``limit`` is less than 1.
+        """
+        self._check_page_limit(limit)
+        if self._entry_index is not None:
+            return self._index_page(cursor=cursor, limit=limit, filter=filter)
+
+        page_entries, next_cursor, _ = self._page_default_entries(
+            cursor=cursor,
+            limit=limit,
+            filter=filter
+        )
+
+        return EntryPage(
+            entries=copy.deepcopy(page_entries),
+            cursor=next_cursor
+        )
+
+
+    def _index_page(
+        self,
+        cursor: Optional[str],
+        limit: int,
+        filter: Optional[ScheduleEntryFilter]
+    ) -> EntryPage:
+        """Helper for ``list_page`` to page through the compact entry index, in index order.
+        """
+        state = {"d": 0} if cursor is None else decode_page_cursor(cursor)
+        start = state.get("d")
+        if not isinstance(start, int) or start < 0:
+            raise InvalidPageCursor("Invalid page cursor '{}'.".format(cursor))
+
+        page_entries = []
+        keys = list(self._entry_index)
+        position = start
+        while position < len(keys) and len(page_entries) < limit:
+            entry = self._decode_entry(self._entry_index.payload(keys[position]))
+            position += 1
+            if filter is None or filter.matches(entry):
+                page_entries.append(entry)
+
+        next_cursor = None
+        if position < len(keys):
+            next_cursor = encode_page_cursor({"d": position})
+
+        return EntryPage(
+            entries=page_entries,
+            cursor=next_cursor
+        )
+
+
+    def count(self, *, filter: Optional[ScheduleEntryFilter] = None) -> int:
+        """Count schedule entries.
+
+        With ``compact_index``, entries are only decoded to match a filter.
+
+        Parameters
+        ----------
+        filter : Optional[ScheduleEntryFilter], optional
+            Only count entries that match this filter, by default None
+
+        Returns
+        -------
+        int
+            Number of schedule entries.
+        """
+        if self._entry_index is not None and filter is None:
+            return len(self._entry_index)
+
+        return super().count(filter=filter)
+
+
+    def stats(self) -> EntryStats:
+        """Count schedule entries by type and enabled state.
+
+        With ``compact_index``, the counts are read from the index without decoding entries.
+
+        Returns
+        -------
+        EntryStats
+            Counts of schedule entries.
+        """
+        if self._entry_index is not None:
+            return EntryStats.from_counts(self._entry_index.counts())
+
+        return super().stats()
+
 
-    def list(self) -> ScheduleEntry:
-        return copy.deepcopy(self.default_sched_entries)
+    @validator("timing_wheel_tick")
+    def timing_wheel_tick_positive(cls, v: Optional[timedelta]) -> Optional[timedelta]:
+        if v is not None and v.total_seconds() <= 0:
+            raise ValueError("'timing_wheel_tick' must be positive.")
 
+        return v
@@ -1,26 +1,215 @@
 
+from contextlib import contextmanager, ExitStack
 import copy
 from datetime import timedelta
 import json
+import threading
 import time
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
-import pottery
 from pydantic import Field
 from pydantic.dataclasses import dataclass
 from redis import Redis
+from redis.commands.core import Script
 
 from beatdrop import art
 from beatdrop import messages
+from beatdrop import metrics
+from beatdrop import operation_stats
+from beatdrop import tracing
 from beatdrop.schedulers.singleton_lock_scheduler import SingletonLockScheduler
 from beatdrop.entries.schedule_entry import ScheduleEntry
+from beatdrop.entry_filter import ScheduleEntryFilter
+from beatdrop.entry_stats import EntryStats
 from beatdrop.entry_type_registry import EntryTypeRegistry
+from beatdrop.helpers import utc_now_naive, utc_timestamp
+from beatdrop.operation_stats import OperationStats
+from beatdrop.pagination import encode_page_cursor, EntryPage
+from beatdrop.redis_lock import RedisLock
 from beatdrop import exceptions
 
 
+# Version of the index sets, counters and sorted sets, stored in ``beatdrop_entries_index_version`` by ``rebuild_indexes``.
+_INDEX_VERSION = 1
+
+# Decrements an entry counter only if the entry is in the enabled index set it was counted with,
+# so entries saved without the indexes are not taken off counters they were never added to.
+# A script so the check and the decrement run together in the write's transaction.
+_uncount_entry_script = Script(None, b"""
+if redis.call('sismember', KEYS[1], ARGV[1]) == 1 then
+    return redis.call('hincrby', KEYS[2], ARGV[2], -1)
+end
+return 0
+""")
+
+
+def _escape_glob(pattern: str) -> str:
+    """Escape redis glob style special characters.
+
+    Parameters
+    ----------
+    pattern : str
+        Literal string to match.
+
+    Returns
+    -------
+    str
+        Escaped string that can be used in a redis ``MATCH`` pattern.
+    """
+    for char in "\\*?[]":
+        pattern = pattern.replace(char, "\\" + char)
+
+    return pattern
+
+
+def _index_key(index_prefix: str, field: str, value: Any) -> str:
+    """Key of a redis secondary index set.
+
+    Parameters
+    ----------
+    index_prefix : str
+        Prefix for all index keys.
+    field : str
+        Indexed field name.
+    value : Any
+        Indexed field value.
+
+    Returns
+    -------
+    str
+        Redis key of the set of entry keys with this field value.
+    """
+    if isinstance(value, bool):
+        value = int(value)
+
+    return "{}{}:{}".format(index_prefix, field, value)
+
+
+def _entry_index_keys(
+    index_prefix: str,
+    entry_type: str,
+    task: str,
+    enabled: bool
+) -> List[str]:
+    """Keys of all of the index sets that an entry belongs to.
+
+    Parameters
+    ----------
+    index_prefix : str
+        Prefix for all index keys.
+    entry_type : str
+        Schedule entry class name.
+    task : str
+        Schedule entry task.
+    enabled : bool
+        Schedule entry enabled state.
+
+    Returns
+    -------
+    List[str]
+        Index set keys.
+    """
+    return [
+        _index_key(index_prefix, "type", entry_type),
+        _index_key(index_prefix, "task", task),
+        _index_key(index_prefix, "enabled", enabled)
+    ]
+
+
+def _sched_entry_meta(sched_entry: ScheduleEntry) -> Tuple[str, str, bool]:
+    """Indexed metadata of a schedule entry.
+
+    Parameters
+    ----------
+    sched_entry : ScheduleEntry
+        Schedule entry.
+
+    Returns
+    -------
+    Tuple[str, str, bool]
+        Type name, task and enabled state.
+    """
+    return type(sched_entry).__name__, sched_entry.task, sched_entry.enabled
+
+
+def _entry_dict_meta(sched_entry_dict: dict) -> Tuple[str, str, bool]:
+    """Indexed metadata of a schedule entry from its dictionary representation.
+
+    Parameters
+    ----------
+    sched_entry_dict : dict
+        Dictionary representation of a schedule entry.
+
+    Returns
+    -------
+    Tuple[str, str, bool]
+        Type name, task and enabled state.
+    """
+    return sched_entry_dict['__beatdrop_type__'], sched_entry_dict['task'], sched_entry_dict['enabled']
+
+
+def _stats_field(meta: Tuple[str, str, bool]) -> str:
+    """Field in the entry counters hash for the type and enabled state of an entry.
+
+    Parameters
+    ----------
+    meta : Tuple[str, str, bool]
+        Type name, task and enabled state.
+
+    Returns
+    -------
+    str
+        Counter field.
+    """
+    return "{}:{}".format(meta[0], int(meta[2]))
+
+
+def _filter_index_keys(
+    index_prefix: str,
+    sched_entry_filter: Optional[ScheduleEntryFilter]
+) -> List[str]:
+    """Keys of the index sets that hold entries matching a filter.
+
+    The key prefix is not indexed with a set, it is matched with ``MATCH`` instead.
+
+    Parameters
+    ----------
+    index_prefix : str
+        Prefix for all index keys.
+    sched_entry_filter : Optional[ScheduleEntryFilter]
+        Filter on schedule entries.
+
+    Returns
+    -------
+    List[str]
+        Index set keys, entries must be a member of all of them to match.
+    """
+    if sched_entry_filter is None:
+        return []
+
+    index_keys = []
+    if sched_entry_filter.entry_type is not None:
+        index_keys.append(_index_key(index_prefix, "type", sched_entry_filter.entry_type))
+
+    if sched_entry_filter.task is not None:
+        index_keys.append(_index_key(index_prefix, "task", sched_entry_filter.task))
+
+    if sched_entry_filter.enabled is not None:
+        index_keys.append(_index_key(index_prefix, "enabled", sched_entry_filter.enabled))
+
+    return index_keys
+
+
 class RedisScheduleEntryList: 
     """Iterator for RedisScheduler entries.
 
+    Without a filter, or with only a key prefix, the entries hash is read with ``HSCAN``.
+    When the filter has indexed fields, the smallest matching index set is read with ``SSCAN``,
+    entry keys are checked against the other index sets, 
+    and only the matching entries are read from the hash.
+
+    Pages of entry JSON can also be read one at a time with ``scan_page``.
+
     Parameters
     ----------
     page_size : int
@@ -33,6 +222,12 @@ class RedisScheduleEntryList:
         Redis key of the hash that stores schedule entries.
     entry_type_registry : EntryTypeRegistry
         Entry type registry for deserializing JSON models from redis.
+    filter : Optional[ScheduleEntryFilter], optional
+        Only list entries that match this filter, by default None
+    index_prefix : str, optional
+        Prefix of the redis secondary index set keys, by default "beatdrop_entries_index:"
+    operation_stats : Optional[OperationStats], optional
+        Where to record the latency of redis reads and decoding, by default None
     """
 
     def __init__(
@@ -41,16 +236,33 @@ class RedisScheduleEntryList:
         default_sched_entries: List[ScheduleEntry], 
         redis_conn: Redis,
         hash_key: str,
-        entry_type_registry: EntryTypeRegistry
+        entry_type_registry: EntryTypeRegistry,
+        filter: Optional[ScheduleEntryFilter] = None,
+        index_prefix: str = "beatdrop_entries_index:",
+        operation_stats: Optional[OperationStats] = None
     ):
+        if operation_stats is None:
+            operation_stats = OperationStats()
+
+        self._operation_stats = operation_stats
         self._redis_conn = redis_conn
         self.page_size = page_size
+        self.filter = filter
+        if filter is not None:
+            default_sched_entries = [entry for entry in default_sched_entries if filter.matches(entry)]
+
         self._default_sched_entries = default_sched_entries
         self._default_entries_iter = iter(self._default_sched_entries)
         self._hash_key = hash_key
         self._entry_type_registry = entry_type_registry
+        self._index_keys = _filter_index_keys(index_prefix, filter)
+        self._match = None
+        if filter is not None and filter.key_prefix is not None:
+            self._match = _escape_glob(filter.key_prefix) + "*"
+
         self._redis_page_iter = None
         self._cursor = None
+        self._scanned_index_key = None
 
 
     def __iter__(self):
@@ -58,6 +270,7 @@ class RedisScheduleEntryList:
         self._iterated_default_entries = False
         self._redis_page_iter = None
         self._cursor = None
+        self._scanned_index_key = None
 
         return self
 
@@ -71,19 +284,18 @@ class RedisScheduleEntryList:
         
         if self._iterated_default_entries == True:
             if self._redis_page_iter is None:
-                self._cursor, results = self._redis_conn.hscan(
-                    name=self._hash_key,
-                    cursor=0,
-                    count=self.page_size
-                )
-                self._redis_page_iter = iter(results.values())
+                self._cursor, self._scanned_index_key, results = self.scan_page(cursor=0)
+                self._redis_page_iter = iter(results)
 
             try:
-                return self._entry_type_registry.dejson_entry(
-                        sched_entry_json=next(self._redis_page_iter)
-                    )
+                return self._decode_entry(next(self._redis_page_iter))
             except StopIteration:
                 return self._get_next_page_item()
+
+
+    def _decode_entry(self, sched_entry_json: str) -> ScheduleEntry:
+        with self._operation_stats.time(operation_stats.DECODE):
+            return self._entry_type_registry.dejson_entry(sched_entry_json=sched_entry_json)
     
     
     def _get_next_page_item(self) -> ScheduleEntry:
@@ -106,20 +318,137 @@ class RedisScheduleEntryList:
         if self._cursor == 0:
             raise StopIteration
         
-        self._cursor, results = self._redis_conn.hscan(
-            name=self._hash_key,
+        self._cursor, self._scanned_index_key, results = self.scan_page(
             cursor=self._cursor,
-            count=self.page_size
+            index_key=self._scanned_index_key
         )
-        self._redis_page_iter = iter(results.values())
+        self._redis_page_iter = iter(results)
         try:
-            return self._entry_type_registry.dejson_entry(
-                sched_entry_json=next(self._redis_page_iter)
-            )
+            return self._decode_entry(next(self._redis_page_iter))
         except StopIteration:
             return self._get_next_page_item()
 
 
+    def scan_page(
+        self,
+        cursor: int = 0,
+        index_key: Optional[str] = None
+    ) -> Tuple[int, Optional[str], List[str]]:
+        """Read a page of the JSON of the matching entries in redis.
+
+        Default entries are not included, and the entries are not decoded.
+        Pages can be empty before the end of the results, see https://redis.io/commands/scan/
+
+        Parameters
+        ----------
+        cursor : int, optional
+            Redis scan cursor from the previous page, by default 0 for the first page.
+        index_key : Optional[str], optional
+            Index set returned with the previous page, by default None.
+            ``None`` scans the smallest index set matching the filter.
+
+        Returns
+        -------
+        Tuple[int, Optional[str], List[str]]
+            Next redis scan cursor, which is 0 at the end of the results, 
+            the index set being scanned, or ``None`` if the hash is scanned, 
+            and the JSON of the matching entries.
+
+        Raises
+        ------
+        ValueError
+            ``index_key`` is not one of the filter's index sets.
+        """
+        if index_key is not None and index_key not in self._index_keys:
+            raise ValueError("'index_key' must be one of the filter's index sets.")
+
+        if len(self._index_keys) == 0:
+            with self._operation_stats.time(operation_stats.HSCAN):
+                cursor, results = self._redis_conn.hscan(
+                    name=self._hash_key,
+                    cursor=cursor,
+                    match=self._match,
+                    count=self.page_size
+                )
+
+            return cursor, None, list(results.values())
+
+        if index_key is None:
+            index_key = self._smallest_index_key()
+
+        with self._operation_stats.time(operation_stats.SSCAN):
+            cursor, keys = self._redis_conn.sscan(
+                name=index_key,
+                cursor=cursor,
+                match=self._match,
+                count=self.page_size
+            )
+            keys = self._keys_in_other_indexes(
+                keys=keys,
+                other_index_keys=[other_key for other_key in self._index_keys if other_key != index_key]
+            )
+
+        if len(keys) == 0:
+            return cursor, index_key, []
+
+        with self._operation_stats.time(operation_stats.HMGET):
+            results = self._redis_conn.hmget(self._hash_key, keys)
+
+        return cursor, index_key, [entry_json for entry_json in results if entry_json is not None]
+
+
+    def _smallest_index_key(self) -> str:
+        """The smallest index set matching the filter, which is the one scanned.
+
+        Returns
+        -------
+        str
+            Index set key.
+        """
+        if len(self._index_keys) == 1:
+            return self._index_keys[0]
+
+        pipe = self._redis_conn.pipeline(transaction=False)
+        for index_key in self._index_keys:
+            pipe.scard(index_key)
+
+        sizes = pipe.execute()
+
+        return min(zip(sizes, self._index_keys))[1]
+
+
+    def _keys_in_other_indexes(self, keys: List[str], other_index_keys: List[str]) -> List[str]:
+        """Only keep the entry keys that are members of all of the other index sets.
+
+        Parameters
+        ----------
+        keys : List[str]
+            Entry keys from the scanned index set.
+        other_index_keys : List[str]
+            The filter's index sets that are not being scanned.
+
+        Returns
+        -------
+        List[str]
+            Entry keys that match the whole filter.
+        """
+        if len(other_index_keys) == 0 or len(keys) == 0:
+            return keys
+
+        pipe = self._redis_conn.pipeline(transaction=False)
+        for key in keys:
+            for index_key in other_index_keys:
+                pipe.sismember(index_key, key)
+
+        is_member = pipe.execute()
+        num_indexes = len(other_index_keys)
+
+        return [
+            key for i, key in enumerate(keys) 
+            if all(is_member[i * num_indexes:(i + 1) * num_indexes])
+        ]
+
+
 @dataclass
 class RedisScheduler(SingletonLockScheduler):
     """Hold schedule entries in a Redis. 
@@ -128,6 +457,13 @@ class RedisScheduler(SingletonLockScheduler):
     It is safe to run multiple ``RedisScheduler`` s simultaneously, 
     as well as have many that are used as clients to read/write entries.
 
+    Entries are stored as JSON in a hash. 
+    Secondary index sets of entry keys by type, task and enabled state are 
+    maintained with every write so entries can be filtered without deserializing them.
+    A sorted set of the enabled entry keys by ``next_due_at`` is also maintained, for ``look_ahead_window``.
+    Entries saved before the indexes were added are indexed with ``rebuild_indexes``, 
+    which the scheduler runs when it takes the scheduler lock if the indexes were not built by this version.
+
     This scheduler does not implement the ``send`` method.
     This must be implemented before it can actually send tasks
     to the specified backend.
@@ -144,57 +480,124 @@ class RedisScheduler(SingletonLockScheduler):
         In general these entries are not held in non-volatile storage 
         so any metadata they hold will be lost if the scheduler fails.
         These entries are static.  The keys cannot be overwritten or deleted.
+    metrics_sink : beatdrop.metrics.MetricsSink, default : NoOpMetricsSink()
+        Sink for tick, scheduling lag, send and lock metrics.
+        See ``beatdrop.metrics`` for the metric names.
     lock_timeout : datetime.timedelta
         The time a scheduler does not refresh the scheduler lock before it is considered dead. 
         Should be at least 3 times the ``max_interval``.
     redis_py_kwargs : Dict[str, Any]
         redis-py's ``redis.Redis()`` key word arguments. Some of the client configuration items may be overwritten.
         https://redis-py.readthedocs.io/en/stable/connections.html#generic-client
+    read_redis_py_kwargs : Optional[Dict[str, Any]], default : None
+        redis-py's ``redis.Redis()`` key word arguments for a read replica.
+        Client reads with ``get``, ``list``, ``list_page``, ``count`` and ``stats`` go to the replica.
+        Scheduler ticks and all writes stay on the primary. 
+        See ``read_your_writes_window`` to read recent writes from the primary.
+        ``None`` reads from the primary.
     """
 
     redis_py_kwargs: Dict[str, Any] = Field()
+    read_redis_py_kwargs: Optional[Dict[str, Any]] = Field(default=None)
 
 
     def __post_init_post_parse__(self) -> None:
         super().__post_init_post_parse__()
         self.redis_py_kwargs['decode_responses'] = True
         self._zero_delta = timedelta(seconds=0)
-        self._scheduler_lock_key = "beatdrop_scheduler_lock"
-        self._entry_lock_prefix = "beatdrop_entry_lock:"
+        # the same lock keys as pottery, so older schedulers still exclude each other during an upgrade
+        self._scheduler_lock_key = "redlock:beatdrop_scheduler_lock"
+        self._entry_lock_prefix = "redlock:beatdrop_entry_lock:"
+        self._fencing_key = "beatdrop_scheduler_fencing_token"
         self._hash_key = "beatdrop_entries"
+        self._index_prefix = "beatdrop_entries_index:"
+        self._stats_key = "beatdrop_entries_stats"
+        self._expiry_key = "beatdrop_entries_expiry"
+        self._next_due_key = "beatdrop_entries_next_due"
+        self._index_version_key = "beatdrop_entries_index_version"
+        self._archive_key = "beatdrop_entries_archive"
+        self._standby_key = "beatdrop_scheduler_standby"
+        self._hand_off_key = "beatdrop_scheduler_hand_off"
+        self._lock_channel = "beatdrop_scheduler_lock_released"
+        self._entries_channel = "beatdrop_entries_changed"
+        self._entry_changes = None
+        self._entry_changes_lock = threading.Lock()
         self._redis_conn = Redis(
             **self.redis_py_kwargs
         )
-        self._redis_masters = {self._redis_conn}
-        self._scheduler_lock = pottery.Redlock(
-            key=self._scheduler_lock_key, 
-            masters=self._redis_masters, 
+        self._read_redis_conn = self._redis_conn
+        if self.read_redis_py_kwargs is not None:
+            self.read_redis_py_kwargs['decode_responses'] = True
+            self._read_redis_conn = Redis(
+                **self.read_redis_py_kwargs
+            )
+        self._scheduler_lock = RedisLock(
+            redis_conn=self._redis_conn,
+            key=self._scheduler_lock_key,
             auto_release_time=self.lock_timeout.total_seconds(),
-            num_extensions=3 # this can't be unlimited!
+            fencing_key=self._fencing_key
         )
 
 
+    @property
+    def fencing_token(self) -> Optional[int]:
+        """Fencing token of the last scheduler lock acquisition, or ``None`` if the lock was never acquired."""
+        return self._scheduler_lock.fencing_token
+
+
     def _acquire_lock(self) -> None:
         """Acquire the scheduler lock.
 
         Will wait indefinitely until the scheduler lock is acquired.
+        While waiting, the scheduler registers itself as the standby that the lock is handed off to,
+        and wakes up as soon as the lock is released or expires.
         This method should only be called by the scheduler ``run`` method.
         **Never by a client.**
         """
         self._logger.debug(messages.sched_lock_acquiring)
-        while True:
-            acquired = self._scheduler_lock.acquire(timeout=1)
-            if acquired:
-                self._logger.info(messages.sched_lock_acquired)
+        acquire_started_at = time.perf_counter()
+        lock_events = self._redis_conn.pubsub(ignore_subscribe_messages=True)
+        lock_events.subscribe(self._lock_channel)
+        try:
+            while True:
+                hand_off_to = self._redis_conn.get(self._hand_off_key)
+                if hand_off_to is None or hand_off_to == self._instance_id:
+                    if self._scheduler_lock.acquire(blocking=False):
+                        if hand_off_to is not None:
+                            self._redis_conn.delete(self._hand_off_key)
+
+                        self._logger.info(messages.sched_lock_acquired)
+                        self._runtime_stats.set_lock_held(True)
+                        self.metrics_sink.observe(
+                            metrics.LOCK_ACQUIRE_DURATION,
+                            time.perf_counter() - acquire_started_at
+                        )
 
-                return
+                        return
 
-            self._logger.debug(
-                messages.sched_lock_wait_template.format(
-                    self.max_interval.total_seconds()
+                    lock_expires_in = self._redis_conn.pttl(self._scheduler_lock.key)
+                else:
+                    # reserved for another standby, until it takes the lock or the hand off expires
+                    lock_expires_in = self._redis_conn.pttl(self._hand_off_key)
+
+                self._logger.debug(messages.sched_lock_unavailable)
+                self._redis_conn.set(
+                    self._standby_key,
+                    self._instance_id,
+                    px=int(self.lock_timeout.total_seconds() * 1000)
                 )
-            )
-            time.sleep(self.max_interval.total_seconds())
+                self._warm_up()
+                wait_time = self._standby_wait_time(
+                    lock_expires_in / 1000 if lock_expires_in > 0 else None
+                )
+                self._logger.debug(messages.sched_lock_wait_template, wait_time)
+                lock_events.get_message(timeout=wait_time)
+                # drain any other notifications so the next wait blocks
+                while lock_events.get_message() is not None:
+                    pass
+
+        finally:
+            lock_events.close()
  
 
     def run(self, max_iterations: int = None) -> None:
@@ -210,112 +613,344 @@ class RedisScheduler(SingletonLockScheduler):
         """
         try:
             self._logger.info(art.logo)
-            self._acquire_lock()
+            self._start_stats_server()
+            self._hold_lock()
             self._logger.info(messages.scheduler_starting)
             num_iterations = 0
             while True:
                 # pull all keys that are schedule entries
                 self._logger.debug(messages.scheduler_pulling_entries)
-                sleep_time = self._run_once()
+                sleep_time = self._tick()
+
+                self._sweep_expired()
                 num_iterations = self._update_run_iteration(
                     num_iterations=num_iterations, 
                     max_iterations=max_iterations
                 )
-                lock_refreshed = self._refresh_lock()
+                lock_refreshed = self._keep_lock()
                 if lock_refreshed:
-                    self._logger.debug(
-                        messages.scheduler_sleep_template.format(sleep_time.total_seconds())
-                    )
-                    time.sleep(sleep_time.total_seconds())
+                    self._sleep(sleep_time)
                 else:
-                    self._acquire_lock()
+                    self._hold_lock()
 
         except (exceptions.MaxRunIterations, KeyboardInterrupt):
             self._logger.debug(messages.scheduler_shutting_down)
         
         except Exception as error:
-            self._logger.critical("{}: {}".format(type(error).__name__, error))
+            self._logger.critical("{}: {}", type(error).__name__, error)
         
         finally:
             self._cleanup()
 
     def _cleanup(self):
+        self._stop_lock_heartbeat()
         self._logger.debug(messages.sched_lock_releasing)
-        try:
-            self._scheduler_lock.release()
-            self._logger.info(messages.sched_lock_released)
-        except pottery.exceptions.ReleaseUnlockedLock:
-            pass
+        if self._scheduler_lock.locked() > 0:
+            standby_id = self._redis_conn.get(self._standby_key)
+            if standby_id is not None and standby_id != self._instance_id:
+                # reserve the lock for the standby before releasing it
+                self._redis_conn.set(
+                    self._hand_off_key,
+                    standby_id,
+                    px=int(self.lock_timeout.total_seconds() * 1000)
+                )
+                self._logger.info(messages.sched_lock_handing_off_template, standby_id)
+
+            if self._scheduler_lock.release():
+                self._logger.info(messages.sched_lock_released)
 
+            self._redis_conn.publish(self._lock_channel, self._instance_id)
+
+        self._runtime_stats.set_lock_held(False)
+        self._stop_watchdog()
+        self._stop_stats_server()
+        self._stop_watching_entry_changes()
         self._logger.info(messages.scheduler_shut_down)
 
 
     def _run_once(self, sched_entries: Optional[List[ScheduleEntry]] = None) -> timedelta:
         """Run an iteration of the scheduler with given context.
 
+        Only enabled entries are visited. 
+        Their keys are read from the enabled index set, so disabled entries are never locked or deserialized.
+        With ``look_ahead_window``, only the entries due within the window are read, see ``_run_look_ahead_once``.
+
         Parameters
         ----------
-        sched_entry_keys : Optional[Dict[str, None]], optional
-            Scheduler entry keys, by default None
+        sched_entries : Optional[List[ScheduleEntry]], optional
+            Schedule entries to check, by default None for all enabled entries.
 
         Returns
         -------
         timedelta
             Sleep time until the scheduler should wake up and run again.
         """
+        if self._look_ahead_wheel is not None and sched_entries is None:
+            return self._run_look_ahead_once()
+
+        tick_started_at = time.perf_counter()
+        num_scanned = 0
+        num_due = 0
+        num_due_soon = 0
         sleep_time = self.max_interval
         if sched_entries is None:
-            sched_entries = self.list()
+            entry_keys = self._active_entry_keys()
+        else:
+            entry_keys = (entry.key for entry in sched_entries)
         
-        for entry in sched_entries:
-            if entry.key in self._default_sched_entry_lookup:
-                sched_entry = self._default_sched_entry_lookup[entry.key]
-                if sched_entry.enabled == True:
-                    due_in = sched_entry.due_in() 
+        for entry_key in entry_keys:
+            if self._lock_is_lost():
+                break
+
+            num_scanned += 1
+            if entry_key in self._default_sched_entry_lookup:
+                sched_entry = self._default_sched_entry_lookup[entry_key]
+                if sched_entry.enabled == True and not sched_entry.is_expired():
+                    due_in = self._due_in(sched_entry) 
+                    checked_at = time.perf_counter()
+                    if due_in <= self._due_soon:
+                        num_due_soon += 1
+
                     if due_in <= self._zero_delta:
+                        num_due += 1
                         sched_entry.sent()
-                        self.send(sched_entry)
+                        self._send_entry(sched_entry, due_in, checked_at)
                     elif due_in < sleep_time:
                         sleep_time = due_in
             else:
-                entry_lock = pottery.Redlock(
-                    key=self._entry_lock_prefix + entry.key,
-                    masters=self._redis_masters
-                )
-                with entry_lock:
-                    entry_json = self._redis_conn.hget(
-                        name=self._hash_key,
-                        key=entry.key
-                    )
+                with self._entry_lock(entry_key):
+                    with self._operation_stats.time(operation_stats.HGET):
+                        entry_json = self._redis_conn.hget(
+                            name=self._hash_key,
+                            key=entry_key
+                        )
+
                     if entry_json is None:
                         continue
 
-                    sched_entry = self._entry_type_registry.dejson_entry(entry_json)
-                    if sched_entry.enabled == False:
+                    sched_entry = self._decode_entry(entry_json)
+                    if sched_entry.enabled == False or sched_entry.is_expired():
+                        # expired entries are left for the sweep
                         continue
 
-                    due_in = sched_entry.due_in()
+                    due_in = self._due_in(sched_entry)
+                    checked_at = time.perf_counter()
+                    if due_in <= self._due_soon:
+                        num_due_soon += 1
+
                     entry_is_due = due_in <= self._zero_delta
                     if entry_is_due:
-                        self._logger.debug(messages.sched_entry_due_template.format(sched_entry))
-                        sched_entry.sent()
-                        self._redis_conn.hset(
-                            name=self._hash_key,
-                            key=entry.key,
-                            value=sched_entry.json()
-                        )
+                        num_due += 1
+                        self._logger.debug(messages.sched_entry_due_template, sched_entry, entry_key=entry_key)
+                        with tracing.start_span(tracing.CLAIM_SPAN, {"beatdrop.entry.key": entry_key}):
+                            old_meta = _sched_entry_meta(sched_entry)
+                            sched_entry.sent()
+                            self._apply_fired_entry_retention(sched_entry)
+                            self._store_entry(
+                                sched_entry=sched_entry,
+                                old_meta=old_meta
+                            )
 
                 # once the lock is free, actually send the entry
                 # Done here to avoid lock contention, if this takes a sizable amount of time or there are any errors.
                 if entry_is_due:
-                    self.send(sched_entry)
+                    self._send_entry(sched_entry, due_in, checked_at)
 
                 if due_in < sleep_time:
                     sleep_time = due_in
                     
+        self._record_tick(tick_started_at, num_scanned, num_due, num_due_soon)
+
         return sleep_time
 
     
+    def _active_entry_keys(self, page_size: int = 500) -> Iterator[str]:
+        """Keys of the enabled default entries and enabled entries in redis.
+
+        Parameters
+        ----------
+        page_size : int, optional
+            Redis suggested minimum page size, by default 500
+
+        Returns
+        -------
+        Iterator[str]
+            Enabled schedule entry keys.
+        """
+        for entry in self.default_sched_entries:
+            if entry.enabled:
+                yield entry.key
+
+        enabled_index_key = _index_key(self._index_prefix, "enabled", True)
+        cursor = None
+        while cursor != 0:
+            with self._operation_stats.time(operation_stats.SSCAN):
+                cursor, keys = self._redis_conn.sscan(
+                    name=enabled_index_key,
+                    cursor=cursor or 0,
+                    count=page_size
+                )
+
+            yield from keys
+
+
+    def _enabled_entry_jsons(self, page_size: int = 500) -> Iterator[str]:
+        """Serialized enabled entries in redis, for ``_warm_up``.
+
+        Parameters
+        ----------
+        page_size : int, optional
+            Redis suggested minimum page size, by default 500
+
+        Returns
+        -------
+        Iterator[str]
+            Schedule entry JSON.
+        """
+        enabled_index_key = _index_key(self._index_prefix, "enabled", True)
+        cursor = None
+        while cursor != 0:
+            with self._operation_stats.time(operation_stats.SSCAN):
+                cursor, keys = self._redis_conn.sscan(
+                    name=enabled_index_key,
+                    cursor=cursor or 0,
+                    count=page_size
+                )
+
+            if len(keys) == 0:
+                continue
+
+            with self._operation_stats.time(operation_stats.HMGET):
+                entry_jsons = self._redis_conn.hmget(self._hash_key, keys)
+
+            for entry_json in entry_jsons:
+                if entry_json is not None:
+                    yield entry_json
+
+
+    def _look_ahead_stored_entries(
+        self, 
+        until: float, 
+        page_size: int = 500
+    ) -> Iterator[Tuple[ScheduleEntry, str]]:
+        """Enabled entries in redis due before ``until``, and their JSON as their versions, for ``look_ahead_window``.
+
+        Entries are found with the next due sorted set, a page at a time.
+        Entries without a ``next_due_at`` will not be due again and are not in the set, like ``SQLScheduler``.
+        Entries moved between pages by a concurrent write are read by the next tick.
+
+        Parameters
+        ----------
+        until : float
+            UTC epoch seconds.
+        page_size : int, optional
+            Number of entries read at once, by default 500
+
+        Returns
+        -------
+        Iterator[Tuple[ScheduleEntry, str]]
+            Schedule entries and their stored JSON.
+        """
+        page_start = 0
+        while True:
+            with self._operation_stats.time(operation_stats.ZRANGEBYSCORE):
+                keys = self._redis_conn.zrangebyscore(
+                    self._next_due_key, 
+                    min="-inf", 
+                    max=until,
+                    start=page_start,
+                    num=page_size
+                )
+
+            if len(keys) > 0:
+                with self._operation_stats.time(operation_stats.HMGET):
+                    entry_jsons = self._redis_conn.hmget(self._hash_key, keys)
+
+                for entry_json in entry_jsons:
+                    if entry_json is not None:
+                        yield self._decode_entry(entry_json), entry_json
+
+            if len(keys) < page_size:
+                return
+
+            page_start += page_size
+
+
+    def _claim_look_ahead_entry(
+        self,
+        sched_entry: ScheduleEntry,
+        version: str
+    ) -> Optional[Tuple[ScheduleEntry, str]]:
+        """Mark a held entry as sent in redis, under its entry lock.
+
+        The stored JSON is only decoded again if it changed since the entry was read.
+
+        Parameters
+        ----------
+        sched_entry : ScheduleEntry
+            Held schedule entry that is due.
+        version : str
+            Stored JSON the entry was read from.
+
+        Returns
+        -------
+        Optional[Tuple[ScheduleEntry, str]]
+            The sent entry and its new stored JSON, or ``None`` if it should not be sent.
+        """
+        with self._entry_lock(sched_entry.key):
+            with self._operation_stats.time(operation_stats.HGET):
+                entry_json = self._redis_conn.hget(
+                    name=self._hash_key,
+                    key=sched_entry.key
+                )
+
+            if entry_json is None:
+                return None
+
+            if entry_json != version:
+                sched_entry = self._decode_entry(entry_json)
+                if sched_entry.enabled == False or sched_entry.is_expired():
+                    return None
+
+                if self._due_in(sched_entry) > self._zero_delta:
+                    self._hold_look_ahead_entry(sched_entry, entry_json)
+                    return None
+
+            self._logger.debug(messages.sched_entry_due_template, sched_entry, entry_key=sched_entry.key)
+            with tracing.start_span(tracing.CLAIM_SPAN, {"beatdrop.entry.key": sched_entry.key}):
+                old_meta = _sched_entry_meta(sched_entry)
+                sched_entry.sent()
+                self._apply_fired_entry_retention(sched_entry)
+                # keeps the next due sorted set current for entry types that do not update it when they are sent
+                sched_entry.next_due_at = sched_entry.compute_next_due_at()
+                entry_json = self._store_entry(
+                    sched_entry=sched_entry,
+                    old_meta=old_meta
+                )
+
+        return sched_entry, entry_json
+
+
+    @contextmanager
+    def _entry_lock(self, key: str) -> Iterator[None]:
+        """Hold the lock of a schedule entry, and time how long it takes to acquire.
+
+        Parameters
+        ----------
+        key : str
+            Schedule entry key.
+        """
+        entry_lock = RedisLock(
+            redis_conn=self._redis_conn,
+            key=self._entry_lock_prefix + key
+        )
+        with ExitStack() as stack:
+            with self._operation_stats.time(operation_stats.LOCK_ACQUIRE):
+                stack.enter_context(entry_lock)
+
+            yield
+
+
     def _refresh_lock(self) -> bool:
         """Refresh the scheduler lock.
 
@@ -328,19 +963,38 @@ class RedisScheduler(SingletonLockScheduler):
             ``True`` if the lock was successfully refreshed, or else ``False``.
         """
         self._logger.debug(messages.sched_lock_refreshing)
-        # Because pottery does not support unlimited extensions on the lock we set this to 0
-        # https://github.com/brainix/pottery/pull/693
-        self._scheduler_lock._extension_num = 0
+        refresh_started_at = time.perf_counter()
         try:
-            self._scheduler_lock.extend()
+            if not self._scheduler_lock.extend():
+                self._logger.error(messages.sched_lock_lost)
+                self._runtime_stats.set_lock_held(False)
+                self.metrics_sink.increment(metrics.LOCK_LOSSES)
+                return False
+
             self._logger.debug(messages.sched_lock_refreshed)
-        except pottery.exceptions.ExtendUnlockedLock:
-            self._logger.error(messages.sched_lock_lost)
-            return False
+        finally:
+            self.metrics_sink.observe(
+                metrics.LOCK_REFRESH_DURATION,
+                time.perf_counter() - refresh_started_at
+            )
 
         return True
 
 
+    def _client_redis_conn(self) -> Redis:
+        """Redis connection for client reads.
+
+        Returns
+        -------
+        Redis
+            The read replica's, unless there is none or this scheduler wrote within ``read_your_writes_window``.
+        """
+        if self._read_from_primary():
+            return self._redis_conn
+
+        return self._read_redis_conn
+
+
     def save(
         self, 
         sched_entry: ScheduleEntry,
@@ -357,54 +1011,494 @@ class RedisScheduler(SingletonLockScheduler):
             Clients should almost always leave this false, by default False
         """
         self._check_default_entry_overwrite(sched_entry=sched_entry)
-        entry_lock = pottery.Redlock(
-            key=self._entry_lock_prefix + sched_entry.key,
-            masters=self._redis_masters
-        )
-        with entry_lock:
-            entry_json = self._redis_conn.hget(
-                name=self._hash_key,
-                key=sched_entry.key
-            )
-            if entry_json is None:
-                self._redis_conn.hset(
-                    name=self._hash_key, 
-                    key=sched_entry.key,
-                    value=sched_entry.json()
+        with self._entry_lock(sched_entry.key):
+            with self._operation_stats.time(operation_stats.HGET):
+                entry_json = self._redis_conn.hget(
+                    name=self._hash_key,
+                    key=sched_entry.key
                 )
-            else:
+
+            old_meta = None
+            if entry_json is not None:
+                entry_dict = json.loads(entry_json)
                 if read_only_attributes == False:
-                    entry_dict = json.loads(entry_json)
                     for ro_field in sched_entry.client_read_only_fields:
-                        setattr(sched_entry, ro_field, entry_dict[ro_field])
+                        if ro_field in entry_dict:
+                            setattr(sched_entry, ro_field, entry_dict[ro_field])
 
-                self._redis_conn.hset(
-                    name=self._hash_key,
-                    key=sched_entry.key, 
-                    value=sched_entry.json()
-                )
+                old_meta = _entry_dict_meta(entry_dict)
+
+            sched_entry.next_due_at = sched_entry.compute_next_due_at()
+
+            self._store_entry(
+                sched_entry=sched_entry,
+                old_meta=old_meta
+            )
+
+        self._wrote(sched_entry.key)
+
+
+    def _store_entry(
+        self,
+        sched_entry: ScheduleEntry,
+        old_meta: Optional[Tuple[str, str, bool]]
+    ) -> str:
+        """Write an entry to the hash, and update its index sets and the entry counters in one transaction.
+
+        The caller must hold the entry lock.
+
+        Parameters
+        ----------
+        sched_entry : ScheduleEntry
+            Schedule entry to write.
+        old_meta : Optional[Tuple[str, str, bool]]
+            Type name, task and enabled state of the stored entry, or ``None`` if it is a new entry.
+
+        Returns
+        -------
+        str
+            The stored JSON.
+        """
+        new_meta = _sched_entry_meta(sched_entry)
+        new_index_keys = self._meta_index_keys(new_meta)
+        pipe = self._redis_conn.pipeline()
+        if old_meta is not None:
+            self._uncount_entry(pipe, sched_entry.key, old_meta)
+            for index_key in self._meta_index_keys(old_meta):
+                if index_key not in new_index_keys:
+                    pipe.srem(index_key, sched_entry.key)
+
+        for index_key in new_index_keys:
+            pipe.sadd(index_key, sched_entry.key)
+
+        pipe.hincrby(self._stats_key, _stats_field(new_meta), 1)
+        self._set_expiry(pipe, sched_entry)
+        self._set_next_due(pipe, sched_entry)
+        entry_json = sched_entry.json()
+        pipe.hset(
+            name=self._hash_key,
+            key=sched_entry.key, 
+            value=entry_json
+        )
+        pipe.publish(self._entries_channel, sched_entry.key)
+        with self._operation_stats.time(operation_stats.HSET):
+            pipe.execute()
+
+        return entry_json
+
+
+    def _meta_index_keys(self, meta: Tuple[str, str, bool]) -> List[str]:
+        return _entry_index_keys(self._index_prefix, *meta)
+
+
+    def _uncount_entry(self, pipe, key: str, old_meta: Tuple[str, str, bool]) -> None:
+        """Take a stored entry off the entry counters, if it was counted.
+
+        Must be added to the pipeline before the entry is removed from its old index sets.
+
+        Parameters
+        ----------
+        pipe : redis.client.Pipeline
+            Pipeline the commands are added to.
+        key : str
+            Key of the stored entry.
+        old_meta : Tuple[str, str, bool]
+            Type name, task and enabled state of the stored entry.
+        """
+        _uncount_entry_script(
+            keys=(_index_key(self._index_prefix, "enabled", old_meta[2]), self._stats_key),
+            args=(key, _stats_field(old_meta)),
+            client=pipe
+        )
+
+
+    def _set_expiry(self, pipe, sched_entry: ScheduleEntry) -> None:
+        """Add the entry to, or remove it from the expiry sorted set.
+
+        Parameters
+        ----------
+        pipe : redis.client.Pipeline
+            Pipeline the commands are added to.
+        sched_entry : ScheduleEntry
+            Schedule entry being written.
+        """
+        if sched_entry.expires_at is None:
+            pipe.zrem(self._expiry_key, sched_entry.key)
+        else:
+            pipe.zadd(
+                self._expiry_key,
+                {sched_entry.key: utc_timestamp(sched_entry.expires_at)}
+            )
+
+
+    def _set_next_due(self, pipe, sched_entry: ScheduleEntry) -> None:
+        """Add the entry to, or remove it from the next due sorted set.
+
+        Only enabled entries with a ``next_due_at`` are in the set.
+
+        Parameters
+        ----------
+        pipe : redis.client.Pipeline
+            Pipeline the commands are added to.
+        sched_entry : ScheduleEntry
+            Schedule entry being written.
+        """
+        if sched_entry.enabled and sched_entry.next_due_at is not None:
+            pipe.zadd(self._next_due_key, {sched_entry.key: sched_entry.next_due_at})
+        else:
+            pipe.zrem(self._next_due_key, sched_entry.key)
+
+
+    def _remove_entry(
+        self,
+        pipe,
+        key: str,
+        old_meta: Tuple[str, str, bool]
+    ) -> None:
+        """Remove a stored entry from the hash, its index sets, the entry counters and the expiry and next due sorted sets.
+
+        Parameters
+        ----------
+        pipe : redis.client.Pipeline
+            Pipeline the commands are added to.
+        key : str
+            Key of the stored entry.
+        old_meta : Tuple[str, str, bool]
+            Type name, task and enabled state of the stored entry.
+        """
+        pipe.hdel(self._hash_key, key)
+        self._uncount_entry(pipe, key, old_meta)
+        for index_key in self._meta_index_keys(old_meta):
+            pipe.srem(index_key, key)
+
+        pipe.zrem(self._expiry_key, key)
+        pipe.zrem(self._next_due_key, key)
+        pipe.publish(self._entries_channel, key)
+
+
+    def _sweep_expired(self) -> int:
+        """Purge or archive a batch of expired entries from redis.
+
+        Expired entries are found with the expiry sorted set.
+        Archived entries are written to the ``beatdrop_entries_archive`` hash.
+
+        Returns
+        -------
+        int
+            Number of entries removed.
+        """
+        utc_now = utc_now_naive()
+        expired_keys = self._redis_conn.zrangebyscore(
+            self._expiry_key,
+            min="-inf",
+            max=utc_timestamp(utc_now),
+            start=0,
+            num=self.expiry_sweep_batch_size
+        )
+        num_removed = 0
+        for key in expired_keys:
+            with self._entry_lock(key):
+                with self._operation_stats.time(operation_stats.HGET):
+                    entry_json = self._redis_conn.hget(
+                        name=self._hash_key,
+                        key=key
+                    )
+
+                if entry_json is None:
+                    self._redis_conn.zrem(self._expiry_key, key)
+                    continue
+
+                sched_entry = self._decode_entry(entry_json)
+                if not sched_entry.is_expired(utc_now):
+                    # the expiry was moved by a save since the sorted set was read
+                    continue
+
+                pipe = self._redis_conn.pipeline()
+                if self.expired_entry_action == "archive":
+                    pipe.hset(
+                        name=self._archive_key,
+                        key=key,
+                        value=entry_json
+                    )
+
+                self._remove_entry(pipe, key, _sched_entry_meta(sched_entry))
+                with self._operation_stats.time(operation_stats.HDEL):
+                    pipe.execute()
+                num_removed += 1
+
+        if num_removed > 0:
+            self._logger.info(messages.sched_entries_expired_template, num_removed)
+
+        return num_removed
+
+
+    def _upgrade_storage(self) -> None:
+        """Rebuild the indexes if they were not built by this version of beatdrop.
+
+        Entries saved by an earlier version are not in the index sets, so ticks would never see them.
+        Fresh deployments with no stored entries only record the index version.
+        """
+        index_version = self._redis_conn.get(self._index_version_key)
+        if index_version is not None and int(index_version) >= _INDEX_VERSION:
+            return
+
+        num_entries = self._redis_conn.hlen(self._hash_key)
+        if num_entries == 0:
+            self._redis_conn.set(self._index_version_key, _INDEX_VERSION)
+            return
+
+        self._logger.warning(messages.sched_entries_indexing_template, num_entries)
+        self.rebuild_indexes()
+        self._logger.info(messages.sched_entries_indexed)
+
+
+    def rebuild_indexes(self, page_size: int = 500) -> None:
+        """Add all stored schedule entries to their secondary index sets, recount the entry counters and rebuild the expiry and next due sorted sets.
 
+        Only needed for entries that were saved by a version of ``beatdrop`` without the indexes.
+        The scheduler runs it when it takes the scheduler lock, if the indexes were not built by this version.
+        Clients should not write entries while the indexes are rebuilt.
 
-    def list(self, page_size: int = 500) -> RedisScheduleEntryList:
+        Parameters
+        ----------
+        page_size : int, optional
+            Redis suggested minimum page size, by default 500
+        """
+        self._redis_conn.delete(self._stats_key, self._expiry_key, self._next_due_key)
+        cursor = None
+        while cursor != 0:
+            cursor, results = self._redis_conn.hscan(
+                name=self._hash_key,
+                cursor=cursor or 0,
+                count=page_size
+            )
+            pipe = self._redis_conn.pipeline(transaction=False)
+            for key, entry_json in results.items():
+                sched_entry = self._entry_type_registry.dejson_entry(entry_json)
+                meta = _sched_entry_meta(sched_entry)
+                for index_key in self._meta_index_keys(meta):
+                    pipe.sadd(index_key, key)
+
+                pipe.hincrby(self._stats_key, _stats_field(meta), 1)
+                self._set_expiry(pipe, sched_entry)
+                if sched_entry.next_due_at is None:
+                    # saved before ``next_due_at`` was added
+                    sched_entry.next_due_at = sched_entry.compute_next_due_at()
+
+                self._set_next_due(pipe, sched_entry)
+
+            pipe.execute()
+
+        self._redis_conn.set(self._index_version_key, _INDEX_VERSION)
+
+
+    def list(
+        self, 
+        page_size: int = 500,
+        *,
+        filter: Optional[ScheduleEntryFilter] = None
+    ) -> RedisScheduleEntryList:
         """List schedule entries.
 
         Parameters
         ----------
         page_size : int, optional
             Redis suggested minimum page size, by default 500
+        filter : Optional[ScheduleEntryFilter], optional
+            Only list entries that match this filter, by default None.
+            Key prefixes are matched with ``MATCH``, 
+            other fields are looked up in the secondary index sets.
 
         Returns
         -------
         RedisScheduleEntryList
             Iterator of all schedule entries.  Automatically paginated redis results.
+
+        Raises
+        ------
+        TypeError
+            A filter was passed as ``page_size``.
         """
+        if isinstance(page_size, ScheduleEntryFilter):
+            # would silently be used as the page size
+            raise TypeError("'filter' must be passed as a keyword argument.")
+
         return RedisScheduleEntryList(
             page_size=page_size,
             default_sched_entries=self.default_sched_entries,
-            redis_conn=self._redis_conn,
+            redis_conn=self._client_redis_conn(),
             hash_key=self._hash_key,
-            entry_type_registry=self._entry_type_registry
+            entry_type_registry=self._entry_type_registry,
+            filter=filter,
+            index_prefix=self._index_prefix,
+            operation_stats=self._operation_stats
+        )
+
+
+    def list_page(
+        self,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        *,
+        filter: Optional[ScheduleEntryFilter] = None
+    ) -> EntryPage:
+        """List a page of schedule entries.
+
+        The continuation token holds the redis scan cursor, 
+        so each page is a single scan call no matter how deep it is.
+
+        **NOTE** - redis treats ``limit`` as a hint. 
+        Pages from redis may have more or less entries than ``limit``.
+
+        Parameters
+        ----------
+        cursor : Optional[str], optional
+            Continuation token from the previous page, by default None for the first page.
+        limit : int, optional
+            Suggested number of entries in the page, by default 100
+        filter : Optional[ScheduleEntryFilter], optional
+            Only list entries that match this filter, by default None.
+            Use the same filter for every page.
+
+        Returns
+        -------
+        EntryPage
+            The schedule entries in the page, and the continuation token for the next page.
+
+        Raises
+        ------
+        ValueError
+            ``limit`` is less than 1.
+        beatdrop.exceptions.InvalidPageCursor
+            The cursor is malformed.
+        """
+        self._check_page_limit(limit)
+        page_entries, next_cursor, state = self._page_default_entries(
+            cursor=cursor,
+            limit=limit,
+            filter=filter
         )
+        if state is None:
+            return EntryPage(entries=page_entries, cursor=next_cursor)
+
+        scan_cursor = state.get("r", 0)
+        if not isinstance(scan_cursor, int):
+            raise exceptions.InvalidPageCursor("Invalid page cursor '{}'.".format(cursor))
+
+        redis_limit = limit - len(page_entries)
+        if redis_limit < 1:
+            return EntryPage(
+                entries=page_entries,
+                cursor=encode_page_cursor({"r": scan_cursor})
+            )
+
+        entry_list = self.list(page_size=redis_limit, filter=filter)
+        scanned_index = state.get("i")
+        # Keep scanning past empty redis pages so a page is only empty at the end of the results.
+        while True:
+            try:
+                scan_cursor, scanned_index, results = entry_list.scan_page(
+                    cursor=scan_cursor,
+                    index_key=scanned_index
+                )
+            except ValueError:
+                raise exceptions.InvalidPageCursor("Invalid page cursor '{}'.".format(cursor))
+
+            for entry_json in results:
+                page_entries.append(self._decode_entry(entry_json))
+
+            if scan_cursor == 0 or len(results) > 0:
+                break
+
+        if scan_cursor == 0:
+            return EntryPage(entries=page_entries, cursor=None)
+
+        next_state = {"r": scan_cursor}
+        if scanned_index is not None:
+            next_state['i'] = scanned_index
+
+        return EntryPage(entries=page_entries, cursor=encode_page_cursor(next_state))
+
+
+    def count(self, *, filter: Optional[ScheduleEntryFilter] = None) -> int:
+        """Count schedule entries.
+
+        Entries are not deserialized. 
+        Unfiltered counts use ``HLEN``, and filters on type and enabled state use the entry counters.
+        Filters on task only use ``SCARD`` of the task's index set. 
+        Other filters scan the matching entry keys.
+
+        Parameters
+        ----------
+        filter : Optional[ScheduleEntryFilter], optional
+            Only count entries that match this filter, by default None
+
+        Returns
+        -------
+        int
+            Number of schedule entries, including default entries.
+        """
+        default_count = self._count_default_entries(filter=filter)
+        redis_conn = self._client_redis_conn()
+        if filter is None or filter == ScheduleEntryFilter():
+            return default_count + redis_conn.hlen(self._hash_key)
+
+        if filter.key_prefix is None and filter.task is None:
+            return default_count + sum(
+                count for entry_type, enabled, count in self._stored_entry_counts(redis_conn)
+                if filter.entry_type in (None, entry_type) and filter.enabled in (None, enabled)
+            )
+
+        if filter.key_prefix is None and filter.entry_type is None and filter.enabled is None:
+            return default_count + redis_conn.scard(
+                _index_key(self._index_prefix, "task", filter.task)
+            )
+
+        entry_list = self.list(filter=filter)
+        cursor = None
+        index_key = None
+        redis_count = 0
+        while cursor != 0:
+            cursor, index_key, results = entry_list.scan_page(cursor=cursor or 0, index_key=index_key)
+            redis_count += len(results)
+
+        return default_count + redis_count
+
+
+    def stats(self) -> EntryStats:
+        """Count schedule entries by type and enabled state.
+
+        Read from the entry counters that are maintained with every write, entries are not deserialized.
+
+        Returns
+        -------
+        EntryStats
+            Counts of schedule entries, including default entries.
+        """
+        return EntryStats.from_counts(
+            self._default_entry_counts() + self._stored_entry_counts(self._client_redis_conn())
+        )
+
+
+    def _stored_entry_counts(self, redis_conn: Redis) -> List[Tuple[str, bool, int]]:
+        """Read the entry counters.
+
+        Parameters
+        ----------
+        redis_conn : Redis
+            Redis connection to read from.
+
+        Returns
+        -------
+        List[Tuple[str, bool, int]]
+            Schedule entry type name, enabled state, and the number of entries in redis.
+        """
+        counts = []
+        for field, count in redis_conn.hgetall(self._stats_key).items():
+            entry_type, enabled = field.rsplit(":", 1)
+            counts.append((entry_type, enabled == "1", int(count)))
+
+        return counts
 
 
     def get(self, key: str) -> ScheduleEntry:
@@ -428,14 +1522,75 @@ class RedisScheduler(SingletonLockScheduler):
         if key in self._default_sched_entry_lookup:
             return self._default_sched_entry_lookup[key]
         
-        entry_json = self._redis_conn.hget(
-            name=self._hash_key,
-            key=key,
-        )
+        cache_generation = None
+        if self._entry_cache is not None:
+            self._watch_entry_changes()
+            cached = self._entry_cache.get(key)
+            if cached is not None:
+                return cached[1]
+
+            cache_generation = self._entry_cache.generation
+
+        with self._operation_stats.time(operation_stats.HGET):
+            entry_json = self._client_redis_conn().hget(
+                name=self._hash_key,
+                key=key,
+            )
+
         if entry_json is None:
             raise exceptions.ScheduleEntryNotFound(messages.sched_entry_not_found_template.format(key))
             
-        return self._entry_type_registry.dejson_entry(entry_json)
+        sched_entry = self._decode_entry(entry_json)
+        if self._entry_cache is not None:
+            self._entry_cache.put(sched_entry, generation=cache_generation)
+
+        return sched_entry
+
+
+    def _watch_entry_changes(self) -> None:
+        """Subscribe to entry change notifications to evict changed entries from the entry cache.
+
+        Every write publishes the entry key on the ``beatdrop_entries_changed`` channel.
+        Notifications are handled in a background thread, started on the first call.
+        Notifications can be missed while the subscription reconnects, so the whole cache is cleared on errors.
+        """
+        if self._entry_changes is not None:
+            return
+
+        with self._entry_changes_lock:
+            if self._entry_changes is not None:
+                return
+
+            entry_changes = self._redis_conn.pubsub(ignore_subscribe_messages=True)
+            entry_changes.subscribe(**{
+                self._entries_channel: lambda message: self._entry_cache.invalidate(message['data'])
+            })
+            # handle the subscribe confirmation before any entry is cached
+            entry_changes.get_message(timeout=1)
+            self._entry_changes = entry_changes.run_in_thread(
+                sleep_time=1,
+                daemon=True,
+                exception_handler=self._entry_changes_failed
+            )
+
+
+    def _stop_watching_entry_changes(self) -> None:
+        """Stop the entry change notification thread if it is running, and clear the entry cache.
+        """
+        with self._entry_changes_lock:
+            if self._entry_changes is None:
+                return
+
+            self._entry_changes.stop()
+            self._entry_changes.join()
+            self._entry_changes = None
+            self._entry_cache.clear()
+
+
+    def _entry_changes_failed(self, error: Exception, pubsub, thread) -> None:
+        self._logger.error(messages.entry_cache_invalidation_failed_template, type(error).__name__, error)
+        self._entry_cache.clear()
+        time.sleep(1)
 
 
     def delete(self, sched_entry: ScheduleEntry) -> None:
@@ -449,7 +1604,20 @@ class RedisScheduler(SingletonLockScheduler):
             Scheduler entry to delete from the scheduler.
 
         """
-        self._redis_conn.hdel(
-            self._hash_key,
-            sched_entry.key
-        )
\ No newline at end of file
+        with self._entry_lock(sched_entry.key):
+            with self._operation_stats.time(operation_stats.HGET):
+                entry_json = self._redis_conn.hget(
+                    name=self._hash_key,
+                    key=sched_entry.key
+                )
+
+            if entry_json is None:
+                return
+
+            old_meta = _entry_dict_meta(json.loads(entry_json))
+            pipe = self._redis_conn.pipeline()
+            self._remove_entry(pipe, sched_entry.key, old_meta)
+            with self._operation_stats.time(operation_stats.HDEL):
+                pipe.execute()
+
+        self._wrote(sched_entry.key)
\ No newline at end of file
@@ -5,8 +5,8 @@ import rq
 from pydantic import Field
 from pydantic.dataclasses import dataclass
 
-from beatdrop import messages
-from beatdrop.schedulers.scheduler import Scheduler
+from beatdrop import messages, tracing
+from beatdrop.schedulers.scheduler import FENCING_TOKEN_KEY, Scheduler
 from beatdrop.entries.schedule_entry import ScheduleEntry
 
 
@@ -40,6 +40,9 @@ class RQScheduler(Scheduler):
         In general these entries are not held in non-volatile storage 
         so any metadata they hold will be lost if the scheduler fails.
         These entries are static.  The keys cannot be overwritten or deleted.
+    metrics_sink : beatdrop.metrics.MetricsSink, default : NoOpMetricsSink()
+        Sink for tick, scheduling lag, send and lock metrics.
+        See ``beatdrop.metrics`` for the metric names.
     rq_queue : rq.Queue
         RQ Queue to send tasks to.
     """
@@ -50,13 +53,16 @@ class RQScheduler(Scheduler):
     def send(self, sched_entry: ScheduleEntry) -> None:
         """Send a schedule entry to the RQ queue.
 
+        The current trace context is sent in the job meta, see ``beatdrop.tracing``.
+        The scheduler's ``fencing_token``, if it has one, is sent in the ``beatdrop_fencing_token`` job meta key.
+
         Parameters
         ----------
         sched_entry : ScheduleEntry
             Schedule entry to send to the RQ queue.
         """
         try:
-            self._logger.debug(messages.sched_entry_sending_template.format(sched_entry))
+            self._logger.debug(messages.sched_entry_sending_template, sched_entry, entry_key=sched_entry.key)
             task_args = sched_entry.args
             task_kwargs = sched_entry.kwargs
             if task_args is None:
@@ -65,13 +71,26 @@ class RQScheduler(Scheduler):
             if task_kwargs is None:
                 task_kwargs = {}
             
-            self.rq_queue.enqueue(sched_entry.task, args=task_args, kwargs=task_kwargs)
-            self._logger.info(messages.sched_entry_sent_template.format(sched_entry))
+            meta = {}
+            trace_context = tracing.inject_context()
+            if len(trace_context) > 0:
+                meta[tracing.RQ_META_KEY] = trace_context
+
+            fencing_token = self.fencing_token
+            if fencing_token is not None:
+                meta[FENCING_TOKEN_KEY] = fencing_token
+
+            if len(meta) == 0:
+                meta = None
+
+            self.rq_queue.enqueue(sched_entry.task, args=task_args, kwargs=task_kwargs, meta=meta)
+            self._logger.info(messages.sched_entry_sent_template, sched_entry, entry_key=sched_entry.key)
         except Exception as error:
+            self._record_send_failure(sched_entry, "{}: {}".format(type(error).__name__, error))
             self._logger.error(
-                "Failed to send entry: {}. {}: {}".format(
-                    sched_entry,
-                    type(error).__name__, 
-                    error
-                )
+                "Failed to send entry: {}. {}: {}",
+                sched_entry,
+                type(error).__name__, 
+                error,
+                entry_key=sched_entry.key
             )
@@ -1,18 +1,36 @@
 
 import datetime
+import os
+import signal
+import tempfile
+import time
 from typing import Iterator, List, Optional, Tuple, Type, Union
 
 from pydantic.dataclasses import dataclass
-from pydantic import Field, validator
+from pydantic import Field, root_validator, validator
 
 from beatdrop.logger import logger
+from beatdrop.entry_filter import ScheduleEntryFilter
+from beatdrop.entry_stats import EntryStats
 from beatdrop.entry_type_registry import EntryTypeRegistry
+from beatdrop.helpers import utc_now_naive
 from beatdrop.exceptions import \
+    InvalidPageCursor, \
     MaxRunIterations, \
     MethodNotImplementedError, \
     OverwriteDefaultEntryError
 from beatdrop.entries.schedule_entry import ScheduleEntry
-from beatdrop import entries, messages
+from beatdrop.metrics import MetricsSink, NoOpMetricsSink
+from beatdrop.operation_stats import OperationStats
+from beatdrop.pagination import decode_page_cursor, encode_page_cursor, EntryPage
+from beatdrop.profiling import SlowTickWatchdog, TickProfiler
+from beatdrop.runtime_stats import RuntimeStats
+from beatdrop import entries, messages, metrics, operation_stats, tracing
+
+# Celery header and RQ job meta key of the scheduler lock fencing token
+FENCING_TOKEN_KEY = "beatdrop_fencing_token"
+# seconds before a high resolution deadline to stop sleeping and yield instead, sleeps overshoot by about this much
+HIGH_RESOLUTION_SPIN_TIME = 0.001
 
 
 @dataclass(kw_only=True)
@@ -27,6 +45,9 @@ class Scheduler:
     All schedulers *should* implement these methods :
 
     - ``list`` - List schedule entries.
+    - ``list_page`` - List a page of schedule entries.
+    - ``count`` - Count schedule entries.
+    - ``stats`` - Count schedule entries by type and enabled state.
     - ``get`` - Get a schedule entry.
     - ``save`` - Save a new or update an existing schedule entry.
     - ``delete`` - Delete a schedule entry.
@@ -45,6 +66,27 @@ class Scheduler:
         In general these entries are not held in non-volatile storage 
         so any metadata they hold will be lost if the scheduler fails.
         These entries are static.  The keys cannot be overwritten or deleted.
+    metrics_sink : beatdrop.metrics.MetricsSink, default : NoOpMetricsSink()
+        Sink for tick, scheduling lag, send and lock metrics.
+        See ``beatdrop.metrics`` for the metric names.
+    stats_server_port : Optional[int], default : None
+        Serve the scheduler's ``runtime_stats`` as JSON on ``http://<stats_server_host>:<port>/stats`` while it runs.
+        ``0`` picks any free port.
+        ``None`` does not start the stats server.
+    stats_server_host : str, default : "127.0.0.1"
+        Address the stats server listens on.
+    decode_memo_size : Optional[int], default : None
+        Keep up to this many decoded entries by a digest of their JSON, 
+        so decoding unchanged entries again is a copy, see ``beatdrop.entry_type_registry.EntryTypeRegistry``.
+        ``None`` decodes every entry.
+    high_resolution : bool, default : False
+        Schedule entries due more often than every second, 
+        like ``IntervalEntry`` s with periods under a second and cron expressions with a seconds field.
+        Allows a ``max_interval`` under one second, 
+        and sleeps until a deadline on the monotonic clock, yielding instead of sleeping for the last millisecond,
+        so the scheduler wakes up within about a millisecond of when an entry is due.
+        Storage backed schedulers read storage and refresh their lock every tick, 
+        so a short ``max_interval`` adds storage load, see ``look_ahead_window``.
     """
 
     max_interval: datetime.timedelta
@@ -57,12 +99,286 @@ class Scheduler:
         )
     )
     default_sched_entries: Optional[List[ScheduleEntry]] = Field(default=[])
+    metrics_sink: MetricsSink = Field(default_factory=NoOpMetricsSink)
+    stats_server_port: Optional[int] = Field(default=None)
+    stats_server_host: str = Field(default="127.0.0.1")
+    decode_memo_size: Optional[int] = Field(default=None)
+    high_resolution: bool = Field(default=False)
 
 
     def __post_init_post_parse__(self):
        self._logger = logger
-       self._entry_type_registry = EntryTypeRegistry(sched_entry_types=self.sched_entry_types)
+       self._entry_type_registry = EntryTypeRegistry(
+           sched_entry_types=self.sched_entry_types,
+           memo_size=self.decode_memo_size
+       )
        self._default_sched_entry_lookup = {entry.key: entry for entry in self.default_sched_entries}
+       self._operation_stats = OperationStats()
+       self._profiler = TickProfiler()
+       self._watchdog: Optional[SlowTickWatchdog] = None
+       self._runtime_stats = RuntimeStats()
+       self._stats_server = None
+       self._due_soon = datetime.timedelta(minutes=1)
+
+
+    @property
+    def operation_stats(self) -> OperationStats:
+        """Latency histograms of this scheduler's storage operations.
+
+        Use ``operation_stats.dump()`` to get a snapshot.
+        """
+        return self._operation_stats
+
+
+    @property
+    def runtime_stats(self) -> RuntimeStats:
+        """Live state of the running scheduler, served by the stats server.
+
+        Use ``runtime_stats.snapshot()`` to get a copy.
+        """
+        return self._runtime_stats
+
+
+    @property
+    def stats_server_address(self) -> Optional[Tuple[str, int]]:
+        """Host and port of the running stats server, or ``None`` if it is not running."""
+        if self._stats_server is None:
+            return None
+
+        return self._stats_server.address
+
+
+    @property
+    def fencing_token(self) -> Optional[int]:
+        """Fencing token of the scheduler lock, or ``None`` if the scheduler has none.
+
+        The token increases with each lock acquisition, so a consumer that remembers the highest token it has seen
+        can reject tasks sent by a scheduler that has since lost the lock.
+        """
+        return None
+
+
+    def _start_stats_server(self) -> None:
+        """Start the stats server if ``stats_server_port`` is set.
+        """
+        if self.stats_server_port is None or self._stats_server is not None:
+            return
+
+        # imported here so clients that never run the scheduler do not import http.server
+        from beatdrop.stats_server import StatsServer
+
+        self._stats_server = StatsServer(
+            runtime_stats=self._runtime_stats,
+            host=self.stats_server_host,
+            port=self.stats_server_port
+        )
+        self._stats_server.start()
+
+
+    def _stop_stats_server(self) -> None:
+        """Stop the stats server if it is running.
+        """
+        if self._stats_server is not None:
+            self._stats_server.stop()
+            self._stats_server = None
+
+
+    def _sleep(self, sleep_time: datetime.timedelta) -> None:
+        """Sleep until the next tick, and report the next wake up time.
+
+        Parameters
+        ----------
+        sleep_time : datetime.timedelta
+            Time to sleep.
+        """
+        self._runtime_stats.sleeping(sleep_time)
+        self._logger.debug(messages.scheduler_sleep_template, sleep_time.total_seconds())
+        self._sleep_until(time.monotonic() + sleep_time.total_seconds())
+
+
+    def _sleep_until(self, deadline: float) -> None:
+        """Sleep until a deadline.
+
+        With ``high_resolution``, sleeps again if it wakes up early,
+        and yields instead of sleeping for the last ``HIGH_RESOLUTION_SPIN_TIME`` seconds.
+
+        Parameters
+        ----------
+        deadline : float
+            ``time.monotonic()`` to wake up at.
+        """
+        remaining = deadline - time.monotonic()
+        if not self.high_resolution:
+            time.sleep(max(remaining, 0))
+            return
+
+        while remaining > 0:
+            time.sleep(max(remaining - HIGH_RESOLUTION_SPIN_TIME, 0))
+            remaining = deadline - time.monotonic()
+
+
+    def profile_ticks(
+        self,
+        num_ticks: int = 10,
+        path: Optional[str] = None,
+        mode: str = "cprofile"
+    ) -> str:
+        """Capture a profile of the next scheduler ticks and write it to a file.
+
+        Can be called from another thread while the scheduler is running.
+        The capture starts at the next tick, and only covers the time spent in ticks, not sleeping.
+
+        Parameters
+        ----------
+        num_ticks : int, optional
+            Number of ticks to capture, by default 10
+        path : Optional[str], optional
+            File to write the capture to, by default None for a timestamped file in the temp directory.
+        mode : str, optional
+            ``"cprofile"`` for a ``pstats`` file of where the time went, 
+            or ``"tracemalloc"`` for a ``tracemalloc.Snapshot`` file of memory allocations, 
+            by default "cprofile"
+
+        Returns
+        -------
+        str
+            File the capture will be written to.
+
+        Raises
+        ------
+        ValueError
+            Invalid ``num_ticks`` or ``mode``.
+        """
+        if path is None:
+            path = self._default_profile_path(mode)
+
+        self._profiler.request(num_ticks=num_ticks, path=path, mode=mode)
+
+        return path
+
+
+    def _default_profile_path(self, mode: str) -> str:
+        return os.path.join(
+            tempfile.gettempdir(),
+            "beatdrop-{}-{}-{}.{}".format(
+                os.getpid(),
+                mode,
+                utc_now_naive().strftime("%Y%m%dT%H%M%S"),
+                "pstats" if mode == "cprofile" else "tracemalloc"
+            )
+        )
+
+
+    def install_profile_signal(
+        self,
+        signum: int = signal.SIGUSR1,
+        num_ticks: int = 10,
+        mode: str = "cprofile"
+    ) -> None:
+        """Capture a profile of the next ticks, like ``profile_ticks``, whenever the process gets a signal.
+
+        Must be called from the main thread.
+
+        Parameters
+        ----------
+        signum : int, optional
+            Signal number, by default ``signal.SIGUSR1``
+        num_ticks : int, optional
+            Number of ticks to capture, by default 10
+        mode : str, optional
+            ``"cprofile"`` or ``"tracemalloc"``, by default "cprofile"
+
+        Example
+        -------
+        .. code-block:: python
+
+            sched.install_profile_signal()
+            sched.run()
+
+        Then run ``kill -USR1 <pid>`` and look for the file path in the logs.
+        """
+        def handle_signal(signum, frame):
+            # loguru can't log from a signal handler, the capture is logged when it starts
+            self._profiler.request(num_ticks=num_ticks, path=self._default_profile_path(mode), mode=mode)
+
+        signal.signal(signum, handle_signal)
+
+
+    def _tick(self) -> datetime.timedelta:
+        """Run an iteration of the scheduler in a ``beatdrop.tick`` span, 
+        under any requested profile and the slow tick watchdog.
+
+        Returns
+        -------
+        datetime.timedelta
+            Sleep time until the scheduler should wake up and run again.
+        """
+        self._profiler.tick_started()
+        if self._watchdog is not None:
+            self._watchdog.tick_started()
+
+        try:
+            with tracing.start_span(tracing.TICK_SPAN):
+                return self._run_once()
+        finally:
+            if self._watchdog is not None:
+                self._watchdog.tick_finished()
+
+            self._profiler.tick_finished()
+
+
+    def _run_once(self) -> datetime.timedelta:
+        """Run an iteration of the scheduler.
+
+        Returns
+        -------
+        datetime.timedelta
+            Sleep time until the scheduler should wake up and run again.
+
+        Raises
+        ------
+        beatdrop.exceptions.MethodNotImplementedError
+            Must implement ``_run_once`` method.
+        """
+        raise MethodNotImplementedError("Must implement the '_run_once' method for a scheduler.")
+
+
+    def _decode_entry(self, sched_entry_json: str) -> ScheduleEntry:
+        """Deserialize a stored schedule entry and time it as a ``decode`` operation.
+
+        Parameters
+        ----------
+        sched_entry_json : str
+            Schedule entry JSON.
+
+        Returns
+        -------
+        ScheduleEntry
+            Deserialized schedule entry.
+        """
+        with self._operation_stats.time(operation_stats.DECODE):
+            return self._entry_type_registry.dejson_entry(sched_entry_json)
+
+
+    def _due_in(self, sched_entry: ScheduleEntry) -> datetime.timedelta:
+        """Time until an entry is due.
+
+        Read from ``next_due_at`` if the entry type keeps it up to date, or else computed with ``due_in``.
+
+        Parameters
+        ----------
+        sched_entry : ScheduleEntry
+            Schedule entry.
+
+        Returns
+        -------
+        datetime.timedelta
+            Time left until the entry should be sent.
+        """
+        if sched_entry.next_due_at is not None and sched_entry.computes_next_due_at():
+            return datetime.timedelta(seconds=sched_entry.next_due_at - time.time())
+
+        return sched_entry.due_in()
 
 
     def run(self, max_iterations: int = None) -> None:
@@ -106,9 +422,120 @@ class Scheduler:
         raise MethodNotImplementedError("Must implement the 'send' method for a scheduler.")
 
 
-    def list(self) -> Iterator[ScheduleEntry]:
+    def _send_entry(
+        self,
+        sched_entry: ScheduleEntry,
+        due_in: datetime.timedelta,
+        checked_at: float
+    ) -> None:
+        """Send a due schedule entry in a ``beatdrop.send`` span, and record the scheduling lag and send latency.
+
+        Parameters
+        ----------
+        sched_entry : ScheduleEntry
+            Due schedule entry to send.
+        due_in : datetime.timedelta
+            ``due_in`` of the entry when it was checked.
+        checked_at : float
+            ``time.perf_counter()`` when ``due_in`` was computed.
+        """
+        labels = {"task": sched_entry.task}
+        self._runtime_stats.send_started()
+        send_started_at = time.perf_counter()
+        self.metrics_sink.observe(
+            metrics.SCHEDULING_LAG,
+            send_started_at - checked_at - due_in.total_seconds(),
+            labels
+        )
+        try:
+            with tracing.start_span(
+                tracing.SEND_SPAN,
+                {
+                    "beatdrop.entry.key": sched_entry.key,
+                    "beatdrop.entry.task": sched_entry.task
+                }
+            ):
+                self.send(sched_entry)
+        except Exception as error:
+            self._record_send_failure(sched_entry, "{}: {}".format(type(error).__name__, error))
+            raise
+        finally:
+            self._runtime_stats.send_finished()
+            self.metrics_sink.observe(
+                metrics.SEND_LATENCY,
+                time.perf_counter() - send_started_at,
+                labels
+            )
+
+
+    def _record_send_failure(self, sched_entry: ScheduleEntry, error: str = "") -> None:
+        """Count a schedule entry that could not be sent, and add it to the recent send failures.
+
+        Parameters
+        ----------
+        sched_entry : ScheduleEntry
+            Schedule entry that failed to send.
+        error : str, optional
+            Why the entry could not be sent, by default ""
+        """
+        self.metrics_sink.increment(
+            metrics.SEND_FAILURES,
+            labels={"task": sched_entry.task}
+        )
+        self._runtime_stats.send_failed(sched_entry.key, sched_entry.task, error)
+
+
+    def _record_tick(
+        self,
+        started_at: float,
+        num_scanned: int,
+        num_due: int,
+        num_due_soon: Optional[int] = None
+    ) -> None:
+        """Record the duration and entry counts of a scheduler tick.
+
+        The counts are also set on the current ``beatdrop.tick`` span, 
+        and logged as a debug summary line with the counts in the log record's extra fields.
+
+        Parameters
+        ----------
+        started_at : float
+            ``time.perf_counter()`` when the tick started.
+        num_scanned : int
+            Number of entries checked in the tick.
+        num_due : int
+            Number of due entries in the tick.
+        num_due_soon : Optional[int], optional
+            Number of entries due within a minute, by default None if they were not counted.
+        """
+        tick_duration = time.perf_counter() - started_at
+        self._runtime_stats.tick_finished(tick_duration, num_due_soon)
+        self.metrics_sink.observe(metrics.TICK_DURATION, tick_duration)
+        self.metrics_sink.increment(metrics.TICK_ENTRIES_SCANNED, num_scanned)
+        self.metrics_sink.increment(metrics.TICK_ENTRIES_DUE, num_due)
+        tracing.set_span_attributes({
+            "beatdrop.entries.scanned": num_scanned,
+            "beatdrop.entries.due": num_due
+        })
+        self._logger.debug(
+            messages.scheduler_tick_template,
+            num_scanned,
+            tick_duration,
+            num_due,
+            tick_entries_scanned=num_scanned,
+            tick_entries_due=num_due,
+            tick_duration=tick_duration
+        )
+
+
+    def list(self, *, filter: Optional[ScheduleEntryFilter] = None) -> Iterator[ScheduleEntry]:
         """List schedule entries.
 
+        Parameters
+        ----------
+        filter : Optional[ScheduleEntryFilter], optional
+            Only list entries that match this filter, by default None
+
         Returns
         -------
         Iterator[ScheduleEntry]
@@ -122,6 +549,75 @@ class Scheduler:
         raise MethodNotImplementedError("This scheduler does not support retrieving entries or has not implemented it.")
 
 
+    def list_page(
+        self,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        *,
+        filter: Optional[ScheduleEntryFilter] = None
+    ) -> EntryPage:
+        """List a page of schedule entries.
+
+        Default entries are listed first, followed by entries in storage. 
+        Pages are resumed from an opaque continuation token, 
+        so a page can be served without listing the pages before it.
+
+        Parameters
+        ----------
+        cursor : Optional[str], optional
+            Continuation token from the previous page, by default None for the first page.
+        limit : int, optional
+            Maximum number of entries in the page, by default 100
+        filter : Optional[ScheduleEntryFilter], optional
+            Only list entries that match this filter, by default None.
+            Use the same filter for every page.
+
+        Returns
+        -------
+        EntryPage
+            The schedule entries in the page, and the continuation token for the next page.
+
+        Raises
+        ------
+        beatdrop.exceptions.MethodNotImplementedError
+            ``list_page`` method not implemented.
+        """
+        raise MethodNotImplementedError("This scheduler does not support paging entries or has not implemented it.")
+
+
+    def count(self, *, filter: Optional[ScheduleEntryFilter] = None) -> int:
+        """Count schedule entries.
+
+        The base implementation counts the entries from ``list``. 
+        Storage backed schedulers override it to count in storage without deserializing entries.
+
+        Parameters
+        ----------
+        filter : Optional[ScheduleEntryFilter], optional
+            Only count entries that match this filter, by default None
+
+        Returns
+        -------
+        int
+            Number of schedule entries, including default entries.
+        """
+        return sum(1 for _ in self.list(filter=filter))
+
+
+    def stats(self) -> EntryStats:
+        """Count schedule entries by type and enabled state.
+
+        The base implementation counts the entries from ``list``. 
+        Storage backed schedulers override it to count in storage without deserializing entries.
+
+        Returns
+        -------
+        EntryStats
+            Counts of schedule entries, including default entries.
+        """
+        return EntryStats.from_entries(self.list())
+
+
     def get(self, key: str) -> ScheduleEntry:
         """Retrieve a schedule entry by its key.
 
@@ -219,6 +715,75 @@ class Scheduler:
         return num_iterations
 
 
+    def _page_default_entries(
+        self,
+        cursor: Optional[str],
+        limit: int,
+        filter: Optional[ScheduleEntryFilter]
+    ) -> Tuple[List[ScheduleEntry], Optional[str], Optional[dict]]:
+        """Helper for ``list_page`` to page through the default entries before storage.
+
+        Parameters
+        ----------
+        cursor : Optional[str]
+            Continuation token from the previous page.
+        limit : int
+            Maximum number of entries in the page.
+        filter : Optional[ScheduleEntryFilter]
+            Only list entries that match this filter.
+
+        Returns
+        -------
+        Tuple[List[ScheduleEntry], Optional[str], Optional[dict]]
+            The default entries for this page, the continuation token if there are more default entries, 
+            and the storage pagination state if the page should continue into storage.
+            The storage state is an empty dict if storage paging has not started yet.
+
+        Raises
+        ------
+        beatdrop.exceptions.InvalidPageCursor
+            The cursor is malformed.
+        """
+        state = {"d": 0} if cursor is None else decode_page_cursor(cursor)
+        if "d" not in state:
+            return [], None, state
+
+        start = state['d']
+        if not isinstance(start, int) or start < 0:
+            raise InvalidPageCursor("Invalid page cursor '{}'.".format(cursor))
+
+        default_entries = self.default_sched_entries
+        if filter is not None:
+            default_entries = [entry for entry in default_entries if filter.matches(entry)]
+
+        end = start + limit
+        page_entries = default_entries[start:end]
+        if end < len(default_entries):
+            return page_entries, encode_page_cursor({"d": end}), None
+
+        return page_entries, None, {}
+
+
+    def _default_entry_counts(self) -> List[Tuple[str, bool, int]]:
+        """Helper for ``stats`` to count the default entries by type and enabled state.
+        """
+        return [(type(entry).__name__, entry.enabled, 1) for entry in self.default_sched_entries]
+
+
+    def _count_default_entries(self, filter: Optional[ScheduleEntryFilter]) -> int:
+        """Helper for ``count`` to count the default entries that match a filter.
+        """
+        if filter is None:
+            return len(self.default_sched_entries)
+
+        return sum(1 for entry in self.default_sched_entries if filter.matches(entry))
+
+
+    def _check_page_limit(self, limit: int) -> None:
+        if limit < 1:
+            raise ValueError("'limit' must be at least 1.")
+
+
     def _check_default_entry_overwrite(self, sched_entry: ScheduleEntry) -> None:
         if sched_entry.key in self._default_sched_entry_lookup:
             raise OverwriteDefaultEntryError(
@@ -226,14 +791,26 @@ class Scheduler:
             )
 
 
-    @validator("max_interval")
-    def max_interval_gte_one(
-        cls,
-        max_interval: datetime.timedelta
-    ) -> datetime.timedelta:
-        if max_interval.total_seconds() < 1:
-            raise ValueError("max_interval must be greater than or equal to 1 second.")
+    @validator("decode_memo_size")
+    def decode_memo_size_positive(cls, v: Optional[int]) -> Optional[int]:
+        if v is not None and v < 1:
+            raise ValueError("'decode_memo_size' must be at least 1.")
+
+        return v
+
+
+    @root_validator
+    def max_interval_gte_one(cls, values: dict) -> dict:
+        max_interval = values.get('max_interval')
+        if max_interval is None:
+            return values
+
+        if values.get('high_resolution'):
+            if max_interval.total_seconds() <= 0:
+                raise ValueError("max_interval must be greater than 0.")
+        elif max_interval.total_seconds() < 1:
+            raise ValueError("max_interval must be greater than or equal to 1 second, unless 'high_resolution' is set.")
         
-        return max_interval
+        return values
 
 
@@ -1,12 +1,22 @@
 
 import datetime
-from typing import Optional
+import itertools
+import threading
+import time
+from typing import Any, Dict, Iterator, Optional, Tuple
+import uuid
 
 from pydantic.dataclasses import dataclass
-from pydantic import Field, root_validator
+from pydantic import Field, root_validator, validator
 
+from beatdrop.entries.schedule_entry import ScheduleEntry
+from beatdrop.entry_cache import EntryCache
+from beatdrop.helpers import naive_utc, utc_now_naive
+from beatdrop.lock_heartbeat import LockHeartbeat
+from beatdrop.profiling import SlowTickWatchdog
 from beatdrop.schedulers.scheduler import Scheduler
-from beatdrop import exceptions
+from beatdrop.timing_wheel import TimingWheel
+from beatdrop import exceptions, messages
 
 
 @dataclass
@@ -29,12 +39,523 @@ class SingletonLockScheduler(Scheduler):
         In general these entries are not held in non-volatile storage 
         so any metadata they hold will be lost if the scheduler fails.
         These entries are static.  The keys cannot be overwritten or deleted.
+    metrics_sink : beatdrop.metrics.MetricsSink, default : NoOpMetricsSink()
+        Sink for tick, scheduling lag, send and lock metrics.
+        See ``beatdrop.metrics`` for the metric names.
     lock_timeout : datetime.timedelta
         The time a scheduler does not refresh the scheduler lock before it is considered dead. 
         Should be at least 3 times the ``max_interval``.
+    fired_entry_retention : Optional[datetime.timedelta], default : None
+        How long to keep one off entries after they are sent, like ``EventEntry``.
+        Entries that disable themselves when they are sent get an ``expires_at`` this far in the future.
+        ``None`` keeps them forever.
+    expired_entry_action : str, default : "purge"
+        What to do with expired entries. 
+        ``"purge"`` deletes them and ``"archive"`` moves them to separate archive storage.
+    expiry_sweep_batch_size : int, default : 500
+        Maximum number of expired entries removed each time the scheduler runs.
+    slow_tick_fraction : Optional[float], default : None
+        Log the stacks of all threads when a tick runs longer than this fraction of ``lock_timeout``, 
+        to see where the time goes before the lock is lost.
+        Must be greater than 0 and at most 1.
+        ``None`` disables the slow tick watchdog.
+    lock_heartbeat_interval : Optional[datetime.timedelta], default : None
+        Refresh the scheduler lock from a background thread this often, instead of after each tick. 
+        Long ticks and slow sends no longer let the lock expire, 
+        and a tick stops claiming entries as soon as the lock is lost.
+        Must be less than ``lock_timeout``.
+        ``None`` refreshes the lock after each tick.
+    standby_poll_interval : Optional[datetime.timedelta], default : None
+        How often a standby scheduler checks the scheduler lock while waiting for it.
+        Standbys also wake up when the lock expires, and Redis standbys wake up as soon as the lock is released.
+        ``None`` uses ``max_interval``.
+    warm_standby : bool, default : False
+        While waiting for the scheduler lock, keep the decoded enabled entries from storage in memory, 
+        so the first tick after taking over does not have to decode them.
+    read_your_writes_window : Optional[datetime.timedelta], default : None
+        Only used when client reads are sent to a read replica.
+        After this scheduler saves or deletes an entry, its client reads go to the primary for this long,
+        so it reads its own writes while the replica catches up.
+        ``None`` always sends client reads to the replica.
+    entry_cache_size : Optional[int], default : None
+        Keep up to this many entries read with ``get`` in memory, see ``beatdrop.entry_cache.EntryCache``.
+        Entries this scheduler saves or deletes are invalidated right away. 
+        ``RedisScheduler`` evicts entries other processes change when it is notified with pub/sub,
+        and ``SQLScheduler`` checks the entry's version in the DB and only decodes it if it changed.
+        ``None`` disables the cache.
+    entry_cache_ttl : Optional[datetime.timedelta], default : None
+        How long an entry stays in the cache.
+        ``None`` keeps entries until they are evicted or invalidated.
+    look_ahead_window : Optional[datetime.timedelta], default : None
+        Each tick, only read the entries due within this window from storage, 
+        and hold them in memory on a ``beatdrop.timing_wheel.TimingWheel`` until they are due.
+        Between ticks, each held entry is claimed in storage and sent at its due time, 
+        so sends are not delayed until the next tick.
+        An entry that changed since it was read is checked again when it is claimed.
+        Must be longer than ``max_interval``, so each tick reads the entries due before the tick after it.
+        ``None`` checks every enabled entry in storage each tick.
     """
 
     lock_timeout: datetime.timedelta = Field()
+    fired_entry_retention: Optional[datetime.timedelta] = Field(default=None)
+    expired_entry_action: str = Field(default="purge")
+    expiry_sweep_batch_size: int = Field(default=500)
+    slow_tick_fraction: Optional[float] = Field(default=None)
+    lock_heartbeat_interval: Optional[datetime.timedelta] = Field(default=None)
+    standby_poll_interval: Optional[datetime.timedelta] = Field(default=None)
+    warm_standby: bool = Field(default=False)
+    read_your_writes_window: Optional[datetime.timedelta] = Field(default=None)
+    entry_cache_size: Optional[int] = Field(default=None)
+    entry_cache_ttl: Optional[datetime.timedelta] = Field(default=None)
+    look_ahead_window: Optional[datetime.timedelta] = Field(default=None)
+
+
+    def __post_init_post_parse__(self) -> None:
+        super().__post_init_post_parse__()
+        self._runtime_stats.set_lock_held(False)
+        self._lock_lost = threading.Event()
+        self._lock_heartbeat: Optional[LockHeartbeat] = None
+        self._instance_id = uuid.uuid4().hex
+        self._warm_entries: Dict[str, ScheduleEntry] = {}
+        self._warmed_at: Optional[float] = None
+        self._last_write_at: Optional[float] = None
+        self._entry_cache: Optional[EntryCache] = None
+        if self.entry_cache_size is not None:
+            self._entry_cache = EntryCache(
+                max_size=self.entry_cache_size,
+                ttl=None if self.entry_cache_ttl is None else self.entry_cache_ttl.total_seconds()
+            )
+        self._look_ahead_wheel: Optional[TimingWheel] = None
+        # key: (entry, storage version, due at)
+        self._look_ahead_entries: Dict[str, Tuple[ScheduleEntry, Any, float]] = {}
+        self._look_ahead_until = 0.0
+        if self.look_ahead_window is not None:
+            self._look_ahead_wheel = TimingWheel()
+
+        if self.slow_tick_fraction is not None:
+            self._watchdog = SlowTickWatchdog(
+                threshold=self.lock_timeout.total_seconds() * self.slow_tick_fraction
+            )
+
+
+    @property
+    def entry_cache(self) -> Optional[EntryCache]:
+        """Cache of entries read with ``get``, or ``None`` if ``entry_cache_size`` is not set.
+
+        Its ``hits`` and ``misses`` count cache lookups.
+        """
+        return self._entry_cache
+
+
+    def _wrote(self, key: str) -> None:
+        """Record that this scheduler saved or deleted an entry.
+
+        Starts the ``read_your_writes_window``, and invalidates the entry in the entry cache.
+
+        Parameters
+        ----------
+        key : str
+            Key of the entry.
+        """
+        self._last_write_at = time.monotonic()
+        if self._entry_cache is not None:
+            self._entry_cache.invalidate(key)
+
+
+    def _read_from_primary(self) -> bool:
+        """Check if client reads should go to the primary instead of the read replica.
+
+        Returns
+        -------
+        bool
+            ``True`` if this scheduler wrote an entry within ``read_your_writes_window``, or else ``False``.
+        """
+        return (
+            self.read_your_writes_window is not None
+            and self._last_write_at is not None
+            and time.monotonic() - self._last_write_at < self.read_your_writes_window.total_seconds()
+        )
+
+
+    def _hold_lock(self) -> None:
+        """Acquire the scheduler lock, start the lock heartbeat if it is enabled, and upgrade the storage.
+
+        Waits until the lock is acquired.
+        """
+        self._stop_lock_heartbeat()
+        self._acquire_lock()
+        self._lock_lost.clear()
+        if self.lock_heartbeat_interval is not None:
+            self._lock_heartbeat = LockHeartbeat(
+                refresh=self._refresh_lock,
+                interval=self.lock_heartbeat_interval.total_seconds(),
+                lock_timeout=self.lock_timeout.total_seconds(),
+                lock_lost=self._lock_lost
+            )
+            self._lock_heartbeat.start()
+
+        self._upgrade_storage()
+
+
+    def _upgrade_storage(self) -> None:
+        """Bring entries saved by an earlier version of beatdrop up to date, so they are scheduled.
+
+        Called while holding the scheduler lock, each time it is acquired. 
+        Does nothing by default.
+        """
+        pass
+
+
+    def _keep_lock(self) -> bool:
+        """Check the scheduler lock is still held after a tick.
+
+        Refreshes the lock, unless the lock heartbeat is refreshing it.
+
+        Returns
+        -------
+        bool
+            ``True`` if the lock is still held, or else ``False``.
+        """
+        if self._lock_heartbeat is None:
+            return self._refresh_lock()
+
+        return not self._lock_lost.is_set()
+
+
+    def _lock_is_lost(self) -> bool:
+        """Check if the lock heartbeat has lost the scheduler lock.
+
+        Ticks check this before claiming each entry, and stop when it is ``True``.
+
+        Returns
+        -------
+        bool
+            ``True`` if the lock has been lost, or else ``False``.
+        """
+        if self._lock_lost.is_set():
+            self._logger.error(messages.sched_lock_lost_mid_tick)
+            return True
+
+        return False
+
+
+    def _standby_wait_time(self, lock_expires_in: Optional[float]) -> float:
+        """Seconds a standby scheduler waits before checking the scheduler lock again.
+
+        Parameters
+        ----------
+        lock_expires_in : Optional[float]
+            Seconds until the current lock expires, or ``None`` if it is not known.
+
+        Returns
+        -------
+        float
+            The standby poll interval, or less if the lock expires sooner.
+        """
+        poll_interval = (self.standby_poll_interval or self.max_interval).total_seconds()
+        if lock_expires_in is None:
+            return poll_interval
+
+        return max(min(poll_interval, lock_expires_in), 0)
+
+
+    def _warm_up(self) -> None:
+        """Decode the enabled entries in storage ahead of taking over, if ``warm_standby`` is set.
+
+        Called by a standby while it waits for the scheduler lock.
+        Only entries that changed since the last warm up are decoded,
+        and storage is read at most once per ``max_interval``.
+        """
+        if not self.warm_standby:
+            return
+
+        if (
+            self._warmed_at is not None 
+            and time.monotonic() - self._warmed_at < self.max_interval.total_seconds()
+        ):
+            return
+
+        warm_entries = {}
+        for sched_entry_json in self._enabled_entry_jsons():
+            sched_entry = self._warm_entries.get(sched_entry_json)
+            if sched_entry is None:
+                sched_entry = super()._decode_entry(sched_entry_json)
+
+            warm_entries[sched_entry_json] = sched_entry
+
+        self._warm_entries = warm_entries
+        self._warmed_at = time.monotonic()
+
+
+    def _enabled_entry_jsons(self) -> Iterator[str]:
+        """Serialized enabled entries in storage, for ``_warm_up``.
+
+        Returns
+        -------
+        Iterator[str]
+            Schedule entry JSON.
+
+        Raises
+        ------
+        beatdrop.exceptions.MethodNotImplementedError
+            Must implement ``_enabled_entry_jsons`` method.
+        """
+        raise exceptions.MethodNotImplementedError("Must implement the '_enabled_entry_jsons' method for a scheduler.")
+
+
+    def _decode_entry(self, sched_entry_json: str) -> ScheduleEntry:
+        # Entries warmed up as a standby are handed out once, then decoded as normal.
+        if len(self._warm_entries) > 0:
+            sched_entry = self._warm_entries.pop(sched_entry_json, None)
+            if sched_entry is not None:
+                return sched_entry
+
+        return super()._decode_entry(sched_entry_json)
+
+
+    def _tick(self) -> datetime.timedelta:
+        try:
+            return super()._tick()
+        finally:
+            # only the first tick after taking over uses the warm entries
+            self._warm_entries = {}
+            self._warmed_at = None
+
+
+    def _sleep(self, sleep_time: datetime.timedelta) -> None:
+        """Sleep until the next tick, and report the next wake up time.
+
+        With ``look_ahead_window``, wakes up as each held entry is due to claim and send it.
+
+        Parameters
+        ----------
+        sleep_time : datetime.timedelta
+            Time to sleep.
+        """
+        if self._look_ahead_wheel is None:
+            super()._sleep(sleep_time)
+            return
+
+        self._runtime_stats.sleeping(sleep_time)
+        self._logger.debug(messages.scheduler_sleep_template, sleep_time.total_seconds())
+        wake_at = time.monotonic() + sleep_time.total_seconds()
+        while True:
+            self._send_look_ahead_entries()
+            if time.monotonic() >= wake_at:
+                return
+
+            deadline = wake_at
+            next_due = self._look_ahead_wheel.next_due()
+            if next_due is not None:
+                deadline = min(deadline, time.monotonic() + next_due - time.time())
+
+            self._sleep_until(deadline)
+
+
+    def _run_look_ahead_once(self) -> datetime.timedelta:
+        """Read the entries due within ``look_ahead_window``, and hold them until they are due.
+
+        The entries held by the last tick are dropped, and read again if they are still due within the window.
+        Held entries are claimed and sent by ``_sleep``.
+
+        Returns
+        -------
+        datetime.timedelta
+            Sleep time until the scheduler should wake up and run again.
+        """
+        tick_started_at = time.perf_counter()
+        num_scanned = 0
+        num_due = 0
+        num_due_soon = 0
+        now = time.time()
+        self._look_ahead_until = now + self.look_ahead_window.total_seconds()
+        self._look_ahead_wheel = TimingWheel()
+        self._look_ahead_entries = {}
+        default_entries = ((sched_entry, None) for sched_entry in self.default_sched_entries if sched_entry.enabled)
+        for sched_entry, version in itertools.chain(
+            default_entries,
+            self._look_ahead_stored_entries(self._look_ahead_until)
+        ):
+            if self._lock_is_lost():
+                break
+
+            num_scanned += 1
+            if sched_entry.enabled == False or sched_entry.is_expired():
+                continue
+
+            due_at = self._hold_look_ahead_entry(sched_entry, version)
+            if due_at - now <= self._due_soon.total_seconds():
+                num_due_soon += 1
+
+            if due_at <= now:
+                num_due += 1
+
+        self._record_tick(tick_started_at, num_scanned, num_due, num_due_soon)
+
+        return self.max_interval
+
+
+    def _hold_look_ahead_entry(self, sched_entry: ScheduleEntry, version: Any) -> float:
+        """Hold an entry on the look-ahead wheel, if it is due before the end of the current window.
+
+        Parameters
+        ----------
+        sched_entry : ScheduleEntry
+            Enabled schedule entry.
+        version : Any
+            Storage version the entry was read at, ``None`` for default entries.
+
+        Returns
+        -------
+        float
+            UTC epoch seconds the entry is due at.
+        """
+        due_at = time.time() + self._due_in(sched_entry).total_seconds()
+        if due_at <= self._look_ahead_until:
+            self._look_ahead_entries[sched_entry.key] = (sched_entry, version, due_at)
+            self._look_ahead_wheel.schedule(sched_entry.key, due_at)
+
+        return due_at
+
+
+    def _send_look_ahead_entries(self) -> int:
+        """Claim and send the held entries that are due.
+
+        Entries that are due again before the end of the window are held again.
+
+        Returns
+        -------
+        int
+            Number of entries sent.
+        """
+        num_sent = 0
+        for key in self._look_ahead_wheel.advance(time.time()):
+            if self._lock_is_lost():
+                # the next scheduler to hold the lock reads them again
+                self._look_ahead_wheel = TimingWheel()
+                self._look_ahead_entries = {}
+                break
+
+            sched_entry, version, due_at = self._look_ahead_entries.pop(key)
+            if key in self._default_sched_entry_lookup:
+                sched_entry.sent()
+            else:
+                claimed = self._claim_look_ahead_entry(sched_entry, version)
+                if claimed is None:
+                    continue
+
+                sched_entry, version = claimed
+
+            num_sent += 1
+            self._send_entry(
+                sched_entry, 
+                datetime.timedelta(seconds=due_at - time.time()), 
+                time.perf_counter()
+            )
+            if sched_entry.enabled and not sched_entry.is_expired():
+                self._hold_look_ahead_entry(sched_entry, version)
+
+        return num_sent
+
+
+    def _look_ahead_stored_entries(self, until: float) -> Iterator[Tuple[ScheduleEntry, Any]]:
+        """Enabled entries in storage due before ``until``, and the versions they were read at, for ``look_ahead_window``.
+
+        Parameters
+        ----------
+        until : float
+            UTC epoch seconds.
+
+        Returns
+        -------
+        Iterator[Tuple[ScheduleEntry, Any]]
+            Schedule entries and their storage versions.
+
+        Raises
+        ------
+        beatdrop.exceptions.MethodNotImplementedError
+            Must implement ``_look_ahead_stored_entries`` method.
+        """
+        raise exceptions.MethodNotImplementedError("Must implement the '_look_ahead_stored_entries' method for a scheduler.")
+
+
+    def _claim_look_ahead_entry(
+        self,
+        sched_entry: ScheduleEntry,
+        version: Any
+    ) -> Optional[Tuple[ScheduleEntry, Any]]:
+        """Mark a held entry as sent in storage, under the entry's lock.
+
+        If the stored entry changed since it was read, it is checked again, 
+        and held again if it is no longer due yet.
+
+        Parameters
+        ----------
+        sched_entry : ScheduleEntry
+            Held schedule entry that is due.
+        version : Any
+            Storage version the entry was read at.
+
+        Returns
+        -------
+        Optional[Tuple[ScheduleEntry, Any]]
+            The sent entry and its new storage version, or ``None`` if it should not be sent.
+
+        Raises
+        ------
+        beatdrop.exceptions.MethodNotImplementedError
+            Must implement ``_claim_look_ahead_entry`` method.
+        """
+        raise exceptions.MethodNotImplementedError("Must implement the '_claim_look_ahead_entry' method for a scheduler.")
+
+
+    def _stop_lock_heartbeat(self) -> None:
+        """Stop the lock heartbeat thread, if it is running.
+        """
+        if self._lock_heartbeat is not None:
+            self._lock_heartbeat.stop()
+            self._lock_heartbeat = None
+
+
+    def _stop_watchdog(self) -> None:
+        """Stop the slow tick watchdog thread, if it is running.
+        """
+        if self._watchdog is not None:
+            self._watchdog.stop()
+
+
+    def _apply_fired_entry_retention(self, sched_entry: ScheduleEntry) -> None:
+        """Expire a one off entry after ``fired_entry_retention`` once it has been sent.
+
+        Should be called after the entry's ``sent`` method.
+
+        Parameters
+        ----------
+        sched_entry : ScheduleEntry
+            Schedule entry that was just sent.
+        """
+        if self.fired_entry_retention is None or sched_entry.enabled:
+            return
+
+        expires_at = utc_now_naive() + self.fired_entry_retention
+        if sched_entry.expires_at is None or naive_utc(sched_entry.expires_at) > expires_at:
+            sched_entry.expires_at = expires_at
+
+
+    def _sweep_expired(self) -> int:
+        """Purge or archive a batch of expired entries from storage.
+
+        Returns
+        -------
+        int
+            Number of entries removed.
+
+        Raises
+        ------
+        beatdrop.exceptions.MethodNotImplementedError
+            Must implement ``_sweep_expired`` method.
+        """
+        raise exceptions.MethodNotImplementedError("Must implement the '_sweep_expired' method for a scheduler.")
    
 
     @root_validator
@@ -43,3 +564,77 @@ class SingletonLockScheduler(Scheduler):
             raise ValueError("'lock_timeout' must be at least 3 times as long as the `max_interval`.")
         
         return values
+
+
+    @validator("expired_entry_action")
+    def valid_expired_entry_action(cls, v: str) -> str:
+        if v not in ("purge", "archive"):
+            raise ValueError("'expired_entry_action' must be 'purge' or 'archive'.")
+
+        return v
+
+
+    @validator("expiry_sweep_batch_size")
+    def expiry_sweep_batch_size_positive(cls, v: int) -> int:
+        if v < 1:
+            raise ValueError("'expiry_sweep_batch_size' must be at least 1.")
+
+        return v
+
+
+    @validator("slow_tick_fraction")
+    def valid_slow_tick_fraction(cls, v: Optional[float]) -> Optional[float]:
+        if v is not None and not 0 < v <= 1:
+            raise ValueError("'slow_tick_fraction' must be greater than 0 and at most 1.")
+
+        return v
+
+
+    @root_validator
+    def lock_heartbeat_interval_lt_lock_timeout(cls, values: dict) -> dict:
+        interval = values.get('lock_heartbeat_interval')
+        if interval is not None and not datetime.timedelta(0) < interval < values['lock_timeout']:
+            raise ValueError("'lock_heartbeat_interval' must be greater than 0 and less than 'lock_timeout'.")
+
+        return values
+
+
+    @validator("standby_poll_interval")
+    def standby_poll_interval_positive(cls, v: Optional[datetime.timedelta]) -> Optional[datetime.timedelta]:
+        if v is not None and v <= datetime.timedelta(0):
+            raise ValueError("'standby_poll_interval' must be greater than 0.")
+
+        return v
+
+
+    @validator("read_your_writes_window")
+    def read_your_writes_window_positive(cls, v: Optional[datetime.timedelta]) -> Optional[datetime.timedelta]:
+        if v is not None and v <= datetime.timedelta(0):
+            raise ValueError("'read_your_writes_window' must be greater than 0.")
+
+        return v
+
+
+    @validator("entry_cache_size")
+    def entry_cache_size_positive(cls, v: Optional[int]) -> Optional[int]:
+        if v is not None and v < 1:
+            raise ValueError("'entry_cache_size' must be at least 1.")
+
+        return v
+
+
+    @root_validator
+    def look_ahead_window_gt_max_interval(cls, values: dict) -> dict:
+        look_ahead_window = values.get('look_ahead_window')
+        if look_ahead_window is not None and look_ahead_window <= values['max_interval']:
+            raise ValueError("'look_ahead_window' must be longer than 'max_interval'.")
+
+        return values
+
+
+    @validator("entry_cache_ttl")
+    def entry_cache_ttl_positive(cls, v: Optional[datetime.timedelta]) -> Optional[datetime.timedelta]:
+        if v is not None and v <= datetime.timedelta(0):
+            raise ValueError("'entry_cache_ttl' must be greater than 0.")
+
+        return v
@@ -1,20 +1,27 @@
 
 import copy
-from datetime import datetime, timedelta, timezone
+from datetime import timedelta, timezone
 import json
+import queue
+import threading
 import time
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 from pydantic import Field, validator
 from pydantic.dataclasses import dataclass
 import sqlalchemy
 from sqlalchemy.orm import declarative_base, sessionmaker
-from sqlalchemy import Column, DateTime, Integer, String
+from sqlalchemy import and_, Boolean, case, Column, DateTime, Float, func, Integer, or_, select, String
 
-from beatdrop import art, messages
-from beatdrop.helpers import utc_now_naive
+from beatdrop import art, messages, metrics, operation_stats, tracing
+from beatdrop.helpers import naive_utc, utc_now_naive
+from beatdrop.entry_filter import ScheduleEntryFilter
+from beatdrop.entry_stats import EntryStats
 from beatdrop.entry_type_registry import EntryTypeRegistry
+from beatdrop.operation_stats import OperationStats
+from beatdrop.pagination import encode_page_cursor, EntryPage
 from beatdrop.schedulers.singleton_lock_scheduler import SingletonLockScheduler
+from beatdrop.sql_lock import lock_strategies, lock_strategy_for
 from beatdrop.entries.schedule_entry import ScheduleEntry
 from beatdrop import exceptions
 
@@ -26,6 +33,11 @@ class SQLScheduleEntry(SQLBase):
     
     - ``key_`` holds the scheduler entry key. 
     - ``json_`` holds the serialized JSON for the scheduler entry.
+    - ``type_``, ``task_`` and ``enabled_`` are indexed copies of the entry's 
+      type name, task and enabled state so entries can be filtered without deserializing them.
+    - ``expires_at_`` is an indexed copy of the entry's ``expires_at`` as a naive datetime in UTC.
+    - ``version_`` is incremented on every write, so cached entries can be checked without reading the JSON.
+    - ``next_due_at_`` is an indexed copy of the entry's ``next_due_at``, in UTC epoch seconds.
     """
     
     __tablename__ = "beatdrop_entries"
@@ -33,6 +45,81 @@ class SQLScheduleEntry(SQLBase):
     key_id = Column(Integer, primary_key=True, autoincrement=True)
     key_ = Column(String, unique=True)
     json_ = Column(String)
+    type_ = Column(String, index=True)
+    task_ = Column(String, index=True)
+    enabled_ = Column(Boolean, index=True)
+    expires_at_ = Column(DateTime, index=True)
+    version_ = Column(Integer, nullable=True)
+    next_due_at_ = Column(Float, index=True, nullable=True)
+
+
+    def set_entry(self, sched_entry: ScheduleEntry) -> None:
+        """Set the JSON and the indexed metadata columns from a schedule entry.
+
+        Parameters
+        ----------
+        sched_entry : ScheduleEntry
+            Schedule entry to store in this row.
+        """
+        self.key_ = sched_entry.key
+        self.json_ = sched_entry.json()
+        self.type_ = type(sched_entry).__name__
+        self.task_ = sched_entry.task
+        self.enabled_ = sched_entry.enabled
+        self.expires_at_ = None
+        self.version_ = (self.version_ or 0) + 1
+        self.next_due_at_ = sched_entry.next_due_at
+        if sched_entry.expires_at is not None:
+            self.expires_at_ = naive_utc(sched_entry.expires_at)
+
+
+class SQLScheduleEntryArchive(SQLBase):
+    """Table to hold expired schedule entries when they are archived.
+
+    - ``key_`` holds the scheduler entry key. Not unique, an entry can be archived more than once.
+    - ``json_`` holds the serialized JSON for the scheduler entry.
+    - ``archived_at`` naive datetime in UTC when the entry was archived.
+    """
+
+    __tablename__ = "beatdrop_entries_archive"
+
+    archive_id = Column(Integer, primary_key=True, autoincrement=True)
+    key_ = Column(String, index=True)
+    json_ = Column(String)
+    archived_at = Column(DateTime, index=True)
+
+
+def _filter_query(query: Any, sched_entry_filter: Optional[ScheduleEntryFilter]) -> Any:
+    """Push a schedule entry filter down to a ``SQLScheduleEntry`` query.
+
+    Parameters
+    ----------
+    query : Any
+        SQLAlchemy query or select statement on ``SQLScheduleEntry``.
+    sched_entry_filter : Optional[ScheduleEntryFilter]
+        Filter to apply, ``None`` does not filter.
+
+    Returns
+    -------
+    Any
+        The filtered query.
+    """
+    if sched_entry_filter is None:
+        return query
+
+    if sched_entry_filter.key_prefix is not None:
+        query = query.filter(SQLScheduleEntry.key_.startswith(sched_entry_filter.key_prefix, autoescape=True))
+
+    if sched_entry_filter.entry_type is not None:
+        query = query.filter(SQLScheduleEntry.type_ == sched_entry_filter.entry_type)
+
+    if sched_entry_filter.task is not None:
+        query = query.filter(SQLScheduleEntry.task_ == sched_entry_filter.task)
+
+    if sched_entry_filter.enabled is not None:
+        query = query.filter(SQLScheduleEntry.enabled_ == sched_entry_filter.enabled)
+
+    return query
 
 
 class SQLSchedulerLock(SQLBase):
@@ -40,22 +127,39 @@ class SQLSchedulerLock(SQLBase):
 
     In order to strive for only one scheduler actively sending tasks,
     there is a separate table that will help to manage this.
-    This table only has one column ``last_refreshed_at`` which is a 
-    datetime in UTC.  
+    The lock is held by the scheduler with the ``owner_id``, until ``last_refreshed_at``, 
+    which is a datetime in UTC, is older than the lock timeout.  
 
     This table should only ever have 0 or 1 row. 
 
-    The scheduler lock is managed by using db ``FOR UPDATE`` queries and the datetime value of ``last_refreshed_at``.
+    The scheduler lock is managed with conditional updates on ``owner_id`` and ``version``, 
+    see ``beatdrop.sql_lock.RowLeaseLock``.
+    Waiting standby schedulers record themselves in ``standby_id`` and ``standby_seen_at``, 
+    and a shutting down scheduler hands the lock off to that standby by setting ``hand_off_to``.
     """
 
     __tablename__ = "beatdrop_scheduler_lock"
 
     last_refreshed_at = Column(DateTime, primary_key=True)
+    standby_id = Column(String(32), nullable=True)
+    standby_seen_at = Column(DateTime, nullable=True)
+    hand_off_to = Column(String(32), nullable=True)
+    owner_id = Column(String(32), nullable=True)
+    version = Column(Integer, nullable=True)
 
 
 class SQLScheduleEntryList: 
     """Iterator for SQLSchedule entries.
 
+    By default the DB is read page by page, with a new session and keyset query for each page.
+
+    In ``stream`` mode a single session is held for the whole listing and rows are
+    fetched with a server side cursor (``yield_per``/``stream_results``). 
+    Only the ``json_`` column is selected.
+    A background thread prefetches the next page while the current one is being decoded,
+    and entries are only decoded as they are iterated over, 
+    so memory use stays constant no matter how many entries are listed.
+
     Parameters
     ----------
     page_size : int
@@ -66,6 +170,12 @@ class SQLScheduleEntryList:
         SQLAlchemy Session maker to query DB.
     entry_type_registry : EntryTypeRegistry
         Entry type registry for deserializing JSON models from the DB.
+    stream : bool, optional
+        Stream results from the DB with a server side cursor, by default False
+    filter : Optional[ScheduleEntryFilter], optional
+        Only list entries that match this filter, by default None
+    operation_stats : Optional[OperationStats], optional
+        Where to record the latency of DB reads and decoding, by default None
     """
 
     def __init__(
@@ -73,18 +183,33 @@ class SQLScheduleEntryList:
         page_size: int, 
         default_sched_entries: List[ScheduleEntry], 
         session_maker: sessionmaker,
-        entry_type_registry: EntryTypeRegistry
+        entry_type_registry: EntryTypeRegistry,
+        stream: bool = False,
+        filter: Optional[ScheduleEntryFilter] = None,
+        operation_stats: Optional[OperationStats] = None
     ):
+        if operation_stats is None:
+            operation_stats = OperationStats()
+
+        self._operation_stats = operation_stats
         self._Session = session_maker
         self.page_size = page_size
+        self.stream = stream
+        self.filter = filter
+        if filter is not None:
+            default_sched_entries = [entry for entry in default_sched_entries if filter.matches(entry)]
+
         self._default_sched_entries = default_sched_entries
         self._default_entries_iter = iter(self._default_sched_entries)
         self._entry_type_registry = entry_type_registry
         self._db_page_iter = None
         self._next_page = None
+        self._stream_pages = None
+        self._stream_stop = None
 
 
     def __iter__(self):
+        self.close()
         self._default_entries_iter = iter(self._default_sched_entries)
         self._iterated_default_entries = False
         self._db_page_iter = None
@@ -101,41 +226,75 @@ class SQLScheduleEntryList:
                 self._iterated_default_entries = True
         
         if self._iterated_default_entries == True:
+            if self.stream:
+                return self._next_streamed_entry()
+
             # start listing from db by page size
             if self._db_page_iter is None:
-                with self._Session() as session:
-                    results = session.query(SQLScheduleEntry).limit(self.page_size + 1).all()
-
-                if len(results) > self.page_size:
-                    results.pop(len(results) - 1)
-                    self._next_page = results[-1].key_id
-                else:
-                    self._next_page = None
-
-                self._db_page_iter = iter(results)
+                with self._Session() as session, self._operation_stats.time(operation_stats.SELECT):
+                    results = _filter_query(
+                        session.query(
+                            SQLScheduleEntry.key_id,
+                            SQLScheduleEntry.json_
+                        ),
+                        self.filter
+                    ).order_by(
+                        SQLScheduleEntry.key_id
+                    ).limit(self.page_size + 1).all()
+
+                self._set_page(results)
                 
             try:
-                return self._entry_type_registry.dejson_entry(
-                        sched_entry_json=next(self._db_page_iter).json_
-                    )
+                return self._decode_entry(next(self._db_page_iter).json_)
             except StopIteration:
                 if self._next_page is None:
                     raise StopIteration
 
                 self._get_next_page()
-                return self._entry_type_registry.dejson_entry(
-                    sched_entry_json=next(self._db_page_iter).json_
-                )
+                return self._decode_entry(next(self._db_page_iter).json_)
+
+
+    def _decode_entry(self, sched_entry_json: str) -> ScheduleEntry:
+        with self._operation_stats.time(operation_stats.DECODE):
+            return self._entry_type_registry.dejson_entry(sched_entry_json=sched_entry_json)
+
+
+    def __del__(self):
+        self.close()
+
+
+    def close(self) -> None:
+        """Stop streaming and release the DB connection.
+
+        Only needed when a ``stream`` listing is abandoned before it is exhausted.
+        """
+        if self._stream_stop is not None:
+            self._stream_stop.set()
+
+        self._stream_pages = None
+        self._stream_stop = None
 
 
     def _get_next_page(self):
-        with self._Session() as session:
-            results = session.query(SQLScheduleEntry).filter(
+        with self._Session() as session, self._operation_stats.time(operation_stats.SELECT):
+            results = _filter_query(
+                session.query(
+                    SQLScheduleEntry.key_id,
+                    SQLScheduleEntry.json_
+                ),
+                self.filter
+            ).filter(
                 SQLScheduleEntry.key_id > self._next_page
+            ).order_by(
+                SQLScheduleEntry.key_id
             ).limit(
                 self.page_size + 1
             ).all()
         
+        self._set_page(results)
+
+
+    def _set_page(self, results: list) -> None:
         if len(results) > self.page_size:
             results.pop(len(results) - 1)
             self._next_page = results[-1].key_id
@@ -145,6 +304,139 @@ class SQLScheduleEntryList:
         self._db_page_iter = iter(results)
 
 
+    def _next_streamed_entry(self) -> ScheduleEntry:
+        """Decode the next entry from the streamed pages.
+
+        Returns
+        -------
+        ScheduleEntry
+            Next schedule entry.
+
+        Raises
+        ------
+        StopIteration
+            When there are no more entries to return.
+        """
+        if self._stream_pages is None:
+            self._start_stream()
+
+        while True:
+            if self._db_page_iter is not None:
+                try:
+                    return self._decode_entry(next(self._db_page_iter))
+                except StopIteration:
+                    self._db_page_iter = None
+
+            page = self._stream_pages.get()
+            if page is None:
+                self.close()
+                raise StopIteration
+
+            if isinstance(page, BaseException):
+                self.close()
+                raise page
+
+            self._db_page_iter = iter(page)
+
+
+    def _start_stream(self) -> None:
+        # The queue only holds 1 page so the reader stays at most one page ahead of decoding.
+        self._stream_pages = queue.Queue(maxsize=1)
+        self._stream_stop = threading.Event()
+        # The reader must not hold a reference to this iterator,
+        # so an abandoned listing can be garbage collected and stop the reader.
+        reader = threading.Thread(
+            target=self._read_stream,
+            kwargs={
+                "session_maker": self._Session,
+                "page_size": self.page_size,
+                "sched_entry_filter": self.filter,
+                "pages": self._stream_pages,
+                "stop": self._stream_stop,
+                "stats": self._operation_stats
+            },
+            daemon=True
+        )
+        reader.start()
+
+
+    @staticmethod
+    def _read_stream(
+        session_maker: sessionmaker,
+        page_size: int,
+        sched_entry_filter: Optional[ScheduleEntryFilter],
+        pages: queue.Queue,
+        stop: threading.Event,
+        stats: OperationStats
+    ) -> None:
+        """Read pages of JSON from a server side cursor and hand them to the iterator.
+
+        Runs in a background thread.
+
+        Parameters
+        ----------
+        session_maker : sessionmaker
+            SQLAlchemy Session maker to query DB.
+        page_size : int
+            Number of rows to fetch per page.
+        sched_entry_filter : Optional[ScheduleEntryFilter]
+            Only read entries that match this filter.
+        pages : queue.Queue
+            Queue to put pages of entry JSON on. 
+            ``None`` is put at the end of the results, or an exception if the read failed.
+        stop : threading.Event
+            Set by the iterator when it no longer needs results.
+        stats : OperationStats
+            Where to record the latency of each page read.
+        """
+        try:
+            with session_maker() as session:
+                with stats.time(operation_stats.SELECT):
+                    results = session.execute(
+                        _filter_query(
+                            select(SQLScheduleEntry.json_),
+                            sched_entry_filter
+                        ).order_by(
+                            SQLScheduleEntry.key_id
+                        ).execution_options(
+                            stream_results=True,
+                            yield_per=page_size
+                        )
+                    ).scalars()
+
+                partitions = results.partitions(page_size)
+                while True:
+                    with stats.time(operation_stats.SELECT):
+                        page = next(partitions, None)
+
+                    if page is None:
+                        break
+
+                    if not SQLScheduleEntryList._put_page(pages, stop, page):
+                        return
+
+            SQLScheduleEntryList._put_page(pages, stop, None)
+        except Exception as error:
+            SQLScheduleEntryList._put_page(pages, stop, error)
+
+
+    @staticmethod
+    def _put_page(
+        pages: queue.Queue,
+        stop: threading.Event,
+        page: Any
+    ) -> bool:
+        while not stop.is_set():
+            try:
+                pages.put(page, timeout=0.1)
+
+                return True
+            except queue.Full:
+                pass
+
+        return False
+
+
 @dataclass
 class SQLScheduler(SingletonLockScheduler):
     """Hold schedule entries in an SQL database. 
@@ -152,6 +444,8 @@ class SQLScheduler(SingletonLockScheduler):
     Uses an SQL database to store schedule entries and scheduler state.
     It is safe to run multiple ``SQLScheduler`` s simultaneously, 
     as well as have many that are purely used as clients to read/write entries.
+    Rows saved before the indexed columns were added are filled in with ``backfill_columns``,
+    which the scheduler runs when it takes the scheduler lock.
 
     This scheduler does not implement the ``send`` method.
     This must be implemented before it can actually send tasks
@@ -169,6 +463,9 @@ class SQLScheduler(SingletonLockScheduler):
         In general these entries are not held in non-volatile storage 
         so any metadata they hold will be lost if the scheduler fails.
         These entries are static.  The keys cannot be overwritten or deleted.
+    metrics_sink : beatdrop.metrics.MetricsSink, default : NoOpMetricsSink()
+        Sink for tick, scheduling lag, send and lock metrics.
+        See ``beatdrop.metrics`` for the metric names.
     lock_timeout: datetime.timedelta
         The time a scheduler does not refresh the scheduler lock before it is considered dead. 
         Should be at least 3 times the ``max_interval``.
@@ -176,66 +473,88 @@ class SQLScheduler(SingletonLockScheduler):
         Keyword arguments to pass to ``sqlalchemy.create_engine``.
         See SQLAlchemy docs for more info. 
         https://docs.sqlalchemy.org/en/14/core/engines.html#sqlalchemy.create_engine
+    lock_strategy: str, default : "row_lease"
+        How the scheduler lock is held, see ``beatdrop.sql_lock``.
+
+        - ``"row_lease"`` - A lease on the row of the ``beatdrop_scheduler_lock`` table. Works on every database.
+        - ``"pg_advisory"`` - PostgreSQL session advisory lock.
+        - ``"mysql_get_lock"`` - MySQL and MariaDB ``GET_LOCK`` named lock.
+
+        Advisory locks write no rows and are released as soon as a dead scheduler's connection closes,
+        but are not handed off to standbys.
+        On other databases they fall back to ``"row_lease"``.
+    read_create_engine_kwargs: Optional[dict], default : None
+        Keyword arguments to pass to ``sqlalchemy.create_engine`` for a read replica.
+        Client reads with ``get``, ``list``, ``list_page``, ``count`` and ``stats`` go to the replica.
+        Scheduler ticks and all writes stay on the primary. 
+        See ``read_your_writes_window`` to read recent writes from the primary.
+        ``None`` reads from the primary.
     """
 
     create_engine_kwargs: Dict[str, Any] = Field()
+    lock_strategy: str = "row_lease"
+    read_create_engine_kwargs: Optional[Dict[str, Any]] = None
 
 
     def __post_init_post_parse__(self) -> None:
         super().__post_init_post_parse__()
-        self._lock_last_refreshed_at = None
         self._engine = sqlalchemy.create_engine(**self.create_engine_kwargs)
         self._Session = sessionmaker(bind=self._engine)
+        self._ReadSession = self._Session
+        if self.read_create_engine_kwargs is not None:
+            self._read_engine = sqlalchemy.create_engine(**self.read_create_engine_kwargs)
+            self._ReadSession = sessionmaker(bind=self._read_engine)
+
         self._zero_delta = timedelta(seconds=0)
+        self._lock_strategy = lock_strategy_for(self.lock_strategy, self._engine.dialect.name)(
+            engine=self._engine,
+            session_maker=self._Session,
+            lock_table=SQLSchedulerLock,
+            instance_id=self._instance_id,
+            lock_timeout=self.lock_timeout
+        )
 
     
     def _acquire_lock(self) -> None:
         """Acquire the scheduler lock.
 
         Will wait indefinitely until the scheduler lock is acquired.
+        While waiting, the scheduler registers itself as the standby that the lock is handed off to,
+        and checks the lock every ``standby_poll_interval``, or when it expires if that is sooner.
+        Advisory lock strategies do not register standbys, see ``lock_strategy``.
         This method should only be called by the scheduler ``run`` method.
         **Never by a client.**
         """
         self._logger.info(messages.sched_lock_acquiring)
+        acquire_started_at = time.perf_counter()
         while True:
-            utc_now = utc_now_naive()
-            with self._Session() as session:
-                # get table lock
-                db_lock_result = session.query(SQLSchedulerLock).populate_existing().with_for_update().all()
-                if len(db_lock_result) < 1:
-                    self._logger.debug(messages.sched_lock_creating)
-                    session.add(
-                        SQLSchedulerLock(
-                            last_refreshed_at=utc_now
-                        )
-                    )
-                    # release table lock
-                    session.commit()
-                    self._lock_last_refreshed_at = utc_now
-                    self._logger.info(messages.sched_lock_acquired)
-                    
-                    return 
-
-                elif ( # check if lock is expired 
-                    (utc_now - db_lock_result[0].last_refreshed_at) > self.lock_timeout
-                ): 
-                    self._logger.debug(messages.sched_lock_expired)
-                    db_lock = db_lock_result[0]
-                    db_lock.last_refreshed_at = utc_now
-                    # release table lock
-                    session.commit()
-                    self._lock_last_refreshed_at = utc_now
-                    self._logger.info(messages.sched_lock_acquired)
-                    
-                    return 
+            acquired, lock_expires_in = self._lock_strategy.try_acquire()
+            if acquired:
+                self._lock_acquired(acquire_started_at)
 
-                else:
-                    self._logger.debug(messages.sched_lock_unavailable)
-                    # release table lock
-                    session.rollback()
+                return
+
+            self._logger.debug(messages.sched_lock_unavailable)
+            self._warm_up()
+            wait_time = self._standby_wait_time(lock_expires_in)
+            self._logger.debug(messages.sched_lock_wait_template, wait_time)
+            time.sleep(wait_time)
 
-            self._logger.debug(messages.sched_lock_wait_template.format(self.max_interval.total_seconds()))
-            time.sleep(self.max_interval.total_seconds())
+
+    def _lock_acquired(self, acquire_started_at: float) -> None:
+        """Record that the scheduler lock was acquired.
+
+        Parameters
+        ----------
+        acquire_started_at : float
+            ``time.perf_counter()`` when the scheduler started to acquire the lock.
+        """
+        self._logger.info(messages.sched_lock_acquired)
+        self._runtime_stats.set_lock_held(True)
+        self.metrics_sink.observe(
+            metrics.LOCK_ACQUIRE_DURATION,
+            time.perf_counter() - acquire_started_at
+        )
 
 
     def run(self, max_iterations: int = None) -> None:
@@ -251,30 +570,30 @@ class SQLScheduler(SingletonLockScheduler):
         """
         try:
             self._logger.info(art.logo)
-            self._acquire_lock()
+            self._start_stats_server()
+            self._hold_lock()
             self._logger.info(messages.scheduler_starting)
             sleep_time = self.max_interval
             num_iterations = 0
             while True:
-                sleep_time = self._run_once()
+                sleep_time = self._tick()
+
+                self._sweep_expired()
                 num_iterations = self._update_run_iteration(
                     num_iterations=num_iterations, 
                     max_iterations=max_iterations
                 )
-                lock_refreshed = self._refresh_lock()
+                lock_refreshed = self._keep_lock()
                 if lock_refreshed:
-                    self._logger.debug(
-                        messages.scheduler_sleep_template.format(sleep_time.total_seconds())
-                    )
-                    time.sleep(sleep_time.total_seconds())
+                    self._sleep(sleep_time)
                 else:
-                    self._acquire_lock()
+                    self._hold_lock()
 
         except (exceptions.MaxRunIterations, KeyboardInterrupt):
             self._logger.debug(messages.scheduler_shutting_down)
         
         except Exception as error:
-            self._logger.critical("{}: {}".format(type(error).__name__, error))
+            self._logger.critical("{}: {}", type(error).__name__, error)
         
         finally:
             self._cleanup()
@@ -286,54 +605,86 @@ class SQLScheduler(SingletonLockScheduler):
     ) -> timedelta:
         """Run an iteration of the scheduler with given context.
 
+        Only enabled entries are visited. 
+        Their keys are read with the indexed ``enabled_`` column, so disabled entries are never locked or deserialized.
+        With ``look_ahead_window``, only the entries due within the window are read, see ``_run_look_ahead_once``.
+
         Parameters
         ----------
         sched_entries: Optional[List[ScheduleEntry]]
-            Schedule entry list.  If None, will pull it from default and DB.
+            Schedule entry list.  If None, will pull the enabled entries from default and DB.
 
         Returns
         -------
         timedelta
             Sleep time until the scheduler should wake up and run again.
         """
+        if self._look_ahead_wheel is not None and sched_entries is None:
+            return self._run_look_ahead_once()
+
+        tick_started_at = time.perf_counter()
+        num_scanned = 0
+        num_due = 0
+        num_due_soon = 0
         sleep_time = self.max_interval
         if sched_entries is None:
-            sched_entries = self.list()
+            entry_keys = self._active_entry_keys()
+        else:
+            entry_keys = (entry.key for entry in sched_entries)
+
         with self._Session() as session:
-            for entry in sched_entries:
-                if entry.key in self._default_sched_entry_lookup:
-                    sched_entry = self._default_sched_entry_lookup[entry.key]
-                    if sched_entry.enabled == True:
-                        due_in = sched_entry.due_in() 
+            for entry_key in entry_keys:
+                if self._lock_is_lost():
+                    break
+
+                num_scanned += 1
+                if entry_key in self._default_sched_entry_lookup:
+                    sched_entry = self._default_sched_entry_lookup[entry_key]
+                    if sched_entry.enabled == True and not sched_entry.is_expired():
+                        due_in = self._due_in(sched_entry) 
+                        checked_at = time.perf_counter()
+                        if due_in <= self._due_soon:
+                            num_due_soon += 1
+
                         if due_in <= self._zero_delta:
+                            num_due += 1
                             sched_entry.sent()
-                            self.send(sched_entry)
+                            self._send_entry(sched_entry, due_in, checked_at)
                         elif due_in < sleep_time:
                             sleep_time = due_in
                 else:
                     # get column lock
-                    db_entry = session.query(SQLScheduleEntry).populate_existing().with_for_update().filter(
-                        SQLScheduleEntry.key_ == entry.key
-                    ).one_or_none()
+                    with self._operation_stats.time(operation_stats.SELECT_FOR_UPDATE):
+                        db_entry = session.query(SQLScheduleEntry).populate_existing().with_for_update().filter(
+                            SQLScheduleEntry.key_ == entry_key
+                        ).one_or_none()
                     if db_entry is None:
                         # release  column lock because the entry doesn't exist
                         session.rollback()
                         continue
                     
-                    sched_entry = self._entry_type_registry.dejson_entry(db_entry.json_) 
-                    if sched_entry.enabled == False:
-                        # release column lock because it's not enabled.
+                    sched_entry = self._decode_entry(db_entry.json_) 
+                    if sched_entry.enabled == False or sched_entry.is_expired():
+                        # release column lock because it's not enabled or it's waiting to be swept.
                         session.rollback()
                         continue
                     
-                    due_in = sched_entry.due_in()
+                    due_in = self._due_in(sched_entry)
+                    checked_at = time.perf_counter()
+                    if due_in <= self._due_soon:
+                        num_due_soon += 1
+
                     entry_is_due = due_in <= self._zero_delta
                     if entry_is_due:
-                        self._logger.debug(messages.sched_entry_due_template.format(sched_entry))
-                        sched_entry.sent()
-                        db_entry.json_ = sched_entry.json()
-                        # Release column lock
-                        session.commit()
+                        num_due += 1
+                        self._logger.debug(messages.sched_entry_due_template, sched_entry, entry_key=entry_key)
+                        with tracing.start_span(tracing.CLAIM_SPAN, {"beatdrop.entry.key": entry_key}):
+                            sched_entry.sent()
+                            self._apply_fired_entry_retention(sched_entry)
+                            db_entry.set_entry(sched_entry)
+                            # Release column lock
+                            with self._operation_stats.time(operation_stats.COMMIT):
+                                session.commit()
                     else:
                         # Release column lock
                         session.rollback()
@@ -341,27 +692,243 @@ class SQLScheduler(SingletonLockScheduler):
                     # once the lock is free, actually send the entry
                     # Done here to avoid lock contention, if this takes a sizable amount of time or there are any errors.
                     if entry_is_due:
-                        self.send(sched_entry)
+                        self._send_entry(sched_entry, due_in, checked_at)
 
                     if due_in < sleep_time:
                         sleep_time = due_in
                     
-            return sleep_time
+        self._record_tick(tick_started_at, num_scanned, num_due, num_due_soon)
+
+        return sleep_time
                     
 
-    def _cleanup(self) -> None:
+    def _sweep_expired(self) -> int:
+        """Purge or archive a batch of expired entries from the DB.
+
+        Expired entries are found with the indexed ``expires_at_`` column.
+
+        Returns
+        -------
+        int
+            Number of entries removed.
+        """
+        utc_now = utc_now_naive()
         with self._Session() as session:
-            db_lock_result = session.query(SQLSchedulerLock).populate_existing().with_for_update().all()
-            if db_lock_result[0].last_refreshed_at == self._lock_last_refreshed_at:
-                self._logger.debug(messages.sched_lock_releasing)
-                session.delete(db_lock_result[0])
-                # Release scheduler lock
+            with self._operation_stats.time(operation_stats.SELECT_FOR_UPDATE):
+                db_entries = session.query(
+                    SQLScheduleEntry
+                ).populate_existing().with_for_update().filter(
+                    SQLScheduleEntry.expires_at_ <= utc_now
+                ).order_by(
+                    SQLScheduleEntry.expires_at_
+                ).limit(
+                    self.expiry_sweep_batch_size
+                ).all()
+            for db_entry in db_entries:
+                if self.expired_entry_action == "archive":
+                    session.add(
+                        SQLScheduleEntryArchive(
+                            key_=db_entry.key_,
+                            json_=db_entry.json_,
+                            archived_at=utc_now
+                        )
+                    )
+
+                session.delete(db_entry)
+            
+            with self._operation_stats.time(operation_stats.COMMIT):
                 session.commit()
-                self._lock_last_refreshed_at = None
-                self._logger.info(messages.sched_lock_released)
-            else:
+
+        if len(db_entries) > 0:
+            self._logger.info(messages.sched_entries_expired_template, len(db_entries))
+
+        return len(db_entries)
+
+
+    def _active_entry_keys(self, page_size: int = 500) -> Iterator[str]:
+        """Keys of the enabled default entries and enabled entries in the DB.
+
+        Parameters
+        ----------
+        page_size : int, optional
+            DB page size, by default 500
+
+        Returns
+        -------
+        Iterator[str]
+            Enabled schedule entry keys.
+        """
+        for entry in self.default_sched_entries:
+            if entry.enabled:
+                yield entry.key
+
+        last_key_id = 0
+        while True:
+            with self._Session() as session, self._operation_stats.time(operation_stats.SELECT):
+                results = session.query(
+                    SQLScheduleEntry.key_id,
+                    SQLScheduleEntry.key_
+                ).filter(
+                    SQLScheduleEntry.enabled_ == True,
+                    SQLScheduleEntry.key_id > last_key_id
+                ).order_by(
+                    SQLScheduleEntry.key_id
+                ).limit(page_size).all()
+
+            for result in results:
+                yield result.key_
+
+            if len(results) < page_size:
+                return
+
+            last_key_id = results[-1].key_id
+
+
+    def _enabled_entry_jsons(self, page_size: int = 500) -> Iterator[str]:
+        """Serialized enabled entries in the DB, for ``_warm_up``.
+
+        Parameters
+        ----------
+        page_size : int, optional
+            DB page size, by default 500
+
+        Returns
+        -------
+        Iterator[str]
+            Schedule entry JSON.
+        """
+        last_key_id = 0
+        while True:
+            with self._Session() as session, self._operation_stats.time(operation_stats.SELECT):
+                results = session.query(
+                    SQLScheduleEntry.key_id,
+                    SQLScheduleEntry.json_
+                ).filter(
+                    SQLScheduleEntry.enabled_ == True,
+                    SQLScheduleEntry.key_id > last_key_id
+                ).order_by(
+                    SQLScheduleEntry.key_id
+                ).limit(page_size).all()
+
+            for result in results:
+                yield result.json_
+
+            if len(results) < page_size:
+                return
+
+            last_key_id = results[-1].key_id
+
+
+    def _look_ahead_stored_entries(
+        self, 
+        until: float, 
+        page_size: int = 500
+    ) -> Iterator[Tuple[ScheduleEntry, Optional[int]]]:
+        """Enabled entries in the DB due before ``until``, and their versions, for ``look_ahead_window``.
+
+        Entries are found with the indexed ``next_due_at_`` column.
+        Rows without a ``next_due_at_`` will not be due again and are not read, like ``RedisScheduler``.
+
+        Parameters
+        ----------
+        until : float
+            UTC epoch seconds.
+        page_size : int, optional
+            DB page size, by default 500
+
+        Returns
+        -------
+        Iterator[Tuple[ScheduleEntry, Optional[int]]]
+            Schedule entries and their ``version_``.
+        """
+        last_key_id = 0
+        while True:
+            with self._Session() as session, self._operation_stats.time(operation_stats.SELECT):
+                results = session.query(
+                    SQLScheduleEntry.key_id,
+                    SQLScheduleEntry.json_,
+                    SQLScheduleEntry.version_
+                ).filter(
+                    SQLScheduleEntry.enabled_ == True,
+                    SQLScheduleEntry.next_due_at_ <= until,
+                    SQLScheduleEntry.key_id > last_key_id
+                ).order_by(
+                    SQLScheduleEntry.key_id
+                ).limit(page_size).all()
+
+            for result in results:
+                yield self._decode_entry(result.json_), result.version_
+
+            if len(results) < page_size:
+                return
+
+            last_key_id = results[-1].key_id
+
+
+    def _claim_look_ahead_entry(
+        self,
+        sched_entry: ScheduleEntry,
+        version: Optional[int]
+    ) -> Optional[Tuple[ScheduleEntry, Optional[int]]]:
+        """Mark a held entry as sent in the DB, under its row lock.
+
+        The stored JSON is only decoded again if the row's ``version_`` changed since the entry was read.
+
+        Parameters
+        ----------
+        sched_entry : ScheduleEntry
+            Held schedule entry that is due.
+        version : Optional[int]
+            ``version_`` the entry was read at.
+
+        Returns
+        -------
+        Optional[Tuple[ScheduleEntry, Optional[int]]]
+            The sent entry and its new ``version_``, or ``None`` if it should not be sent.
+        """
+        with self._Session() as session:
+            with self._operation_stats.time(operation_stats.SELECT_FOR_UPDATE):
+                db_entry = session.query(SQLScheduleEntry).populate_existing().with_for_update().filter(
+                    SQLScheduleEntry.key_ == sched_entry.key
+                ).one_or_none()
+            if db_entry is None:
                 session.rollback()
-        
+                return None
+
+            if version is None or db_entry.version_ != version:
+                sched_entry = self._decode_entry(db_entry.json_)
+                if sched_entry.enabled == False or sched_entry.is_expired():
+                    session.rollback()
+                    return None
+
+                if self._due_in(sched_entry) > self._zero_delta:
+                    version = db_entry.version_
+                    session.rollback()
+                    self._hold_look_ahead_entry(sched_entry, version)
+                    return None
+
+            self._logger.debug(messages.sched_entry_due_template, sched_entry, entry_key=sched_entry.key)
+            with tracing.start_span(tracing.CLAIM_SPAN, {"beatdrop.entry.key": sched_entry.key}):
+                sched_entry.sent()
+                self._apply_fired_entry_retention(sched_entry)
+                # keeps ``next_due_at_`` current for entry types that do not update it when they are sent
+                sched_entry.next_due_at = sched_entry.compute_next_due_at()
+                db_entry.set_entry(sched_entry)
+                version = db_entry.version_
+                with self._operation_stats.time(operation_stats.COMMIT):
+                    session.commit()
+
+        return sched_entry, version
+
+
+    def _cleanup(self) -> None:
+        self._stop_lock_heartbeat()
+        if self._lock_strategy.release():
+            self._logger.info(messages.sched_lock_released)
+
+        self._runtime_stats.set_lock_held(False)
+        self._stop_watchdog()
+        self._stop_stats_server()
         self._logger.info(messages.scheduler_shut_down)
 
 
@@ -377,27 +944,41 @@ class SQLScheduler(SingletonLockScheduler):
             ``True`` if the lock was successfully refreshed, or else ``False``.
         """
         self._logger.debug(messages.sched_lock_refreshing)
-        utc_now = utc_now_naive()
-        with self._Session() as session:
-            # get table lock
-            db_lock_result = session.query(SQLSchedulerLock).populate_existing().with_for_update().all()
-            if db_lock_result[0].last_refreshed_at == self._lock_last_refreshed_at:
-                db_lock_result[0].last_refreshed_at = utc_now
-                # release table lock
-                session.commit()
-                self._logger.debug(messages.sched_lock_refreshed)
-                self._lock_last_refreshed_at = utc_now
-                
-                return True
+        refresh_started_at = time.perf_counter()
+        try:
+            with self._operation_stats.time(operation_stats.LOCK_REFRESH):
+                lock_refreshed = self._lock_strategy.refresh()
 
-            else:
+            if not lock_refreshed:
                 self._logger.error(messages.sched_lock_lost)
-                # release table lock
-                session.rollback()
-                self._lock_last_refreshed_at = None
-                
+                self._runtime_stats.set_lock_held(False)
+                self.metrics_sink.increment(metrics.LOCK_LOSSES)
+
                 return False
 
+            self._logger.debug(messages.sched_lock_refreshed)
+        finally:
+            self.metrics_sink.observe(
+                metrics.LOCK_REFRESH_DURATION,
+                time.perf_counter() - refresh_started_at
+            )
+
+        return True
+
+
+    def _client_session_maker(self) -> sessionmaker:
+        """Session maker for client reads.
+
+        Returns
+        -------
+        sessionmaker
+            The read replica's, unless there is none or this scheduler wrote within ``read_your_writes_window``.
+        """
+        if self._read_from_primary():
+            return self._Session
+
+        return self._ReadSession
+
 
     def save(
         self, 
@@ -420,52 +1001,208 @@ class SQLScheduler(SingletonLockScheduler):
         self._check_default_entry_overwrite(sched_entry=sched_entry)
         with self._Session() as session:
             # Get lock for the column
-            db_entry = session.query(
-                SQLScheduleEntry
-            ).populate_existing().with_for_update().filter(
-                SQLScheduleEntry.key_ == sched_entry.key
-            ).one_or_none()
+            with self._operation_stats.time(operation_stats.SELECT_FOR_UPDATE):
+                db_entry = session.query(
+                    SQLScheduleEntry
+                ).populate_existing().with_for_update().filter(
+                    SQLScheduleEntry.key_ == sched_entry.key
+                ).one_or_none()
             if db_entry is None: # If it doesn't exit create the entry
-                session.add(
-                    SQLScheduleEntry(
-                        key_=sched_entry.key,
-                        json_=sched_entry.json() 
-                    )
-                )
+                db_entry = SQLScheduleEntry()
+                sched_entry.next_due_at = sched_entry.compute_next_due_at()
+                db_entry.set_entry(sched_entry)
+                session.add(db_entry)
             else: # Update it
                 if not read_only_attributes:
                     # If we aren't setting the read only attributes get them from the db first
                     entry_dict = json.loads(db_entry.json_)
                     for ro_field in sched_entry.client_read_only_fields:
-                        setattr(sched_entry, ro_field, entry_dict[ro_field])
+                        if ro_field in entry_dict:
+                            setattr(sched_entry, ro_field, entry_dict[ro_field])
                     
                 # Update the whole entry
-                db_entry.json_ = sched_entry.json()                
+                sched_entry.next_due_at = sched_entry.compute_next_due_at()
+                db_entry.set_entry(sched_entry)
 
             # release lock
-            session.commit()
+            with self._operation_stats.time(operation_stats.COMMIT):
+                session.commit()
+
+        self._wrote(sched_entry.key)
 
 
-    def list(self, page_size: int = 500) -> SQLScheduleEntryList:
+    def list(
+        self, 
+        page_size: int = 500,
+        stream: bool = False,
+        *,
+        filter: Optional[ScheduleEntryFilter] = None
+    ) -> SQLScheduleEntryList:
         """List schedule entries.
 
         Parameters
         ----------
         page_size : int, optional
             DB page size, by default 500
+        stream : bool, optional
+            Stream entries over a single DB connection with a server side cursor, by default False.
+            Useful for listing very large numbers of entries with constant memory.
+        filter : Optional[ScheduleEntryFilter], optional
+            Only list entries that match this filter, by default None.
+            The filter is applied with indexed columns in the DB.
 
         Returns
         -------
         SQLScheduleEntryList
             Iterator of all schedule entries.  Automatically paginated DB results.
+
+        Raises
+        ------
+        TypeError
+            A filter was passed as ``page_size``.
         """
+        if isinstance(page_size, ScheduleEntryFilter):
+            # would silently be used as the page size
+            raise TypeError("'filter' must be passed as a keyword argument.")
+
         return SQLScheduleEntryList(
             page_size=page_size,
             default_sched_entries=self.default_sched_entries,
-            session_maker=self._Session,
-            entry_type_registry=self._entry_type_registry
+            session_maker=self._client_session_maker(),
+            entry_type_registry=self._entry_type_registry,
+            stream=stream,
+            filter=filter,
+            operation_stats=self._operation_stats
+        )
+
+    def list_page(
+        self,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        *,
+        filter: Optional[ScheduleEntryFilter] = None
+    ) -> EntryPage:
+        """List a page of schedule entries.
+
+        The continuation token holds the last ``key_id`` of the page, 
+        so each page is a single keyset query no matter how deep it is.
 
+        Parameters
+        ----------
+        cursor : Optional[str], optional
+            Continuation token from the previous page, by default None for the first page.
+        limit : int, optional
+            Maximum number of entries in the page, by default 100
+        filter : Optional[ScheduleEntryFilter], optional
+            Only list entries that match this filter, by default None.
+            Use the same filter for every page.
+
+        Returns
+        -------
+        EntryPage
+            The schedule entries in the page, and the continuation token for the next page.
+
+        Raises
+        ------
+        ValueError
+            ``limit`` is less than 1.
+        beatdrop.exceptions.InvalidPageCursor
+            The cursor is malformed.
+        """
+        self._check_page_limit(limit)
+        page_entries, next_cursor, state = self._page_default_entries(
+            cursor=cursor,
+            limit=limit,
+            filter=filter
         )
+        if state is None:
+            return EntryPage(entries=page_entries, cursor=next_cursor)
+
+        last_key_id = state.get("k", 0)
+        if not isinstance(last_key_id, int):
+            raise exceptions.InvalidPageCursor("Invalid page cursor '{}'.".format(cursor))
+
+        db_limit = limit - len(page_entries)
+        if db_limit < 1:
+            return EntryPage(
+                entries=page_entries,
+                cursor=encode_page_cursor({"k": last_key_id})
+            )
+
+        with self._client_session_maker()() as session, self._operation_stats.time(operation_stats.SELECT):
+            results = _filter_query(
+                session.query(
+                    SQLScheduleEntry.key_id,
+                    SQLScheduleEntry.json_
+                ),
+                filter
+            ).filter(
+                SQLScheduleEntry.key_id > last_key_id
+            ).order_by(
+                SQLScheduleEntry.key_id
+            ).limit(
+                db_limit + 1
+            ).all()
+
+        next_cursor = None
+        if len(results) > db_limit:
+            results = results[:db_limit]
+            next_cursor = encode_page_cursor({"k": results[-1].key_id})
+
+        for result in results:
+            page_entries.append(self._decode_entry(result.json_))
+
+        return EntryPage(entries=page_entries, cursor=next_cursor)
+
+
+    def count(self, *, filter: Optional[ScheduleEntryFilter] = None) -> int:
+        """Count schedule entries.
+
+        Counted with ``COUNT(*)`` in the DB, entries are not deserialized.
+
+        Parameters
+        ----------
+        filter : Optional[ScheduleEntryFilter], optional
+            Only count entries that match this filter, by default None
+
+        Returns
+        -------
+        int
+            Number of schedule entries, including default entries.
+        """
+        with self._client_session_maker()() as session, self._operation_stats.time(operation_stats.COUNT):
+            db_count = _filter_query(
+                session.query(func.count(SQLScheduleEntry.key_id)),
+                filter
+            ).scalar()
+
+        return self._count_default_entries(filter=filter) + db_count
+
+
+    def stats(self) -> EntryStats:
+        """Count schedule entries by type and enabled state.
+
+        Counted with ``GROUP BY`` on the indexed metadata columns in the DB, entries are not deserialized.
+
+        Returns
+        -------
+        EntryStats
+            Counts of schedule entries, including default entries.
+        """
+        with self._client_session_maker()() as session, self._operation_stats.time(operation_stats.COUNT):
+            db_counts = session.query(
+                SQLScheduleEntry.type_,
+                SQLScheduleEntry.enabled_,
+                func.count(SQLScheduleEntry.key_id)
+            ).group_by(
+                SQLScheduleEntry.type_,
+                SQLScheduleEntry.enabled_
+            ).all()
+
+        return EntryStats.from_counts(
+            self._default_entry_counts() + [tuple(db_count) for db_count in db_counts]
+        )
+
 
     def get(self, key: str) -> ScheduleEntry:
         """Retrieve a schedule entry by its key.
@@ -488,13 +1225,37 @@ class SQLScheduler(SingletonLockScheduler):
         if key in self._default_sched_entry_lookup:
             return self._default_sched_entry_lookup[key]
 
-        with self._Session() as session:
-            db_entry = session.query(SQLScheduleEntry).filter(SQLScheduleEntry.key_ == key).one_or_none()
+        cached = None
+        json_column = SQLScheduleEntry.json_
+        if self._entry_cache is not None:
+            cached = self._entry_cache.get(key)
+            if cached is not None:
+                # the JSON is only read if the entry changed since it was cached
+                json_column = case(
+                    (SQLScheduleEntry.version_ == cached[0], sqlalchemy.null()),
+                    else_=SQLScheduleEntry.json_
+                )
+
+        with self._client_session_maker()() as session, self._operation_stats.time(operation_stats.SELECT):
+            db_entry = session.query(
+                SQLScheduleEntry.version_,
+                json_column.label("json_")
+            ).filter(SQLScheduleEntry.key_ == key).one_or_none()
             
-        if db_entry is not None:
-            return self._entry_type_registry.dejson_entry(db_entry.json_)
+        if db_entry is None:
+            if self._entry_cache is not None:
+                self._entry_cache.invalidate(key)
+
+            raise exceptions.ScheduleEntryNotFound(messages.sched_entry_not_found_template.format(key))
+
+        if cached is not None and db_entry.json_ is None:
+            return cached[1]
+
+        sched_entry = self._decode_entry(db_entry.json_)
+        if self._entry_cache is not None and db_entry.version_ is not None:
+            self._entry_cache.put(sched_entry, version=db_entry.version_)
 
-        raise exceptions.ScheduleEntryNotFound(messages.sched_entry_not_found_template.format(key))
+        return sched_entry
  
 
     def delete(self, sched_entry: ScheduleEntry) -> None:
@@ -511,13 +1272,96 @@ class SQLScheduler(SingletonLockScheduler):
             session.query(SQLScheduleEntry).filter(
                 SQLScheduleEntry.key_ == sched_entry.key
             ).delete()
-            session.commit()
+            with self._operation_stats.time(operation_stats.COMMIT):
+                session.commit()
+
+        self._wrote(sched_entry.key)
+
+
+    def _upgrade_storage(self) -> None:
+        """Fill the indexed columns of entries saved by an earlier version of beatdrop, see ``backfill_columns``.
+
+        Raises
+        ------
+        beatdrop.exceptions.StorageSchemaError
+            The ``beatdrop_entries`` table is missing columns.
+        """
+        table_name = SQLScheduleEntry.__tablename__
+        column_names = {column['name'] for column in sqlalchemy.inspect(self._engine).get_columns(table_name)}
+        missing_columns = [
+            column.name for column in SQLScheduleEntry.__table__.columns
+            if column.name not in column_names
+        ]
+        if len(missing_columns) > 0:
+            raise exceptions.StorageSchemaError(
+                messages.sched_entries_table_missing_columns_template.format(table_name, ", ".join(missing_columns))
+            )
+
+        num_filled = self.backfill_columns()
+        if num_filled > 0:
+            self._logger.warning(messages.sched_entries_backfilled_template, num_filled)
+
+
+    def backfill_columns(self, page_size: int = 500) -> int:
+        """Fill the indexed columns of entries saved by a version of ``beatdrop`` without them, from their JSON.
+
+        Rows without a ``type_``, and enabled rows without a ``next_due_at_``, are filled.
+        Until then they are not scheduled, filtered or counted correctly.
+        The scheduler runs it each time it takes the scheduler lock.
+
+        Parameters
+        ----------
+        page_size : int, optional
+            Number of rows filled per transaction, by default 500
+
+        Returns
+        -------
+        int
+            Number of rows filled.
+        """
+        num_filled = 0
+        last_key_id = 0
+        while True:
+            with self._Session() as session:
+                with self._operation_stats.time(operation_stats.SELECT_FOR_UPDATE):
+                    db_entries = session.query(
+                        SQLScheduleEntry
+                    ).populate_existing().with_for_update().filter(
+                        or_(
+                            SQLScheduleEntry.type_ == None,
+                            and_(SQLScheduleEntry.enabled_ == True, SQLScheduleEntry.next_due_at_ == None)
+                        ),
+                        SQLScheduleEntry.key_id > last_key_id
+                    ).order_by(
+                        SQLScheduleEntry.key_id
+                    ).limit(page_size).all()
+                if len(db_entries) > 0:
+                    last_key_id = db_entries[-1].key_id
+
+                for db_entry in db_entries:
+                    sched_entry = self._decode_entry(db_entry.json_)
+                    if sched_entry.next_due_at is None:
+                        sched_entry.next_due_at = sched_entry.compute_next_due_at()
+
+                    if db_entry.type_ is not None and sched_entry.next_due_at is None:
+                        # will not be due again, nothing to fill
+                        continue
+
+                    db_entry.set_entry(sched_entry)
+                    num_filled += 1
+
+                with self._operation_stats.time(operation_stats.COMMIT):
+                    session.commit()
+
+            if len(db_entries) < page_size:
+                return num_filled
 
 
     def create_tables(self) -> None:
         """Create DB tables for the schedule entries.
         """
         SQLScheduleEntry.__table__.create(self._engine)
+        SQLScheduleEntryArchive.__table__.create(self._engine)
         SQLSchedulerLock.__table__.create(self._engine)
 
 
@@ -530,3 +1374,23 @@ class SQLScheduler(SingletonLockScheduler):
 
         return v
 
+
+    @validator(
+        "read_create_engine_kwargs"
+    )
+    def url_in_read_kwargs(cls, v: Optional[dict]) -> Optional[dict]:
+        if v is not None and "url" not in v:
+            raise ValueError("'url' must be passed as a read engine kwarg")
+
+        return v
+
+
+    @validator(
+        "lock_strategy"
+    )
+    def lock_strategy_known(cls, v: str) -> str:
+        if v not in lock_strategies:
+            raise ValueError("'lock_strategy' must be one of: {}".format(", ".join(lock_strategies)))
+
+        return v
+
@@ -0,0 +1,377 @@
+from datetime import timedelta
+from typing import Any, Dict, Optional, Tuple, Type
+import zlib
+
+import sqlalchemy
+from sqlalchemy import delete, select, text, update
+from sqlalchemy.engine import Connection, Engine
+
+from beatdrop.exceptions import MethodNotImplementedError
+from beatdrop.helpers import utc_now_naive
+from beatdrop.logger import logger
+from beatdrop import messages
+
+
+ADVISORY_LOCK_NAME = "beatdrop_scheduler_lock"
+# pg_locks shows a bigint advisory key as classid (high 32 bits) and objid (low 32 bits)
+ADVISORY_LOCK_KEY = zlib.crc32(ADVISORY_LOCK_NAME.encode()) & 0x7fffffff
+
+
+class SQLLockStrategy:
+    """Base class of the ``SQLScheduler`` scheduler lock strategies.
+
+    Strategies **must** implement these methods:
+
+    - ``try_acquire`` - Try once to acquire the lock.
+    - ``refresh`` - Check the lock is still held, and extend it.
+    - ``release`` - Release the lock if it is held.
+
+    Parameters
+    ----------
+    engine : Engine
+        SQLAlchemy engine of the scheduler.
+    session_maker : Any
+        SQLAlchemy session factory bound to ``engine``.
+    lock_table : Any
+        ORM class of the scheduler lock table, see ``beatdrop.schedulers.sql_scheduler.SQLSchedulerLock``.
+    instance_id : str
+        Unique id of the scheduler holding or waiting for the lock.
+    lock_timeout : timedelta
+        The time a scheduler does not refresh the scheduler lock before it is considered dead.
+    """
+
+    # SQLAlchemy dialect names the strategy works on, empty for all.
+    dialects: Tuple[str, ...] = ()
+
+    def __init__(
+        self,
+        engine: Engine,
+        session_maker: Any,
+        lock_table: Any,
+        instance_id: str,
+        lock_timeout: timedelta
+    ) -> None:
+        self.engine = engine
+        self.session_maker = session_maker
+        self.lock_table = lock_table
+        self.instance_id = instance_id
+        self.lock_timeout = lock_timeout
+
+
+    def try_acquire(self) -> Tuple[bool, Optional[float]]:
+        """Try once to acquire the scheduler lock.
+
+        Returns
+        -------
+        Tuple[bool, Optional[float]]
+            Whether the lock was acquired,
+            and the seconds until the current holder's lock expires or ``None`` if it is not known.
+        """
+        raise MethodNotImplementedError("`try_acquire` not implemented.")
+
+
+    def refresh(self) -> bool:
+        """Refresh the scheduler lock.
+
+        Returns
+        -------
+        bool
+            ``True`` if the lock is still held, or else ``False``.
+        """
+        raise MethodNotImplementedError("`refresh` not implemented.")
+
+
+    def release(self) -> bool:
+        """Release the scheduler lock if it is held.
+
+        Returns
+        -------
+        bool
+            ``True`` if the lock was held and released, or else ``False``.
+        """
+        raise MethodNotImplementedError("`release` not implemented.")
+
+
+class RowLeaseLock(SQLLockStrategy):
+    """Lease on the single row of the scheduler lock table. Works on every database.
+
+    The row holds the ``owner_id`` of the scheduler holding the lease and a ``version``
+    that is incremented by every acquisition and refresh.
+    Each operation is a conditional ``UPDATE`` or ``DELETE`` on the owner and version the scheduler last wrote,
+    so no row lock is held between statements and ownership does not depend on datetime equality.
+    The lease expires when it is not refreshed for ``lock_timeout``.
+
+    Waiting schedulers record themselves in ``standby_id`` and ``standby_seen_at``,
+    and a releasing scheduler hands the lease off to a recently seen standby by setting ``hand_off_to``.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._version: Optional[int] = None
+
+
+    def _held_by_me(self) -> Any:
+        return sqlalchemy.and_(
+            self.lock_table.owner_id == self.instance_id,
+            self.lock_table.version == self._version
+        )
+
+
+    def try_acquire(self) -> Tuple[bool, Optional[float]]:
+        utc_now = utc_now_naive()
+        with self.session_maker() as session:
+            db_lock = session.execute(select(self.lock_table)).scalars().first()
+            if db_lock is None:
+                logger.debug(messages.sched_lock_creating)
+                session.add(
+                    self.lock_table(
+                        last_refreshed_at=utc_now,
+                        owner_id=self.instance_id,
+                        version=1
+                    )
+                )
+                session.commit()
+                self._version = 1
+
+                return True, None
+
+            lock_expired = (utc_now - db_lock.last_refreshed_at) > self.lock_timeout
+            if lock_expired or db_lock.hand_off_to == self.instance_id:
+                if lock_expired:
+                    logger.debug(messages.sched_lock_expired)
+
+                version = (db_lock.version or 0) + 1
+                # only one of the schedulers that saw this version takes the lease
+                result = session.execute(
+                    update(self.lock_table)
+                    .where(self.lock_table.version == db_lock.version)
+                    .values(
+                        last_refreshed_at=utc_now,
+                        owner_id=self.instance_id,
+                        version=version,
+                        hand_off_to=None
+                    )
+                    .execution_options(synchronize_session=False)
+                )
+                session.commit()
+                if result.rowcount == 1:
+                    self._version = version
+
+                    return True, None
+
+                return False, None
+
+            session.execute(
+                update(self.lock_table)
+                .values(
+                    standby_id=self.instance_id,
+                    standby_seen_at=utc_now
+                )
+                .execution_options(synchronize_session=False)
+            )
+            session.commit()
+
+            return False, (db_lock.last_refreshed_at + self.lock_timeout - utc_now).total_seconds()
+
+
+    def refresh(self) -> bool:
+        if self._version is None:
+            return False
+
+        with self.session_maker() as session:
+            result = session.execute(
+                update(self.lock_table)
+                .where(self._held_by_me())
+                .values(
+                    last_refreshed_at=utc_now_naive(),
+                    version=self._version + 1
+                )
+                .execution_options(synchronize_session=False)
+            )
+            session.commit()
+
+        if result.rowcount != 1:
+            self._version = None
+
+            return False
+
+        self._version += 1
+
+        return True
+
+
+    def release(self) -> bool:
+        if self._version is None:
+            return False
+
+        with self.session_maker() as session:
+            db_lock = session.execute(
+                select(self.lock_table).where(self._held_by_me())
+            ).scalars().first()
+            if db_lock is None:
+                self._version = None
+
+                return False
+
+            logger.debug(messages.sched_lock_releasing)
+            utc_now = utc_now_naive()
+            if (
+                db_lock.standby_id is not None
+                and db_lock.standby_id != self.instance_id
+                and utc_now - db_lock.standby_seen_at <= self.lock_timeout
+            ):
+                # the lease stays reserved for the standby, it takes over on its next check
+                logger.info(messages.sched_lock_handing_off_template, db_lock.standby_id)
+                statement = update(self.lock_table).where(self._held_by_me()).values(
+                    last_refreshed_at=utc_now,
+                    owner_id=None,
+                    version=self._version + 1,
+                    hand_off_to=db_lock.standby_id
+                )
+            else:
+                statement = delete(self.lock_table).where(self._held_by_me())
+
+            result = session.execute(statement.execution_options(synchronize_session=False))
+            session.commit()
+
+        self._version = None
+
+        return result.rowcount == 1
+
+
+class AdvisoryLock(SQLLockStrategy):
+    """Base class of session level advisory locks.
+
+    The lock is held by a dedicated connection in autocommit mode, for as long as the scheduler holds it.
+    The database releases it as soon as that connection closes, so a standby can take over
+    as soon as a dead scheduler's connection is dropped, without waiting for ``lock_timeout``.
+    No rows are written or locked, so the lock does not contend with clients writing schedule entries.
+
+    Advisory locks do not expire, do not record standbys and are not handed off.
+    Standbys check the lock every ``standby_poll_interval``.
+    """
+
+    _try_lock_sql = ""
+    _held_sql = ""
+    _unlock_sql = ""
+    _params: Dict[str, Any] = {}
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._connection: Optional[Connection] = None
+        self._held = False
+
+
+    def _close(self) -> None:
+        self._held = False
+        if self._connection is not None:
+            try:
+                self._connection.close()
+            except sqlalchemy.exc.SQLAlchemyError:
+                pass
+
+            self._connection = None
+
+
+    def try_acquire(self) -> Tuple[bool, Optional[float]]:
+        if self._connection is None:
+            self._connection = self.engine.connect().execution_options(isolation_level="AUTOCOMMIT")
+
+        try:
+            self._held = bool(self._connection.execute(text(self._try_lock_sql), self._params).scalar())
+        except sqlalchemy.exc.SQLAlchemyError:
+            self._close()
+            raise
+
+        return self._held, None
+
+
+    def refresh(self) -> bool:
+        if not self._held:
+            return False
+
+        try:
+            self._held = bool(self._connection.execute(text(self._held_sql), self._params).scalar())
+        except sqlalchemy.exc.SQLAlchemyError:
+            # the lock went with the connection
+            self._held = False
+
+        if not self._held:
+            self._close()
+
+        return self._held
+
+
+    def release(self) -> bool:
+        if not self._held:
+            self._close()
+
+            return False
+
+        logger.debug(messages.sched_lock_releasing)
+        try:
+            released = bool(self._connection.execute(text(self._unlock_sql), self._params).scalar())
+        except sqlalchemy.exc.SQLAlchemyError:
+            released = False
+
+        self._close()
+
+        return released
+
+
+class PostgresAdvisoryLock(AdvisoryLock):
+    """PostgreSQL session level advisory lock, with ``pg_try_advisory_lock``.
+    """
+
+    dialects = ("postgresql",)
+    _try_lock_sql = "SELECT pg_try_advisory_lock(:key)"
+    _held_sql = (
+        "SELECT EXISTS (SELECT 1 FROM pg_locks WHERE locktype = 'advisory' AND granted "
+        "AND pid = pg_backend_pid() AND classid::bigint = 0 AND objid::bigint = :key AND objsubid = 1)"
+    )
+    _unlock_sql = "SELECT pg_advisory_unlock(:key)"
+    _params = {"key": ADVISORY_LOCK_KEY}
+
+
+class MySQLGetLock(AdvisoryLock):
+    """MySQL and MariaDB named lock, with ``GET_LOCK``.
+    """
+
+    dialects = ("mysql",)
+    _try_lock_sql = "SELECT GET_LOCK(:name, 0)"
+    _held_sql = "SELECT IS_USED_LOCK(:name) = CONNECTION_ID()"
+    _unlock_sql = "SELECT RELEASE_LOCK(:name)"
+    _params = {"name": ADVISORY_LOCK_NAME}
+
+
+lock_strategies: Dict[str, Type[SQLLockStrategy]] = {
+    "row_lease": RowLeaseLock,
+    "pg_advisory": PostgresAdvisoryLock,
+    "mysql_get_lock": MySQLGetLock
+}
+
+
+def lock_strategy_for(name: str, dialect_name: str) -> Type[SQLLockStrategy]:
+    """Get the lock strategy class for a strategy name and SQLAlchemy dialect.
+
+    Strategies that do not support the dialect fall back to ``RowLeaseLock``.
+
+    Parameters
+    ----------
+    name : str
+        Name of the strategy in ``lock_strategies``.
+    dialect_name : str
+        SQLAlchemy dialect name of the engine, like ``postgresql``.
+
+    Returns
+    -------
+    Type[SQLLockStrategy]
+        Lock strategy class.
+    """
+    strategy = lock_strategies[name]
+    if strategy.dialects and dialect_name not in strategy.dialects:
+        logger.warning(messages.sched_lock_strategy_fallback_template, name, dialect_name)
+
+        return RowLeaseLock
+
+    return strategy
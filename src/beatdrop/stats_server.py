@@ -0,0 +1,85 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import threading
+from typing import Tuple
+
+from beatdrop.logger import logger
+from beatdrop.runtime_stats import RuntimeStats
+from beatdrop import messages
+
+
+class _StatsRequestHandler(BaseHTTPRequestHandler):
+
+    def do_GET(self) -> None:
+        if self.path not in ("/", "/stats"):
+            self.send_error(404)
+            return
+
+        body = json.dumps(self.server.runtime_stats.snapshot()).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+    def log_message(self, format: str, *args) -> None:
+        # ``http.server`` passes a printf style format
+        logger.debug(messages.stats_server_request_template, format % args)
+
+
+class StatsServer:
+    """Localhost HTTP server that reports a scheduler's ``RuntimeStats`` as JSON.
+
+    ``GET /stats`` returns ``RuntimeStats.snapshot()``.
+    Requests are served from daemon threads, separate from the scheduler's run loop.
+
+    Parameters
+    ----------
+    runtime_stats : RuntimeStats
+        Stats to report.
+    host : str, optional
+        Address to listen on, by default "127.0.0.1"
+    port : int, optional
+        Port to listen on, by default 0 for any free port.
+    """
+
+    def __init__(
+        self,
+        runtime_stats: RuntimeStats,
+        host: str = "127.0.0.1",
+        port: int = 0
+    ) -> None:
+        self._httpd = ThreadingHTTPServer((host, port), _StatsRequestHandler)
+        self._httpd.daemon_threads = True
+        self._httpd.runtime_stats = runtime_stats
+        self._thread = None
+
+
+    @property
+    def address(self) -> Tuple[str, int]:
+        """Host and port the server is listening on."""
+        return self._httpd.server_address[:2]
+
+
+    def start(self) -> None:
+        """Start serving in a daemon thread.
+        """
+        self._thread = threading.Thread(
+            target=self._httpd.serve_forever,
+            name="beatdrop-stats-server",
+            daemon=True
+        )
+        self._thread.start()
+        logger.info(messages.stats_server_started_template, *self.address)
+
+
+    def stop(self) -> None:
+        """Stop serving and close the socket.
+        """
+        if self._thread is not None:
+            self._httpd.shutdown()
+            self._thread.join()
+            self._thread = None
+
+        self._httpd.server_close()
@@ -0,0 +1,310 @@
+import math
+import time
+from typing import Dict, Iterator, List, Optional, Tuple
+
+
+class TimingWheel:
+    """Hierarchical timing wheel of schedule entry keys and their due times.
+
+    Time is cut into ticks of ``tick`` seconds.
+    Level 0 has a slot per tick for the next ``wheel_size`` ticks,
+    and each level above has slots that span ``wheel_size`` slots of the level below.
+    When a level's cursor wraps around, the next slot of the level above is cascaded down,
+    so every key is moved at most ``levels`` times before it expires.
+
+    Scheduling, cancelling and expiring a key are O(1), however many keys are in the wheel.
+    Keys due after the range of the top level wait in its last slot, and are placed again when it is cascaded.
+    ``advance`` expires keys at their due time, never early, and ``next_due`` is the time to advance to.
+    The wheel is not thread safe.
+
+    Parameters
+    ----------
+    tick : float, optional
+        Seconds per tick, by default 0.05
+    wheel_size : int, optional
+        Slots per level, by default 256
+    levels : int, optional
+        Number of levels, by default 4
+    start : Optional[float], optional
+        UTC epoch seconds of the first tick, by default None for the current time.
+    """
+
+    __slots__ = (
+        "tick",
+        "wheel_size",
+        "levels",
+        "_current",
+        "_wheels",
+        "_timers",
+        "_ready"
+    )
+
+    def __init__(
+        self,
+        tick: float = 0.05,
+        wheel_size: int = 256,
+        levels: int = 4,
+        start: Optional[float] = None
+    ) -> None:
+        self.tick = tick
+        self.wheel_size = wheel_size
+        self.levels = levels
+        self._current = math.floor((time.time() if start is None else start) / tick)
+        self._wheels: List[List[Dict[str, float]]] = [
+            [{} for _ in range(wheel_size)] for _ in range(levels)
+        ]
+        # key: (level, slot), level -1 for keys that are already due
+        self._timers: Dict[str, Tuple[int, int]] = {}
+        self._ready: Dict[str, float] = {}
+
+
+    def schedule(self, key: str, due_at: float) -> None:
+        """Schedule a key, replacing its due time if it is already scheduled.
+
+        Parameters
+        ----------
+        key : str
+            Schedule entry key.
+        due_at : float
+            UTC epoch seconds the key is due at.
+        """
+        self.cancel(key)
+        self._place(key, due_at)
+
+
+    def cancel(self, key: str) -> bool:
+        """Remove a key from the wheel.
+
+        Parameters
+        ----------
+        key : str
+            Schedule entry key.
+
+        Returns
+        -------
+        bool
+            ``True`` if the key was scheduled, or else ``False``.
+        """
+        location = self._timers.pop(key, None)
+        if location is None:
+            return False
+
+        level, slot = location
+        if level < 0:
+            del self._ready[key]
+        else:
+            del self._wheels[level][slot][key]
+
+        return True
+
+
+    def advance(self, now: float) -> List[str]:
+        """Move the wheel forward to ``now``, and expire the keys that are due.
+
+        Parameters
+        ----------
+        now : float
+            UTC epoch seconds.
+
+        Returns
+        -------
+        List[str]
+            Keys due at or before ``now``, removed from the wheel.
+        """
+        # a key due exactly on a tick is due at that tick, despite float rounding
+        target = math.floor(now / self.tick + 1e-9)
+        if not self._timers:
+            self._current = max(self._current, target)
+            return []
+
+        due_keys = list(self._ready)
+        self._ready.clear()
+        for key in due_keys:
+            del self._timers[key]
+
+        while self._current < target and self._timers:
+            if target - self._current > self.wheel_size:
+                # skip the empty ticks, instead of stepping through them
+                self._current = max(self._current, min(self._next_tick(), target) - 1)
+
+            self._current += 1
+            self._cascade()
+            slot = self._wheels[0][self._current % self.wheel_size]
+            expired = list(slot.items())
+            slot.clear()
+            for key, due_at in expired:
+                del self._timers[key]
+                if self._tick_of(due_at) <= self._current:
+                    due_keys.append(key)
+                else:
+                    # with a single level, keys due after its range wait in level 0
+                    self._place(key, due_at)
+
+        self._current = max(self._current, target)
+        # keys cascaded into the ready set on the last tick are due too
+        for key in self._ready:
+            del self._timers[key]
+
+        due_keys.extend(self._ready)
+        self._ready.clear()
+        # and keys of the next tick that are due before it starts
+        for slot in self._slots_at(self._current + 1):
+            expired = [key for key, due_at in slot.items() if due_at <= now]
+            for key in expired:
+                del slot[key]
+                del self._timers[key]
+
+            due_keys.extend(expired)
+
+        return due_keys
+
+
+    def next_due(self) -> Optional[float]:
+        """Get the earliest time a key is due, to sleep until.
+
+        The time is exact, unless the earliest key is in a slot of an upper level that starts later.
+        Then it is the start of that slot, and advancing the wheel to it cascades the keys down.
+
+        Returns
+        -------
+        Optional[float]
+            UTC epoch seconds, or ``None`` if the wheel is empty.
+        """
+        if not self._timers:
+            return None
+
+        if self._ready:
+            return self._current * self.tick
+
+        next_tick = self._next_tick()
+        next_due = next_tick * self.tick
+        for slot in self._slots_at(next_tick):
+            if slot:
+                next_due = min(next_due, min(slot.values()))
+
+        return next_due
+
+
+    def count_before(self, until: float) -> int:
+        """Count the keys due before ``until``.
+
+        Parameters
+        ----------
+        until : float
+            UTC epoch seconds.
+
+        Returns
+        -------
+        int
+            Number of keys due before ``until``.
+        """
+        count = len(self._ready)
+        until_tick = self._tick_of(until)
+        for level, wheel in enumerate(self._wheels):
+            span = self.wheel_size ** level
+            position = self._current // span
+            for offset in range(1, self.wheel_size + 1):
+                slot_start = (position + offset) * span
+                if slot_start > until_tick:
+                    break
+
+                slot = wheel[(position + offset) % self.wheel_size]
+                # the top level also holds keys due after its range
+                if slot_start + span <= until_tick and level < self.levels - 1:
+                    count += len(slot)
+                else:
+                    count += sum(1 for due_at in slot.values() if due_at < until)
+
+        return count
+
+
+    def due_at(self, key: str) -> float:
+        """Get the UTC epoch seconds a key is due at.
+        """
+        level, slot = self._timers[key]
+        if level < 0:
+            return self._ready[key]
+
+        return self._wheels[level][slot][key]
+
+
+    def _next_tick(self) -> int:
+        """First tick after the current one with a slot to expire or cascade, in any level."""
+        next_tick = None
+        for level, wheel in enumerate(self._wheels):
+            span = self.wheel_size ** level
+            position = self._current // span
+            for offset in range(1, self.wheel_size + 1):
+                if wheel[(position + offset) % self.wheel_size]:
+                    slot_start = (position + offset) * span
+                    if next_tick is None or slot_start < next_tick:
+                        next_tick = slot_start
+
+                    break
+
+        return self._current + 1 if next_tick is None else next_tick
+
+
+    def _slots_at(self, tick: int) -> Iterator[Dict[str, float]]:
+        """Slots of every level that start at a tick."""
+        span = 1
+        for wheel in self._wheels:
+            if tick % span == 0:
+                yield wheel[(tick // span) % self.wheel_size]
+
+            span *= self.wheel_size
+
+
+    def _tick_of(self, timestamp: float) -> int:
+        return math.ceil(timestamp / self.tick)
+
+
+    def _place(self, key: str, due_at: float) -> None:
+        due_tick = self._tick_of(due_at)
+        delta = due_tick - self._current
+        if delta <= 0:
+            self._ready[key] = due_at
+            self._timers[key] = (-1, 0)
+            return
+
+        span = 1
+        for level in range(self.levels):
+            if delta < span * self.wheel_size:
+                slot = (due_tick // span) % self.wheel_size
+                break
+
+            span *= self.wheel_size
+        else:
+            # past the range of the wheel, wait in the slot of the top level that is cascaded last
+            level = self.levels - 1
+            slot = (self._current // (span // self.wheel_size) - 1) % self.wheel_size
+
+        self._wheels[level][slot][key] = due_at
+        self._timers[key] = (level, slot)
+
+
+    def _cascade(self) -> None:
+        """Place the keys of the upper level slots that start at the current tick again, highest level first."""
+        span = self.wheel_size ** (self.levels - 1)
+        for level in range(self.levels - 1, 0, -1):
+            if self._current % span == 0:
+                slot = self._wheels[level][(self._current // span) % self.wheel_size]
+                cascaded = list(slot.items())
+                slot.clear()
+                for key, due_at in cascaded:
+                    del self._timers[key]
+                    self._place(key, due_at)
+
+            span //= self.wheel_size
+
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._timers
+
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._timers)
+
+
+    def __len__(self) -> int:
+        return len(self._timers)
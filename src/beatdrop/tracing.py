@@ -0,0 +1,135 @@
+"""Optional OpenTelemetry tracing.
+
+Install the ``otel`` extra, and configure an OpenTelemetry tracer provider to enable tracing.
+Without ``opentelemetry-api`` installed all of these functions are no-ops.
+
+Schedulers emit spans:
+
+- ``beatdrop.tick`` - Each time the scheduler checks its entries.
+- ``beatdrop.claim`` - A due entry in storage is updated as sent, while its lock is held.
+- ``beatdrop.send`` - A due entry is sent to the task backend.
+
+The trace context of the send span is propagated to the tasks.
+Celery tasks get it in the message headers,
+and RQ jobs get it in ``job.meta`` under the ``RQ_META_KEY`` key.
+
+Example
+-------
+.. code-block:: python
+
+    from opentelemetry import context
+    import rq
+
+    from beatdrop import tracing
+
+    def my_task():
+        job = rq.get_current_job()
+        trace_context = tracing.extract_context(job.meta.get(tracing.RQ_META_KEY, {}))
+        token = context.attach(trace_context)
+        try:
+            ... # spans here are children of the beatdrop send span
+        finally:
+            context.detach(token)
+"""
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+
+try:
+    from opentelemetry import propagate, trace
+except ModuleNotFoundError: # pragma: no cover
+    propagate = None
+    trace = None
+
+
+TICK_SPAN = "beatdrop.tick"
+CLAIM_SPAN = "beatdrop.claim"
+SEND_SPAN = "beatdrop.send"
+
+RQ_META_KEY = "beatdrop_trace_context"
+
+
+def is_enabled() -> bool:
+    """Check if ``opentelemetry-api`` is installed.
+
+    Returns
+    -------
+    bool
+        ``True`` if spans are emitted, or else ``False``.
+    """
+    return trace is not None
+
+
+@contextmanager
+def start_span(
+    name: str,
+    attributes: Optional[Dict[str, Any]] = None
+) -> Iterator[Any]:
+    """Start a span as the current span.
+
+    Parameters
+    ----------
+    name : str
+        Span name.
+    attributes : Optional[Dict[str, Any]], optional
+        Span attributes, by default None
+
+    Yields
+    ------
+    Any
+        The OpenTelemetry span, or ``None`` when tracing is not installed.
+    """
+    if trace is None:
+        yield None
+        return
+
+    with trace.get_tracer("beatdrop").start_as_current_span(name, attributes=attributes) as span:
+        yield span
+
+
+def set_span_attributes(attributes: Dict[str, Any]) -> None:
+    """Set attributes on the current span.
+
+    Parameters
+    ----------
+    attributes : Dict[str, Any]
+        Span attributes.
+    """
+    if trace is None:
+        return
+
+    trace.get_current_span().set_attributes(attributes)
+
+
+def inject_context() -> Dict[str, str]:
+    """Serialize the current trace context to send with a task.
+
+    Returns
+    -------
+    Dict[str, str]
+        Trace context carrier, like the W3C ``traceparent`` header.
+        Empty when tracing is not installed or there is no current span.
+    """
+    carrier = {}
+    if propagate is not None:
+        propagate.inject(carrier)
+
+    return carrier
+
+
+def extract_context(carrier: Dict[str, str]) -> Any:
+    """Deserialize a trace context sent with a task.
+
+    Parameters
+    ----------
+    carrier : Dict[str, str]
+        Trace context carrier created with ``inject_context``.
+
+    Returns
+    -------
+    Any
+        OpenTelemetry context, or ``None`` when tracing is not installed.
+    """
+    if propagate is None:
+        return None
+
+    return propagate.extract(carrier)
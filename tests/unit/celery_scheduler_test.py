@@ -1,13 +1,15 @@
 
 import datetime
 import json
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch, PropertyMock
 
 import celery
 import pytest
 import redislite
 
+from beatdrop import metrics
 from beatdrop.entries import IntervalEntry
+from beatdrop.metrics import PrometheusMetricsSink
 from beatdrop.schedulers import CeleryScheduler
 
 
@@ -60,6 +62,17 @@ def test_send(
     assert json.loads(rdb.lrange("celery", 0, 100)[0])['headers']['task'] == celery_entry.task
 
 
+def test_send_fencing_token(
+    rdb: redislite.Redis,
+    celery_entry: IntervalEntry,
+    celery_scheduler: CeleryScheduler
+) -> None:
+    with patch.object(CeleryScheduler, "fencing_token", new_callable=PropertyMock, return_value=7):
+        celery_scheduler.send(celery_entry)
+
+    assert json.loads(rdb.lrange("celery", 0, 100)[0])['headers']['beatdrop_fencing_token'] == 7
+
+
 def test_send_not_found(
     rdb: redislite.Redis,
     celery_entry: IntervalEntry,
@@ -92,8 +105,10 @@ def test_send_exception(
     celery_scheduler: CeleryScheduler,
     caplog: pytest.LogCaptureFixture
 ) -> None:
-    celery_scheduler.celery_app.tasks[celery_entry.task].delay = MagicMock(side_effect=[Exception]) 
+    celery_scheduler.metrics_sink = PrometheusMetricsSink()
+    celery_scheduler.celery_app.tasks[celery_entry.task].apply_async = MagicMock(side_effect=[Exception]) 
     celery_scheduler.send(celery_entry)
     assert "ERROR" in caplog.text
     assert len(rdb.lrange("celery", 0, 100)) == 0
+    assert metrics.SEND_FAILURES in celery_scheduler.metrics_sink.render()
 
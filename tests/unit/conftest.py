@@ -159,6 +159,38 @@ def default_entries(
     ]
 
 
+@pytest.fixture(scope="function")
+def filter_entries(test_task: str) -> List[entries.ScheduleEntry]:
+    return [
+        entries.CrontabTZEntry(
+            key="team_a:tz_enabled",
+            enabled=True,
+            task=test_task,
+            cron_expression="*/1 * * * *",
+            timezone="US/Eastern"
+        ),
+        entries.CrontabTZEntry(
+            key="team_a:tz_disabled",
+            enabled=False,
+            task=test_task,
+            cron_expression="*/1 * * * *",
+            timezone="US/Eastern"
+        ),
+        entries.IntervalEntry(
+            key="team_b:interval_other_task",
+            enabled=True,
+            task="beatdrop.validators.valid_cron_expression",
+            period=120
+        ),
+        entries.IntervalEntry(
+            key="team_b:interval*[glob]",
+            enabled=True,
+            task=test_task,
+            period=120
+        )
+    ]
+
+
 @pytest.fixture(scope="function")
 def rdb() -> redislite.Redis:
     return redislite.Redis(decode_responses=True)
@@ -1,5 +1,6 @@
 
 import datetime
+import time
 
 import pytest
 
@@ -46,3 +47,27 @@ def test_sent(crontab_entry: CrontabEntry) -> None:
     last_sent = crontab_entry.last_sent_at
     crontab_entry.sent()
     assert last_sent < crontab_entry.last_sent_at
+
+
+def test_next_due_at(crontab_entry: CrontabEntry) -> None:
+    assert crontab_entry.next_due_at is None
+    assert crontab_entry.compute_next_due_at() == pytest.approx(time.time() + crontab_entry.due_in().total_seconds(), abs=1)
+    crontab_entry.sent()
+    assert crontab_entry.next_due_at == crontab_entry.compute_next_due_at()
+    assert 0 < crontab_entry.next_due_at - time.time() <= 60
+
+
+def test_seconds_field(test_task: str) -> None:
+    crontab_entry = CrontabEntry(
+        key="every_15_seconds",
+        enabled=True,
+        task=test_task,
+        cron_expression="* * * * * */15",
+        last_sent_at=datetime.datetime(2024, 1, 1, 12, 0, 0, 500000)
+    )
+    assert crontab_entry._next_run_at() == datetime.datetime(2024, 1, 1, 12, 0, 15)
+    crontab_entry.sent()
+    assert 0 < crontab_entry.next_due_at - time.time() <= 15
+
+    with pytest.raises(ValueError):
+        crontab_entry.cron_expression = "* * * * * 61"
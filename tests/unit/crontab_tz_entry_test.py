@@ -1,5 +1,6 @@
 
 import datetime
+import time
 
 import pytest
 
@@ -48,3 +49,27 @@ def test_sent(crontab_tz_entry: CrontabTZEntry) -> None:
     last_sent = crontab_tz_entry.last_sent_at
     crontab_tz_entry.sent()
     assert last_sent < crontab_tz_entry.last_sent_at
+
+
+def test_next_due_at(crontab_tz_entry: CrontabTZEntry) -> None:
+    assert crontab_tz_entry.next_due_at is None
+    assert crontab_tz_entry.compute_next_due_at() == pytest.approx(
+        time.time() + crontab_tz_entry.due_in().total_seconds(),
+        abs=1
+    )
+    crontab_tz_entry.sent()
+    assert crontab_tz_entry.next_due_at == crontab_tz_entry.compute_next_due_at()
+    assert 0 < crontab_tz_entry.next_due_at - time.time() <= 60
+
+
+def test_seconds_field(test_task: str) -> None:
+    crontab_tz_entry = CrontabTZEntry(
+        key="every_15_seconds",
+        enabled=True,
+        task=test_task,
+        cron_expression="* 9 * * * */15",
+        timezone="us/eastern",
+        last_sent_at=datetime.datetime(2024, 1, 1, 14, 0, 0, 500000)
+    )
+    # 9 AM in New York is 2 PM in UTC in January
+    assert crontab_tz_entry._next_run_at() == datetime.datetime(2024, 1, 1, 14, 0, 15)
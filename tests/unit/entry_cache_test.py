@@ -0,0 +1,74 @@
+import time
+
+from beatdrop.entries import IntervalEntry
+from beatdrop.entry_cache import EntryCache
+
+
+def make_entry(key: str) -> IntervalEntry:
+    return IntervalEntry(
+        key=key,
+        enabled=True,
+        task="test.task",
+        period=10
+    )
+
+
+def test_get_put() -> None:
+    cache = EntryCache(max_size=2)
+    entry = make_entry("a")
+    assert cache.get("a") is None
+    cache.put(entry, version=3)
+    version, cached_entry = cache.get("a")
+    assert version == 3
+    assert cached_entry == entry
+    # copies are cached and returned
+    cached_entry.enabled = False
+    entry.task = "other.task"
+    cached_entry = cache.get("a")[1]
+    assert cached_entry.enabled == True
+    assert cached_entry.task == "test.task"
+    assert cache.hits == 2
+    assert cache.misses == 1
+
+
+def test_lru_eviction() -> None:
+    cache = EntryCache(max_size=2)
+    cache.put(make_entry("a"))
+    cache.put(make_entry("b"))
+    assert cache.get("a") is not None
+    cache.put(make_entry("c"))
+    assert len(cache) == 2
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
+
+
+def test_ttl() -> None:
+    cache = EntryCache(max_size=2, ttl=.1)
+    cache.put(make_entry("a"))
+    assert cache.get("a") is not None
+    time.sleep(.15)
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_invalidate() -> None:
+    cache = EntryCache(max_size=2)
+    cache.put(make_entry("a"))
+    cache.put(make_entry("b"))
+    cache.invalidate("a")
+    assert cache.get("a") is None
+    assert cache.get("b") is not None
+    cache.clear()
+    assert cache.get("b") is None
+
+
+def test_put_after_invalidation() -> None:
+    cache = EntryCache(max_size=2)
+    generation = cache.generation
+    cache.invalidate("a")
+    # read before the invalidation, so it may be stale
+    cache.put(make_entry("a"), generation=generation)
+    assert cache.get("a") is None
+    cache.put(make_entry("a"), generation=cache.generation)
+    assert cache.get("a") is not None
@@ -0,0 +1,61 @@
+
+from typing import List
+
+import pytest
+
+from beatdrop import entries, ScheduleEntryFilter
+
+
+def test_creation() -> None:
+    sched_filter = ScheduleEntryFilter()
+    assert sched_filter.key_prefix is None
+    assert sched_filter.entry_type is None
+    assert sched_filter.task is None
+    assert sched_filter.enabled is None
+
+
+def test_entry_type_class_name() -> None:
+    assert ScheduleEntryFilter(entry_type=entries.CrontabTZEntry).entry_type == "CrontabTZEntry"
+    assert ScheduleEntryFilter(entry_type="CrontabTZEntry").entry_type == "CrontabTZEntry"
+
+
+@pytest.mark.parametrize(
+    "sched_filter,expected_keys",
+    [
+        (
+            ScheduleEntryFilter(),
+            ["team_a:tz_enabled", "team_a:tz_disabled", "team_b:interval_other_task", "team_b:interval*[glob]"]
+        ),
+        (
+            ScheduleEntryFilter(key_prefix="team_a:"),
+            ["team_a:tz_enabled", "team_a:tz_disabled"]
+        ),
+        (
+            ScheduleEntryFilter(entry_type=entries.IntervalEntry),
+            ["team_b:interval_other_task", "team_b:interval*[glob]"]
+        ),
+        (
+            ScheduleEntryFilter(task="beatdrop.validators.valid_cron_expression"),
+            ["team_b:interval_other_task"]
+        ),
+        (
+            ScheduleEntryFilter(enabled=False),
+            ["team_a:tz_disabled"]
+        ),
+        (
+            ScheduleEntryFilter(entry_type=entries.CrontabTZEntry, enabled=True),
+            ["team_a:tz_enabled"]
+        ),
+        (
+            ScheduleEntryFilter(key_prefix="team_b:interval*"),
+            ["team_b:interval*[glob]"]
+        )
+    ]
+)
+def test_matches(
+    filter_entries: List[entries.ScheduleEntry],
+    sched_filter: ScheduleEntryFilter,
+    expected_keys: List[str]
+) -> None:
+    matched_keys = [entry.key for entry in filter_entries if sched_filter.matches(entry)]
+    assert matched_keys == expected_keys
@@ -0,0 +1,125 @@
+import math
+import time
+from typing import List
+
+import pytest
+
+from beatdrop import entries
+from beatdrop.entry_index import CompactEntryIndex
+from beatdrop.entry_type_registry import EntryTypeRegistry
+from beatdrop.exceptions import ScheduleEntryTypeNotRegistered
+
+
+sched_entry_types = (
+    entries.CrontabEntry,
+    entries.CrontabTZEntry,
+    entries.EventEntry,
+    entries.IntervalEntry
+)
+
+
+@pytest.fixture
+def entry_index(default_entries: List[entries.ScheduleEntry]) -> CompactEntryIndex:
+    entry_index = CompactEntryIndex(sched_entry_types)
+    for entry in default_entries:
+        entry_index.add(entry)
+
+    return entry_index
+
+
+def test_add(
+    entry_index: CompactEntryIndex,
+    default_entries: List[entries.ScheduleEntry]
+) -> None:
+    registry = EntryTypeRegistry(sched_entry_types)
+    assert len(entry_index) == len(default_entries)
+    assert list(entry_index) == [entry.key for entry in default_entries]
+    for entry in default_entries:
+        assert entry.key in entry_index
+        assert entry_index.entry_type(entry.key) is type(entry)
+        assert entry_index.enabled(entry.key)
+        assert registry.dejson_entry(entry_index.payload(entry.key)) == entry
+
+    assert entry_index.next_due("my_interval") == pytest.approx(time.time() + 120, abs=1)
+    assert entry_index.next_due("my_event_due") <= time.time()
+
+    entry = default_entries[0].copy(update={"enabled": False})
+    entry_index.add(entry, next_due=5)
+    assert len(entry_index) == len(default_entries)
+    assert not entry_index.enabled(entry.key)
+    assert entry_index.next_due(entry.key) == 5
+    assert registry.dejson_entry(entry_index.payload(entry.key)) == entry
+
+
+def test_add_not_registered(test_task: str) -> None:
+    entry_index = CompactEntryIndex((entries.IntervalEntry,))
+    with pytest.raises(ScheduleEntryTypeNotRegistered):
+        entry_index.add(entries.EventEntry(key="event", enabled=True, task=test_task, due_at=time.time()))
+
+
+def test_remove(
+    entry_index: CompactEntryIndex,
+    default_entries: List[entries.ScheduleEntry]
+) -> None:
+    registry = EntryTypeRegistry(sched_entry_types)
+    assert entry_index.remove("my_interval")
+    assert not entry_index.remove("my_interval")
+    assert "my_interval" not in entry_index
+    assert len(entry_index) == len(default_entries) - 1
+    # the last entry takes the removed slot
+    assert list(entry_index)[0] == default_entries[-1].key
+    for entry in default_entries[1:]:
+        assert registry.dejson_entry(entry_index.payload(entry.key)) == entry
+
+    for entry in default_entries[1:]:
+        assert entry_index.remove(entry.key)
+
+    assert len(entry_index) == 0
+
+
+def test_scan(entry_index: CompactEntryIndex) -> None:
+    now = time.time() + 1
+    due_keys, num_due_soon, earliest = entry_index.scan(now, now + 60)
+    expected_keys = {"my_interval_due", "my_event_due", "my_cron_due", "my_cron_tz_due"}
+    # the every minute cron entries are due too if ``now`` is past the next minute
+    if entry_index.next_due("my_cron") <= now:
+        expected_keys |= {"my_cron", "my_cron_tz"}
+        assert now + 60 < earliest
+    else:
+        assert now < earliest <= now + 60
+
+    assert set(due_keys) == expected_keys
+    # the due entries, and the cron entries due within the minute
+    assert num_due_soon == 6
+
+    entry_index.set_next_due("my_event_due", math.inf)
+    assert "my_event_due" not in entry_index.scan(now, now + 60)[0]
+
+
+def test_scan_skips_disabled(test_task: str) -> None:
+    entry_index = CompactEntryIndex(sched_entry_types)
+    entry_index.add(entries.IntervalEntry(key="disabled", enabled=False, task=test_task, period=1), next_due=0)
+    entry_index.add(entries.IntervalEntry(key="enabled", enabled=True, task=test_task, period=1), next_due=10)
+    assert entry_index.scan(5, 5) == ([], 0, 10)
+    assert entry_index.scan(10, 10) == (["enabled"], 1, math.inf)
+
+
+def test_counts(entry_index: CompactEntryIndex) -> None:
+    entry_index.add(entries.IntervalEntry(key="disabled", enabled=False, task="task", period=1))
+    assert sorted(entry_index.counts()) == [
+        ("CrontabEntry", True, 2),
+        ("CrontabTZEntry", True, 2),
+        ("EventEntry", True, 2),
+        ("IntervalEntry", False, 1),
+        ("IntervalEntry", True, 2)
+    ]
+
+
+def test_without_payloads(default_entries: List[entries.ScheduleEntry]) -> None:
+    entry_index = CompactEntryIndex(sched_entry_types, store_payloads=False)
+    for entry in default_entries:
+        entry_index.add(entry)
+
+    assert entry_index.remove(default_entries[0].key)
+    with pytest.raises(KeyError):
+        entry_index.payload(default_entries[1].key)
@@ -0,0 +1,33 @@
+
+from typing import List
+
+from beatdrop import entries
+from beatdrop.entry_stats import EntryStats
+
+
+def test_from_counts() -> None:
+    stats = EntryStats.from_counts(
+        [
+            ("CrontabEntry", True, 3),
+            ("CrontabEntry", False, 2),
+            ("EventEntry", False, 4),
+            ("CrontabEntry", True, 1),
+            ("IntervalEntry", True, 0)
+        ]
+    )
+    assert stats.total == 10
+    assert stats.enabled == 4
+    assert stats.disabled == 6
+    assert stats.by_type == {"CrontabEntry": 6, "EventEntry": 4}
+    assert stats.enabled_by_type == {"CrontabEntry": 4}
+
+
+def test_from_entries(filter_entries: List[entries.ScheduleEntry]) -> None:
+    stats = EntryStats.from_entries(filter_entries)
+    assert stats == EntryStats(
+        total=4,
+        enabled=3,
+        disabled=1,
+        by_type={"CrontabTZEntry": 2, "IntervalEntry": 2},
+        enabled_by_type={"CrontabTZEntry": 1, "IntervalEntry": 2}
+    )
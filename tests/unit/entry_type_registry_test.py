@@ -36,3 +36,36 @@ def test_dejson_unknown_entry_type(entry_type_registry: EntryTypeRegistry, test_
     with pytest.raises(exceptions.ScheduleEntryTypeNotRegistered):
         entry_type_registry.dejson_entry(json_)
 
+
+
+def test_dejson_memo(default_entries: List[ScheduleEntry]) -> None:
+    entry_type_registry = EntryTypeRegistry(sched_entry_types=default_sched_entry_types, memo_size=2)
+    entry = default_entries[0]
+    json_ = entry.json()
+    first = entry_type_registry.dejson_entry(json_)
+    assert entry_type_registry.memo_misses == 1
+    first.enabled = not first.enabled
+    second = entry_type_registry.dejson_entry(json_)
+    assert entry_type_registry.memo_hits == 1
+    # copies of the memoized entry are returned
+    assert second == entry
+    assert second is not first
+
+    for other_entry in default_entries[1:3]:
+        entry_type_registry.dejson_entry(other_entry.json())
+
+    # evicted as the least recently used
+    assert len(entry_type_registry._memo) == 2
+    entry_type_registry.dejson_entry(json_)
+    assert entry_type_registry.memo_misses == 4
+
+
+def test_dejson_memo_changed_json(
+    default_entries: List[ScheduleEntry]
+) -> None:
+    entry_type_registry = EntryTypeRegistry(sched_entry_types=default_sched_entry_types, memo_size=10)
+    entry = default_entries[0].copy(deep=True)
+    entry_type_registry.dejson_entry(entry.json())
+    entry.enabled = not entry.enabled
+    assert entry_type_registry.dejson_entry(entry.json()).enabled == entry.enabled
+    assert entry_type_registry.memo_hits == 0
@@ -58,3 +58,9 @@ def test_sent(event_entry: EventEntry) -> None:
     assert event_entry.was_sent == True
     assert event_entry.due_in().total_seconds() > 500
 
+
+def test_next_due_at(event_entry: EventEntry) -> None:
+    assert event_entry.next_due_at is None
+    assert event_entry.compute_next_due_at() == pytest.approx(time.time(), abs=1)
+    event_entry.sent()
+    assert event_entry.next_due_at is None
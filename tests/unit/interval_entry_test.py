@@ -1,5 +1,6 @@
 
 import datetime
+import time
 
 import pytest
 import pytz
@@ -70,3 +71,24 @@ def test_bad_last_sent_at(interval_entry: IntervalEntry) -> None:
     with pytest.raises(ValueError):
         interval_entry.last_sent_at = pytz.utc.localize(utc_now_naive()).astimezone(pytz.timezone("us/eastern"))
 
+
+def test_next_due_at(interval_entry: IntervalEntry) -> None:
+    assert interval_entry.next_due_at is None
+    assert interval_entry.compute_next_due_at() == pytest.approx(time.time() + period, abs=1)
+    interval_entry.sent()
+    assert interval_entry.next_due_at == pytest.approx(time.time() + period, abs=1)
+
+
+def test_sub_second_period(test_task: str) -> None:
+    last_sent_at = datetime.datetime(2024, 1, 1, 12, 0, 0, 100000)
+    interval_entry = IntervalEntry(
+        key="fast",
+        enabled=True,
+        task=test_task,
+        period=.25,
+        last_sent_at=last_sent_at
+    )
+    assert interval_entry.compute_next_due_at() == pytz.utc.localize(
+        datetime.datetime(2024, 1, 1, 12, 0, 0, 350000)
+    ).timestamp()
+    assert IntervalEntry.parse_raw(interval_entry.json()).period == datetime.timedelta(milliseconds=250)
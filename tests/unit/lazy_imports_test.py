@@ -0,0 +1,62 @@
+import json
+import subprocess
+import sys
+
+import pytest
+
+import beatdrop
+from beatdrop import entries, schedulers
+
+
+backend_modules = ["celery", "redis", "rq", "sqlalchemy", "http.server"]
+
+
+def _imported_modules(code: str) -> list:
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            code + "\nimport json, sys\nprint(json.dumps(sorted(sys.modules)))"
+        ],
+        capture_output=True,
+        check=True,
+        text=True
+    )
+    return json.loads(result.stdout.splitlines()[-1])
+
+
+def test_import_beatdrop_is_lazy() -> None:
+    modules = _imported_modules("import beatdrop")
+    for module in backend_modules + ["pydantic", "beatdrop.schedulers.scheduler", "beatdrop.entries.schedule_entry"]:
+        assert module not in modules
+
+
+def test_import_sql_scheduler_client() -> None:
+    modules = _imported_modules("from beatdrop import SQLScheduler, IntervalEntry")
+    assert "sqlalchemy" in modules
+    for module in ["celery", "redis", "rq", "http.server"]:
+        assert module not in modules
+
+
+def test_all() -> None:
+    for name in beatdrop.__all__:
+        assert getattr(beatdrop, name) is not None
+        assert name in dir(beatdrop)
+
+    assert "SQLScheduler" in schedulers.__all__
+    assert beatdrop.SQLScheduler is schedulers.SQLScheduler
+    assert beatdrop.IntervalEntry in entries.default_sched_entry_types
+
+
+def test_unknown_attribute() -> None:
+    with pytest.raises(AttributeError):
+        beatdrop.NotAScheduler
+
+    with pytest.raises(AttributeError):
+        schedulers.NotAScheduler
+
+    with pytest.raises(AttributeError):
+        entries.NotAnEntry
+
+    with pytest.raises(ImportError):
+        from beatdrop import NotAScheduler
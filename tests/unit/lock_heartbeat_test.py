@@ -0,0 +1,41 @@
+import threading
+import time
+from unittest.mock import MagicMock
+
+from beatdrop.lock_heartbeat import LockHeartbeat
+
+
+def test_lock_heartbeat() -> None:
+    lock_lost = threading.Event()
+    refresh = MagicMock(side_effect=[True, True, False])
+    heartbeat = LockHeartbeat(refresh=refresh, interval=0.01, lock_timeout=1, lock_lost=lock_lost)
+    heartbeat.start()
+    assert lock_lost.wait(1)
+    heartbeat.stop()
+    assert refresh.call_count == 3
+
+
+def test_lock_heartbeat_stop() -> None:
+    lock_lost = threading.Event()
+    refresh = MagicMock(return_value=True)
+    heartbeat = LockHeartbeat(refresh=refresh, interval=0.01, lock_timeout=1, lock_lost=lock_lost)
+    heartbeat.start()
+    time.sleep(0.05)
+    heartbeat.stop()
+    call_count = refresh.call_count
+    assert call_count > 0
+    time.sleep(0.05)
+    assert refresh.call_count == call_count
+    assert not lock_lost.is_set()
+
+
+def test_lock_heartbeat_refresh_errors(caplog) -> None:
+    lock_lost = threading.Event()
+    refresh = MagicMock(side_effect=[ConnectionError("down"), True, ConnectionError("down")] + [ConnectionError("down")] * 100)
+    heartbeat = LockHeartbeat(refresh=refresh, interval=0.01, lock_timeout=0.1, lock_lost=lock_lost)
+    heartbeat.start()
+    assert lock_lost.wait(1)
+    heartbeat.stop()
+    # errors are retried until the lock would have timed out
+    assert refresh.call_count > 3
+    assert "ConnectionError: down" in caplog.text
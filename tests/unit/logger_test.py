@@ -0,0 +1,57 @@
+import io
+import json
+from typing import List
+from unittest.mock import MagicMock
+
+from loguru import logger
+
+from beatdrop import entries
+from beatdrop.logger import _structured_filter, configure_logging
+from beatdrop.schedulers import MemScheduler
+
+
+def test_configure_logging_text(default_entries: List[entries.ScheduleEntry]) -> None:
+    sink = io.StringIO()
+    handler_id = configure_logging(level="DEBUG", sink=sink, colorize=False)
+    try:
+        logger.info("not from beatdrop")
+        MemScheduler(max_interval=60)._record_tick(0, num_scanned=3, num_due=1)
+    finally:
+        logger.remove(handler_id)
+
+    assert "not from beatdrop" not in sink.getvalue()
+    assert "Checked 3 entries" in sink.getvalue()
+
+
+def test_configure_logging_structured(default_entries: List[entries.ScheduleEntry]) -> None:
+    sink = io.StringIO()
+    mem_sched = MemScheduler(max_interval=60, default_sched_entries=default_entries)
+    mem_sched.send = MagicMock(return_value=None)
+    handler_id = configure_logging(level="DEBUG", sink=sink, structured=True)
+    try:
+        mem_sched._run_once()
+    finally:
+        logger.remove(handler_id)
+
+    assert mem_sched.send.call_count > 0
+    # per entry lines are replaced by the tick summary
+    logs = [json.loads(line) for line in sink.getvalue().splitlines()]
+    assert len(logs) == 1
+    assert logs[0]["level"] == "DEBUG"
+    assert logs[0]["tick_entries_scanned"] == len(default_entries)
+    assert logs[0]["tick_entries_due"] == mem_sched.send.call_count
+
+
+def test__structured_filter() -> None:
+    record = {
+        "name": "beatdrop.schedulers.celery_scheduler",
+        "level": logger.level("INFO"),
+        "extra": {}
+    }
+    assert _structured_filter(record) == True
+    record["extra"]["entry_key"] = "my_entry"
+    assert _structured_filter(record) == False
+    record["level"] = logger.level("ERROR")
+    assert _structured_filter(record) == True
+    record["name"] = "some_app"
+    assert _structured_filter(record) == False
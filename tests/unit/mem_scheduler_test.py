@@ -1,11 +1,20 @@
+import datetime
+import json
+import os
+import pstats
+import signal
+import time
+import urllib.request
 
 from typing import Callable, List
 from unittest.mock import call, MagicMock
 
 import pytest
 
-from beatdrop import entries
+from beatdrop import entries, metrics, ScheduleEntryFilter
+from beatdrop.metrics import PrometheusMetricsSink
 from beatdrop.schedulers import MemScheduler
+from beatdrop.schedulers import scheduler as scheduler_module
 
 
 @pytest.fixture
@@ -30,3 +39,275 @@ def test_run(
     scheduler_run_tests(mem_scheduler)
 
 
+def test_run_metrics(mem_scheduler: MemScheduler) -> None:
+    mem_scheduler.metrics_sink = PrometheusMetricsSink()
+    mem_scheduler.max_interval = datetime.timedelta(seconds=0)
+    mem_scheduler.run(max_iterations=1)
+    rendered = mem_scheduler.metrics_sink.render()
+    assert "{}_count 1".format(metrics.TICK_DURATION) in rendered
+    assert metrics.SCHEDULING_LAG in rendered
+    assert metrics.SEND_LATENCY in rendered
+    assert metrics.SEND_FAILURES not in rendered
+
+
+def test_run_stats_server(mem_scheduler: MemScheduler) -> None:
+    stats = []
+    def send(sched_entry: entries.ScheduleEntry) -> None:
+        url = "http://{}:{}/stats".format(*mem_scheduler.stats_server_address)
+        with urllib.request.urlopen(url, timeout=5) as response:
+            stats.append(json.loads(response.read()))
+
+    mem_scheduler.stats_server_port = 0
+    mem_scheduler.send = send
+    mem_scheduler.max_interval = datetime.timedelta(seconds=0)
+    mem_scheduler.run(max_iterations=1)
+    assert len(stats) > 0
+    assert stats[0]["lock_held"] is None
+    assert stats[0]["dispatch_queue_depth"] == 1
+    assert mem_scheduler.stats_server_address is None
+
+    snapshot = mem_scheduler.runtime_stats.snapshot()
+    assert snapshot["dispatch_queue_depth"] == 0
+    assert snapshot["last_tick_duration"] > 0
+    assert snapshot["entries_due_next_minute"] >= len(stats)
+
+
+def test_runtime_stats_send_failures(mem_scheduler: MemScheduler) -> None:
+    mem_scheduler.send = MagicMock(side_effect=ValueError("no queue"))
+    with pytest.raises(ValueError):
+        mem_scheduler._send_entry(mem_scheduler.default_sched_entries[0], datetime.timedelta(seconds=0), 0)
+
+    failures = mem_scheduler.runtime_stats.snapshot()["recent_send_failures"]
+    assert failures[0]["key"] == mem_scheduler.default_sched_entries[0].key
+    assert failures[0]["error"] == "ValueError: no queue"
+
+
+def test_profile_ticks(mem_scheduler: MemScheduler, tmp_path, caplog: pytest.LogCaptureFixture) -> None:
+    mem_scheduler.max_interval = datetime.timedelta(seconds=0)
+    path = mem_scheduler.profile_ticks(num_ticks=1, path=str(tmp_path / "ticks.pstats"))
+    assert "Capturing a cprofile profile" not in caplog.text
+    mem_scheduler.run(max_iterations=2)
+    assert "Capturing a cprofile profile of the next 1 scheduler ticks to: {}".format(path) in caplog.text
+    stats = pstats.Stats(path)
+    assert any(func_name == "_run_once" for _, _, func_name in stats.stats)
+
+
+def test_profile_ticks_default_path(mem_scheduler: MemScheduler) -> None:
+    path = mem_scheduler.profile_ticks(mode="tracemalloc")
+    assert path.endswith(".tracemalloc")
+    assert not os.path.exists(path)
+
+    with pytest.raises(ValueError):
+        mem_scheduler.profile_ticks(mode="perf")
+
+
+def test_install_profile_signal(mem_scheduler: MemScheduler, tmp_path) -> None:
+    previous_handler = signal.getsignal(signal.SIGUSR1)
+    mem_scheduler._profiler = MagicMock()
+    try:
+        mem_scheduler.install_profile_signal(num_ticks=3)
+        signal.raise_signal(signal.SIGUSR1)
+    finally:
+        signal.signal(signal.SIGUSR1, previous_handler)
+
+    mem_scheduler._profiler.request.assert_called_once()
+    request_kwargs = mem_scheduler._profiler.request.call_args.kwargs
+    assert request_kwargs["num_ticks"] == 3
+    assert request_kwargs["mode"] == "cprofile"
+    assert request_kwargs["path"].endswith(".pstats")
+
+
+def test__send_entry_failure(
+    mem_scheduler: MemScheduler,
+    default_entries: List[entries.ScheduleEntry]
+) -> None:
+    mem_scheduler.metrics_sink = PrometheusMetricsSink()
+    mem_scheduler.send = MagicMock(side_effect=[ValueError])
+    with pytest.raises(ValueError):
+        mem_scheduler._send_entry(default_entries[0], datetime.timedelta(seconds=0), 0)
+
+    assert '{}{{task="{}"}} 1.0'.format(
+        metrics.SEND_FAILURES,
+        default_entries[0].task
+    ) in mem_scheduler.metrics_sink.render()
+
+
+def test_list_filter(
+    mem_scheduler: MemScheduler,
+    default_entries: List[entries.ScheduleEntry]
+) -> None:
+    sched_filter = ScheduleEntryFilter(entry_type=entries.EventEntry)
+    entry_list = mem_scheduler.list(filter=sched_filter)
+    assert entry_list == [entry for entry in default_entries if isinstance(entry, entries.EventEntry)]
+    assert entry_list[0] is not default_entries[2]
+
+
+def test_list_page(
+    mem_scheduler: MemScheduler,
+    default_entries: List[entries.ScheduleEntry]
+) -> None:
+    page = mem_scheduler.list_page(limit=3)
+    assert page.entries == default_entries[:3]
+    pages = [page]
+    while page.cursor is not None:
+        page = mem_scheduler.list_page(cursor=page.cursor, limit=3)
+        pages.append(page)
+
+    assert len(pages) == 3
+    assert [entry for page in pages for entry in page.entries] == default_entries
+
+
+def test_count_stats(
+    mem_scheduler: MemScheduler,
+    default_entries: List[entries.ScheduleEntry]
+) -> None:
+    assert mem_scheduler.count() == len(default_entries)
+    assert mem_scheduler.count(filter=ScheduleEntryFilter(entry_type=entries.EventEntry)) == 2
+    stats = mem_scheduler.stats()
+    assert stats.total == len(default_entries)
+    assert stats.by_type == {
+        "IntervalEntry": 2,
+        "EventEntry": 2,
+        "CrontabEntry": 2,
+        "CrontabTZEntry": 2
+    }
+
+
+@pytest.fixture
+def compact_mem_scheduler(default_entries: List[entries.ScheduleEntry]) -> MemScheduler:
+    mem_sched =  MemScheduler(
+        max_interval=60,
+        default_sched_entries=default_entries,
+        compact_index=True
+    )
+    mem_sched.send = MagicMock(return_value=None)
+
+    return mem_sched
+
+
+def test_compact_index(
+    compact_mem_scheduler: MemScheduler,
+    default_entries: List[entries.ScheduleEntry]
+) -> None:
+    assert compact_mem_scheduler.default_sched_entries == []
+    assert compact_mem_scheduler.list() == default_entries
+    assert compact_mem_scheduler.count() == len(default_entries)
+    assert compact_mem_scheduler.count(filter=ScheduleEntryFilter(entry_type=entries.EventEntry)) == 2
+    assert compact_mem_scheduler.stats() == MemScheduler(
+        max_interval=60,
+        default_sched_entries=default_entries
+    ).stats()
+
+
+def test_compact_index_run(
+    compact_mem_scheduler: MemScheduler,
+    scheduler_run_tests: Callable
+) -> None:
+    scheduler_run_tests(compact_mem_scheduler)
+    sent_keys = {sent_call.args[0].key for sent_call in compact_mem_scheduler.send.call_args_list}
+    assert sent_keys == {"my_interval_due", "my_event_due", "my_cron_due", "my_cron_tz_due"}
+    # the sent event is disabled in the index, and not decoded again
+    assert not compact_mem_scheduler._entry_index.enabled("my_event_due")
+
+
+def test_compact_index_list_page(
+    compact_mem_scheduler: MemScheduler,
+    default_entries: List[entries.ScheduleEntry]
+) -> None:
+    page = compact_mem_scheduler.list_page(limit=3)
+    pages = [page]
+    while page.cursor is not None:
+        page = compact_mem_scheduler.list_page(cursor=page.cursor, limit=3)
+        pages.append(page)
+
+    assert len(pages) == 3
+    assert [entry for page in pages for entry in page.entries] == default_entries
+
+    sched_filter = ScheduleEntryFilter(entry_type=entries.CrontabEntry)
+    page = compact_mem_scheduler.list_page(limit=1, filter=sched_filter)
+    assert [entry.key for entry in page.entries] == ["my_cron"]
+    page = compact_mem_scheduler.list_page(cursor=page.cursor, limit=1, filter=sched_filter)
+    assert [entry.key for entry in page.entries] == ["my_cron_due"]
+
+
+@pytest.mark.parametrize("compact_index", [False, True])
+@pytest.mark.parametrize("limit", [0, -5])
+def test_list_page_bad_limit(default_entries: List[entries.ScheduleEntry], compact_index: bool, limit: int) -> None:
+    mem_scheduler = MemScheduler(max_interval=60, default_sched_entries=default_entries, compact_index=compact_index)
+    with pytest.raises(ValueError):
+        mem_scheduler.list_page(limit=limit)
+
+
+@pytest.mark.parametrize("compact_index", [False, True])
+def test_timing_wheel_run(
+    default_entries: List[entries.ScheduleEntry],
+    scheduler_run_tests: Callable,
+    compact_index: bool
+) -> None:
+    mem_scheduler = MemScheduler(
+        max_interval=60,
+        default_sched_entries=default_entries,
+        compact_index=compact_index,
+        timing_wheel_tick=.01
+    )
+    mem_scheduler.send = MagicMock(return_value=None)
+    assert len(mem_scheduler._timing_wheel) == len(default_entries)
+    scheduler_run_tests(mem_scheduler)
+    sent_keys = [sent_call.args[0].key for sent_call in mem_scheduler.send.call_args_list]
+    assert set(sent_keys) == {"my_interval_due", "my_event_due", "my_cron_due", "my_cron_tz_due"}
+    # the sent event is not scheduled again
+    assert "my_event_due" not in mem_scheduler._timing_wheel
+    assert "my_interval_due" in mem_scheduler._timing_wheel
+
+
+def test_timing_wheel_sleep(mem_scheduler: MemScheduler) -> None:
+    mem_scheduler.timing_wheel_tick = datetime.timedelta(seconds=.01)
+    mem_scheduler.__post_init_post_parse__()
+    sleep_time = mem_scheduler._run_once()
+    # my_interval_due is due again in .1 seconds
+    assert 0 < sleep_time.total_seconds() <= .2
+    assert mem_scheduler.runtime_stats.snapshot()["entries_due_next_minute"] >= 4
+
+
+def test_bad_timing_wheel_tick() -> None:
+    with pytest.raises(ValueError):
+        MemScheduler(max_interval=60, timing_wheel_tick=0)
+
+
+def test_high_resolution_run(test_task: str) -> None:
+    sent_at = []
+    mem_sched = MemScheduler(
+        max_interval=.25,
+        high_resolution=True,
+        default_sched_entries=[
+            entries.IntervalEntry(key="fast", enabled=True, task=test_task, period=.25)
+        ]
+    )
+    mem_sched.send = MagicMock(side_effect=lambda sched_entry: sent_at.append(time.time()))
+    mem_sched.run(max_iterations=5)
+    # 5 sub-second ticks, the entry is due at least every other tick
+    assert len(sent_at) >= 2
+    for gap in (later - earlier for earlier, later in zip(sent_at, sent_at[1:])):
+        assert gap >= .2
+
+
+@pytest.mark.parametrize("high_resolution", [False, True])
+def test_sleep_until_wakes_early(monkeypatch: pytest.MonkeyPatch, high_resolution: bool) -> None:
+    clock = {"now": 100.0}
+    sleeps = []
+
+    def fake_sleep(seconds: float) -> None:
+        # the OS wakes the scheduler up halfway through every sleep, and even a yield takes some time
+        sleeps.append(seconds)
+        clock["now"] += seconds / 2 + .0001
+
+    fake_time = MagicMock(monotonic=lambda: clock["now"], sleep=fake_sleep)
+    monkeypatch.setattr(scheduler_module, "time", fake_time)
+    mem_sched = MemScheduler(max_interval=1, high_resolution=high_resolution)
+    mem_sched._sleep_until(101.0)
+    if high_resolution:
+        assert len(sleeps) > 1
+        assert clock["now"] >= 101.0 - scheduler_module.HIGH_RESOLUTION_SPIN_TIME
+    else:
+        assert sleeps == [1.0]
+        assert clock["now"] < 101.0
@@ -0,0 +1,46 @@
+import pytest
+
+from beatdrop import exceptions, metrics
+from beatdrop.metrics import MetricsSink, NoOpMetricsSink, PrometheusMetricsSink
+
+
+def test_not_implemented_methods() -> None:
+    sink = MetricsSink()
+    with pytest.raises(exceptions.MethodNotImplementedError):
+        sink.observe(metrics.TICK_DURATION, 1.0)
+
+    with pytest.raises(exceptions.MethodNotImplementedError):
+        sink.increment(metrics.LOCK_LOSSES)
+
+
+def test_no_op() -> None:
+    sink = NoOpMetricsSink()
+    sink.observe(metrics.TICK_DURATION, 1.0)
+    sink.increment(metrics.LOCK_LOSSES, labels={"task": "a"})
+
+
+def test_validate() -> None:
+    sink = NoOpMetricsSink()
+    assert MetricsSink.validate(sink) is sink
+    with pytest.raises(TypeError):
+        MetricsSink.validate("not a sink")
+
+
+def test_prometheus_render() -> None:
+    sink = PrometheusMetricsSink()
+    assert sink.render() == "\n"
+    sink.observe(metrics.SEND_LATENCY, 0.25, {"task": "a.b"})
+    sink.observe(metrics.SEND_LATENCY, 0.5, {"task": "a.b"})
+    sink.observe(metrics.TICK_DURATION, 1)
+    sink.increment(metrics.SEND_FAILURES, labels={"task": 'quote"back\\slash'})
+    sink.increment(metrics.SEND_FAILURES, 2, labels={"task": 'quote"back\\slash'})
+    assert sink.render() == "\n".join([
+        "# TYPE beatdrop_send_latency_seconds summary",
+        'beatdrop_send_latency_seconds_sum{task="a.b"} 0.75',
+        'beatdrop_send_latency_seconds_count{task="a.b"} 2',
+        "# TYPE beatdrop_tick_duration_seconds summary",
+        "beatdrop_tick_duration_seconds_sum 1.0",
+        "beatdrop_tick_duration_seconds_count 1",
+        "# TYPE beatdrop_send_failures_total counter",
+        'beatdrop_send_failures_total{task="quote\\"back\\\\slash"} 3.0',
+    ]) + "\n"
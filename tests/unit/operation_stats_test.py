@@ -0,0 +1,47 @@
+import pytest
+
+from beatdrop import operation_stats
+from beatdrop.operation_stats import OperationStats
+
+
+def test_record() -> None:
+    stats = OperationStats(buckets=(0.1, 1.0))
+    stats.record(operation_stats.HGET, 0.05)
+    stats.record(operation_stats.HGET, 0.5)
+    stats.record(operation_stats.HGET, 2)
+    stats.record(operation_stats.DECODE, 0.1)
+    assert stats.dump() == {
+        operation_stats.DECODE: {
+            "count": 1,
+            "sum": 0.1,
+            "max": 0.1,
+            "buckets": {"0.1": 1, "1.0": 1, "+Inf": 1}
+        },
+        operation_stats.HGET: {
+            "count": 3,
+            "sum": pytest.approx(2.55),
+            "max": 2,
+            "buckets": {"0.1": 1, "1.0": 2, "+Inf": 3}
+        }
+    }
+
+
+def test_time() -> None:
+    stats = OperationStats()
+    with stats.time(operation_stats.COMMIT):
+        pass
+
+    with pytest.raises(ValueError):
+        with stats.time(operation_stats.COMMIT):
+            raise ValueError
+
+    dumped = stats.dump()[operation_stats.COMMIT]
+    assert dumped["count"] == 2
+    assert dumped["buckets"]["+Inf"] == 2
+
+
+def test_reset() -> None:
+    stats = OperationStats()
+    stats.record(operation_stats.HSCAN, 1)
+    stats.reset()
+    assert stats.dump() == {}
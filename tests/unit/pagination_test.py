@@ -0,0 +1,25 @@
+
+import pytest
+
+from beatdrop import exceptions
+from beatdrop.pagination import decode_page_cursor, encode_page_cursor
+
+
+def test_cursor_round_trip() -> None:
+    state = {"k": 12345, "i": "beatdrop_entries_index:type:CrontabEntry"}
+    cursor = encode_page_cursor(state)
+    assert "=" not in cursor
+    assert decode_page_cursor(cursor) == state
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        "not a cursor!",
+        "bm90IGpzb24",
+        encode_page_cursor([1, 2, 3])
+    ]
+)
+def test_decode_invalid_cursor(cursor: str) -> None:
+    with pytest.raises(exceptions.InvalidPageCursor):
+        decode_page_cursor(cursor)
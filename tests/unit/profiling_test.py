@@ -0,0 +1,75 @@
+import pstats
+import threading
+import time
+import tracemalloc
+
+import pytest
+
+from beatdrop.profiling import format_thread_stacks, SlowTickWatchdog, TickProfiler
+
+
+def test_tick_profiler_cprofile(tmp_path) -> None:
+    profiler = TickProfiler()
+    path = str(tmp_path / "ticks.pstats")
+    profiler.request(num_ticks=2, path=path)
+    assert not profiler.active
+
+    profiler.tick_started()
+    assert profiler.active
+    sum(range(1000))
+    assert profiler.tick_finished() is None
+
+    profiler.tick_started()
+    assert profiler.tick_finished() == path
+    assert not profiler.active
+    pstats.Stats(path)
+
+    # nothing requested
+    profiler.tick_started()
+    assert profiler.tick_finished() is None
+
+
+def test_tick_profiler_tracemalloc(tmp_path) -> None:
+    profiler = TickProfiler()
+    path = str(tmp_path / "ticks.tracemalloc")
+    profiler.request(num_ticks=1, path=path, mode="tracemalloc")
+    profiler.tick_started()
+    assert tracemalloc.is_tracing()
+    data = [str(i) for i in range(1000)]
+    assert profiler.tick_finished() == path
+    assert not tracemalloc.is_tracing()
+    tracemalloc.Snapshot.load(path)
+
+
+def test_tick_profiler_bad_request(tmp_path) -> None:
+    profiler = TickProfiler()
+    with pytest.raises(ValueError):
+        profiler.request(num_ticks=0, path=str(tmp_path / "ticks"))
+
+    with pytest.raises(ValueError):
+        profiler.request(num_ticks=1, path=str(tmp_path / "ticks"), mode="perf")
+
+
+def test_slow_tick_watchdog(caplog) -> None:
+    watchdog = SlowTickWatchdog(threshold=0.05)
+    try:
+        watchdog.tick_started()
+        watchdog.tick_finished()
+        time.sleep(0.1)
+        assert "Thread stacks" not in caplog.text
+
+        watchdog.tick_started()
+        time.sleep(0.2)
+        watchdog.tick_finished()
+    finally:
+        watchdog.stop()
+
+    assert caplog.text.count("Thread stacks") == 1
+    assert "test_slow_tick_watchdog" in caplog.text
+    assert not any(thread.name == "beatdrop-slow-tick-watchdog" for thread in threading.enumerate())
+
+
+def test_format_thread_stacks() -> None:
+    stacks = format_thread_stacks()
+    assert threading.current_thread().name in stacks
+    assert "test_format_thread_stacks" in stacks
@@ -0,0 +1,73 @@
+import time
+
+import redislite
+
+from beatdrop.redis_lock import RedisLock
+
+
+def test_acquire_release(rdb: redislite.Redis) -> None:
+    lock = RedisLock(rdb, key="test_lock")
+    other_lock = RedisLock(rdb, key="test_lock")
+    assert lock.acquire(blocking=False)
+    assert lock.locked() > 0
+    assert not other_lock.acquire(blocking=False)
+    assert other_lock.locked() == 0
+    assert lock.release()
+    assert lock.locked() == 0
+    assert not lock.release()
+    assert other_lock.acquire(blocking=False)
+
+
+def test_release_other_token(rdb: redislite.Redis) -> None:
+    lock = RedisLock(rdb, key="test_lock", auto_release_time=.1)
+    other_lock = RedisLock(rdb, key="test_lock")
+    assert lock.acquire(blocking=False)
+    time.sleep(.2)
+    assert other_lock.acquire(blocking=False)
+    # the expired holder must not release or extend the new holder's lock
+    assert not lock.extend()
+    assert not lock.release()
+    assert other_lock.locked() > 0
+
+
+def test_extend(rdb: redislite.Redis) -> None:
+    lock = RedisLock(rdb, key="test_lock", auto_release_time=.3)
+    assert not lock.extend()
+    assert lock.acquire(blocking=False)
+    time.sleep(.2)
+    assert lock.extend()
+    time.sleep(.2)
+    assert lock.locked() > 0
+    lock.release()
+
+
+def test_acquire_timeout(rdb: redislite.Redis) -> None:
+    lock = RedisLock(rdb, key="test_lock", auto_release_time=.3)
+    other_lock = RedisLock(rdb, key="test_lock")
+    assert lock.acquire()
+    started_at = time.monotonic()
+    assert not other_lock.acquire(timeout=.1)
+    assert time.monotonic() - started_at < .3
+    # blocks until the lock expires
+    assert other_lock.acquire(timeout=1)
+
+
+def test_fencing_token(rdb: redislite.Redis) -> None:
+    lock = RedisLock(rdb, key="test_lock", fencing_key="test_fencing")
+    other_lock = RedisLock(rdb, key="test_lock", fencing_key="test_fencing")
+    assert lock.fencing_token is None
+    assert lock.acquire(blocking=False)
+    first_token = lock.fencing_token
+    assert not other_lock.acquire(blocking=False)
+    assert other_lock.fencing_token is None
+    lock.release()
+    assert other_lock.acquire(blocking=False)
+    assert other_lock.fencing_token > first_token
+
+
+def test_context_manager(rdb: redislite.Redis) -> None:
+    lock = RedisLock(rdb, key="test_lock")
+    with lock:
+        assert lock.locked() > 0
+
+    assert lock.locked() == 0
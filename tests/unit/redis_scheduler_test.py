@@ -1,14 +1,43 @@
 
+import json
+import threading
 import datetime
+import time
 from typing import Callable, List
 from unittest.mock import MagicMock
 
 import pytest
+import redislite
 
 from beatdrop.helpers import utc_now_naive
+from beatdrop.entry_stats import EntryStats
+from beatdrop.metrics import PrometheusMetricsSink
+from beatdrop.pagination import encode_page_cursor
+from beatdrop.profiling import SlowTickWatchdog
 from beatdrop.schedulers import RedisScheduler
 from beatdrop.entries import IntervalEntry, ScheduleEntry
-from beatdrop import entries, exceptions, messages
+from beatdrop import entries, metrics, operation_stats, exceptions, messages, ScheduleEntryFilter
+
+
+list_filters = [
+    ScheduleEntryFilter(key_prefix="team_a:"),
+    ScheduleEntryFilter(key_prefix="team_b:interval*"),
+    ScheduleEntryFilter(entry_type=entries.IntervalEntry),
+    ScheduleEntryFilter(task="beatdrop.validators.valid_cron_expression"),
+    ScheduleEntryFilter(enabled=False),
+    ScheduleEntryFilter(entry_type=entries.CrontabTZEntry, enabled=True),
+    ScheduleEntryFilter(key_prefix="team_", entry_type=entries.IntervalEntry, enabled=True)
+]
+
+
+def list_all_pages(scheduler, limit: int, **kwargs) -> list:
+    page = scheduler.list_page(limit=limit, **kwargs)
+    all_entries = list(page.entries)
+    while page.cursor is not None:
+        page = scheduler.list_page(cursor=page.cursor, limit=limit, **kwargs)
+        all_entries.extend(page.entries)
+
+    return all_entries
 
 
 @pytest.fixture
@@ -164,6 +193,279 @@ def test_list_blank_pages(
     assert interval_entry in results
 
 
+@pytest.mark.parametrize("sched_filter", list_filters)
+def test_list_filter(
+    redis_scheduler: RedisScheduler,
+    default_entries: List[ScheduleEntry],
+    filter_entries: List[ScheduleEntry],
+    sched_filter: ScheduleEntryFilter
+) -> None:
+    for entry in filter_entries:
+        redis_scheduler.save(entry)
+
+    expected_keys = [entry.key for entry in default_entries + filter_entries if sched_filter.matches(entry)]
+    entry_list = list(redis_scheduler.list(page_size=1, filter=sched_filter))
+    assert sorted([entry.key for entry in entry_list]) == sorted(expected_keys)
+
+
+@pytest.mark.parametrize("sched_filter", list_filters)
+def test_list_scan_page(
+    redis_scheduler: RedisScheduler,
+    filter_entries: List[ScheduleEntry],
+    sched_filter: ScheduleEntryFilter
+) -> None:
+    for entry in filter_entries:
+        redis_scheduler.save(entry)
+
+    entry_list = redis_scheduler.list(page_size=1, filter=sched_filter)
+    cursor, index_key, results = entry_list.scan_page()
+    entry_jsons = list(results)
+    while cursor != 0:
+        cursor, index_key, results = entry_list.scan_page(cursor=cursor, index_key=index_key)
+        entry_jsons.extend(results)
+
+    assert sorted(json.loads(entry_json)["key"] for entry_json in entry_jsons) == sorted(
+        entry.key for entry in filter_entries if sched_filter.matches(entry)
+    )
+    with pytest.raises(ValueError):
+        entry_list.scan_page(index_key="not an index")
+
+
+def test_list_filter_only_reads_matching(
+    redis_scheduler: RedisScheduler,
+    filter_entries: List[ScheduleEntry]
+) -> None:
+    for entry in filter_entries:
+        redis_scheduler.save(entry)
+
+    redis_scheduler._redis_conn.hscan = MagicMock(side_effect=Exception)
+    hmget = redis_scheduler._redis_conn.hmget
+    redis_scheduler._redis_conn.hmget = MagicMock(side_effect=hmget)
+    entry_list = list(
+        redis_scheduler.list(
+            filter=ScheduleEntryFilter(key_prefix="team_", entry_type=entries.CrontabTZEntry, enabled=True)
+        )
+    )
+    assert [entry.key for entry in entry_list] == ["team_a:tz_enabled"]
+    redis_scheduler._redis_conn.hmget.assert_called_once_with(
+        redis_scheduler._hash_key, 
+        ["team_a:tz_enabled"]
+    )
+
+
+def test_save_next_due_at(
+    redis_scheduler: RedisScheduler,
+    interval_entry: IntervalEntry
+) -> None:
+    # entries stored without next_due_at are updated on save
+    entry_dict = json.loads(interval_entry.json())
+    del entry_dict["next_due_at"]
+    redis_scheduler._redis_conn.hset(redis_scheduler._hash_key, interval_entry.key, json.dumps(entry_dict))
+    redis_scheduler.save(interval_entry)
+    entry = redis_scheduler.get(interval_entry.key)
+    assert entry.next_due_at == interval_entry.compute_next_due_at()
+    assert entry.next_due_at == pytest.approx(time.time() + interval_entry.period.total_seconds(), abs=5)
+
+
+def test_save_indexes(
+    redis_scheduler: RedisScheduler,
+    interval_entry: IntervalEntry
+) -> None:
+    enabled_key = redis_scheduler._index_prefix + "enabled:1"
+    disabled_key = redis_scheduler._index_prefix + "enabled:0"
+    type_key = redis_scheduler._index_prefix + "type:IntervalEntry"
+    task_key = redis_scheduler._index_prefix + "task:" + interval_entry.task
+    redis_scheduler.save(interval_entry)
+    assert redis_scheduler._redis_conn.sismember(enabled_key, interval_entry.key)
+    assert not redis_scheduler._redis_conn.sismember(disabled_key, interval_entry.key)
+    assert redis_scheduler._redis_conn.sismember(type_key, interval_entry.key)
+    assert redis_scheduler._redis_conn.sismember(task_key, interval_entry.key)
+    interval_entry.enabled = False
+    redis_scheduler.save(interval_entry)
+    assert not redis_scheduler._redis_conn.sismember(enabled_key, interval_entry.key)
+    assert redis_scheduler._redis_conn.sismember(disabled_key, interval_entry.key)
+    redis_scheduler.delete(interval_entry)
+    assert not redis_scheduler._redis_conn.sismember(disabled_key, interval_entry.key)
+    assert not redis_scheduler._redis_conn.sismember(type_key, interval_entry.key)
+    assert not redis_scheduler._redis_conn.sismember(task_key, interval_entry.key)
+
+
+def test_rebuild_indexes(
+    redis_scheduler: RedisScheduler,
+    filter_entries: List[ScheduleEntry]
+) -> None:
+    for entry in filter_entries:
+        redis_scheduler.save(entry)
+
+    index_keys = redis_scheduler._redis_conn.keys(redis_scheduler._index_prefix + "*")
+    redis_scheduler._redis_conn.delete(redis_scheduler._stats_key, *index_keys)
+    sched_filter = ScheduleEntryFilter(key_prefix="team_", entry_type=entries.IntervalEntry)
+    assert list(redis_scheduler.list(filter=sched_filter)) == []
+    redis_scheduler.rebuild_indexes(page_size=1)
+    assert redis_scheduler.stats() == EntryStats.from_entries(redis_scheduler.list())
+    entry_list = list(redis_scheduler.list(filter=sched_filter))
+    assert sorted([entry.key for entry in entry_list]) == sorted(
+        [entry.key for entry in filter_entries if sched_filter.matches(entry)]
+    )
+
+
+def test_rebuild_indexes_next_due(
+    redis_scheduler: RedisScheduler,
+    filter_entries: List[ScheduleEntry]
+) -> None:
+    for entry in filter_entries:
+        redis_scheduler.save(entry)
+
+    next_due = redis_scheduler._redis_conn.zrange(redis_scheduler._next_due_key, 0, -1, withscores=True)
+    assert sorted(key for key, score in next_due) == sorted(entry.key for entry in filter_entries if entry.enabled)
+    redis_scheduler._redis_conn.delete(redis_scheduler._next_due_key)
+    redis_scheduler.rebuild_indexes(page_size=1)
+    assert redis_scheduler._redis_conn.zrange(redis_scheduler._next_due_key, 0, -1, withscores=True) == next_due
+    for entry in filter_entries:
+        redis_scheduler.delete(entry)
+
+    assert redis_scheduler._redis_conn.zcard(redis_scheduler._next_due_key) == 0
+
+
+def test_run_indexes_earlier_version_entries(
+    redis_scheduler: RedisScheduler,
+    interval_entry: IntervalEntry,
+    caplog: pytest.LogCaptureFixture
+) -> None:
+    interval_entry.last_sent_at = utc_now_naive() - datetime.timedelta(seconds=120)
+    # saved by a version without the indexes
+    redis_scheduler._redis_conn.hset(
+        redis_scheduler._hash_key,
+        interval_entry.key,
+        interval_entry.json(exclude={"expires_at", "next_due_at"})
+    )
+    redis_scheduler.run(max_iterations=1)
+    assert messages.sched_entries_indexed in caplog.text
+    assert redis_scheduler._redis_conn.get(redis_scheduler._index_version_key) is not None
+    assert redis_scheduler._redis_conn.zscore(redis_scheduler._next_due_key, interval_entry.key) is not None
+    assert redis_scheduler.stats() == EntryStats.from_entries(redis_scheduler.list())
+    sent_keys = [call.args[0].key for call in redis_scheduler.send.call_args_list]
+    assert interval_entry.key in sent_keys
+
+
+def test_run_indexes_once(
+    redis_scheduler: RedisScheduler,
+    interval_entry: IntervalEntry,
+    caplog: pytest.LogCaptureFixture
+) -> None:
+    redis_scheduler.run(max_iterations=1)
+    assert redis_scheduler._redis_conn.get(redis_scheduler._index_version_key) is not None
+    redis_scheduler.save(interval_entry)
+    redis_scheduler.rebuild_indexes = MagicMock()
+    redis_scheduler.run(max_iterations=1)
+    redis_scheduler.rebuild_indexes.assert_not_called()
+    assert messages.sched_entries_indexed not in caplog.text
+
+
+@pytest.mark.parametrize("limit", [1, 3, 100])
+def test_list_page(
+    redis_scheduler: RedisScheduler,
+    default_entries: List[entries.ScheduleEntry],
+    filter_entries: List[entries.ScheduleEntry],
+    limit: int
+) -> None:
+    for entry in filter_entries:
+        redis_scheduler.save(entry)
+
+    all_entries = list_all_pages(redis_scheduler, limit=limit)
+    assert all_entries[:len(default_entries)] == default_entries
+    assert sorted([entry.key for entry in all_entries[len(default_entries):]]) == sorted(
+        [entry.key for entry in filter_entries]
+    )
+
+
+@pytest.mark.parametrize("sched_filter", list_filters)
+def test_list_page_filter(
+    redis_scheduler: RedisScheduler,
+    default_entries: List[entries.ScheduleEntry],
+    filter_entries: List[entries.ScheduleEntry],
+    sched_filter: ScheduleEntryFilter
+) -> None:
+    for entry in filter_entries:
+        redis_scheduler.save(entry)
+
+    all_entries = list_all_pages(redis_scheduler, limit=1, filter=sched_filter)
+    expected_keys = [entry.key for entry in default_entries + filter_entries if sched_filter.matches(entry)]
+    assert sorted([entry.key for entry in all_entries]) == sorted(expected_keys)
+
+
+def test_list_page_invalid_cursor(redis_scheduler: RedisScheduler) -> None:
+    with pytest.raises(exceptions.InvalidPageCursor):
+        redis_scheduler.list_page(cursor="garbage!")
+
+    with pytest.raises(exceptions.InvalidPageCursor):
+        redis_scheduler.list_page(cursor=encode_page_cursor({"k": "1", "r": "1", "i": "not an index"}))
+
+
+@pytest.mark.parametrize("limit", [0, -5])
+def test_list_page_bad_limit(redis_scheduler: RedisScheduler, limit: int) -> None:
+    with pytest.raises(ValueError):
+        redis_scheduler.list_page(limit=limit)
+
+
+@pytest.mark.parametrize("sched_filter", [None, ScheduleEntryFilter()] + list_filters)
+def test_count(
+    redis_scheduler: RedisScheduler,
+    filter_entries: List[entries.ScheduleEntry],
+    sched_filter: ScheduleEntryFilter
+) -> None:
+    for entry in filter_entries:
+        redis_scheduler.save(entry)
+
+    expected_count = len(list(redis_scheduler.list(filter=sched_filter)))
+    redis_scheduler._entry_type_registry.dejson_entry = MagicMock(side_effect=Exception)
+    assert redis_scheduler.count(filter=sched_filter) == expected_count
+
+
+def test_stats(
+    redis_scheduler: RedisScheduler,
+    filter_entries: List[entries.ScheduleEntry]
+) -> None:
+    assert redis_scheduler.stats() == EntryStats.from_entries(redis_scheduler.default_sched_entries)
+    for entry in filter_entries:
+        redis_scheduler.save(entry)
+
+    filter_entries[0].enabled = False
+    redis_scheduler.save(filter_entries[0])
+    redis_scheduler.delete(filter_entries[2])
+    expected_stats = EntryStats.from_entries(redis_scheduler.list())
+    redis_scheduler._entry_type_registry.dejson_entry = MagicMock(side_effect=Exception)
+    assert redis_scheduler.stats() == expected_stats
+
+
+@pytest.mark.parametrize("enabled", [True, False])
+def test_stats_unindexed_entry(
+    redis_scheduler: RedisScheduler,
+    interval_entry: IntervalEntry,
+    enabled: bool
+) -> None:
+    # saved by a version without the indexes, so it was never counted
+    interval_entry.enabled = enabled
+    redis_scheduler._redis_conn.hset(
+        redis_scheduler._hash_key,
+        interval_entry.key,
+        interval_entry.json(exclude={"expires_at", "next_due_at"})
+    )
+    redis_scheduler.save(interval_entry)
+    assert redis_scheduler.stats() == EntryStats.from_entries(redis_scheduler.list())
+    redis_scheduler.delete(interval_entry)
+    assert all(int(count) == 0 for count in redis_scheduler._redis_conn.hgetall(redis_scheduler._stats_key).values())
+    assert redis_scheduler.stats() == EntryStats.from_entries(redis_scheduler.default_sched_entries)
+
+    redis_scheduler._redis_conn.hset(
+        redis_scheduler._hash_key,
+        interval_entry.key,
+        interval_entry.json(exclude={"expires_at", "next_due_at"})
+    )
+    redis_scheduler.delete(interval_entry)
+    assert all(int(count) == 0 for count in redis_scheduler._redis_conn.hgetall(redis_scheduler._stats_key).values())
+
+
 def test_get(
     redis_scheduler_rdb_entries: RedisScheduler,
     interval_entry: IntervalEntry,
@@ -193,6 +495,20 @@ def test_delete(
     assert default_entries[0] in redis_scheduler_rdb_entries.list()
 
 
+def test_fencing_token(
+    redis_scheduler: RedisScheduler,
+    redis_scheduler2: RedisScheduler
+) -> None:
+    assert redis_scheduler.fencing_token is None
+    redis_scheduler._acquire_lock()
+    first_token = redis_scheduler.fencing_token
+    assert first_token is not None
+    redis_scheduler._cleanup()
+    redis_scheduler2._acquire_lock()
+    assert redis_scheduler2.fencing_token > first_token
+    redis_scheduler2._cleanup()
+
+
 def test__acquire_lock(
     redis_scheduler: RedisScheduler,
     redis_scheduler2: RedisScheduler
@@ -208,13 +524,82 @@ def test__acquire_lock(
     assert acquired_after < (redis_scheduler.lock_timeout + redis_scheduler.max_interval)
 
 
+def test__acquire_lock_expiry_wake_up(
+    redis_scheduler: RedisScheduler,
+    redis_scheduler2: RedisScheduler
+) -> None:
+    # the standby wakes up when the lock expires, not after its poll interval
+    redis_scheduler2.standby_poll_interval = datetime.timedelta(seconds=30)
+    redis_scheduler._acquire_lock()
+    before = utc_now_naive()
+    redis_scheduler2._acquire_lock()
+    assert utc_now_naive() - before < redis_scheduler.lock_timeout + datetime.timedelta(seconds=0.5)
+
+
+def test__cleanup_hand_off(
+    redis_scheduler: RedisScheduler,
+    redis_scheduler2: RedisScheduler,
+    caplog: pytest.LogCaptureFixture
+) -> None:
+    # the standby is woken up by the release notification, not its poll interval
+    redis_scheduler2.standby_poll_interval = datetime.timedelta(seconds=30)
+    redis_scheduler._acquire_lock()
+    standby = threading.Thread(target=redis_scheduler2._acquire_lock)
+    standby.start()
+    time.sleep(0.2)
+    assert redis_scheduler._redis_conn.get(redis_scheduler._standby_key) == redis_scheduler2._instance_id
+
+    before = utc_now_naive()
+    redis_scheduler._cleanup()
+    standby.join(timeout=2)
+    assert not standby.is_alive()
+    assert utc_now_naive() - before < datetime.timedelta(seconds=1)
+    assert messages.sched_lock_handing_off_template.format(redis_scheduler2._instance_id) in caplog.text
+    assert redis_scheduler2._scheduler_lock.locked() > 0
+    assert redis_scheduler._redis_conn.get(redis_scheduler._hand_off_key) is None
+
+
+def test__acquire_lock_hand_off_reserved(
+    redis_scheduler: RedisScheduler,
+    redis_scheduler2: RedisScheduler
+) -> None:
+    # a lock handed off to another standby is left for it
+    redis_scheduler._redis_conn.set(redis_scheduler._hand_off_key, "other", px=300)
+    before = utc_now_naive()
+    redis_scheduler._acquire_lock()
+    assert utc_now_naive() - before > datetime.timedelta(seconds=0.25)
+
+
+def test__acquire_lock_warm_standby(
+    redis_scheduler_rdb_entries: RedisScheduler,
+    redis_scheduler2: RedisScheduler,
+    interval_entry: IntervalEntry
+) -> None:
+    redis_scheduler2.warm_standby = True
+    redis_scheduler_rdb_entries._acquire_lock()
+    standby = threading.Thread(target=redis_scheduler2._acquire_lock)
+    standby.start()
+    time.sleep(0.2)
+    assert [entry.key for entry in redis_scheduler2._warm_entries.values()] == [interval_entry.key]
+
+    redis_scheduler_rdb_entries._cleanup()
+    standby.join(timeout=2)
+    redis_scheduler2._operation_stats.reset()
+    redis_scheduler2._tick()
+    # the warm entry was used instead of decoding it
+    assert "decode" not in redis_scheduler2.operation_stats.dump()
+    assert redis_scheduler2._warm_entries == {}
+
+
 def test__refresh_lock(
     redis_scheduler: RedisScheduler,
     redis_scheduler2: RedisScheduler
 ) -> None:
     redis_scheduler._acquire_lock()
+    redis_scheduler2.metrics_sink = PrometheusMetricsSink()
     assert redis_scheduler._refresh_lock() == True
     assert redis_scheduler2._refresh_lock() == False
+    assert "{} 1.0".format(metrics.LOCK_LOSSES) in redis_scheduler2.metrics_sink.render()
 
 
 def test_run(
@@ -224,6 +609,151 @@ def test_run(
     scheduler_run_tests(redis_scheduler_rdb_entries)
 
 
+def test_run_look_ahead(
+    redis_scheduler_rdb_entries: RedisScheduler,
+    scheduler_run_tests: Callable
+) -> None:
+    redis_scheduler_rdb_entries.look_ahead_window = datetime.timedelta(seconds=2)
+    redis_scheduler_rdb_entries.__post_init_post_parse__()
+    scheduler_run_tests(redis_scheduler_rdb_entries)
+
+
+def test__run_once_look_ahead(
+    redis_scheduler: RedisScheduler,
+    test_task: str
+) -> None:
+    redis_scheduler.look_ahead_window = datetime.timedelta(seconds=2)
+    redis_scheduler.__post_init_post_parse__()
+    sent_at = {}
+    redis_scheduler.send = MagicMock(side_effect=lambda sched_entry: sent_at.setdefault(sched_entry.key, time.time()))
+    utc_now = utc_now_naive()
+    for key, seconds_ago in (("soon", 59.7), ("later", 0)):
+        redis_scheduler.save(
+            IntervalEntry(
+                key=key,
+                enabled=True,
+                task=test_task,
+                period=60,
+                last_sent_at=utc_now - datetime.timedelta(seconds=seconds_ago)
+            ),
+            read_only_attributes=True
+        )
+
+    ticked_at = time.time()
+    assert redis_scheduler._run_once() == redis_scheduler.max_interval
+    assert "soon" in redis_scheduler._look_ahead_entries
+    assert "later" not in redis_scheduler._look_ahead_entries
+    soon_due_at = redis_scheduler._look_ahead_entries["soon"][2]
+    redis_scheduler._sleep(datetime.timedelta(seconds=.6))
+    # sent at its due time, before the next tick
+    assert soon_due_at <= sent_at["soon"] < ticked_at + redis_scheduler.max_interval.total_seconds()
+    assert "later" not in sent_at
+    assert redis_scheduler.get("soon").last_sent_at > utc_now
+    # not due again within the window
+    assert "soon" not in redis_scheduler._look_ahead_entries
+
+
+def test__run_once_look_ahead_changed(
+    redis_scheduler: RedisScheduler,
+    test_task: str
+) -> None:
+    redis_scheduler.look_ahead_window = datetime.timedelta(seconds=2)
+    redis_scheduler.__post_init_post_parse__()
+    redis_scheduler.default_sched_entries = []
+    utc_now = utc_now_naive()
+    for key in ("disabled", "moved", "new_args", "repeats"):
+        redis_scheduler.save(
+            IntervalEntry(
+                key=key,
+                enabled=True,
+                task=test_task,
+                period=.2 if key == "repeats" else 60,
+                last_sent_at=utc_now - datetime.timedelta(seconds=59.8)
+            ),
+            read_only_attributes=True
+        )
+
+    redis_scheduler._run_once()
+    assert sorted(redis_scheduler._look_ahead_entries) == ["disabled", "moved", "new_args", "repeats"]
+    # changed by a client after they were read
+    disabled = redis_scheduler.get("disabled")
+    disabled.enabled = False
+    redis_scheduler.save(disabled)
+    moved = redis_scheduler.get("moved")
+    moved.period = datetime.timedelta(seconds=120)
+    redis_scheduler.save(moved)
+    new_args = redis_scheduler.get("new_args")
+    new_args.args = [1]
+    redis_scheduler.save(new_args)
+    redis_scheduler._sleep(datetime.timedelta(seconds=.8))
+    sent_entries = [call.args[0] for call in redis_scheduler.send.call_args_list]
+    sent_keys = [entry.key for entry in sent_entries]
+    assert "disabled" not in sent_keys
+    assert "moved" not in sent_keys
+    assert [entry.args for entry in sent_entries if entry.key == "new_args"] == [(1,)]
+    # held again after each send, while it is due within the window
+    assert sent_keys.count("repeats") >= 3
+    assert "repeats" in redis_scheduler._look_ahead_entries
+
+
+def test__look_ahead_stored_entries_no_next_due_at(
+    redis_scheduler: RedisScheduler,
+    interval_entry: IntervalEntry,
+    test_task: str
+) -> None:
+    # an enabled event that was already sent is not due again
+    sent_event = entries.EventEntry(
+        key="sent_event",
+        enabled=True,
+        task=test_task,
+        due_at=utc_now_naive(),
+        was_sent=True
+    )
+    redis_scheduler.save(sent_event, read_only_attributes=True)
+    redis_scheduler.save(interval_entry)
+    assert redis_scheduler._redis_conn.sismember(redis_scheduler._index_prefix + "enabled:1", sent_event.key)
+    assert redis_scheduler._redis_conn.zscore(redis_scheduler._next_due_key, sent_event.key) is None
+    held_keys = [
+        sched_entry.key
+        for sched_entry, version in redis_scheduler._look_ahead_stored_entries(time.time() + 3600)
+    ]
+    assert held_keys == [interval_entry.key]
+
+
+@pytest.mark.parametrize("page_size", [1, 2, 100])
+def test__look_ahead_stored_entries_paged(
+    redis_scheduler: RedisScheduler,
+    filter_entries: List[ScheduleEntry],
+    page_size: int
+) -> None:
+    for entry in filter_entries:
+        redis_scheduler.save(entry)
+
+    until = time.time() + 3600
+    expected_keys = redis_scheduler._redis_conn.zrangebyscore(redis_scheduler._next_due_key, min="-inf", max=until)
+    assert len(expected_keys) > 2
+    held_entries = list(redis_scheduler._look_ahead_stored_entries(until, page_size=page_size))
+    assert [sched_entry.key for sched_entry, version in held_entries] == expected_keys
+    num_pages = len(expected_keys) // page_size + 1
+    assert redis_scheduler.operation_stats.dump()[operation_stats.ZRANGEBYSCORE]["count"] == num_pages
+
+
+def test__send_look_ahead_entries_lost_lock(
+    redis_scheduler: RedisScheduler,
+    interval_entry: IntervalEntry
+) -> None:
+    redis_scheduler.look_ahead_window = datetime.timedelta(seconds=2)
+    redis_scheduler.__post_init_post_parse__()
+    redis_scheduler.save(interval_entry)
+    redis_scheduler._run_once()
+    assert interval_entry.key in redis_scheduler._look_ahead_entries
+    redis_scheduler._lock_lost.set()
+    time.sleep(.2)
+    assert redis_scheduler._send_look_ahead_entries() == 0
+    assert redis_scheduler._look_ahead_entries == {}
+    redis_scheduler.send.assert_not_called()
+
+
 def test_run_lost_lock(
     redis_scheduler_rdb_entries: RedisScheduler,
     caplog: pytest.LogCaptureFixture
@@ -242,6 +772,68 @@ def test_run_critical_error(
     assert "CRITICAL" in caplog.text
 
 
+def test_run_lock_held(redis_scheduler_rdb_entries: RedisScheduler) -> None:
+    lock_held = []
+    redis_scheduler_rdb_entries.send = MagicMock(
+        side_effect=lambda sched_entry: lock_held.append(
+            redis_scheduler_rdb_entries.runtime_stats.snapshot()["lock_held"]
+        )
+    )
+    assert redis_scheduler_rdb_entries.runtime_stats.snapshot()["lock_held"] == False
+    redis_scheduler_rdb_entries.run(max_iterations=1)
+    assert len(lock_held) > 0
+    assert all(lock_held)
+    assert redis_scheduler_rdb_entries.runtime_stats.snapshot()["lock_held"] == False
+
+
+def test_run_lock_heartbeat(
+    redis_scheduler_rdb_entries: RedisScheduler,
+    redis_scheduler2: RedisScheduler
+) -> None:
+    # the send outlasts the lock timeout, so the lock is only kept by the heartbeat
+    redis_scheduler_rdb_entries.lock_heartbeat_interval = datetime.timedelta(seconds=0.5)
+    lock_taken = []
+    def send(sched_entry: ScheduleEntry) -> None:
+        if len(lock_taken) == 0:
+            time.sleep(redis_scheduler_rdb_entries.lock_timeout.total_seconds() + 0.5)
+            lock_taken.append(redis_scheduler2._scheduler_lock.acquire(timeout=0))
+
+    redis_scheduler_rdb_entries.send = send
+    redis_scheduler_rdb_entries.run(max_iterations=1)
+    assert lock_taken == [False]
+    assert redis_scheduler_rdb_entries._lock_heartbeat is None
+
+
+def test_run_lock_heartbeat_lost(
+    redis_scheduler: RedisScheduler,
+    caplog: pytest.LogCaptureFixture
+) -> None:
+    redis_scheduler.default_sched_entries = []
+    redis_scheduler._default_sched_entry_lookup = {}
+    for i in range(3):
+        redis_scheduler.save(IntervalEntry(key="due_{}".format(i), enabled=True, task="test.task", period=.1))
+
+    time.sleep(0.2)
+    redis_scheduler.lock_heartbeat_interval = datetime.timedelta(seconds=0.05)
+    redis_scheduler._refresh_lock = MagicMock(return_value=False)
+    redis_scheduler.send = MagicMock(side_effect=lambda sched_entry: time.sleep(0.3))
+    redis_scheduler.run(max_iterations=1)
+    assert redis_scheduler.send.call_count == 1
+    assert messages.sched_lock_lost_mid_tick in caplog.text
+
+
+def test_run_slow_tick(
+    redis_scheduler_rdb_entries: RedisScheduler,
+    caplog: pytest.LogCaptureFixture
+) -> None:
+    redis_scheduler_rdb_entries._watchdog = SlowTickWatchdog(threshold=0.05)
+    redis_scheduler_rdb_entries.send = MagicMock(side_effect=lambda sched_entry: time.sleep(0.2))
+    redis_scheduler_rdb_entries.run(max_iterations=1)
+    assert "Thread stacks" in caplog.text
+    assert "_run_once" in caplog.text
+    assert redis_scheduler_rdb_entries._watchdog._thread is None
+
+
 def test__cleanup_no_lock(
     redis_scheduler_rdb_entries: RedisScheduler
 ) -> None:
@@ -266,3 +858,250 @@ def test__run_once_disabled_db_entry(
     # Should not throw an error
     redis_scheduler_rdb_entries._run_once()
 
+
+def test__active_entry_keys(
+    redis_scheduler: RedisScheduler,
+    default_entries: List[entries.ScheduleEntry],
+    filter_entries: List[entries.ScheduleEntry]
+) -> None:
+    for entry in filter_entries:
+        redis_scheduler.save(entry)
+
+    active_keys = list(redis_scheduler._active_entry_keys(page_size=1))
+    expected_keys = [entry.key for entry in default_entries + filter_entries if entry.enabled]
+    assert sorted(active_keys) == sorted(expected_keys)
+
+
+def test__run_once_fired_event_leaves_active_set(
+    redis_scheduler: RedisScheduler,
+    test_task: str
+) -> None:
+    event_entry = entries.EventEntry(
+        key="fire_once",
+        enabled=True,
+        task=test_task,
+        due_at=utc_now_naive()
+    )
+    redis_scheduler.save(event_entry)
+    assert "fire_once" in list(redis_scheduler._active_entry_keys())
+    redis_scheduler._run_once()
+    assert redis_scheduler.send.call_args_list[-1].args[0].key == "fire_once"
+    assert "fire_once" not in list(redis_scheduler._active_entry_keys())
+    assert redis_scheduler.count(filter=ScheduleEntryFilter(key_prefix="fire_once", enabled=False)) == 1
+    redis_scheduler.send.reset_mock()
+    redis_scheduler._run_once()
+    assert "fire_once" not in [call.args[0].key for call in redis_scheduler.send.call_args_list]
+
+
+def test__run_once_skips_expired(
+    redis_scheduler: RedisScheduler,
+    test_task: str
+) -> None:
+    event_entry = entries.EventEntry(
+        key="expired",
+        enabled=True,
+        task=test_task,
+        due_at=utc_now_naive(),
+        expires_at=utc_now_naive() - datetime.timedelta(seconds=1)
+    )
+    redis_scheduler.save(event_entry)
+    redis_scheduler._run_once()
+    assert "expired" not in [call.args[0].key for call in redis_scheduler.send.call_args_list]
+
+
+@pytest.mark.parametrize("expired_entry_action", ["purge", "archive"])
+def test__sweep_expired(
+    redis_scheduler: RedisScheduler,
+    test_task: str,
+    expired_entry_action: str
+) -> None:
+    redis_scheduler.fired_entry_retention = datetime.timedelta(seconds=0)
+    redis_scheduler.expired_entry_action = expired_entry_action
+    redis_scheduler.expiry_sweep_batch_size = 2
+    for i in range(3):
+        redis_scheduler.save(
+            entries.EventEntry(
+                key="fire_once_{}".format(i),
+                enabled=True,
+                task=test_task,
+                due_at=utc_now_naive()
+            )
+        )
+
+    kept_entry = entries.EventEntry(
+        key="not_expired",
+        enabled=True,
+        task=test_task,
+        due_at=utc_now_naive() + datetime.timedelta(days=1),
+        expires_at=utc_now_naive() + datetime.timedelta(days=2)
+    )
+    redis_scheduler.save(kept_entry)
+    redis_scheduler._run_once()
+    assert len([
+        call for call in redis_scheduler.send.call_args_list 
+        if call.args[0].key.startswith("fire_once_")
+    ]) == 3
+    assert redis_scheduler.count(filter=ScheduleEntryFilter(key_prefix="fire_once_")) == 3
+    num_event_entries = redis_scheduler.stats().by_type["EventEntry"]
+    assert redis_scheduler._sweep_expired() == 2
+    assert redis_scheduler._sweep_expired() == 1
+    assert redis_scheduler._sweep_expired() == 0
+    assert redis_scheduler.count(filter=ScheduleEntryFilter(key_prefix="fire_once_")) == 0
+    assert redis_scheduler.get("not_expired").expires_at == kept_entry.expires_at
+    assert redis_scheduler.stats().by_type["EventEntry"] == num_event_entries - 3
+    archived = redis_scheduler._redis_conn.hgetall(redis_scheduler._archive_key)
+    if expired_entry_action == "archive":
+        assert sorted(archived) == ["fire_once_0", "fire_once_1", "fire_once_2"]
+        assert json.loads(archived["fire_once_0"])["was_sent"] == True
+    else:
+        assert archived == {}
+
+    assert redis_scheduler._redis_conn.zrange(redis_scheduler._expiry_key, 0, -1) == ["not_expired"]
+
+
+def test_metrics(
+    redis_scheduler: RedisScheduler,
+    test_task: str
+) -> None:
+    redis_scheduler.metrics_sink = PrometheusMetricsSink()
+    redis_scheduler.save(
+        entries.EventEntry(
+            key="fire_once",
+            enabled=True,
+            task=test_task,
+            due_at=utc_now_naive()
+        )
+    )
+    redis_scheduler._acquire_lock()
+    redis_scheduler._run_once()
+    assert redis_scheduler._refresh_lock() == True
+    rendered = redis_scheduler.metrics_sink.render()
+    assert "{}_count 1".format(metrics.TICK_DURATION) in rendered
+    assert '{}_count{{task="{}"}}'.format(metrics.SCHEDULING_LAG, test_task) in rendered
+    assert '{}_count{{task="{}"}}'.format(metrics.SEND_LATENCY, test_task) in rendered
+    assert "{}_count 1".format(metrics.LOCK_ACQUIRE_DURATION) in rendered
+    assert "{}_count 1".format(metrics.LOCK_REFRESH_DURATION) in rendered
+    assert metrics.LOCK_LOSSES not in rendered
+
+
+def test_operation_stats(
+    redis_scheduler: RedisScheduler,
+    test_task: str
+) -> None:
+    redis_scheduler.save(
+        entries.EventEntry(
+            key="fire_once",
+            enabled=True,
+            task=test_task,
+            due_at=utc_now_naive()
+        )
+    )
+    redis_scheduler._run_once()
+    list(redis_scheduler.list())
+    redis_scheduler.get("fire_once")
+    dumped = redis_scheduler.operation_stats.dump()
+    for operation in (operation_stats.HSCAN, operation_stats.HGET, operation_stats.HSET, operation_stats.LOCK_ACQUIRE, operation_stats.DECODE):
+        assert dumped[operation]["count"] > 0
+
+
+@pytest.fixture
+def redis_scheduler_replica(
+    max_interval: datetime.timedelta,
+    lock_timeout: datetime.timedelta,
+    default_entries: List[ScheduleEntry],
+    redis_scheduler: RedisScheduler
+) -> RedisScheduler:
+    # a replica that never catches up, so reads from it are easy to tell apart
+    replica = redislite.Redis()
+    redis_sched = RedisScheduler(
+        max_interval=max_interval,
+        default_sched_entries=default_entries,
+        lock_timeout=lock_timeout,
+        redis_py_kwargs=redis_scheduler.redis_py_kwargs,
+        read_redis_py_kwargs={"unix_socket_path": replica.socket_file}
+    )
+    redis_sched.send = MagicMock(return_value=None)
+
+    yield redis_sched
+
+    replica.shutdown()
+
+
+def test_read_replica(
+    redis_scheduler_replica: RedisScheduler,
+    interval_entry: IntervalEntry
+) -> None:
+    redis_scheduler_replica.save(interval_entry)
+    with pytest.raises(exceptions.ScheduleEntryNotFound):
+        redis_scheduler_replica.get(interval_entry.key)
+
+    assert interval_entry.key not in [entry.key for entry in redis_scheduler_replica.list()]
+    assert redis_scheduler_replica.count() == len(redis_scheduler_replica.default_sched_entries)
+    assert redis_scheduler_replica.stats().total == len(redis_scheduler_replica.default_sched_entries)
+    # ticks stay on the primary
+    redis_scheduler_replica._run_once()
+    assert redis_scheduler_replica.send.call_count > 0
+
+
+def test_read_your_writes_window(
+    redis_scheduler_replica: RedisScheduler,
+    interval_entry: IntervalEntry
+) -> None:
+    redis_scheduler_replica.read_your_writes_window = datetime.timedelta(seconds=0.2)
+    redis_scheduler_replica.save(interval_entry)
+    assert redis_scheduler_replica.get(interval_entry.key) == interval_entry
+    assert redis_scheduler_replica.count() == len(redis_scheduler_replica.default_sched_entries) + 1
+    time.sleep(0.25)
+    with pytest.raises(exceptions.ScheduleEntryNotFound):
+        redis_scheduler_replica.get(interval_entry.key)
+
+
+def test_get_entry_cache(
+    redis_scheduler: RedisScheduler,
+    redis_scheduler2: RedisScheduler,
+    interval_entry: IntervalEntry
+) -> None:
+    redis_scheduler.entry_cache_size = 10
+    redis_scheduler.__post_init_post_parse__()
+    redis_scheduler.save(interval_entry)
+    assert redis_scheduler.get(interval_entry.key) == interval_entry
+    redis_scheduler._operation_stats.reset()
+    assert redis_scheduler.get(interval_entry.key) == interval_entry
+    # served from memory
+    assert redis_scheduler.operation_stats.dump() == {}
+    assert redis_scheduler.entry_cache.hits == 1
+
+    # changed by another process, evicted by the notification
+    interval_entry.enabled = False
+    redis_scheduler2.save(interval_entry)
+    time.sleep(.1)
+    assert len(redis_scheduler.entry_cache) == 0
+    assert redis_scheduler.get(interval_entry.key).enabled == False
+    redis_scheduler2.delete(interval_entry)
+    time.sleep(.1)
+    with pytest.raises(exceptions.ScheduleEntryNotFound):
+        redis_scheduler.get(interval_entry.key)
+
+    redis_scheduler._stop_watching_entry_changes()
+    assert redis_scheduler._entry_changes is None
+
+
+def test__run_once_decode_memo(
+    redis_scheduler: RedisScheduler,
+    test_task: str
+) -> None:
+    redis_scheduler.decode_memo_size = 100
+    redis_scheduler.__post_init_post_parse__()
+    redis_scheduler.save(
+        IntervalEntry(
+            key="not_due",
+            enabled=True,
+            task=test_task,
+            period=120
+        )
+    )
+    redis_scheduler._run_once()
+    assert redis_scheduler._entry_type_registry.memo_hits == 0
+    # the unchanged entry is copied instead of decoded on the next tick
+    redis_scheduler._run_once()
+    assert redis_scheduler._entry_type_registry.memo_hits == 1
@@ -1,6 +1,6 @@
 
 import datetime
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch, PropertyMock
 
 import pytest
 import rq
@@ -58,6 +58,18 @@ def test_send(
     assert rq_scheduler.rq_queue.get_jobs()[0].func_name == rq_entry.task
 
 
+def test_send_fencing_token(
+    rq_entry: IntervalEntry,
+    rq_scheduler: RQScheduler
+) -> None:
+    rq_scheduler.send(rq_entry)
+    assert "beatdrop_fencing_token" not in rq_scheduler.rq_queue.get_jobs()[0].meta
+    with patch.object(RQScheduler, "fencing_token", new_callable=PropertyMock, return_value=7):
+        rq_scheduler.send(rq_entry)
+
+    assert rq_scheduler.rq_queue.get_jobs()[1].meta["beatdrop_fencing_token"] == 7
+
+
 def test_send_exception(
     rq_entry: IntervalEntry,
     rq_scheduler: RQScheduler,
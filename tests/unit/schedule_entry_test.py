@@ -1,10 +1,11 @@
 
 import datetime
+import time
 
 import pytest
 
 from beatdrop.entries import ScheduleEntry
-from beatdrop import exceptions
+from beatdrop import entries, exceptions
 
 
 @pytest.fixture
@@ -44,6 +45,15 @@ def test_creation(sched_entry: ScheduleEntry) -> None:
 #         )
 
 
+def test_is_expired(sched_entry: ScheduleEntry) -> None:
+    assert not sched_entry.is_expired()
+    sched_entry.expires_at = datetime.datetime.now(tz=datetime.timezone.utc) - datetime.timedelta(seconds=1)
+    assert sched_entry.is_expired()
+    sched_entry.expires_at = datetime.datetime.utcnow() + datetime.timedelta(hours=1)
+    assert not sched_entry.is_expired()
+    assert sched_entry.is_expired(datetime.datetime.utcnow() + datetime.timedelta(hours=2))
+
+
 def test_not_implemented_methods(sched_entry: ScheduleEntry) -> None:
     with pytest.raises(exceptions.MethodNotImplementedError):
         sched_entry.due_in()
@@ -74,3 +84,21 @@ def test_json(sched_entry: ScheduleEntry) -> None:
     json_ = sched_entry.json()
     assert "__beatdrop_type__" in json_
 
+
+class FixedEntry(ScheduleEntry):
+    """Entry type that only implements ``due_in`` and ``sent``."""
+
+    def due_in(self) -> datetime.timedelta:
+        return datetime.timedelta(seconds=10)
+
+    def sent(self) -> None:
+        pass
+
+
+def test_compute_next_due_at(test_task: str) -> None:
+    entry = FixedEntry(key="fixed", enabled=True, task=test_task)
+    assert entry.compute_next_due_at() == pytest.approx(time.time() + 10, abs=1)
+    assert not FixedEntry.computes_next_due_at()
+    assert not ScheduleEntry.computes_next_due_at()
+    assert entries.IntervalEntry.computes_next_due_at()
+    assert "next_due_at" in ScheduleEntry.client_read_only_fields
@@ -1,11 +1,13 @@
 
+import time
 from typing import List
 
 import pytest
 
-from beatdrop import entries, exceptions
+from beatdrop import entries, exceptions, ScheduleEntryFilter
 from beatdrop.entries.schedule_entry import ScheduleEntry
-from beatdrop.schedulers import Scheduler
+from beatdrop.pagination import encode_page_cursor
+from beatdrop.schedulers import MemScheduler, Scheduler
 
 
 @pytest.fixture
@@ -31,6 +33,34 @@ def test_bad_max_interval() -> None:
             max_interval=-1
         )
 
+    with pytest.raises(ValueError):
+        Scheduler(
+            max_interval=.25
+        )
+
+
+def test_high_resolution() -> None:
+    scheduler = Scheduler(
+        max_interval=.25,
+        high_resolution=True
+    )
+    assert scheduler.max_interval.total_seconds() == .25
+    for deadline_in in (.05, .002, 0):
+        deadline = time.monotonic() + deadline_in
+        scheduler._sleep_until(deadline)
+        assert 0 <= time.monotonic() - deadline < .01
+
+    # a deadline in the past does not sleep
+    started_at = time.monotonic()
+    scheduler._sleep_until(started_at - 1)
+    assert time.monotonic() - started_at < .01
+
+    with pytest.raises(ValueError):
+        Scheduler(
+            max_interval=0,
+            high_resolution=True
+        )
+
 
 def test_not_implemented_methods(scheduler: ScheduleEntry) -> None:
     with pytest.raises(exceptions.MethodNotImplementedError):
@@ -42,6 +72,15 @@ def test_not_implemented_methods(scheduler: ScheduleEntry) -> None:
     with pytest.raises(exceptions.MethodNotImplementedError):
         scheduler.list()
 
+    with pytest.raises(exceptions.MethodNotImplementedError):
+        scheduler.list_page()
+
+    with pytest.raises(exceptions.MethodNotImplementedError):
+        scheduler.count()
+
+    with pytest.raises(exceptions.MethodNotImplementedError):
+        scheduler.stats()
+
     with pytest.raises(exceptions.MethodNotImplementedError):
         scheduler.get("test")
 
@@ -52,6 +91,32 @@ def test_not_implemented_methods(scheduler: ScheduleEntry) -> None:
         scheduler.delete("test")
 
 
+@pytest.mark.parametrize("backend", ["mem", "sql", "redis"])
+def test_filter_keyword_only(
+    request: pytest.FixtureRequest,
+    default_entries: List[entries.ScheduleEntry],
+    backend: str
+) -> None:
+    if backend == "mem":
+        sched = MemScheduler(max_interval=60, default_sched_entries=default_entries)
+    else:
+        sched = request.getfixturevalue("{}_scheduler".format(backend))
+
+    sched_filter = ScheduleEntryFilter(entry_type=entries.CrontabEntry)
+    expected_keys = [entry.key for entry in default_entries if sched_filter.matches(entry)]
+    assert [entry.key for entry in sched.list(filter=sched_filter)] == expected_keys
+    assert [entry.key for entry in sched.list_page(None, 100, filter=sched_filter).entries] == expected_keys
+    assert sched.count(filter=sched_filter) == len(expected_keys)
+    with pytest.raises(TypeError):
+        sched.list(sched_filter)
+
+    with pytest.raises(TypeError):
+        sched.list_page(None, 100, sched_filter)
+
+    with pytest.raises(TypeError):
+        sched.count(sched_filter)
+
+
 def test__update_run_iteration(scheduler: Scheduler) -> None:
     num_iters = 0
     max_iters = None
@@ -82,3 +147,26 @@ def test__check_default_entry_overwrite(
         with pytest.raises(exceptions.OverwriteDefaultEntryError):
             scheduler._check_default_entry_overwrite(sched_entry=entry)
 
+
+def test__page_default_entries(
+    scheduler: Scheduler, 
+    default_entries: List[entries.ScheduleEntry]
+) -> None:
+    page_entries, next_cursor, state = scheduler._page_default_entries(cursor=None, limit=5, filter=None)
+    assert page_entries == default_entries[:5]
+    assert state is None
+    page_entries, next_cursor, state = scheduler._page_default_entries(cursor=next_cursor, limit=5, filter=None)
+    assert page_entries == default_entries[5:]
+    assert next_cursor is None
+    assert state == {}
+    with pytest.raises(exceptions.InvalidPageCursor):
+        scheduler._page_default_entries(cursor=encode_page_cursor({"d": "1"}), limit=5, filter=None)
+
+
+def test__due_in(scheduler: Scheduler, default_entries: List[entries.ScheduleEntry]) -> None:
+    entry = default_entries[0]
+    assert scheduler._due_in(entry).total_seconds() == pytest.approx(entry.due_in().total_seconds(), abs=1)
+    # entry types that compute next_due_at are checked with it
+    entry.next_due_at = 0
+    assert scheduler._due_in(entry).total_seconds() < 0
+    assert entry.due_in().total_seconds() > 0
@@ -1,10 +1,12 @@
 
 import datetime
+import time
 from typing import List
 
 import pytest
 
-from beatdrop import entries
+from beatdrop import entries, exceptions
+from beatdrop.helpers import utc_now_naive
 from beatdrop.schedulers import SingletonLockScheduler
 
 
@@ -24,3 +26,155 @@ def test_short_lock_timeout(default_entries: List[entries.ScheduleEntry]) -> Non
             default_sched_entries=default_entries,
             lock_timeout=179
         )
+
+
+def test_slow_tick_fraction(default_entries: List[entries.ScheduleEntry]) -> None:
+    single_sched = SingletonLockScheduler(
+        max_interval=60,
+        default_sched_entries=default_entries,
+        lock_timeout=180,
+        slow_tick_fraction=0.5
+    )
+    assert single_sched._watchdog.threshold == 90
+
+    for slow_tick_fraction in (0, 1.5):
+        with pytest.raises(ValueError):
+            SingletonLockScheduler(
+                max_interval=60,
+                default_sched_entries=default_entries,
+                lock_timeout=180,
+                slow_tick_fraction=slow_tick_fraction
+            )
+
+
+def test_lock_heartbeat_interval(default_entries: List[entries.ScheduleEntry]) -> None:
+    single_sched = SingletonLockScheduler(
+        max_interval=60,
+        default_sched_entries=default_entries,
+        lock_timeout=180,
+        lock_heartbeat_interval=30
+    )
+    assert single_sched.lock_heartbeat_interval == datetime.timedelta(seconds=30)
+
+    for lock_heartbeat_interval in (0, 180):
+        with pytest.raises(ValueError):
+            SingletonLockScheduler(
+                max_interval=60,
+                default_sched_entries=default_entries,
+                lock_timeout=180,
+                lock_heartbeat_interval=lock_heartbeat_interval
+            )
+
+
+def test__standby_wait_time(default_entries: List[entries.ScheduleEntry]) -> None:
+    single_sched = SingletonLockScheduler(
+        max_interval=60,
+        default_sched_entries=default_entries,
+        lock_timeout=180
+    )
+    assert single_sched._standby_wait_time(None) == 60
+    assert single_sched._standby_wait_time(5) == 5
+    assert single_sched._standby_wait_time(-1) == 0
+    single_sched.standby_poll_interval = datetime.timedelta(seconds=0.5)
+    assert single_sched._standby_wait_time(5) == 0.5
+
+    with pytest.raises(ValueError):
+        SingletonLockScheduler(
+            max_interval=60,
+            default_sched_entries=default_entries,
+            lock_timeout=180,
+            standby_poll_interval=0
+        )
+
+
+def test__read_from_primary(default_entries: List[entries.ScheduleEntry]) -> None:
+    single_sched = SingletonLockScheduler(
+        max_interval=60,
+        default_sched_entries=default_entries,
+        lock_timeout=180
+    )
+    single_sched._wrote("key")
+    assert not single_sched._read_from_primary()
+    single_sched.read_your_writes_window = datetime.timedelta(seconds=0.1)
+    assert single_sched._read_from_primary()
+    time.sleep(0.15)
+    assert not single_sched._read_from_primary()
+
+    with pytest.raises(ValueError):
+        SingletonLockScheduler(
+            max_interval=60,
+            default_sched_entries=default_entries,
+            lock_timeout=180,
+            read_your_writes_window=0
+        )
+
+
+def test_bad_expiry_config(default_entries: List[entries.ScheduleEntry]) -> None:
+    with pytest.raises(ValueError):
+        SingletonLockScheduler(
+            max_interval=60,
+            default_sched_entries=default_entries,
+            lock_timeout=180,
+            expired_entry_action="keep"
+        )
+
+    with pytest.raises(ValueError):
+        SingletonLockScheduler(
+            max_interval=60,
+            default_sched_entries=default_entries,
+            lock_timeout=180,
+            expiry_sweep_batch_size=0
+        )
+
+
+def test__apply_fired_entry_retention(
+    default_entries: List[entries.ScheduleEntry],
+    test_task: str
+) -> None:
+    single_sched = SingletonLockScheduler(
+        max_interval=60,
+        default_sched_entries=default_entries,
+        lock_timeout=180,
+        fired_entry_retention=datetime.timedelta(hours=1)
+    )
+    event_entry = entries.EventEntry(
+        key="fired",
+        enabled=True,
+        task=test_task,
+        due_at=utc_now_naive()
+    )
+    single_sched._apply_fired_entry_retention(event_entry)
+    assert event_entry.expires_at is None
+    event_entry.sent()
+    single_sched._apply_fired_entry_retention(event_entry)
+    assert utc_now_naive() < event_entry.expires_at <= utc_now_naive() + datetime.timedelta(hours=1)
+    earlier = utc_now_naive() + datetime.timedelta(minutes=1)
+    event_entry.expires_at = earlier
+    single_sched._apply_fired_entry_retention(event_entry)
+    assert event_entry.expires_at == earlier
+    with pytest.raises(exceptions.MethodNotImplementedError):
+        single_sched._sweep_expired()
+
+
+def test_look_ahead_window(default_entries: List[entries.ScheduleEntry]) -> None:
+    single_sched = SingletonLockScheduler(
+        max_interval=60,
+        default_sched_entries=default_entries,
+        lock_timeout=180,
+        look_ahead_window=120
+    )
+    assert single_sched._look_ahead_wheel is not None
+    with pytest.raises(exceptions.MethodNotImplementedError):
+        list(single_sched._look_ahead_stored_entries(time.time()))
+
+    with pytest.raises(exceptions.MethodNotImplementedError):
+        single_sched._claim_look_ahead_entry(default_entries[0], None)
+
+    for look_ahead_window in (30, 60):
+        with pytest.raises(ValueError):
+            SingletonLockScheduler(
+                max_interval=60,
+                default_sched_entries=default_entries,
+                lock_timeout=180,
+                look_ahead_window=look_ahead_window
+            )
@@ -0,0 +1,184 @@
+import datetime
+import itertools
+from pathlib import Path
+import time
+from typing import Dict
+from unittest.mock import patch
+
+import pytest
+import sqlalchemy
+from sqlalchemy import event
+from sqlalchemy.orm import sessionmaker
+
+from beatdrop import messages
+from beatdrop.schedulers.sql_scheduler import SQLSchedulerLock
+from beatdrop.sql_lock import \
+    AdvisoryLock, \
+    lock_strategy_for, \
+    MySQLGetLock, \
+    PostgresAdvisoryLock, \
+    RowLeaseLock
+
+
+@pytest.fixture
+def lock_engine(tmp_path: Path) -> sqlalchemy.engine.Engine:
+    engine = sqlalchemy.create_engine("sqlite:///{}".format(tmp_path / "lock.sqlite"))
+    SQLSchedulerLock.__table__.create(engine)
+    return engine
+
+
+def make_row_lease(
+    engine: sqlalchemy.engine.Engine,
+    instance_id: str,
+    lock_timeout: float = 3
+) -> RowLeaseLock:
+    return RowLeaseLock(
+        engine=engine,
+        session_maker=sessionmaker(bind=engine),
+        lock_table=SQLSchedulerLock,
+        instance_id=instance_id,
+        lock_timeout=datetime.timedelta(seconds=lock_timeout)
+    )
+
+
+def test_row_lease(lock_engine: sqlalchemy.engine.Engine) -> None:
+    lock = make_row_lease(lock_engine, "a")
+    other_lock = make_row_lease(lock_engine, "b")
+    assert lock.try_acquire() == (True, None)
+    acquired, lock_expires_in = other_lock.try_acquire()
+    assert not acquired
+    assert 0 < lock_expires_in <= 3
+    assert lock.refresh()
+    assert lock.refresh()
+    assert not other_lock.refresh()
+    with sessionmaker(bind=lock_engine)() as session:
+        db_lock = session.query(SQLSchedulerLock).one()
+        assert db_lock.owner_id == "a"
+        assert db_lock.version == 3
+        assert db_lock.standby_id == "b"
+
+    # b was seen recently, so the lease is handed off
+    assert lock.release()
+    assert not lock.release()
+    assert other_lock.try_acquire() == (True, None)
+    assert other_lock.release()
+    with sessionmaker(bind=lock_engine)() as session:
+        assert session.query(SQLSchedulerLock).count() == 0
+
+
+def test_row_lease_expired(lock_engine: sqlalchemy.engine.Engine) -> None:
+    lock = make_row_lease(lock_engine, "a", lock_timeout=.1)
+    other_lock = make_row_lease(lock_engine, "b", lock_timeout=.1)
+    assert lock.try_acquire()[0]
+    time.sleep(.2)
+    assert other_lock.try_acquire()[0]
+    # the expired holder can no longer refresh or release the new holder's lease
+    assert not lock.refresh()
+    assert not lock.release()
+    assert other_lock.refresh()
+
+
+def test_row_lease_acquire_race(lock_engine: sqlalchemy.engine.Engine) -> None:
+    lock = make_row_lease(lock_engine, "a", lock_timeout=.1)
+    assert lock.try_acquire()[0]
+    time.sleep(.2)
+    other_lock = make_row_lease(lock_engine, "b", lock_timeout=.1)
+    # another scheduler takes the expired lease between the read and the update
+    original_execute = sqlalchemy.orm.Session.execute
+
+    def execute_after_refresh(session, statement, *args, **kwargs):
+        if statement.is_dml:
+            assert original_execute(session, update_version, *args, **kwargs).rowcount == 1
+
+        return original_execute(session, statement, *args, **kwargs)
+
+    update_version = sqlalchemy.update(SQLSchedulerLock).values(version=SQLSchedulerLock.version + 1)
+    with patch.object(sqlalchemy.orm.Session, "execute", execute_after_refresh):
+        assert other_lock.try_acquire() == (False, None)
+
+    # the version moved on under both schedulers
+    assert not lock.refresh()
+
+
+class FakeAdvisoryLock(AdvisoryLock):
+    """Advisory lock backed by Python functions registered on SQLite connections."""
+
+    dialects = ("sqlite",)
+    _try_lock_sql = "SELECT try_lock(:name)"
+    _held_sql = "SELECT lock_held(:name)"
+    _unlock_sql = "SELECT unlock(:name)"
+    _params = {"name": "test_lock"}
+
+
+@pytest.fixture
+def advisory_engine(lock_engine: sqlalchemy.engine.Engine) -> sqlalchemy.engine.Engine:
+    holders: Dict[str, int] = {}
+    # not ``id``, a new connection can reuse the address of an invalidated one
+    connection_ids = itertools.count()
+
+    @event.listens_for(lock_engine, "connect")
+    def register_lock_functions(dbapi_connection, connection_record) -> None:
+        connection_id = next(connection_ids)
+
+        def try_lock(name: str) -> int:
+            if holders.setdefault(name, connection_id) == connection_id:
+                return 1
+
+            return 0
+
+        def unlock(name: str) -> int:
+            if holders.get(name) == connection_id:
+                del holders[name]
+                return 1
+
+            return 0
+
+        dbapi_connection.create_function("try_lock", 1, try_lock)
+        dbapi_connection.create_function("lock_held", 1, lambda name: int(holders.get(name) == connection_id))
+        dbapi_connection.create_function("unlock", 1, unlock)
+
+    return lock_engine
+
+
+def make_advisory(engine: sqlalchemy.engine.Engine, instance_id: str) -> FakeAdvisoryLock:
+    return FakeAdvisoryLock(
+        engine=engine,
+        session_maker=sessionmaker(bind=engine),
+        lock_table=SQLSchedulerLock,
+        instance_id=instance_id,
+        lock_timeout=datetime.timedelta(seconds=3)
+    )
+
+
+def test_advisory_lock(advisory_engine: sqlalchemy.engine.Engine) -> None:
+    lock = make_advisory(advisory_engine, "a")
+    other_lock = make_advisory(advisory_engine, "b")
+    assert lock.try_acquire() == (True, None)
+    assert other_lock.try_acquire() == (False, None)
+    assert not other_lock.refresh()
+    assert lock.refresh()
+    assert lock.release()
+    assert not lock.refresh()
+    assert other_lock.try_acquire() == (True, None)
+    assert not lock.release()
+    assert other_lock.release()
+    # no rows are written
+    with sessionmaker(bind=advisory_engine)() as session:
+        assert session.query(SQLSchedulerLock).count() == 0
+
+
+def test_advisory_lock_connection_lost(advisory_engine: sqlalchemy.engine.Engine) -> None:
+    lock = make_advisory(advisory_engine, "a")
+    assert lock.try_acquire()[0]
+    lock._connection.invalidate()
+    assert not lock.refresh()
+    assert lock._connection is None
+
+
+def test_lock_strategy_for(caplog: pytest.LogCaptureFixture) -> None:
+    assert lock_strategy_for("pg_advisory", "postgresql") is PostgresAdvisoryLock
+    assert lock_strategy_for("mysql_get_lock", "mysql") is MySQLGetLock
+    assert lock_strategy_for("row_lease", "postgresql") is RowLeaseLock
+    assert messages.sched_lock_strategy_fallback_template.format("pg_advisory", "sqlite") not in caplog.text
+    assert lock_strategy_for("pg_advisory", "sqlite") is RowLeaseLock
+    assert messages.sched_lock_strategy_fallback_template.format("pg_advisory", "sqlite") in caplog.text
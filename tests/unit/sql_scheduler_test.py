@@ -1,15 +1,44 @@
 
 import datetime
+import json
 from pathlib import Path
+import threading
+import time
 from typing import Callable, List
 from unittest.mock import MagicMock
 
 import pytest
+import sqlalchemy
 
 from beatdrop.helpers import utc_now_naive
-from beatdrop import entries, messages, exceptions
+from beatdrop.entry_stats import EntryStats
+from beatdrop.metrics import PrometheusMetricsSink
+from beatdrop.pagination import encode_page_cursor
+from beatdrop import entries, metrics, operation_stats, messages, exceptions, ScheduleEntryFilter
 from beatdrop.entries import IntervalEntry
-from beatdrop.schedulers.sql_scheduler import SQLScheduler, SQLScheduleEntry, SQLSchedulerLock
+from beatdrop.schedulers.sql_scheduler import SQLScheduler, SQLScheduleEntry, SQLScheduleEntryArchive, SQLSchedulerLock
+from beatdrop.sql_lock import RowLeaseLock
+
+
+list_filters = [
+    ScheduleEntryFilter(key_prefix="team_a:"),
+    ScheduleEntryFilter(key_prefix="team_b:interval*"),
+    ScheduleEntryFilter(entry_type=entries.IntervalEntry),
+    ScheduleEntryFilter(task="beatdrop.validators.valid_cron_expression"),
+    ScheduleEntryFilter(enabled=False),
+    ScheduleEntryFilter(entry_type=entries.CrontabTZEntry, enabled=True),
+    ScheduleEntryFilter(key_prefix="team_", entry_type=entries.IntervalEntry, enabled=True)
+]
+
+
+def list_all_pages(scheduler, limit: int, **kwargs) -> list:
+    page = scheduler.list_page(limit=limit, **kwargs)
+    all_entries = list(page.entries)
+    while page.cursor is not None:
+        page = scheduler.list_page(cursor=page.cursor, limit=limit, **kwargs)
+        all_entries.extend(page.entries)
+
+    return all_entries
 
 
 @pytest.fixture
@@ -64,6 +93,30 @@ def test_creation_no_url(
         )
 
 
+def test_creation_lock_strategy(
+    max_interval: datetime.timedelta,
+    lock_timeout: datetime.timedelta,
+    caplog: pytest.LogCaptureFixture
+) -> None:
+    with pytest.raises(ValueError):
+        SQLScheduler(
+            max_interval=max_interval,
+            lock_timeout=lock_timeout,
+            create_engine_kwargs={"url": "sqlite://"},
+            lock_strategy="table_lock"
+        )
+
+    # advisory locks fall back to the row lease on SQLite
+    sql_sched = SQLScheduler(
+        max_interval=max_interval,
+        lock_timeout=lock_timeout,
+        create_engine_kwargs={"url": "sqlite://"},
+        lock_strategy="pg_advisory"
+    )
+    assert isinstance(sql_sched._lock_strategy, RowLeaseLock)
+    assert messages.sched_lock_strategy_fallback_template.format("pg_advisory", "sqlite") in caplog.text
+
+
 def test_save_create(
     sql_scheduler: SQLScheduler,
     interval_entry: entries.ScheduleEntry
@@ -180,6 +233,256 @@ def test_list_paginate(
     assert yet_another_entry in entry_list
 
 
+def test_list_stream(
+    sql_scheduler_w_db_entry: SQLScheduler,
+    interval_entry: entries.IntervalEntry,
+    default_entries: List[entries.ScheduleEntry],
+    test_task: str
+) -> None:
+    crontab_entries = [
+        entries.CrontabEntry(
+            key="stream_crontab_{}".format(i),
+            enabled=True,
+            task=test_task,
+            cron_expression="*/1 * * * *",
+        )
+        for i in range(5)
+    ]
+    for entry in crontab_entries:
+        sql_scheduler_w_db_entry.save(entry)
+
+    entry_list = list(sql_scheduler_w_db_entry.list(page_size=2, stream=True))
+    assert entry_list == default_entries + [interval_entry] + crontab_entries
+    # Can be iterated again
+    assert list(sql_scheduler_w_db_entry.list(page_size=2, stream=True)) == entry_list
+
+
+def test_list_stream_close(
+    sql_scheduler_w_db_entry: SQLScheduler,
+    default_entries: List[entries.ScheduleEntry]
+) -> None:
+    entry_iter = iter(sql_scheduler_w_db_entry.list(page_size=1, stream=True))
+    for _ in range(len(default_entries) + 1):
+        next(entry_iter)
+
+    stop = entry_iter._stream_stop
+    entry_iter.close()
+    assert stop.is_set()
+    assert entry_iter._stream_pages is None
+
+
+def test_list_stream_error(
+    sql_scheduler: SQLScheduler,
+    default_entries: List[entries.ScheduleEntry]
+) -> None:
+    SQLScheduleEntry.__table__.drop(sql_scheduler._engine)
+    entry_iter = iter(sql_scheduler.list(stream=True))
+    for _ in range(len(default_entries)):
+        next(entry_iter)
+
+    with pytest.raises(Exception):
+        next(entry_iter)
+
+
+@pytest.mark.parametrize("stream", [False, True])
+@pytest.mark.parametrize("sched_filter", list_filters)
+def test_list_filter(
+    sql_scheduler: SQLScheduler,
+    default_entries: List[entries.ScheduleEntry],
+    filter_entries: List[entries.ScheduleEntry],
+    sched_filter: ScheduleEntryFilter,
+    stream: bool
+) -> None:
+    for entry in filter_entries:
+        sql_scheduler.save(entry)
+
+    expected = [entry for entry in default_entries + filter_entries if sched_filter.matches(entry)]
+    entry_list = list(sql_scheduler.list(page_size=1, stream=stream, filter=sched_filter))
+    assert entry_list == expected
+
+
+def test_save_metadata_columns(
+    sql_scheduler: SQLScheduler,
+    interval_entry: IntervalEntry
+) -> None:
+    sql_scheduler.save(interval_entry)
+    interval_entry.enabled = False
+    sql_scheduler.save(interval_entry)
+    with sql_scheduler._Session() as sess:
+        db_entry = sess.query(SQLScheduleEntry).one()
+
+    assert db_entry.key_ == interval_entry.key
+    assert db_entry.type_ == "IntervalEntry"
+    assert db_entry.task_ == interval_entry.task
+    assert db_entry.enabled_ == False
+
+
+def test_save_next_due_at(
+    sql_scheduler: SQLScheduler,
+    interval_entry: IntervalEntry
+) -> None:
+    sql_scheduler.save(interval_entry)
+    with sql_scheduler._Session() as sess:
+        db_entry = sess.query(SQLScheduleEntry).one()
+
+    assert db_entry.next_due_at_ == interval_entry.compute_next_due_at()
+    assert sql_scheduler.get(interval_entry.key).next_due_at == db_entry.next_due_at_
+
+    # entries stored without next_due_at are updated on save
+    interval_entry.period = datetime.timedelta(seconds=120)
+    with sql_scheduler._Session() as sess:
+        db_entry = sess.query(SQLScheduleEntry).one()
+        entry_dict = json.loads(db_entry.json_)
+        del entry_dict["next_due_at"]
+        db_entry.json_ = json.dumps(entry_dict)
+        sess.commit()
+
+    sql_scheduler.save(interval_entry)
+    with sql_scheduler._Session() as sess:
+        db_entry = sess.query(SQLScheduleEntry).one()
+
+    assert db_entry.next_due_at_ == interval_entry.compute_next_due_at()
+    assert db_entry.next_due_at_ == pytest.approx(time.time() + 120, abs=5)
+
+
+def test_backfill_columns(
+    sql_scheduler: SQLScheduler,
+    filter_entries: List[entries.ScheduleEntry]
+) -> None:
+    # saved by a version without the indexed columns
+    with sql_scheduler._Session() as sess:
+        for entry in filter_entries:
+            sess.add(SQLScheduleEntry(key_=entry.key, json_=entry.json(exclude={"expires_at", "next_due_at"})))
+
+        sess.commit()
+
+    assert sql_scheduler.backfill_columns(page_size=1) == len(filter_entries)
+    assert sql_scheduler.backfill_columns(page_size=1) == 0
+    with sql_scheduler._Session() as sess:
+        db_entries = sess.query(SQLScheduleEntry).order_by(SQLScheduleEntry.key_id).all()
+
+    assert [db_entry.type_ for db_entry in db_entries] == [type(entry).__name__ for entry in filter_entries]
+    assert [db_entry.enabled_ for db_entry in db_entries] == [entry.enabled for entry in filter_entries]
+    assert all(
+        db_entry.next_due_at_ is not None
+        for db_entry in db_entries
+        if db_entry.enabled_
+    )
+    assert sql_scheduler.stats() == EntryStats.from_entries(sql_scheduler.list())
+
+
+def test_run_earlier_version_entries(
+    sql_scheduler: SQLScheduler,
+    interval_entry: IntervalEntry,
+    caplog: pytest.LogCaptureFixture
+) -> None:
+    interval_entry.last_sent_at = utc_now_naive() - datetime.timedelta(seconds=120)
+    with sql_scheduler._Session() as sess:
+        sess.add(SQLScheduleEntry(key_=interval_entry.key, json_=interval_entry.json(exclude={"expires_at", "next_due_at"})))
+        sess.commit()
+
+    sql_scheduler.run(max_iterations=1)
+    assert messages.sched_entries_backfilled_template.format(1) in caplog.text
+    sent_keys = [call.args[0].key for call in sql_scheduler.send.call_args_list]
+    assert interval_entry.key in sent_keys
+
+
+def test_run_table_missing_columns(
+    sql_scheduler: SQLScheduler,
+    caplog: pytest.LogCaptureFixture
+) -> None:
+    # created by a version without the indexed columns
+    with sql_scheduler._engine.begin() as conn:
+        conn.execute(sqlalchemy.text("DROP TABLE beatdrop_entries"))
+        conn.execute(sqlalchemy.text(
+            "CREATE TABLE beatdrop_entries (key_id INTEGER PRIMARY KEY, key_ VARCHAR UNIQUE, json_ VARCHAR)"
+        ))
+
+    with pytest.raises(exceptions.StorageSchemaError, match="next_due_at_"):
+        sql_scheduler._upgrade_storage()
+
+    sql_scheduler.run(max_iterations=1)
+    assert "CRITICAL" in caplog.text
+    assert "StorageSchemaError" in caplog.text
+    sql_scheduler.send.assert_not_called()
+
+
+@pytest.mark.parametrize("limit", [1, 3, 100])
+def test_list_page(
+    sql_scheduler: SQLScheduler,
+    default_entries: List[entries.ScheduleEntry],
+    filter_entries: List[entries.ScheduleEntry],
+    limit: int
+) -> None:
+    for entry in filter_entries:
+        sql_scheduler.save(entry)
+
+    all_entries = list_all_pages(sql_scheduler, limit=limit)
+    assert all_entries[:len(default_entries)] == default_entries
+    assert sorted([entry.key for entry in all_entries[len(default_entries):]]) == sorted(
+        [entry.key for entry in filter_entries]
+    )
+
+
+@pytest.mark.parametrize("sched_filter", list_filters)
+def test_list_page_filter(
+    sql_scheduler: SQLScheduler,
+    default_entries: List[entries.ScheduleEntry],
+    filter_entries: List[entries.ScheduleEntry],
+    sched_filter: ScheduleEntryFilter
+) -> None:
+    for entry in filter_entries:
+        sql_scheduler.save(entry)
+
+    all_entries = list_all_pages(sql_scheduler, limit=1, filter=sched_filter)
+    expected_keys = [entry.key for entry in default_entries + filter_entries if sched_filter.matches(entry)]
+    assert sorted([entry.key for entry in all_entries]) == sorted(expected_keys)
+
+
+def test_list_page_invalid_cursor(sql_scheduler: SQLScheduler) -> None:
+    with pytest.raises(exceptions.InvalidPageCursor):
+        sql_scheduler.list_page(cursor="garbage!")
+
+    with pytest.raises(exceptions.InvalidPageCursor):
+        sql_scheduler.list_page(cursor=encode_page_cursor({"k": "1", "r": "1", "i": "not an index"}))
+
+
+@pytest.mark.parametrize("limit", [0, -5])
+def test_list_page_bad_limit(sql_scheduler: SQLScheduler, limit: int) -> None:
+    with pytest.raises(ValueError):
+        sql_scheduler.list_page(limit=limit)
+
+
+@pytest.mark.parametrize("sched_filter", [None, ScheduleEntryFilter()] + list_filters)
+def test_count(
+    sql_scheduler: SQLScheduler,
+    filter_entries: List[entries.ScheduleEntry],
+    sched_filter: ScheduleEntryFilter
+) -> None:
+    for entry in filter_entries:
+        sql_scheduler.save(entry)
+
+    expected_count = len(list(sql_scheduler.list(filter=sched_filter)))
+    sql_scheduler._entry_type_registry.dejson_entry = MagicMock(side_effect=Exception)
+    assert sql_scheduler.count(filter=sched_filter) == expected_count
+
+
+def test_stats(
+    sql_scheduler: SQLScheduler,
+    filter_entries: List[entries.ScheduleEntry]
+) -> None:
+    assert sql_scheduler.stats() == EntryStats.from_entries(sql_scheduler.default_sched_entries)
+    for entry in filter_entries:
+        sql_scheduler.save(entry)
+
+    filter_entries[0].enabled = False
+    sql_scheduler.save(filter_entries[0])
+    sql_scheduler.delete(filter_entries[2])
+    expected_stats = EntryStats.from_entries(sql_scheduler.list())
+    sql_scheduler._entry_type_registry.dejson_entry = MagicMock(side_effect=Exception)
+    assert sql_scheduler.stats() == expected_stats
+
+
 def test_get(
     sql_scheduler_w_db_entry: SQLScheduler,
     interval_entry: entries.IntervalEntry,
@@ -238,6 +541,65 @@ def test__acquire_lock_dead_scheduler(
     assert second_acquire_delta < (sql_scheduler.lock_timeout + sql_scheduler.max_interval)
 
 
+def test__acquire_lock_expiry_wake_up(
+    sql_scheduler: SQLScheduler,
+    sql_scheduler2: SQLScheduler
+) -> None:
+    # the standby wakes up when the lock expires, not after its poll interval
+    sql_scheduler2.standby_poll_interval = datetime.timedelta(seconds=30)
+    sql_scheduler._acquire_lock()
+    before = utc_now_naive()
+    sql_scheduler2._acquire_lock()
+    assert utc_now_naive() - before < sql_scheduler.lock_timeout + datetime.timedelta(seconds=0.5)
+
+
+def test__cleanup_hand_off(
+    sql_scheduler: SQLScheduler,
+    sql_scheduler2: SQLScheduler,
+    caplog: pytest.LogCaptureFixture
+) -> None:
+    sql_scheduler2.standby_poll_interval = datetime.timedelta(seconds=0.05)
+    sql_scheduler._acquire_lock()
+    standby = threading.Thread(target=sql_scheduler2._acquire_lock)
+    standby.start()
+    time.sleep(0.2)
+    with sql_scheduler._Session() as session:
+        assert session.query(SQLSchedulerLock).one().standby_id == sql_scheduler2._instance_id
+
+    before = utc_now_naive()
+    sql_scheduler._cleanup()
+    standby.join(timeout=2)
+    assert not standby.is_alive()
+    assert utc_now_naive() - before < datetime.timedelta(seconds=1)
+    assert messages.sched_lock_handing_off_template.format(sql_scheduler2._instance_id) in caplog.text
+    assert sql_scheduler2._refresh_lock()
+    with sql_scheduler._Session() as session:
+        assert session.query(SQLSchedulerLock).one().hand_off_to is None
+
+
+def test__acquire_lock_warm_standby(
+    sql_scheduler_w_db_entry: SQLScheduler,
+    sql_scheduler2: SQLScheduler,
+    interval_entry: IntervalEntry
+) -> None:
+    sql_scheduler2.warm_standby = True
+    sql_scheduler2.standby_poll_interval = datetime.timedelta(seconds=0.05)
+    sql_scheduler_w_db_entry._acquire_lock()
+    standby = threading.Thread(target=sql_scheduler2._acquire_lock)
+    standby.start()
+    time.sleep(0.2)
+    assert [entry.key for entry in sql_scheduler2._warm_entries.values()] == [interval_entry.key]
+
+    sql_scheduler_w_db_entry._cleanup()
+    standby.join(timeout=2)
+    sql_scheduler2._operation_stats.reset()
+    sql_scheduler2._tick()
+    # the warm entry was used instead of decoding it
+    assert "decode" not in sql_scheduler2.operation_stats.dump()
+    assert sql_scheduler2._warm_entries == {}
+    assert sql_scheduler2.send.call_count > 0
+
+
 def test__refresh_lock(sql_scheduler: SQLScheduler) -> None:
     sql_scheduler._acquire_lock()
     with sql_scheduler._Session() as sess:
@@ -251,6 +613,7 @@ def test__refresh_lock(sql_scheduler: SQLScheduler) -> None:
         refreshed_at = lock_entry.last_refreshed_at
 
     assert refreshed_at > acquired_at
+    assert sql_scheduler.operation_stats.dump()[operation_stats.LOCK_REFRESH]["count"] == 1
 
 
 def test__refresh_lock_fail(
@@ -262,8 +625,10 @@ def test__refresh_lock_fail(
         lock_entry: SQLSchedulerLock = sess.query(SQLSchedulerLock).one()
         acquired_at = lock_entry.last_refreshed_at
 
+    sql_scheduler2.metrics_sink = PrometheusMetricsSink()
     is_refreshed = sql_scheduler2._refresh_lock()
     assert is_refreshed == False
+    assert "{} 1.0".format(metrics.LOCK_LOSSES) in sql_scheduler2.metrics_sink.render()
     with sql_scheduler._Session() as sess:
         lock_entry: SQLSchedulerLock = sess.query(SQLSchedulerLock).one()
         refreshed_at = lock_entry.last_refreshed_at
@@ -287,6 +652,19 @@ def test_run_lost_lock(
     assert caplog.text.count(messages.sched_lock_acquired) == 2
 
 
+def test_run_lock_heartbeat(
+    sql_scheduler_w_db_entry: SQLScheduler,
+    caplog: pytest.LogCaptureFixture
+) -> None:
+    sql_scheduler_w_db_entry.lock_heartbeat_interval = datetime.timedelta(seconds=0.1)
+    sql_scheduler_w_db_entry.send = MagicMock(side_effect=lambda sched_entry: time.sleep(0.15))
+    sql_scheduler_w_db_entry.run(max_iterations=2)
+    # refreshed by the heartbeat during the ticks, and still held at cleanup
+    assert caplog.text.count(messages.sched_lock_refreshed) > 0
+    assert messages.sched_lock_released in caplog.text
+    assert sql_scheduler_w_db_entry._lock_heartbeat is None
+
+
 def test_run_critical_error(
     sql_scheduler_w_db_entry: SQLScheduler,
     caplog: pytest.LogCaptureFixture
@@ -324,3 +702,384 @@ def test__run_once_disabled_db_entry(
     # Should not throw an error
     sql_scheduler._run_once()
 
+
+def test__active_entry_keys(
+    sql_scheduler: SQLScheduler,
+    default_entries: List[entries.ScheduleEntry],
+    filter_entries: List[entries.ScheduleEntry]
+) -> None:
+    for entry in filter_entries:
+        sql_scheduler.save(entry)
+
+    active_keys = list(sql_scheduler._active_entry_keys(page_size=1))
+    expected_keys = [entry.key for entry in default_entries + filter_entries if entry.enabled]
+    assert sorted(active_keys) == sorted(expected_keys)
+
+
+def test__run_once_fired_event_leaves_active_set(
+    sql_scheduler: SQLScheduler,
+    test_task: str
+) -> None:
+    event_entry = entries.EventEntry(
+        key="fire_once",
+        enabled=True,
+        task=test_task,
+        due_at=utc_now_naive()
+    )
+    sql_scheduler.save(event_entry)
+    assert "fire_once" in list(sql_scheduler._active_entry_keys())
+    sql_scheduler._run_once()
+    assert sql_scheduler.send.call_args_list[-1].args[0].key == "fire_once"
+    assert "fire_once" not in list(sql_scheduler._active_entry_keys())
+    assert sql_scheduler.count(filter=ScheduleEntryFilter(key_prefix="fire_once", enabled=False)) == 1
+    sql_scheduler.send.reset_mock()
+    sql_scheduler._run_once()
+    assert "fire_once" not in [call.args[0].key for call in sql_scheduler.send.call_args_list]
+
+
+def test__run_once_skips_expired(
+    sql_scheduler: SQLScheduler,
+    test_task: str
+) -> None:
+    event_entry = entries.EventEntry(
+        key="expired",
+        enabled=True,
+        task=test_task,
+        due_at=utc_now_naive(),
+        expires_at=utc_now_naive() - datetime.timedelta(seconds=1)
+    )
+    sql_scheduler.save(event_entry)
+    sql_scheduler._run_once()
+    assert "expired" not in [call.args[0].key for call in sql_scheduler.send.call_args_list]
+
+
+def test_run_look_ahead(
+    sql_scheduler_w_db_entry: SQLScheduler,
+    scheduler_run_tests: Callable
+) -> None:
+    sql_scheduler_w_db_entry.look_ahead_window = datetime.timedelta(seconds=2)
+    sql_scheduler_w_db_entry.__post_init_post_parse__()
+    scheduler_run_tests(sql_scheduler_w_db_entry)
+
+
+def test__run_once_look_ahead(
+    sql_scheduler: SQLScheduler,
+    test_task: str
+) -> None:
+    sql_scheduler.look_ahead_window = datetime.timedelta(seconds=2)
+    sql_scheduler.__post_init_post_parse__()
+    sent_at = {}
+    sql_scheduler.send = MagicMock(side_effect=lambda sched_entry: sent_at.setdefault(sched_entry.key, time.time()))
+    utc_now = utc_now_naive()
+    for key, seconds_ago in (("soon", 59.7), ("later", 0)):
+        sql_scheduler.save(
+            IntervalEntry(
+                key=key,
+                enabled=True,
+                task=test_task,
+                period=60,
+                last_sent_at=utc_now - datetime.timedelta(seconds=seconds_ago)
+            ),
+            read_only_attributes=True
+        )
+
+    ticked_at = time.time()
+    assert sql_scheduler._run_once() == sql_scheduler.max_interval
+    assert "soon" in sql_scheduler._look_ahead_entries
+    assert "later" not in sql_scheduler._look_ahead_entries
+    soon_due_at = sql_scheduler._look_ahead_entries["soon"][2]
+    sql_scheduler._sleep(datetime.timedelta(seconds=.6))
+    # sent at its due time, before the next tick
+    assert soon_due_at <= sent_at["soon"] < ticked_at + sql_scheduler.max_interval.total_seconds()
+    assert "later" not in sent_at
+    assert sql_scheduler.get("soon").last_sent_at > utc_now
+    # not due again within the window
+    assert "soon" not in sql_scheduler._look_ahead_entries
+
+
+def test__run_once_look_ahead_changed(
+    sql_scheduler: SQLScheduler,
+    test_task: str
+) -> None:
+    sql_scheduler.look_ahead_window = datetime.timedelta(seconds=2)
+    sql_scheduler.__post_init_post_parse__()
+    sql_scheduler.default_sched_entries = []
+    utc_now = utc_now_naive()
+    for key in ("disabled", "moved", "new_args", "repeats"):
+        sql_scheduler.save(
+            IntervalEntry(
+                key=key,
+                enabled=True,
+                task=test_task,
+                period=.2 if key == "repeats" else 60,
+                last_sent_at=utc_now - datetime.timedelta(seconds=59.8)
+            ),
+            read_only_attributes=True
+        )
+
+    sql_scheduler._run_once()
+    assert sorted(sql_scheduler._look_ahead_entries) == ["disabled", "moved", "new_args", "repeats"]
+    # changed by a client after they were read
+    disabled = sql_scheduler.get("disabled")
+    disabled.enabled = False
+    sql_scheduler.save(disabled)
+    moved = sql_scheduler.get("moved")
+    moved.period = datetime.timedelta(seconds=120)
+    sql_scheduler.save(moved)
+    new_args = sql_scheduler.get("new_args")
+    new_args.args = [1]
+    sql_scheduler.save(new_args)
+    sql_scheduler._sleep(datetime.timedelta(seconds=.8))
+    sent_entries = [call.args[0] for call in sql_scheduler.send.call_args_list]
+    sent_keys = [entry.key for entry in sent_entries]
+    assert "disabled" not in sent_keys
+    assert "moved" not in sent_keys
+    assert [entry.args for entry in sent_entries if entry.key == "new_args"] == [(1,)]
+    # held again after each send, while it is due within the window
+    assert sent_keys.count("repeats") >= 3
+    assert "repeats" in sql_scheduler._look_ahead_entries
+
+
+def test__look_ahead_stored_entries_no_next_due_at(
+    sql_scheduler: SQLScheduler,
+    interval_entry: IntervalEntry,
+    test_task: str
+) -> None:
+    # an enabled event that was already sent is not due again
+    sent_event = entries.EventEntry(
+        key="sent_event",
+        enabled=True,
+        task=test_task,
+        due_at=utc_now_naive(),
+        was_sent=True
+    )
+    sql_scheduler.save(sent_event, read_only_attributes=True)
+    sql_scheduler.save(interval_entry)
+    with sql_scheduler._Session() as sess:
+        db_entry = sess.query(SQLScheduleEntry).filter(SQLScheduleEntry.key_ == sent_event.key).one()
+
+    assert db_entry.enabled_ == True
+    assert db_entry.next_due_at_ is None
+    assert sql_scheduler.backfill_columns() == 0
+    held_keys = [
+        sched_entry.key
+        for sched_entry, version in sql_scheduler._look_ahead_stored_entries(time.time() + 3600)
+    ]
+    assert held_keys == [interval_entry.key]
+
+
+def test__send_look_ahead_entries_lost_lock(
+    sql_scheduler: SQLScheduler,
+    interval_entry: IntervalEntry
+) -> None:
+    sql_scheduler.look_ahead_window = datetime.timedelta(seconds=2)
+    sql_scheduler.__post_init_post_parse__()
+    sql_scheduler.save(interval_entry)
+    sql_scheduler._run_once()
+    assert interval_entry.key in sql_scheduler._look_ahead_entries
+    sql_scheduler._lock_lost.set()
+    time.sleep(.2)
+    assert sql_scheduler._send_look_ahead_entries() == 0
+    assert sql_scheduler._look_ahead_entries == {}
+    sql_scheduler.send.assert_not_called()
+
+
+@pytest.mark.parametrize("expired_entry_action", ["purge", "archive"])
+def test__sweep_expired(
+    sql_scheduler: SQLScheduler,
+    test_task: str,
+    expired_entry_action: str
+) -> None:
+    sql_scheduler.fired_entry_retention = datetime.timedelta(seconds=0)
+    sql_scheduler.expired_entry_action = expired_entry_action
+    sql_scheduler.expiry_sweep_batch_size = 2
+    for i in range(3):
+        sql_scheduler.save(
+            entries.EventEntry(
+                key="fire_once_{}".format(i),
+                enabled=True,
+                task=test_task,
+                due_at=utc_now_naive()
+            )
+        )
+
+    kept_entry = entries.EventEntry(
+        key="not_expired",
+        enabled=True,
+        task=test_task,
+        due_at=utc_now_naive() + datetime.timedelta(days=1),
+        expires_at=utc_now_naive() + datetime.timedelta(days=2)
+    )
+    sql_scheduler.save(kept_entry)
+    sql_scheduler._run_once()
+    assert len([
+        call for call in sql_scheduler.send.call_args_list 
+        if call.args[0].key.startswith("fire_once_")
+    ]) == 3
+    assert sql_scheduler.count(filter=ScheduleEntryFilter(key_prefix="fire_once_")) == 3
+    num_event_entries = sql_scheduler.stats().by_type["EventEntry"]
+    assert sql_scheduler._sweep_expired() == 2
+    assert sql_scheduler._sweep_expired() == 1
+    assert sql_scheduler._sweep_expired() == 0
+    assert sql_scheduler.count(filter=ScheduleEntryFilter(key_prefix="fire_once_")) == 0
+    assert sql_scheduler.get("not_expired").expires_at == kept_entry.expires_at
+    assert sql_scheduler.stats().by_type["EventEntry"] == num_event_entries - 3
+    with sql_scheduler._Session() as session:
+        archived_keys = sorted(
+            row.key_ for row in session.query(SQLScheduleEntryArchive).all()
+        )
+
+    if expired_entry_action == "archive":
+        assert archived_keys == ["fire_once_0", "fire_once_1", "fire_once_2"]
+    else:
+        assert archived_keys == []
+
+
+def test_metrics(
+    sql_scheduler: SQLScheduler,
+    test_task: str
+) -> None:
+    sql_scheduler.metrics_sink = PrometheusMetricsSink()
+    sql_scheduler.save(
+        entries.EventEntry(
+            key="fire_once",
+            enabled=True,
+            task=test_task,
+            due_at=utc_now_naive()
+        )
+    )
+    sql_scheduler._acquire_lock()
+    sql_scheduler._run_once()
+    assert sql_scheduler._refresh_lock() == True
+    rendered = sql_scheduler.metrics_sink.render()
+    assert "{}_count 1".format(metrics.TICK_DURATION) in rendered
+    assert '{}_count{{task="{}"}}'.format(metrics.SCHEDULING_LAG, test_task) in rendered
+    assert '{}_count{{task="{}"}}'.format(metrics.SEND_LATENCY, test_task) in rendered
+    assert "{}_count 1".format(metrics.LOCK_ACQUIRE_DURATION) in rendered
+    assert "{}_count 1".format(metrics.LOCK_REFRESH_DURATION) in rendered
+    assert metrics.LOCK_LOSSES not in rendered
+
+
+def test_operation_stats(
+    sql_scheduler: SQLScheduler,
+    test_task: str
+) -> None:
+    sql_scheduler.save(
+        entries.EventEntry(
+            key="fire_once",
+            enabled=True,
+            task=test_task,
+            due_at=utc_now_naive()
+        )
+    )
+    sql_scheduler._run_once()
+    list(sql_scheduler.list())
+    sql_scheduler.get("fire_once")
+    sql_scheduler.count()
+    sql_scheduler.stats()
+    dumped = sql_scheduler.operation_stats.dump()
+    for operation in (
+        operation_stats.SELECT,
+        operation_stats.SELECT_FOR_UPDATE,
+        operation_stats.COUNT,
+        operation_stats.COMMIT,
+        operation_stats.DECODE
+    ):
+        assert dumped[operation]["count"] > 0
+
+    assert dumped[operation_stats.COUNT]["count"] == 2
+
+
+@pytest.fixture
+def sql_scheduler_replica(
+    max_interval: datetime.timedelta,
+    lock_timeout: datetime.timedelta,
+    default_entries: List[entries.ScheduleEntry],
+    sql_scheduler: SQLScheduler,
+    tmp_path: Path
+) -> SQLScheduler:
+    # a replica that never catches up, so reads from it are easy to tell apart
+    replica_url = "sqlite:///{}".format(tmp_path / "replica.sqlite")
+    SQLScheduleEntry.__table__.create(sqlalchemy.create_engine(replica_url))
+    sql_sched = SQLScheduler(
+        max_interval=max_interval,
+        default_sched_entries=default_entries,
+        lock_timeout=lock_timeout,
+        create_engine_kwargs=sql_scheduler.create_engine_kwargs,
+        read_create_engine_kwargs={"url": replica_url}
+    )
+    sql_sched.send = MagicMock(return_value=None)
+
+    return sql_sched
+
+
+def test_read_replica(
+    sql_scheduler_replica: SQLScheduler,
+    interval_entry: IntervalEntry
+) -> None:
+    sql_scheduler_replica.save(interval_entry)
+    with pytest.raises(exceptions.ScheduleEntryNotFound):
+        sql_scheduler_replica.get(interval_entry.key)
+
+    assert interval_entry.key not in [entry.key for entry in sql_scheduler_replica.list()]
+    assert sql_scheduler_replica.list_page().entries == sql_scheduler_replica.default_sched_entries
+    assert sql_scheduler_replica.count() == len(sql_scheduler_replica.default_sched_entries)
+    assert sql_scheduler_replica.stats().total == len(sql_scheduler_replica.default_sched_entries)
+    # ticks stay on the primary
+    sql_scheduler_replica._run_once()
+    assert sql_scheduler_replica.send.call_count > 0
+
+
+def test_read_your_writes_window(
+    sql_scheduler_replica: SQLScheduler,
+    interval_entry: IntervalEntry
+) -> None:
+    sql_scheduler_replica.read_your_writes_window = datetime.timedelta(seconds=0.2)
+    with pytest.raises(exceptions.ScheduleEntryNotFound):
+        sql_scheduler_replica.get(interval_entry.key)
+
+    sql_scheduler_replica.save(interval_entry)
+    assert sql_scheduler_replica.get(interval_entry.key) == interval_entry
+    assert sql_scheduler_replica.count() == len(sql_scheduler_replica.default_sched_entries) + 1
+    time.sleep(0.25)
+    with pytest.raises(exceptions.ScheduleEntryNotFound):
+        sql_scheduler_replica.get(interval_entry.key)
+
+
+def test_creation_read_replica_no_url(
+    max_interval: datetime.timedelta,
+    lock_timeout: datetime.timedelta
+) -> None:
+    with pytest.raises(ValueError):
+        SQLScheduler(
+            max_interval=max_interval,
+            lock_timeout=lock_timeout,
+            create_engine_kwargs={"url": "sqlite://"},
+            read_create_engine_kwargs={}
+        )
+
+
+def test_get_entry_cache(
+    sql_scheduler: SQLScheduler,
+    sql_scheduler2: SQLScheduler,
+    interval_entry: IntervalEntry
+) -> None:
+    sql_scheduler.entry_cache_size = 10
+    sql_scheduler.__post_init_post_parse__()
+    sql_scheduler.save(interval_entry)
+    assert sql_scheduler.get(interval_entry.key) == interval_entry
+    sql_scheduler._operation_stats.reset()
+    assert sql_scheduler.get(interval_entry.key) == interval_entry
+    # the version matched, so the entry was not decoded again
+    assert "decode" not in sql_scheduler.operation_stats.dump()
+    assert sql_scheduler.entry_cache.hits == 1
+
+    # changed by another process
+    interval_entry.enabled = False
+    sql_scheduler2.save(interval_entry)
+    assert sql_scheduler.get(interval_entry.key).enabled == False
+    sql_scheduler2.delete(interval_entry)
+    with pytest.raises(exceptions.ScheduleEntryNotFound):
+        sql_scheduler.get(interval_entry.key)
+
+    assert len(sql_scheduler.entry_cache) == 0
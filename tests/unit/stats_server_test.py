@@ -0,0 +1,57 @@
+import datetime
+import json
+import urllib.error
+import urllib.request
+
+import pytest
+
+from beatdrop.runtime_stats import RuntimeStats
+from beatdrop.stats_server import StatsServer
+
+
+def test_runtime_stats() -> None:
+    runtime_stats = RuntimeStats(max_send_failures=2)
+    snapshot = runtime_stats.snapshot()
+    assert snapshot["lock_held"] is None
+    assert snapshot["last_tick_at"] is None
+    assert snapshot["dispatch_queue_depth"] == 0
+    assert snapshot["recent_send_failures"] == []
+
+    runtime_stats.set_lock_held(True)
+    runtime_stats.tick_finished(0.5, 3)
+    runtime_stats.sleeping(datetime.timedelta(seconds=10))
+    runtime_stats.send_started()
+    for key in ("a", "b", "c"):
+        runtime_stats.send_failed(key, "task", "error")
+
+    snapshot = runtime_stats.snapshot()
+    assert snapshot["lock_held"] == True
+    assert snapshot["last_tick_duration"] == 0.5
+    assert snapshot["entries_due_next_minute"] == 3
+    assert datetime.datetime.fromisoformat(snapshot["next_wake_up_at"]) > datetime.datetime.fromisoformat(snapshot["last_tick_at"])
+    assert snapshot["dispatch_queue_depth"] == 1
+    assert [failure["key"] for failure in snapshot["recent_send_failures"]] == ["b", "c"]
+
+    runtime_stats.send_finished()
+    assert runtime_stats.snapshot()["dispatch_queue_depth"] == 0
+
+
+def test_stats_server(caplog: pytest.LogCaptureFixture) -> None:
+    runtime_stats = RuntimeStats()
+    runtime_stats.tick_finished(0.25, 1)
+    stats_server = StatsServer(runtime_stats=runtime_stats)
+    stats_server.start()
+    try:
+        host, port = stats_server.address
+        with urllib.request.urlopen("http://{}:{}/stats".format(host, port), timeout=5) as response:
+            assert response.headers["Content-Type"] == "application/json"
+            assert json.loads(response.read()) == runtime_stats.snapshot()
+
+        with pytest.raises(urllib.error.HTTPError):
+            urllib.request.urlopen("http://{}:{}/other".format(host, port), timeout=5)
+
+    finally:
+        stats_server.stop()
+
+    assert '"GET /stats HTTP/1.1" 200' in caplog.text
+    assert "%s" not in caplog.text
@@ -0,0 +1,97 @@
+import random
+
+import pytest
+
+from beatdrop.timing_wheel import TimingWheel
+
+
+@pytest.fixture
+def timing_wheel() -> TimingWheel:
+    return TimingWheel(tick=1, wheel_size=4, levels=3, start=0)
+
+
+def test_schedule_advance(timing_wheel: TimingWheel) -> None:
+    timing_wheel.schedule("soon", 2.5)
+    timing_wheel.schedule("later", 10)
+    timing_wheel.schedule("much_later", 40)
+    timing_wheel.schedule("now", 0)
+    assert len(timing_wheel) == 4
+    assert timing_wheel.due_at("later") == 10
+    assert timing_wheel.next_due() == 0
+    assert timing_wheel.advance(0) == ["now"]
+    assert timing_wheel.next_due() == 2.5
+    # keys are expired at their due time, never before
+    assert timing_wheel.advance(2.4) == []
+    assert timing_wheel.advance(2.5) == ["soon"]
+    assert timing_wheel.advance(9.5) == []
+    assert timing_wheel.advance(12) == ["later"]
+    assert timing_wheel.advance(39) == []
+    assert timing_wheel.advance(45) == ["much_later"]
+    assert len(timing_wheel) == 0
+    assert timing_wheel.next_due() is None
+
+
+def test_schedule_replaces(timing_wheel: TimingWheel) -> None:
+    timing_wheel.schedule("key", 30)
+    timing_wheel.schedule("key", 2)
+    assert len(timing_wheel) == 1
+    assert timing_wheel.advance(2) == ["key"]
+    assert timing_wheel.advance(30) == []
+
+
+def test_cancel(timing_wheel: TimingWheel) -> None:
+    timing_wheel.schedule("key", 30)
+    timing_wheel.schedule("due", -1)
+    assert timing_wheel.cancel("key")
+    assert not timing_wheel.cancel("key")
+    assert timing_wheel.cancel("due")
+    assert "key" not in timing_wheel
+    assert timing_wheel.advance(100) == []
+
+
+def test_past_range(timing_wheel: TimingWheel) -> None:
+    # 3 levels of 4 slots cover 64 ticks
+    timing_wheel.schedule("far", 1000.5)
+    assert timing_wheel.next_due() <= 1000.5
+    assert timing_wheel.advance(1000) == []
+    assert timing_wheel.advance(1001) == ["far"]
+
+
+def test_count_before(timing_wheel: TimingWheel) -> None:
+    for due_at in [0, 1.5, 5, 17, 17.5, 1000]:
+        timing_wheel.schedule(str(due_at), due_at)
+
+    assert timing_wheel.count_before(1) == 1
+    assert timing_wheel.count_before(17.2) == 4
+    assert timing_wheel.count_before(18) == 5
+    assert timing_wheel.count_before(2000) == 6
+
+
+@pytest.mark.parametrize("levels", [1, 2, 3])
+def test_random(levels: int) -> None:
+    rnd = random.Random(levels)
+    timing_wheel = TimingWheel(tick=.1, wheel_size=8, levels=levels, start=100)
+    due_ats = {}
+    now = 100
+    for _ in range(2000):
+        key = "key{}".format(rnd.randrange(100))
+        operation = rnd.random()
+        if operation < .5:
+            due_ats[key] = now + rnd.choice([rnd.uniform(-1, 1), rnd.uniform(0, 20), rnd.uniform(0, 500)])
+            timing_wheel.schedule(key, due_ats[key])
+        elif operation < .6:
+            assert timing_wheel.cancel(key) == (key in due_ats)
+            due_ats.pop(key, None)
+        else:
+            now += rnd.choice([rnd.uniform(0, 1), rnd.uniform(0, 50)])
+            assert timing_wheel.count_before(now + 10) == sum(1 for due_at in due_ats.values() if due_at < now + 10)
+            if due_ats:
+                assert timing_wheel.next_due() <= max(min(due_ats.values()), timing_wheel._current * .1)
+
+            expired = timing_wheel.advance(now)
+            assert all(due_ats[key] <= now for key in expired)
+            assert not [key for key, due_at in due_ats.items() if due_at <= now and key not in expired]
+            for key in expired:
+                del due_ats[key]
+
+            assert len(timing_wheel) == len(due_ats)
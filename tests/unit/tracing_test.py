@@ -0,0 +1,31 @@
+import pytest
+
+from beatdrop import tracing
+
+
+def test_no_op_without_opentelemetry(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(tracing, "trace", None)
+    monkeypatch.setattr(tracing, "propagate", None)
+    assert tracing.is_enabled() == False
+    with tracing.start_span(tracing.TICK_SPAN, {"beatdrop.entries.due": 1}) as span:
+        assert span is None
+        tracing.set_span_attributes({"beatdrop.entries.scanned": 1})
+
+    assert tracing.inject_context() == {}
+    assert tracing.extract_context({"traceparent": "00-0af7651916cd43dd8448eb211c80319c-b7ad6b7169203331-01"}) is None
+
+
+def test_propagation() -> None:
+    pytest.importorskip("opentelemetry.sdk")
+    from opentelemetry import trace
+    from opentelemetry.sdk.trace import TracerProvider
+
+    trace.set_tracer_provider(TracerProvider())
+    with tracing.start_span(tracing.SEND_SPAN) as span:
+        carrier = tracing.inject_context()
+        span_context = span.get_span_context()
+
+    assert "traceparent" in carrier
+    extracted = trace.get_current_span(tracing.extract_context(carrier)).get_span_context()
+    assert extracted.trace_id == span_context.trace_id
+    assert extracted.span_id == span_context.span_id